@@ -3,10 +3,19 @@ AI Leadership 4Dx - AI Provider API
 """
 
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import AsyncIterator, Dict, List, Tuple
+import json
 from ..schemas.ai import AIProviderInfo, AIAnalysisRequest, AIInsightResponse
-from ..services.ai_client import AIClientFactory, get_ai_client
-from ..services.analysis import trigger_analysis
+from ..services.ai_client import AIClientFactory
+from ..services.ai_compare import compare_providers
+from ..services.ai_router import ai_router
+from ..services.insight_cache import insight_cache
+from ..services.insight_stream import stream_leadership_analysis
+from ..services.jobs import JobStatus, get_analysis_job_queue
+from ..services.repository import get_analysis_repository
+from ..services.singleflight import insight_flight
+from ..core.config import settings
 import logging
 
 router = APIRouter()
@@ -35,51 +44,66 @@ async def get_available_providers():
         )
 
 
+@router.get("/cache/stats")
+async def get_insight_cache_stats():
+    """LLM 인사이트 캐시 적중률/절감 시간 (동시 중복 호출 합침 횟수 포함)"""
+    return {**insight_cache.stats.snapshot(), "singleflight": insight_flight.stats.snapshot()}
+
+
+@router.get("/routing/stats")
+async def get_routing_stats():
+    """provider별 EWMA 지연/오류율, 서킷 상태, 라우팅/헤징 횟수"""
+    return ai_router.snapshot()
+
+
 @router.post("/analyze", response_model=AIInsightResponse)
 async def analyze_with_ai(request: AIAnalysisRequest):
     """선택한 AI Provider로 리더십 분석 실행"""
     try:
         # 사용자의 최신 설문 응답 가져오기
-        from ..core.database import get_service_supabase
-        db = get_service_supabase()
+        repository = await get_analysis_repository()
+        latest_response = await repository.latest_survey_response(request.user_id)
         
-        response_result = db.table("survey_responses") \
-            .select("responses") \
-            .eq("user_id", request.user_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
-        
-        if not response_result.data:
+        if not latest_response:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No survey response found for this user"
             )
         
-        responses = response_result.data[0]["responses"]
+        # AI 분석 작업 등록 후 완료 대기 (워커 풀에서 동시 실행 수 제한)
+        job_queue = await get_analysis_job_queue()
+        job = await job_queue.enqueue({
+            "user_id": request.user_id,
+            "responses": latest_response["responses"],
+            "ai_provider": request.ai_provider,
+            "survey_version": latest_response.get("survey_version"),
+            "survey_response_id": latest_response["id"],
+            "force_refresh": request.force_refresh,
+        })
+        job = await job_queue.wait(job.id, settings.ANALYSIS_JOB_WAIT_SECONDS)
         
-        # AI 분석 실행
-        await trigger_analysis(
-            request.user_id, 
-            responses,
-            ai_provider=request.ai_provider
-        )
+        if job is None or job.status == JobStatus.FAILED:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"AI analysis failed: {job.error if job else 'job expired'}"
+            )
+        if not job.finished:
+            # 대기 시간 초과 시 작업 ID 반환 (GET /api/analysis/jobs/{job_id}로 확인)
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"status": job.status.value, "job_id": job.id}
+            )
         
         # 분석 결과 조회
-        analysis_result = db.table("leadership_analysis") \
-            .select("*") \
-            .eq("user_id", request.user_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
-        
-        if not analysis_result.data:
+        latest_analysis = await repository.latest_analysis(request.user_id)
+        
+        if not latest_analysis:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Analysis failed"
             )
         
-        ai_insights = analysis_result.data[0]["ai_insights"]
+        ai_insights = latest_analysis["ai_insights"]
         
         return AIInsightResponse(
             strengths=ai_insights.get("strengths", []),
@@ -100,57 +124,92 @@ async def analyze_with_ai(request: AIAnalysisRequest):
         )
 
 
-@router.post("/compare")
-async def compare_ai_providers(request: AIAnalysisRequest):
-    """두 AI Provider의 분석 결과 비교"""
+async def _sse(events: AsyncIterator[Tuple[str, Dict]]) -> AsyncIterator[str]:
+    """(이벤트, 데이터) -> Server-Sent Events 형식"""
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/stream")
+async def analyze_with_ai_stream(request: AIAnalysisRequest):
+    """AI 분석 스트리밍 (SSE: scores -> insight 항목 -> done, 완료 시 분석 저장)"""
     try:
-        providers = AIClientFactory.get_available_providers()
+        repository = await get_analysis_repository()
+        latest_response = await repository.latest_survey_response(request.user_id)
         
-        if len(providers) < 2:
+        if not latest_response:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Need at least 2 AI providers for comparison"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No survey response found for this user"
             )
         
-        # 각 Provider로 분석 실행
-        results = {}
+        events = stream_leadership_analysis(
+            request.user_id,
+            latest_response,
+            request.ai_provider.value if request.ai_provider else None,
+            request.force_refresh,
+        )
+        return StreamingResponse(
+            _sse(events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
         
-        for provider_info in providers:
-            provider = provider_info["provider"]
-            try:
-                # AI 클라이언트 생성
-                ai_client = await get_ai_client(provider)
-                
-                # 사용자 데이터 준비 (실제로는 DB에서 가져와야 함)
-                from ..core.database import get_service_supabase
-                db = get_service_supabase()
-                
-                # 최신 분석 결과 가져오기
-                analysis_result = db.table("leadership_analysis") \
-                    .select("*") \
-                    .eq("user_id", request.user_id) \
-                    .order("created_at", desc=True) \
-                    .limit(1) \
-                    .execute()
-                
-                if analysis_result.data:
-                    data = {
-                        'people': analysis_result.data[0]["blake_mouton_people"],
-                        'production': analysis_result.data[0]["blake_mouton_production"],
-                        'care': analysis_result.data[0]["feedback_care"],
-                        'challenge': analysis_result.data[0]["feedback_challenge"],
-                        'lmx': analysis_result.data[0]["lmx_score"],
-                        'style': analysis_result.data[0]["leadership_style"],
-                        'context': request.context or "일반 기업 환경"
-                    }
-                    
-                    # AI 분석 실행
-                    result = await ai_client.analyze_leadership(data)
-                    results[provider] = result
-                
-            except Exception as e:
-                logger.error(f"Error with {provider}: {str(e)}")
-                results[provider] = {"error": str(e)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"AI streaming analysis error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"AI analysis failed: {str(e)}"
+        )
+
+
+async def _comparison_data(request: AIAnalysisRequest) -> Dict:
+    """비교용 분석 데이터 (최신 분석 1회 조회)"""
+    providers = AIClientFactory.get_available_providers()
+    
+    if len(providers) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Need at least 2 AI providers for comparison"
+        )
+    
+    repository = await get_analysis_repository()
+    latest_analysis = await repository.latest_analysis(request.user_id)
+    
+    if not latest_analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No analysis found for this user"
+        )
+    
+    return {
+        "providers": [p["provider"] for p in providers],
+        "data": {
+            'people': latest_analysis["blake_mouton_people"],
+            'production': latest_analysis["blake_mouton_production"],
+            'care': latest_analysis["feedback_care"],
+            'challenge': latest_analysis["feedback_challenge"],
+            'lmx': latest_analysis["lmx_score"],
+            'style': latest_analysis["leadership_style"],
+            'context': request.context or "일반 기업 환경"
+        },
+    }
+
+
+@router.post("/compare")
+async def compare_ai_providers(request: AIAnalysisRequest):
+    """AI Provider 분석 결과 비교 (동시 호출, provider별 지연 시간/토큰 사용량 포함)"""
+    try:
+        comparison = await _comparison_data(request)
+        
+        # 완료 순서대로 수집 (시간 초과 provider는 오류로 기록)
+        results = {}
+        async for provider, result in compare_providers(
+            comparison["providers"], comparison["data"], settings.AI_COMPARE_TIMEOUT
+        ):
+            results[provider] = result
         
         return {
             "comparison": results,
@@ -164,4 +223,35 @@ async def compare_ai_providers(request: AIAnalysisRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to compare AI providers"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/compare/stream")
+async def compare_ai_providers_stream(request: AIAnalysisRequest):
+    """AI Provider 비교 스트리밍 (SSE: provider별 result 이벤트를 완료 순서대로 -> done)"""
+    try:
+        comparison = await _comparison_data(request)
+        
+        async def events() -> AsyncIterator[Tuple[str, Dict]]:
+            completed = []
+            async for provider, result in compare_providers(
+                comparison["providers"], comparison["data"], settings.AI_COMPARE_TIMEOUT
+            ):
+                completed.append(provider)
+                yield "result", {"provider": provider, **result}
+            yield "done", {"completed": completed}
+        
+        return StreamingResponse(
+            _sse(events()),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Comparison error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compare AI providers"
+        )
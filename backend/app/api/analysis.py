@@ -9,10 +9,13 @@ from ..schemas.analysis import (
     LeadershipAnalysis, 
     AnalysisRequest,
     QuickAnalysis,
-    AIInsight
+    AIInsight,
+    AnalysisJobStatus
 )
-from ..core.database import get_service_supabase
-from ..services.analysis import trigger_analysis
+from ..services.repository import get_analysis_repository
+from ..services.jobs import AnalysisJob, get_analysis_job_queue
+from ..services.memo import memo_stats
+from ..services.singleflight import analysis_flight
 import logging
 
 router = APIRouter()
@@ -23,24 +26,17 @@ logger = logging.getLogger(__name__)
 async def get_user_analysis(user_id: str):
     """사용자의 최신 분석 결과 조회"""
     try:
-        db = get_service_supabase()
+        repository = await get_analysis_repository()
         
         # 최신 분석 결과 조회
-        result = db.table("leadership_analysis") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        data = await repository.latest_analysis(user_id)
         
-        if not result.data:
+        if not data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No analysis found for this user"
             )
         
-        data = result.data[0]
-        
         return LeadershipAnalysis(
             id=data["id"],
             user_id=data["user_id"],
@@ -81,17 +77,10 @@ async def get_analysis_history(
 ):
     """사용자의 분석 이력 조회"""
     try:
-        db = get_service_supabase()
-        
-        result = db.table("leadership_analysis") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .order("created_at", desc=True) \
-            .limit(limit) \
-            .execute()
+        repository = await get_analysis_repository()
         
         analyses = []
-        for data in result.data:
+        for data in await repository.analysis_history(user_id, limit):
             analyses.append(LeadershipAnalysis(
                 id=data["id"],
                 user_id=data["user_id"],
@@ -129,31 +118,32 @@ async def get_analysis_history(
 async def trigger_user_analysis(request: AnalysisRequest):
     """분석 실행 트리거"""
     try:
-        db = get_service_supabase()
+        repository = await get_analysis_repository()
         
         # 최신 설문 응답 가져오기
-        response_result = db.table("survey_responses") \
-            .select("responses") \
-            .eq("user_id", request.user_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        latest_response = await repository.latest_survey_response(request.user_id)
         
-        if not response_result.data:
+        if not latest_response:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No survey response found for this user"
             )
         
-        responses = response_result.data[0]["responses"]
-        
-        # 분석 실행
-        await trigger_analysis(request.user_id, responses)
+        # 분석 작업 등록 (응답 당시 설문 버전 기준으로 채점)
+        job_queue = await get_analysis_job_queue()
+        job = await job_queue.enqueue({
+            "user_id": request.user_id,
+            "responses": latest_response["responses"],
+            "survey_version": latest_response.get("survey_version"),
+            "survey_response_id": latest_response["id"],
+            "force_refresh": request.force_refresh,
+        })
         
         return {
             "status": "accepted",
             "message": "Analysis triggered successfully",
-            "user_id": request.user_id
+            "user_id": request.user_id,
+            "job_id": job.id
         }
         
     except HTTPException:
@@ -166,6 +156,67 @@ async def trigger_user_analysis(request: AnalysisRequest):
         )
 
 
+@router.get("/memo/stats")
+async def get_memo_stats():
+    """분석 메모이제이션 적중/미적중 통계 (동시 중복 분석 합침 횟수 포함)"""
+    return {**memo_stats.snapshot(), "singleflight": analysis_flight.stats.snapshot()}
+
+
+@router.get("/jobs/dead-letter", response_model=List[AnalysisJobStatus])
+async def get_dead_letter_jobs(limit: int = Query(100, ge=1, le=1000)):
+    """최종 실패한 분석 작업 목록"""
+    try:
+        job_queue = await get_analysis_job_queue()
+        jobs = await job_queue.dead_letters(limit)
+        return [_job_status(job) for job in jobs]
+        
+    except Exception as e:
+        logger.error(f"Error fetching dead-letter jobs: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching dead-letter jobs"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobStatus)
+async def get_analysis_job(job_id: str):
+    """분석 작업 상태 조회"""
+    try:
+        job_queue = await get_analysis_job_queue()
+        job = await job_queue.get(job_id)
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Analysis job not found"
+            )
+        
+        return _job_status(job)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching analysis job: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error fetching analysis job"
+        )
+
+
+def _job_status(job: AnalysisJob) -> AnalysisJobStatus:
+    """작업 -> 응답 스키마 변환"""
+    return AnalysisJobStatus(
+        job_id=job.id,
+        status=job.status.value,
+        attempts=job.attempts,
+        error=job.error,
+        user_id=job.payload.get("user_id"),
+        survey_response_id=job.payload.get("survey_response_id"),
+        created_at=datetime.fromtimestamp(job.created_at),
+        updated_at=datetime.fromtimestamp(job.updated_at)
+    )
+
+
 @router.get("/quick/{user_id}", response_model=QuickAnalysis)
 async def get_quick_analysis(user_id: str):
     """빠른 분석 결과 (프론트엔드 표시용)"""
@@ -6,7 +6,8 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from ..core.database import get_supabase
+from ..core.database import get_async_supabase
+from ..services.user_cache import user_cache
 import logging
 
 router = APIRouter()
@@ -44,10 +45,10 @@ class AuthResponse(BaseModel):
 async def login(request: LoginRequest):
     """로그인"""
     try:
-        client = get_supabase()
+        client = await get_async_supabase()
         
         # Supabase 인증
-        response = client.auth.sign_in_with_password({
+        response = await client.auth.sign_in_with_password({
             "email": request.email,
             "password": request.password
         })
@@ -59,7 +60,7 @@ async def login(request: LoginRequest):
             )
         
         # 사용자 정보 조회
-        user_result = client.table("users") \
+        user_result = await client.table("users") \
             .select("*") \
             .eq("id", response.user.id) \
             .single() \
@@ -90,10 +91,10 @@ async def login(request: LoginRequest):
 async def signup(request: SignUpRequest):
     """회원가입"""
     try:
-        client = get_supabase()
+        client = await get_async_supabase()
         
         # Supabase 회원가입
-        response = client.auth.sign_up({
+        response = await client.auth.sign_up({
             "email": request.email,
             "password": request.password
         })
@@ -115,7 +116,10 @@ async def signup(request: SignUpRequest):
             "role": "user"
         }
         
-        client.table("users").insert(user_data).execute()
+        await client.table("users").insert(user_data).execute()
+        
+        # 설문 제출용 이메일 -> 사용자 ID 캐시 무효화
+        await user_cache.invalidate(request.email)
         
         # 세션이 있으면 반환
         if response.session:
@@ -148,10 +152,10 @@ async def signup(request: SignUpRequest):
 async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """로그아웃"""
     try:
-        client = get_supabase()
+        client = await get_async_supabase()
         
         # Supabase 로그아웃
-        client.auth.sign_out()
+        await client.auth.sign_out()
         
         return {"message": "Logged out successfully"}
         
@@ -167,10 +171,10 @@ async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """현재 사용자 정보 조회"""
     try:
-        client = get_supabase()
+        client = await get_async_supabase()
         
         # 토큰으로 사용자 조회
-        user = client.auth.get_user(credentials.credentials)
+        user = await client.auth.get_user(credentials.credentials)
         
         if not user:
             raise HTTPException(
@@ -179,7 +183,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             )
         
         # 사용자 상세 정보 조회
-        user_result = client.table("users") \
+        user_result = await client.table("users") \
             .select("*") \
             .eq("id", user.user.id) \
             .single() \
@@ -201,10 +205,10 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
 async def refresh_token(refresh_token: str):
     """토큰 갱신"""
     try:
-        client = get_supabase()
+        client = await get_async_supabase()
         
         # 토큰 갱신
-        response = client.auth.refresh_session(refresh_token)
+        response = await client.auth.refresh_session(refresh_token)
         
         if not response.session:
             raise HTTPException(
@@ -6,6 +6,10 @@ from fastapi import APIRouter, status
 from datetime import datetime
 from ..core.config import settings
 from ..core.database import get_supabase
+from ..core.client_pool import client_pools
+from ..middleware.admission import admission_controller
+from ..middleware.rate_limit import rate_limiter, usage_monitor
+from ..services.user_cache import user_cache
 
 router = APIRouter()
 
@@ -31,6 +35,23 @@ async def health_check():
         health_status["status"] = "degraded"
         health_status["database"] = f"error: {str(e)}"
     
+    # 사용자별 클라이언트 풀 생성/재사용 횟수
+    health_status["user_client_pools"] = {
+        name: pool.snapshot() for name, pool in client_pools.items()
+    }
+    
+    # 설문 제출 사용자 확인 캐시 적중률
+    health_status["user_cache"] = user_cache.stats.snapshot()
+    
+    # 메모리 rate limit 저장소 키 수/삭제 횟수
+    health_status["rate_limit"] = rate_limiter.snapshot()
+    
+    # 경로별 허용/429/503 횟수와 동시 실행 현황
+    health_status["admission"] = admission_controller.snapshot()
+    
+    # LLM 사용량 롤업 DB 반영 현황
+    health_status["llm_usage"] = {**usage_monitor.stats.snapshot(), "pending": len(usage_monitor.pending)}
+    
     return health_status
 
 
@@ -9,8 +9,9 @@ from datetime import datetime, timedelta
 import os
 import tempfile
 from ..schemas.analysis import LeadershipAnalysis
-from ..core.database import get_service_supabase
+from ..core.database import get_async_service_supabase
 from ..services.report_generator import ReportGenerator
+from ..services.repository import get_analysis_repository
 import logging
 
 router = APIRouter()
@@ -24,7 +25,7 @@ async def generate_pdf_report(
 ):
     """PDF 보고서 생성"""
     try:
-        db = get_service_supabase()
+        db = await get_async_service_supabase()
         
         # 분석 결과 조회
         query = db.table("leadership_analysis").select("*").eq("user_id", user_id)
@@ -34,7 +35,7 @@ async def generate_pdf_report(
         else:
             query = query.order("created_at", desc=True).limit(1)
         
-        result = query.execute()
+        result = await query.execute()
         
         if not result.data:
             raise HTTPException(
@@ -45,7 +46,7 @@ async def generate_pdf_report(
         analysis_data = result.data[0]
         
         # 사용자 정보 조회
-        user_result = db.table("users").select("*").eq("id", user_id).single().execute()
+        user_result = await db.table("users").select("*").eq("id", user_id).single().execute()
         user_data = user_result.data
         
         # PDF 생성
@@ -73,27 +74,21 @@ async def generate_pdf_report(
 async def get_report_summary(user_id: str):
     """보고서 요약 조회"""
     try:
-        db = get_service_supabase()
+        db = await get_async_service_supabase()
+        repository = await get_analysis_repository(db)
         
         # 최신 분석 결과
-        analysis_result = db.table("leadership_analysis") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        analysis = await repository.latest_analysis(user_id)
         
-        if not analysis_result.data:
+        if not analysis:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No analysis found"
             )
         
-        analysis = analysis_result.data[0]
-        
         # 과거 분석과 비교
         past_date = datetime.now() - timedelta(days=90)
-        history_result = db.table("leadership_analysis") \
+        history_result = await db.table("leadership_analysis") \
             .select("blake_mouton_people,blake_mouton_production,lmx_score,created_at") \
             .eq("user_id", user_id) \
             .gte("created_at", past_date.isoformat()) \
@@ -107,21 +102,9 @@ async def get_report_summary(user_id: str):
             "lmx": _calculate_trend([h["lmx_score"] for h in history_result.data])
         }
         
-        # 동료 비교 (익명화)
-        peer_result = db.table("leadership_analysis") \
-            .select("leadership_style") \
-            .neq("user_id", user_id) \
-            .execute()
-        
-        style_distribution = {}
-        for peer in peer_result.data:
-            style = peer["leadership_style"]
-            style_distribution[style] = style_distribution.get(style, 0) + 1
-        
-        total_peers = len(peer_result.data)
-        style_percentile = {}
-        for style, count in style_distribution.items():
-            style_percentile[style] = (count / total_peers * 100) if total_peers > 0 else 0
+        # 동료 비교 (익명화, 집계 행에서 본인 기여분 제외)
+        peer_comparison = await _get_peer_style_distribution(db, user_id)
+        peer_comparison["your_style"] = analysis["leadership_style"]
         
         return {
             "current_analysis": {
@@ -134,11 +117,7 @@ async def get_report_summary(user_id: str):
                 }
             },
             "trends": trend,
-            "peer_comparison": {
-                "your_style": analysis["leadership_style"],
-                "style_distribution": style_percentile,
-                "total_peers": total_peers
-            },
+            "peer_comparison": peer_comparison,
             "key_insights": analysis["ai_insights"].get("strengths", [])[:3],
             "development_focus": analysis["ai_insights"].get("improvements", [])[:3]
         }
@@ -160,55 +139,43 @@ async def get_team_report(
 ):
     """팀/조직 보고서"""
     try:
-        db = get_service_supabase()
-        
-        # 팀원 조회
-        user_query = db.table("users").select("id").eq("organization", organization)
-        if department:
-            user_query = user_query.eq("department", department)
+        db = await get_async_service_supabase()
         
-        users_result = user_query.execute()
-        user_ids = [u["id"] for u in users_result.data]
+        # 조직/부서 집계 조회 (분석 저장 시 DB 트리거가 증분 갱신)
+        stats_result = await db.table("team_analysis_stats") \
+            .select("*") \
+            .eq("organization", organization) \
+            .eq("department", department or "") \
+            .limit(1) \
+            .execute()
         
-        if not user_ids:
+        stats = stats_result.data[0] if stats_result.data else None
+        if not stats or stats["member_count"] <= 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No users found in this organization"
             )
         
-        # 팀 분석 데이터 조회
-        analyses_result = db.table("leadership_analysis") \
-            .select("*") \
-            .in_("user_id", user_ids) \
-            .execute()
-        
-        # 통계 계산
-        styles = {}
+        # 통계 계산 (구성원별 최신 분석 기준)
+        styles = {
+            style: count for style, count in stats["style_counts"].items() if count > 0
+        }
         risks = {"low": 0, "medium": 0, "high": 0}
-        avg_scores = {"people": 0, "production": 0, "lmx": 0}
-        
-        for analysis in analyses_result.data:
-            # 스타일 분포
-            style = analysis["leadership_style"]
-            styles[style] = styles.get(style, 0) + 1
-            
-            # 위험도 분포
-            risk = analysis["overall_risk_level"]
-            risks[risk] += 1
-            
-            # 평균 점수
-            avg_scores["people"] += analysis["blake_mouton_people"]
-            avg_scores["production"] += analysis["blake_mouton_production"]
-            avg_scores["lmx"] += analysis["lmx_score"]
+        risks.update(stats["risk_counts"])
         
-        total_analyses = len(analyses_result.data)
+        total_analyses = stats["analyzed_members"]
+        avg_scores = {"people": 0, "production": 0, "lmx": 0}
         if total_analyses > 0:
-            avg_scores = {k: v / total_analyses for k, v in avg_scores.items()}
+            avg_scores = {
+                "people": float(stats["sum_people"]) / total_analyses,
+                "production": float(stats["sum_production"]) / total_analyses,
+                "lmx": float(stats["sum_lmx"]) / total_analyses
+            }
         
         return {
             "organization": organization,
             "department": department,
-            "total_members": len(user_ids),
+            "total_members": stats["member_count"],
             "analyzed_members": total_analyses,
             "style_distribution": styles,
             "risk_distribution": risks,
@@ -246,6 +213,48 @@ def _calculate_trend(values: List[float]) -> str:
     return "stable"
 
 
+async def _get_peer_style_distribution(db, user_id: str) -> dict:
+    """동료 스타일 분포 (전체 + 소속 조직, 본인 최신 분석 제외)"""
+    own_result = await db.table("user_latest_analysis") \
+        .select("organization,leadership_style") \
+        .eq("user_id", user_id) \
+        .limit(1) \
+        .execute()
+    own = own_result.data[0] if own_result.data else None
+    organization = own["organization"] if own else None
+
+    scopes = [""] + ([organization] if organization else [])
+    stats_result = await db.table("style_distribution_stats") \
+        .select("scope,total,style_counts") \
+        .in_("scope", scopes) \
+        .execute()
+    stats = {row["scope"]: row for row in stats_result.data}
+
+    def distribution(scope: str) -> dict:
+        row = stats.get(scope) or {"total": 0, "style_counts": {}}
+        counts = dict(row["style_counts"])
+        total_peers = row["total"]
+        if own:
+            own_style = own["leadership_style"] or "Unknown"
+            counts[own_style] = counts.get(own_style, 0) - 1
+            total_peers -= 1
+        return {
+            "style_distribution": {
+                style: (count / total_peers * 100) if total_peers > 0 else 0
+                for style, count in counts.items() if count > 0
+            },
+            "total_peers": max(total_peers, 0)
+        }
+
+    peer_comparison = distribution("")
+    if organization:
+        peer_comparison["organization"] = {
+            "name": organization,
+            **distribution(organization)
+        }
+    return peer_comparison
+
+
 def _assess_team_health(avg_scores: dict, risks: dict) -> str:
     """팀 건강도 평가"""
     # 평균 점수가 5 이상이고 고위험이 20% 미만이면 건강
@@ -2,14 +2,19 @@
 AI Leadership 4Dx - Survey API
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List, Dict, Optional
 import json
 from uuid import uuid4
 from datetime import datetime
-from ..schemas.survey import SurveySubmission, SurveyResponse, SurveyStats
-from ..core.database import get_service_supabase
-from ..services.analysis import trigger_analysis
+from ..schemas.survey import SurveySubmission, SurveyResponse, SurveyStats, SurveyBulkResult
+from ..core.config import settings
+from ..core.database import get_async_service_supabase
+from ..services.ingest import SurveyBulkIngestor
+from ..services.jobs import get_analysis_job_queue
+from ..services.repository import get_analysis_repository
+from ..services.scoring import DEFAULT_SURVEY_VERSION, get_scoring_spec
+from ..services.user_cache import user_cache
 
 router = APIRouter()
 
@@ -21,29 +26,31 @@ async def submit_survey(
 ):
     """설문 응답 제출"""
     try:
-        db = get_service_supabase()
+        # 설문 버전 확인 (등록된 채점 스펙이 있어야 함)
+        survey_version = submission.survey_version or DEFAULT_SURVEY_VERSION
+        try:
+            get_scoring_spec(survey_version)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported survey version: {survey_version}"
+            )
+        
+        db = await get_async_service_supabase()
         
-        # 사용자 확인 또는 생성
+        # 사용자 확인 또는 생성 (캐시 적중 시 DB 조회 없음, 생성은 이메일 기준 upsert)
         user_id = submission.user_id
         if not user_id:
-            # 이메일로 사용자 검색
-            user_result = db.table("users").select("*").eq("email", submission.email).execute()
-            
-            if user_result.data:
-                user_id = user_result.data[0]["id"]
-            else:
-                # 새 사용자 생성
-                new_user = {
-                    "id": str(uuid4()),
-                    "email": submission.email,
+            user_id = await user_cache.resolve(
+                submission.email,
+                {
                     "name": submission.name,
                     "organization": submission.organization,
                     "department": submission.department,
                     "position": submission.position,
-                    "role": "user",
-                }
-                user_result = db.table("users").insert(new_user).execute()
-                user_id = user_result.data[0]["id"]
+                },
+                await get_analysis_repository(db),
+            )
         
         # 응답 데이터 변환
         responses_dict = {r.question_id: r.value for r in submission.responses}
@@ -53,24 +60,39 @@ async def submit_survey(
             "id": str(uuid4()),
             "user_id": user_id,
             "responses": responses_dict,
+            "survey_version": survey_version,
             "completion_time_seconds": submission.completion_time_seconds or 0,
             "device_info": submission.device_info,
         }
         
-        result = db.table("survey_responses").insert(survey_data).execute()
+        try:
+            result = await db.table("survey_responses").insert(survey_data).execute()
+        except Exception:
+            # 캐시된 사용자가 삭제된 경우 다음 제출에서 다시 확인
+            if not submission.user_id:
+                await user_cache.invalidate(submission.email)
+            raise
         
         if result.data:
             response_data = result.data[0]
             
-            # 비동기 분석 트리거 (AI provider 지정 가능)
-            await trigger_analysis(user_id, responses_dict, ai_provider)
+            # 분석 작업 등록 (워커 풀에서 처리, AI provider 지정 가능)
+            job_queue = await get_analysis_job_queue()
+            job = await job_queue.enqueue({
+                "user_id": user_id,
+                "responses": responses_dict,
+                "ai_provider": ai_provider,
+                "survey_version": survey_version,
+                "survey_response_id": response_data["id"],
+            })
             
             return SurveyResponse(
                 id=response_data["id"],
                 user_id=response_data["user_id"],
                 responses=response_data["responses"],
                 completion_time_seconds=response_data["completion_time_seconds"],
-                created_at=datetime.fromisoformat(response_data["created_at"])
+                created_at=datetime.fromisoformat(response_data["created_at"]),
+                analysis_job_id=job.id
             )
         else:
             raise HTTPException(
@@ -78,6 +100,8 @@ async def submit_survey(
                 detail="Failed to save survey response"
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -85,12 +109,56 @@ async def submit_survey(
         )
 
 
+@router.post("/bulk", response_model=SurveyBulkResult)
+async def submit_survey_bulk(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson or csv (default: from Content-Type)"),
+    analyze: bool = Query(True, description="Enqueue analysis jobs for inserted responses"),
+    ai_provider: Optional[str] = Query(None, description="AI provider to use for analysis (openai or anthropic)")
+):
+    """설문 응답 대량 제출 (NDJSON/CSV 스트리밍, 행별 오류 반환)"""
+    try:
+        fmt = format
+        if fmt is None:
+            content_type = request.headers.get("content-type", "")
+            fmt = "csv" if "csv" in content_type else "ndjson"
+        if fmt not in ("ndjson", "csv"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported format: {fmt}"
+            )
+        
+        repository = await get_analysis_repository()
+        job_queue = await get_analysis_job_queue() if analyze else None
+        ingestor = SurveyBulkIngestor(
+            repository,
+            job_queue,
+            batch_size=settings.SURVEY_BULK_BATCH_SIZE,
+            max_errors=settings.SURVEY_BULK_MAX_ERRORS,
+            ai_provider=ai_provider,
+        )
+        return await ingestor.ingest(request.stream(), fmt)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid bulk payload: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error ingesting surveys: {str(e)}"
+        )
+
+
 @router.get("/responses/{user_id}", response_model=List[SurveyResponse])
 async def get_user_responses(user_id: str):
     """사용자의 설문 응답 목록 조회"""
     try:
-        db = get_service_supabase()
-        result = db.table("survey_responses").select("*").eq("user_id", user_id).execute()
+        repository = await get_analysis_repository()
+        rows = await repository.survey_responses(user_id)
         
         return [
             SurveyResponse(
@@ -100,7 +168,7 @@ async def get_user_responses(user_id: str):
                 completion_time_seconds=r["completion_time_seconds"],
                 created_at=datetime.fromisoformat(r["created_at"])
             )
-            for r in result.data
+            for r in rows
         ]
     except Exception as e:
         raise HTTPException(
@@ -113,14 +181,14 @@ async def get_user_responses(user_id: str):
 async def get_survey_stats():
     """설문 통계 조회"""
     try:
-        db = get_service_supabase()
+        db = await get_async_service_supabase()
         
         # 전체 응답 수
-        total_result = db.table("survey_responses").select("id", count="exact").execute()
+        total_result = await db.table("survey_responses").select("id", count="exact").execute()
         total_responses = total_result.count or 0
         
         # 평균 완료 시간
-        time_result = db.table("survey_responses").select("completion_time_seconds").execute()
+        time_result = await db.table("survey_responses").select("completion_time_seconds").execute()
         if time_result.data:
             times = [r["completion_time_seconds"] for r in time_result.data if r["completion_time_seconds"]]
             avg_time = sum(times) / len(times) if times else 0
@@ -128,13 +196,13 @@ async def get_survey_stats():
             avg_time = 0
         
         # 마지막 응답 시간
-        last_result = db.table("survey_responses").select("created_at").order("created_at", desc=True).limit(1).execute()
+        last_result = await db.table("survey_responses").select("created_at").order("created_at", desc=True).limit(1).execute()
         last_response_at = None
         if last_result.data:
             last_response_at = datetime.fromisoformat(last_result.data[0]["created_at"])
         
         # 응답률 계산 (전체 사용자 대비)
-        users_result = db.table("users").select("id", count="exact").execute()
+        users_result = await db.table("users").select("id", count="exact").execute()
         total_users = users_result.count or 1
         response_rate = (total_responses / total_users) * 100 if total_users > 0 else 0
         
@@ -0,0 +1,115 @@
+"""
+사용자별 Supabase 클라이언트 풀
+토큰 해시 기준 LRU 재사용, JWT 만료 시각에 제거 (요청마다 새 HTTP 세션/인증 설정 방지)
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Generic, Tuple, TypeVar
+
+from jose import jwt
+
+logger = logging.getLogger(__name__)
+
+ClientT = TypeVar("ClientT")
+
+# 이름별 풀 (헬스 체크에서 통계 조회)
+client_pools: Dict[str, "UserClientPool"] = {}
+
+
+@dataclass
+class ClientPoolStats:
+    """생성/재사용/제거 횟수 (프로세스 단위)"""
+    created: int = 0
+    reused: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    def snapshot(self) -> Dict:
+        return asdict(self)
+
+
+def token_ttl(access_token: str, default_ttl: float) -> float:
+    """JWT exp 클레임까지 남은 시간 (서명 검증 없이 읽기만 함, exp 없으면 기본값)"""
+    try:
+        exp = jwt.get_unverified_claims(access_token).get("exp")
+    except Exception:
+        exp = None
+    if exp is None:
+        return default_ttl
+    return float(exp) - time.time()
+
+
+class UserClientPool(Generic[ClientT]):
+    """토큰 해시 -> 클라이언트 LRU (만료 토큰 제거, 최대 크기 제한)"""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[str], ClientT],
+        max_size: int = 256,
+        default_ttl: float = 3600.0,
+    ):
+        self.name = name
+        self.factory = factory
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.stats = ClientPoolStats()
+        self._clients: "OrderedDict[str, Tuple[float, ClientT]]" = OrderedDict()
+        self._lock = threading.Lock()
+        client_pools[name] = self
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, access_token: str) -> ClientT:
+        """토큰의 클라이언트 반환 (없거나 만료 시 생성)"""
+        key = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                expires_at, client = entry
+                if expires_at > now:
+                    self._clients.move_to_end(key)
+                    self.stats.reused += 1
+                    return client
+                del self._clients[key]
+                self.stats.expired += 1
+
+        client = self.factory(access_token)
+        expires_at = now + token_ttl(access_token, self.default_ttl)
+
+        with self._lock:
+            self.stats.created += 1
+            # 이미 만료된 토큰은 풀에 넣지 않음
+            if expires_at > now:
+                self._clients[key] = (expires_at, client)
+                self._clients.move_to_end(key)
+                self._prune(now)
+        return client
+
+    def _prune(self, now: float) -> None:
+        """만료 항목 제거 후 최대 크기 초과분을 오래된 순으로 제거"""
+        if len(self._clients) <= self.max_size:
+            return
+        for key in [k for k, (expires_at, _) in self._clients.items() if expires_at <= now]:
+            del self._clients[key]
+            self.stats.expired += 1
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+            self.stats.evicted += 1
+
+    def snapshot(self) -> Dict:
+        return {"size": len(self), "max_size": self.max_size, **self.stats.snapshot()}
+
+    def clear(self) -> None:
+        """풀/통계 초기화"""
+        with self._lock:
+            self._clients.clear()
+            self.stats = ClientPoolStats()
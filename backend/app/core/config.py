@@ -26,6 +26,24 @@ class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_KEY: str
+    # 비동기 PostgREST HTTP 커넥션 풀 (클라이언트별)
+    DB_HTTP_MAX_CONNECTIONS: int = 100
+    DB_HTTP_MAX_KEEPALIVE: int = 20
+    DB_HTTP_TIMEOUT: float = 30.0
+    # 사용자별 클라이언트 풀 (토큰 해시 기준, JWT 만료 시 제거)
+    USER_CLIENT_POOL_SIZE: int = 256
+    USER_CLIENT_DEFAULT_TTL: float = 3600.0
+    
+    # Postgres 직접 연결 (핫 쿼리 전용, 연결 실패 시 Supabase REST로 대체)
+    DB_BACKEND: str = "rest"  # "rest" or "postgres"
+    DATABASE_URL: Optional[str] = None
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    
+    # Bulk survey ingestion
+    SURVEY_BULK_BATCH_SIZE: int = 1000
+    SURVEY_BULK_MAX_ERRORS: int = 1000
     
     # AI Models
     # OpenAI
@@ -39,6 +57,31 @@ class Settings(BaseSettings):
     # Default AI Provider
     DEFAULT_AI_PROVIDER: str = "openai"  # "openai" or "anthropic"
     
+    # Provider 비교 시 provider별 제한 시간 (초)
+    AI_COMPARE_TIMEOUT: float = 30.0
+    
+    # Provider 라우팅 (provider 미지정 요청을 EWMA 지연/오류율 기준으로 분배)
+    AI_ROUTER_EWMA_ALPHA: float = 0.2
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    AI_CIRCUIT_RESET_SECONDS: float = 30.0
+    # 헤징: 1순위가 p95 지연을 넘기면 2순위에도 요청 (토큰 비용 증가)
+    AI_HEDGE_ENABLED: bool = False
+    AI_HEDGE_PERCENTILE: float = 0.95
+    AI_HEDGE_MIN_DELAY: float = 1.0
+    
+    # 토큰 단가 (USD / 1M 토큰, 비용 보고용)
+    OPENAI_INPUT_PRICE_PER_MTOK: float = 0.40
+    OPENAI_CACHED_INPUT_PRICE_PER_MTOK: float = 0.10  # 프롬프트 캐시 적중 입력
+    OPENAI_OUTPUT_PRICE_PER_MTOK: float = 1.60
+    ANTHROPIC_INPUT_PRICE_PER_MTOK: float = 3.00
+    ANTHROPIC_CACHED_INPUT_PRICE_PER_MTOK: float = 0.30  # 프롬프트 캐시 읽기
+    ANTHROPIC_OUTPUT_PRICE_PER_MTOK: float = 15.00
+    
+    # 배치 인사이트 생성 (조직 전체 재생성, provider 배치 API 또는 로컬 대체 실행)
+    AI_BATCH_POLL_INTERVAL: float = 30.0
+    AI_BATCH_MAX_WAIT: float = 86400.0
+    AI_BATCH_LOCAL_CONCURRENCY: int = 2
+    
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -63,6 +106,45 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: Optional[str] = None
     
+    # Analysis Job Queue
+    ANALYSIS_JOB_BACKEND: str = "memory"  # "memory" or "redis"
+    ANALYSIS_WORKERS: int = 4
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 3
+    ANALYSIS_JOB_BACKOFF_SECONDS: float = 1.0
+    ANALYSIS_JOB_WAIT_SECONDS: float = 60.0
+    ANALYSIS_JOB_STALE_SECONDS: float = 300.0  # 이 시간 동안 생존 표시 없는 워커의 작업은 대기열로 복구
+    
+    # LLM Insight Cache (양자화 점수 프로필 기준)
+    INSIGHT_CACHE_QUANTUM: float = 0.25
+    INSIGHT_CACHE_LOCAL_SIZE: int = 1024
+    INSIGHT_CACHE_LOCAL_TTL: int = 600
+    INSIGHT_CACHE_TTL: int = 604800
+    
+    # User Resolution Cache (설문 제출 이메일 -> 사용자 ID)
+    USER_CACHE_LOCAL_SIZE: int = 10000
+    USER_CACHE_LOCAL_TTL: int = 300
+    USER_CACHE_TTL: int = 86400
+    USER_CACHE_NEGATIVE_TTL: int = 60
+    
+    # Singleflight (동시 중복 분석/LLM 호출 제거, Redis 락은 다중 워커용)
+    SINGLEFLIGHT_REDIS_LOCK: bool = False
+    SINGLEFLIGHT_LOCK_TTL: float = 120.0
+    
+    # Rate Limit (Redis 미사용 시 메모리 저장소 키 수 상한, 초과 시 LRU 삭제)
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 10000
+    
+    # Admission Control (API 경로별 사용자 한도, 비싼 경로 동시 실행 상한/대기열)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT_PER_MINUTE: int = 300
+    RATE_LIMIT_REPORT_CONCURRENCY: int = 4
+    RATE_LIMIT_QUEUE_SIZE: int = 8
+    RATE_LIMIT_QUEUE_TIMEOUT: float = 2.0
+    
+    # LLM 사용량 롤업 (분/시간/일 버킷, 미반영 증분을 주기적으로 llm_usage_rollups에 합산)
+    LLM_USAGE_FLUSH_INTERVAL: float = 60.0
+    LLM_USAGE_FLUSH_BATCH_SIZE: int = 500
+    LLM_USAGE_MAX_PENDING: int = 50000
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
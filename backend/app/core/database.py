@@ -2,10 +2,13 @@
 AI Leadership 4Dx - Database Connection
 """
 
-from supabase import create_client, Client
-from typing import Optional
+from supabase import create_client, acreate_client, Client, ClientOptions, AsyncClient, AsyncClientOptions
+from typing import List, Optional
+import asyncio
 import logging
+import httpx
 from .config import settings
+from .client_pool import UserClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -62,21 +65,93 @@ class SupabaseClient:
         return self._service_client
     
     def get_user_client(self, access_token: str) -> Client:
-        """사용자 인증 토큰으로 클라이언트 생성"""
-        client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_ANON_KEY,
-            options={
-                "headers": {
-                    "Authorization": f"Bearer {access_token}"
-                }
+        """사용자 인증 토큰의 클라이언트 반환 (토큰 만료 전까지 풀에서 재사용)"""
+        return user_client_pool.get(access_token)
+
+
+def _create_user_client(access_token: str) -> Client:
+    """사용자 인증 토큰으로 클라이언트 생성"""
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_ANON_KEY,
+        options=ClientOptions(
+            headers={
+                "Authorization": f"Bearer {access_token}"
             }
         )
+    )
+
+
+class AsyncSupabaseClient:
+    """비동기 Supabase 클라이언트 (이벤트 루프 비차단)
+    
+    클라이언트별 HTTP 커넥션 풀(keep-alive, HTTP/2)을 프로세스 전체에서 재사용한다.
+    PostgREST가 전달받은 HTTP 클라이언트의 base_url/헤더를 덮어쓰므로 풀은 클라이언트 간 공유하지 않는다.
+    """
+    
+    def __init__(self):
+        self._client: Optional[AsyncClient] = None
+        self._service_client: Optional[AsyncClient] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._http_clients: List[httpx.AsyncClient] = []
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.DB_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.DB_HTTP_MAX_KEEPALIVE,
+            ),
+            timeout=settings.DB_HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+        )
+        self._http_clients.append(http_client)
+        return http_client
+    
+    async def _get(self, attr: str, key: str) -> AsyncClient:
+        client = getattr(self, attr)
+        if client is not None:
+            return client
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            client = getattr(self, attr)
+            if client is None:
+                client = await acreate_client(
+                    settings.SUPABASE_URL,
+                    key,
+                    options=AsyncClientOptions(httpx_client=self._create_http_client())
+                )
+                setattr(self, attr, client)
+                logger.info(f"Async Supabase {attr.strip('_')} initialized")
         return client
+    
+    async def client(self) -> AsyncClient:
+        """일반 비동기 클라이언트 (RLS 적용)"""
+        return await self._get("_client", settings.SUPABASE_ANON_KEY)
+    
+    async def service_client(self) -> AsyncClient:
+        """서비스 비동기 클라이언트 (RLS 우회)"""
+        return await self._get("_service_client", settings.SUPABASE_SERVICE_KEY)
+    
+    async def close(self) -> None:
+        """HTTP 커넥션 풀 종료"""
+        self._client = None
+        self._service_client = None
+        while self._http_clients:
+            await self._http_clients.pop().aclose()
 
 
 # 싱글톤 인스턴스
+user_client_pool = UserClientPool(
+    "user",
+    _create_user_client,
+    max_size=settings.USER_CLIENT_POOL_SIZE,
+    default_ttl=settings.USER_CLIENT_DEFAULT_TTL,
+)
 supabase_client = SupabaseClient()
+async_supabase_client = AsyncSupabaseClient()
 
 
 # 헬퍼 함수들
@@ -92,4 +167,14 @@ def get_service_supabase() -> Client:
 
 def get_user_supabase(access_token: str) -> Client:
     """사용자별 Supabase 클라이언트 반환"""
-    return supabase_client.get_user_client(access_token)
\ No newline at end of file
+    return supabase_client.get_user_client(access_token)
+
+
+async def get_async_supabase() -> AsyncClient:
+    """일반 비동기 Supabase 클라이언트 반환"""
+    return await async_supabase_client.client()
+
+
+async def get_async_service_supabase() -> AsyncClient:
+    """서비스 비동기 Supabase 클라이언트 반환 (RLS 우회)"""
+    return await async_supabase_client.service_client()
@@ -0,0 +1,86 @@
+"""
+Postgres 직접 연결 풀 (asyncpg)
+핫 쿼리 전용 경로, DB_BACKEND="postgres" 설정 시 사용
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+import asyncpg
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# 연결 실패 후 재시도까지 대기 (요청마다 연결 시도 방지)
+RETRY_INTERVAL_SECONDS = 30.0
+
+# 풀 인스턴스
+pg_pool: Optional[asyncpg.Pool] = None
+_retry_at = 0.0
+_lock: Optional[asyncio.Lock] = None
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """JSON/JSONB를 dict로 주고받도록 코덱 설정 (REST 응답과 같은 형태)"""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def init_pg_pool() -> Optional[asyncpg.Pool]:
+    """연결 풀 초기화 (실패 시 None, 호출자는 REST로 대체)"""
+    global pg_pool, _retry_at
+
+    if not settings.DATABASE_URL:
+        logger.warning("DATABASE_URL is not set; using Supabase REST")
+        _retry_at = float("inf")
+        return None
+
+    try:
+        pg_pool = await asyncpg.create_pool(
+            settings.DATABASE_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            # 연결별 prepared statement 캐시 (PgBouncer transaction 모드는 0)
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            command_timeout=settings.DB_HTTP_TIMEOUT,
+            init=_init_connection,
+        )
+        logger.info("Postgres pool initialized")
+        return pg_pool
+
+    except Exception as e:
+        logger.warning(f"Postgres pool unavailable, using Supabase REST: {str(e)}")
+        pg_pool = None
+        _retry_at = time.monotonic() + RETRY_INTERVAL_SECONDS
+        return None
+
+
+async def get_pg_pool() -> Optional[asyncpg.Pool]:
+    """연결 풀 반환 (최근 실패 시 재시도 간격 동안 None)"""
+    global _lock
+
+    if pg_pool is not None or time.monotonic() < _retry_at:
+        return pg_pool
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if pg_pool is None and time.monotonic() >= _retry_at:
+            await init_pg_pool()
+    return pg_pool
+
+
+async def close_pg_pool() -> None:
+    """연결 풀 종료"""
+    global pg_pool
+
+    if pg_pool is not None:
+        await pg_pool.close()
+        pg_pool = None
+        logger.info("Postgres pool closed")
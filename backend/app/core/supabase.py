@@ -7,6 +7,7 @@ import os
 from typing import Optional
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from .client_pool import UserClientPool
 
 load_dotenv()
 
@@ -20,6 +21,21 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 # 서비스 클라이언트 (백엔드 전용, RLS 우회)
 supabase_service: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+
+def _create_session_client(access_token: str) -> Client:
+    """사용자 세션 클라이언트 생성 (RLS 적용)"""
+    client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    client.auth.set_session(access_token, "")
+    return client
+
+
+# 사용자별 클라이언트 풀 (토큰 만료 전까지 재사용)
+session_client_pool = UserClientPool(
+    "session",
+    _create_session_client,
+    max_size=int(os.getenv("USER_CLIENT_POOL_SIZE", "256")),
+)
+
 def get_supabase_client(access_token: Optional[str] = None) -> Client:
     """
     Supabase 클라이언트 반환
@@ -32,9 +48,7 @@ def get_supabase_client(access_token: Optional[str] = None) -> Client:
     """
     if access_token:
         # 사용자별 클라이언트 (RLS 적용)
-        client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-        client.auth.set_session(access_token, "")
-        return client
+        return session_client_pool.get(access_token)
     else:
         # 서비스 클라이언트 반환
         return supabase_service
@@ -8,7 +8,11 @@ from contextlib import asynccontextmanager
 import logging
 from .core.config import settings
 from .api import health, auth, survey, analysis, reports, ai
-from .core.database import supabase_client
+from .core.database import supabase_client, async_supabase_client
+from .core.postgres import close_pg_pool
+from .middleware.admission import AdmissionMiddleware
+from .middleware.rate_limit import usage_monitor
+from .services.jobs import get_analysis_job_queue
 
 # 로깅 설정
 logging.basicConfig(
@@ -34,10 +38,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Supabase connection failed: {e}")
     
+    # 분석 작업 워커 풀 시작
+    job_queue = await get_analysis_job_queue()
+    await job_queue.start()
+    
+    # LLM 사용량 롤업 주기 반영
+    usage_monitor.start()
+    
     yield
     
     # 종료 시
     logger.info("👋 Shutting down AI Leadership 4Dx API...")
+    await job_queue.stop()
+    await usage_monitor.stop()
+    await async_supabase_client.close()
+    await close_pg_pool()
 
 
 # FastAPI 앱 생성
@@ -51,6 +66,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 요청 한도/동시 실행 제어 (CORS 안쪽: 429/503 응답에도 CORS 헤더, preflight는 제외)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -58,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
 )
 
 # 라우터 등록
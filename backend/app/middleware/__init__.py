@@ -2,6 +2,12 @@
 미들웨어 패키지
 """
 
-from .auth import auth_middleware, security
+__all__ = ["auth_middleware", "security"]
 
-__all__ = ["auth_middleware", "security"]
\ No newline at end of file
+
+def __getattr__(name):
+    # auth는 가져올 때 JWT_SECRET을 요구하므로 처음 접근할 때 로드 (rate_limit만 쓰는 경로는 영향 없음)
+    if name in __all__:
+        from . import auth
+        return getattr(auth, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,284 @@
+"""
+AI Leadership 4Dx - Admission Control
+경로별/사용자별 요청 한도(RateLimiter)와 경로별 동시 실행 상한 + 대기열 ASGI 미들웨어
+
+- 한도 초과: 핸들러 실행 전 즉시 429 (Retry-After, X-RateLimit-* 헤더)
+- 동시 실행 상한 초과: 상한 있는 대기열에서 queue_timeout까지 대기, 대기열이 가득 차거나 시간 초과면 503
+  (과부하 시 대기 요청이 무한히 쌓이지 않으므로 처리되는 요청의 지연은 상한 안에서 유지)
+"""
+
+import asyncio
+import logging
+import math
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from jose import JWTError, jwt
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.config import settings
+from .rate_limit import RateLimiter, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# auth 모듈과 같은 설정 (auth는 가져올 때 JWT_SECRET을 요구하므로 직접 읽음)
+JWT_SECRET = os.getenv("JWT_SECRET", "")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+
+
+def compile_route(pattern: str) -> Pattern:
+    """FastAPI 경로 형식 -> 정규식 ({name}은 한 구간, {name:path}는 나머지 전체)"""
+    parts = []
+    for part in re.split(r"(\{[^}]+\})", pattern):
+        if part.startswith("{"):
+            parts.append(".+" if part.endswith(":path}") else "[^/]+")
+        else:
+            parts.append(re.escape(part))
+    return re.compile("^" + "".join(parts) + "$")
+
+
+@dataclass
+class RoutePolicy:
+    """경로별 제한 정책 (처음 일치하는 정책 하나만 적용)"""
+    name: str
+    pattern: str
+    limit: int
+    window: int = 60
+    anonymous_limit: Optional[int] = None
+    max_concurrency: Optional[int] = None
+    max_queue: int = 0
+    queue_timeout: float = 1.0
+    methods: Optional[Tuple[str, ...]] = None
+    regex: Pattern = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.regex = compile_route(self.pattern)
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return self.regex.match(path) is not None
+
+    def limit_for(self, principal: str) -> int:
+        """인증 사용자는 limit, 익명(IP 기준)은 anonymous_limit"""
+        if principal.startswith("ip:") and self.anonymous_limit is not None:
+            return self.anonymous_limit
+        return self.limit
+
+
+@dataclass
+class AdmissionStats:
+    """경로별 허용/거절 통계 (프로세스 단위)"""
+    admitted: int = 0
+    queued: int = 0
+    rate_limited: int = 0
+    queue_full: int = 0
+    queue_timeouts: int = 0
+
+    def snapshot(self) -> Dict:
+        return asdict(self)
+
+
+class ConcurrencyGate:
+    """동시 실행 상한 + 상한 있는 FIFO 대기열"""
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, queue_timeout: float = 1.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def acquire(self, stats: AdmissionStats) -> bool:
+        """슬롯 확보 (대기열이 가득 찼거나 시간 초과면 False)"""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                stats.queue_full += 1
+                return False
+            stats.queued += 1
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                stats.queue_timeouts += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+        }
+
+
+def request_principal(scope: Scope) -> str:
+    """서명 확인된 JWT의 sub, 없으면 클라이언트 IP (위조 토큰으로 한도 분산 방지)"""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token and JWT_SECRET:
+                try:
+                    payload = jwt.decode(
+                        token,
+                        JWT_SECRET,
+                        algorithms=[JWT_ALGORITHM],
+                        options={"verify_aud": False}
+                    )
+                    if payload.get("sub"):
+                        return f"user:{payload['sub']}"
+                except JWTError:
+                    pass
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+def rate_limit_headers(info: Dict[str, int]) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(info["limit"]),
+        "X-RateLimit-Remaining": str(info["remaining"]),
+    }
+    if "reset" in info:
+        headers["X-RateLimit-Reset"] = str(info["reset"])
+    return headers
+
+
+class AdmissionController:
+    """정책 매칭, 한도 확인, 동시 실행 슬롯 관리"""
+
+    def __init__(
+        self,
+        policies: List[RoutePolicy],
+        limiter: RateLimiter = rate_limiter,
+        enabled: bool = True,
+    ):
+        self.policies = policies
+        self.limiter = limiter
+        self.enabled = enabled
+        self.gates: Dict[str, ConcurrencyGate] = {
+            policy.name: ConcurrencyGate(policy.max_concurrency, policy.max_queue, policy.queue_timeout)
+            for policy in policies if policy.max_concurrency
+        }
+        self.stats: Dict[str, AdmissionStats] = {policy.name: AdmissionStats() for policy in policies}
+
+    def match(self, method: str, path: str) -> Optional[RoutePolicy]:
+        for policy in self.policies:
+            if policy.matches(method, path):
+                return policy
+        return None
+
+    def snapshot(self) -> Dict:
+        return {
+            name: {
+                **stats.snapshot(),
+                **({"concurrency": self.gates[name].snapshot()} if name in self.gates else {}),
+            }
+            for name, stats in self.stats.items()
+        }
+
+
+def reject(status_code: int, detail: str, retry_after: int, headers: Dict[str, str]) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={**headers, "Retry-After": str(max(1, retry_after))},
+    )
+
+
+class AdmissionMiddleware:
+    """ASGI 요청 한도/동시 실행 제어 (정책이 없는 경로와 HTTP 외 요청은 그대로 통과)"""
+
+    def __init__(self, app: ASGIApp, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        controller = self.controller
+        if scope["type"] != "http" or not controller.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        policy = controller.match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        stats = controller.stats[policy.name]
+        principal = request_principal(scope)
+        allowed, info = await controller.limiter.check_rate_limit(
+            f"route:{policy.name}:{principal}", policy.limit_for(principal), policy.window
+        )
+        headers = rate_limit_headers(info)
+        if not allowed:
+            stats.rate_limited += 1
+            response = reject(429, "요청 한도를 초과했습니다", info.get("retry_after", policy.window), headers)
+            await response(scope, receive, send)
+            return
+
+        gate = controller.gates.get(policy.name)
+        if gate is not None and not await gate.acquire(stats):
+            logger.debug(f"Admission rejected {policy.name}: {gate.active} active, {gate.waiting} waiting")
+            response = reject(503, "요청이 많아 처리할 수 없습니다", math.ceil(policy.queue_timeout), headers)
+            await response(scope, receive, send)
+            return
+
+        stats.admitted += 1
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    response_headers.append(name, value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if gate is not None:
+                gate.release()
+
+
+# 비싼 경로는 사용자별 한도 + 동시 실행 상한, 나머지 API는 사용자별 기본 한도
+DEFAULT_POLICIES = [
+    RoutePolicy(
+        "reports_pdf", "/api/reports/pdf/{user_id}", limit=10,
+        max_concurrency=settings.RATE_LIMIT_REPORT_CONCURRENCY,
+        max_queue=settings.RATE_LIMIT_QUEUE_SIZE,
+        queue_timeout=settings.RATE_LIMIT_QUEUE_TIMEOUT,
+        methods=("GET",),
+    ),
+    RoutePolicy(
+        "reports_team", "/api/reports/team/{organization}", limit=30,
+        max_concurrency=settings.RATE_LIMIT_REPORT_CONCURRENCY * 2,
+        max_queue=settings.RATE_LIMIT_QUEUE_SIZE,
+        queue_timeout=settings.RATE_LIMIT_QUEUE_TIMEOUT,
+        methods=("GET",),
+    ),
+    RoutePolicy(
+        "survey_stats", "/api/survey/stats", limit=30,
+        max_concurrency=settings.RATE_LIMIT_REPORT_CONCURRENCY,
+        max_queue=settings.RATE_LIMIT_QUEUE_SIZE,
+        queue_timeout=settings.RATE_LIMIT_QUEUE_TIMEOUT,
+        methods=("GET",),
+    ),
+    RoutePolicy("api", "/api/{path:path}", limit=settings.RATE_LIMIT_DEFAULT_PER_MINUTE),
+]
+
+# 싱글톤 인스턴스
+admission_controller = AdmissionController(DEFAULT_POLICIES, enabled=settings.RATE_LIMIT_ENABLED)
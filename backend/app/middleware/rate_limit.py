@@ -3,29 +3,192 @@ Rate Limiting 미들웨어
 LLM API 호출 비용 관리 및 사용량 제한
 """
 
+import asyncio
+import math
 import time
-from typing import Dict, Optional, Tuple
-from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
 from fastapi import Request, HTTPException, status
-import redis
-from collections import defaultdict
+from redis.asyncio import Redis
+from collections import OrderedDict, defaultdict
 import json
+import logging
+
+from ..core.config import settings
+from ..core.database import get_async_service_supabase
+from ..core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# GCRA (Generic Cell Rate Algorithm): 키당 값 1개(이론적 도착 시각, TAT)만 저장하므로 요청 수와 무관하게 O(1) 메모리
+# window 동안 limit회, 최대 limit회 연속 허용. 거부된 요청은 차감하지 않음
+# ARGV: now, 요청 간격(window / limit), window
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - window > now then
+  return {0, tostring(tat)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat)}
+"""
+
+# 토큰 버킷 리필 (윈도우 동안 용량만큼 연속 리필, 키가 없으면 가득 참)
+# 가득 차는 시각 이후에는 새 키와 같으므로 그때 만료 (초과 사용으로 음수가 된 잔량은 그만큼 더 유지)
+_REFILL_LUA = """
+local function refill(key, capacity, rate, now)
+  local state = redis.call('HMGET', key, 'level', 'updated')
+  local level = tonumber(state[1])
+  if level == nil then return capacity end
+  return math.min(capacity, level + math.max(0, now - tonumber(state[2])) * rate)
+end
+local function store(key, level, now, capacity, rate)
+  redis.call('HSET', key, 'level', tostring(level), 'updated', tostring(now))
+  redis.call('EXPIRE', key, math.max(1, math.ceil((capacity - level) / rate)))
+end
+"""
+
+# 예약: 토큰 버킷(KEYS[1])과 요청 버킷(KEYS[2])을 함께 확인해 둘 다 가능할 때만 차감 (1회 왕복, 원자적)
+# ARGV: now, 토큰 용량, 토큰 리필/초, 예약 토큰, 요청 용량, 요청 리필/초
+RESERVE_SCRIPT = _REFILL_LUA + """
+local now = tonumber(ARGV[1])
+local token_capacity, token_rate = tonumber(ARGV[2]), tonumber(ARGV[3])
+local request_capacity, request_rate = tonumber(ARGV[5]), tonumber(ARGV[6])
+local tokens = refill(KEYS[1], token_capacity, token_rate, now)
+local requests = refill(KEYS[2], request_capacity, request_rate, now)
+local cost = tonumber(ARGV[4])
+local allowed = 0
+if tokens >= cost and requests >= 1 then
+  tokens = tokens - cost
+  requests = requests - 1
+  allowed = 1
+end
+store(KEYS[1], tokens, now, token_capacity, token_rate)
+store(KEYS[2], requests, now, request_capacity, request_rate)
+return {allowed, tostring(tokens), tostring(requests)}
+"""
+
+# 정산: 예약 토큰 - 실제 사용 토큰만큼 되돌림 (초과 사용은 음수 잔량으로 다음 예약에 반영)
+# ARGV: now, 토큰 용량, 토큰 리필/초, 되돌릴 토큰
+RECONCILE_SCRIPT = _REFILL_LUA + """
+local now = tonumber(ARGV[1])
+local capacity, rate = tonumber(ARGV[2]), tonumber(ARGV[3])
+local level = math.min(capacity, refill(KEYS[1], capacity, rate, now) + tonumber(ARGV[4]))
+store(KEYS[1], level, now, capacity, rate)
+return tostring(level)
+"""
+
+
+def estimate_prompt_tokens(*texts: str) -> int:
+    """프롬프트 토큰 로컬 추정 (ASCII 4자당 1토큰, 한글 등 비ASCII는 1자당 1토큰)"""
+    ascii_chars = non_ascii_chars = 0
+    for text in texts:
+        ascii_count = sum(1 for char in text if ord(char) < 128)
+        ascii_chars += ascii_count
+        non_ascii_chars += len(text) - ascii_count
+    return math.ceil(ascii_chars / 4) + non_ascii_chars
+
+
+@dataclass
+class TokenBucket:
+    """메모리 기반 토큰 버킷 (Redis 스크립트와 같은 계산)"""
+    level: float
+    updated: float
+
+    def refill(self, capacity: float, rate: float, now: float) -> float:
+        self.level = min(capacity, self.level + max(0.0, now - self.updated) * rate)
+        self.updated = now
+        return self.level
+
+
+@dataclass
+class RateLimitStoreStats:
+    """메모리 저장소 통계 (프로세스 단위)"""
+    keys: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    def snapshot(self) -> Dict:
+        return asdict(self)
+
+
+class RateLimitStore:
+    """메모리 기반 제한 상태 (키당 값 1개, 키 수 상한 LRU + 만료 키 정리, 확인당 O(1))
+
+    만료 시각 이후의 상태는 새 키와 같으므로 삭제해도 제한 결과가 바뀌지 않는다.
+    상한 초과로 밀려난 키만 한도가 초기화된다 (evicted).
+    """
+
+    def __init__(self, max_keys: int = 10000, sweep: int = 2):
+        self.max_keys = max_keys
+        self.sweep = sweep
+        self.stats = RateLimitStoreStats()
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, now: float) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._data[key]
+            self.stats.expired += 1
+            self.stats.keys = len(self._data)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        # 가장 오래 쓰지 않은 키부터 만료분 정리 (확인당 최대 sweep개)
+        for _ in range(self.sweep):
+            oldest = next(iter(self._data))
+            if oldest == key or self._data[oldest][0] > now:
+                break
+            del self._data[oldest]
+            self.stats.expired += 1
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+            self.stats.evicted += 1
+        self.stats.keys = len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.stats = RateLimitStoreStats()
+
 
 class RateLimiter:
     """Rate Limiting 구현"""
     
     def __init__(
         self,
-        redis_client: Optional[redis.Redis] = None,
+        redis_client: Optional[Redis] = None,
         default_limit: int = 100,
-        window_seconds: int = 3600
+        window_seconds: int = 3600,
+        use_redis: bool = False,
+        max_memory_keys: int = 10000
     ):
         self.redis_client = redis_client
+        self.use_redis = use_redis
         self.default_limit = default_limit
         self.window_seconds = window_seconds
         
-        # Redis 없을 때 메모리 기반 제한
-        self.memory_store: Dict[str, list] = defaultdict(list)
+        # Redis 없을 때 메모리 기반 제한 (키 수 상한)
+        self.memory_store = RateLimitStore(max_memory_keys)
+        self.buckets = RateLimitStore(max_memory_keys)
+        
+        # 클라이언트별 등록 스크립트 (EVALSHA, 없으면 EVAL)
+        self._scripts: Dict[str, Any] = {}
+        self._scripts_client: Optional[Redis] = None
         
         # LLM 특별 제한
         self.llm_limits = {
@@ -44,42 +207,49 @@ class RateLimiter:
         limit = limit or self.default_limit
         window = window or self.window_seconds
         
-        if self.redis_client:
-            return await self._check_redis(key, limit, window)
+        client = await self._client()
+        if client is not None:
+            return await self._check_redis(client, key, limit, window)
         else:
             return self._check_memory(key, limit, window)
     
+    async def _client(self) -> Optional[Redis]:
+        """주입된 클라이언트, 없으면 use_redis일 때 공유 비동기 클라이언트"""
+        if self.redis_client is not None:
+            return self.redis_client
+        if self.use_redis:
+            return await get_redis_client()
+        return None
+    
+    def _script(self, client: Redis, source: str) -> Any:
+        # 클라이언트가 바뀌면 (재연결) 다시 등록
+        if client is not self._scripts_client:
+            self._scripts = {}
+            self._scripts_client = client
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = client.register_script(source)
+        return script
+    
     async def _check_redis(
         self,
+        client: Redis,
         key: str,
         limit: int,
         window: int
     ) -> Tuple[bool, Dict[str, int]]:
-        """Redis 기반 rate limit 확인"""
+        """Redis 기반 rate limit 확인 (GCRA 스크립트 1회 왕복)"""
         try:
-            pipe = self.redis_client.pipeline()
             now = time.time()
-            
-            # Sliding window 구현
-            pipe.zremrangebyscore(key, 0, now - window)
-            pipe.zadd(key, {str(now): now})
-            pipe.zcount(key, now - window, now)
-            pipe.expire(key, window)
-            
-            results = pipe.execute()
-            count = results[2]
-            
-            remaining = max(0, limit - count)
-            reset_time = int(now + window)
-            
-            return count <= limit, {
-                "limit": limit,
-                "remaining": remaining,
-                "reset": reset_time,
-                "retry_after": 0 if count <= limit else window
-            }
-        except Exception:
+            interval = window / limit
+            allowed, tat = await self._script(client, GCRA_SCRIPT)(
+                keys=[f"rl:{key}"], args=[now, interval, window]
+            )
+            allowed = bool(int(allowed))
+            return allowed, self._gcra_info(allowed, float(tat), now, limit, window)
+        except Exception as e:
             # Redis 실패 시 통과
+            logger.warning(f"Rate limit check failed, allowing: {str(e)}")
             return True, {"limit": limit, "remaining": limit}
     
     def _check_memory(
@@ -88,103 +258,285 @@ class RateLimiter:
         limit: int,
         window: int
     ) -> Tuple[bool, Dict[str, int]]:
-        """메모리 기반 rate limit 확인"""
+        """메모리 기반 rate limit 확인 (Redis와 같은 GCRA, 키당 TAT 1개)"""
         now = time.time()
+        interval = window / limit
         
-        # 오래된 요청 제거
-        self.memory_store[key] = [
-            ts for ts in self.memory_store[key]
-            if ts > now - window
-        ]
+        tat = max(self.memory_store.get(key, now) or now, now)
+        allowed = tat + interval - window <= now
+        if allowed:
+            # TAT가 지나면 새 키와 같으므로 그때 만료
+            tat += interval
+            self.memory_store.set(key, tat, tat, now)
         
-        # 현재 요청 추가
-        self.memory_store[key].append(now)
-        count = len(self.memory_store[key])
-        
-        remaining = max(0, limit - count)
-        reset_time = int(now + window)
-        
-        return count <= limit, {
+        return allowed, self._gcra_info(allowed, tat, now, limit, window)
+    
+    @staticmethod
+    def _gcra_info(
+        allowed: bool,
+        tat: float,
+        now: float,
+        limit: int,
+        window: int
+    ) -> Dict[str, int]:
+        interval = window / limit
+        return {
             "limit": limit,
-            "remaining": remaining,
-            "reset": reset_time,
-            "retry_after": 0 if count <= limit else window
+            "remaining": max(0, math.floor((window - (tat - now)) / interval + 1e-9)),
+            "reset": math.ceil(tat),
+            "retry_after": 0 if allowed else math.ceil(tat + interval - window - now)
         }
     
+    def _llm_limits(self, model: str) -> Tuple[str, Dict[str, int]]:
+        if model not in self.llm_limits:
+            model = "gpt-4o-mini"  # 기본값
+        return model, self.llm_limits[model]
+    
+    def _bucket(self, key: str, capacity: float, rate: float, now: float) -> TokenBucket:
+        bucket = self.buckets.get(key, now)
+        if bucket is None:
+            bucket = TokenBucket(level=capacity, updated=now)
+        bucket.refill(capacity, rate, now)
+        return bucket
+    
+    def _store_bucket(
+        self,
+        key: str,
+        bucket: TokenBucket,
+        capacity: float,
+        rate: float,
+        now: float
+    ) -> None:
+        # 가득 차는 시각 이후에는 새 버킷과 같으므로 그때 만료
+        self.buckets.set(key, bucket, now + max(0.0, capacity - bucket.level) / rate, now)
+    
+    def _reserve_memory(
+        self,
+        token_key: str,
+        request_key: str,
+        tokens: int,
+        limits: Dict[str, int],
+        now: float
+    ) -> Tuple[bool, float, float]:
+        """메모리 기반 예약 (이벤트 루프 안에서 await 없이 처리되므로 원자적)"""
+        window = limits["window"]
+        token_rate = limits["tokens"] / window
+        request_rate = limits["requests"] / window
+        token_bucket = self._bucket(token_key, limits["tokens"], token_rate, now)
+        request_bucket = self._bucket(request_key, limits["requests"], request_rate, now)
+        allowed = token_bucket.level >= tokens and request_bucket.level >= 1
+        if allowed:
+            token_bucket.level -= tokens
+            request_bucket.level -= 1
+        self._store_bucket(token_key, token_bucket, limits["tokens"], token_rate, now)
+        self._store_bucket(request_key, request_bucket, limits["requests"], request_rate, now)
+        return allowed, token_bucket.level, request_bucket.level
+    
+    async def _reserve_redis(
+        self,
+        client: Redis,
+        token_key: str,
+        request_key: str,
+        tokens: int,
+        limits: Dict[str, int],
+        now: float
+    ) -> Tuple[bool, float, float]:
+        """Redis 스크립트 1회 왕복 예약"""
+        window = limits["window"]
+        allowed, token_level, request_level = await self._script(client, RESERVE_SCRIPT)(
+            keys=[token_key, request_key],
+            args=[
+                now,
+                limits["tokens"], limits["tokens"] / window, tokens,
+                limits["requests"], limits["requests"] / window,
+            ],
+        )
+        return bool(int(allowed)), float(token_level), float(request_level)
+    
     async def check_llm_usage(
         self,
         user_id: str,
         model: str,
         tokens: int
     ) -> Tuple[bool, Dict[str, Any]]:
-        """LLM 사용량 확인"""
-        if model not in self.llm_limits:
-            model = "gpt-4o-mini"  # 기본값
-        
-        limits = self.llm_limits[model]
-        
-        # 요청 수 확인
+        """LLM 사용량 예약 (요청 1회 + 예상 토큰, 호출 후 reconcile_llm_usage로 정산)"""
+        model, limits = self._llm_limits(model)
+        token_key = f"llm:{user_id}:{model}:tokens"
         request_key = f"llm:{user_id}:{model}:requests"
-        req_allowed, req_info = await self.check_rate_limit(
-            request_key,
-            limits["requests"],
-            limits["window"]
-        )
+        now = time.time()
         
-        # 토큰 사용량 확인
-        token_key = f"llm:{user_id}:{model}:tokens"
-        token_usage = await self._get_token_usage(token_key, limits["window"])
-        token_allowed = token_usage + tokens <= limits["tokens"]
+        client = await self._client()
+        if client is not None:
+            try:
+                allowed, token_level, request_level = await self._reserve_redis(
+                    client, token_key, request_key, tokens, limits, now
+                )
+            except Exception as e:
+                # Redis 실패 시 통과
+                logger.warning(f"LLM rate limit check failed, allowing: {str(e)}")
+                allowed, token_level, request_level = True, limits["tokens"], limits["requests"]
+        else:
+            allowed, token_level, request_level = self._reserve_memory(
+                token_key, request_key, tokens, limits, now
+            )
         
-        if req_allowed and token_allowed:
-            # 토큰 사용량 업데이트
-            await self._update_token_usage(token_key, tokens, limits["window"])
+        # 부족한 토큰/요청이 리필될 때까지 대기 시간
+        window = limits["window"]
+        retry_after = 0 if allowed else math.ceil(max(
+            (tokens - token_level) * window / limits["tokens"],
+            (1 - request_level) * window / limits["requests"],
+            0
+        ))
         
-        return req_allowed and token_allowed, {
-            "requests": req_info,
+        return allowed, {
+            "requests": {
+                "limit": limits["requests"],
+                "remaining": max(0, math.floor(request_level)),
+                "reset": int(now + window),
+                "retry_after": retry_after
+            },
             "tokens": {
                 "limit": limits["tokens"],
-                "used": token_usage,
-                "remaining": max(0, limits["tokens"] - token_usage - tokens),
+                "used": max(0, limits["tokens"] - math.floor(token_level)),
+                "remaining": max(0, math.floor(token_level)),
                 "requested": tokens
             },
             "model": model,
-            "allowed": req_allowed and token_allowed
+            "allowed": allowed,
+            "retry_after": retry_after
         }
     
-    async def _get_token_usage(self, key: str, window: int) -> int:
-        """토큰 사용량 조회"""
-        if self.redis_client:
-            try:
-                usage = self.redis_client.get(f"{key}:total")
-                return int(usage) if usage else 0
-            except:
-                return 0
-        else:
-            # 메모리 기반은 단순화
-            return len(self.memory_store.get(key, [])) * 100
-    
-    async def _update_token_usage(
+    async def reconcile_llm_usage(
         self,
-        key: str,
-        tokens: int,
-        window: int
-    ):
-        """토큰 사용량 업데이트"""
-        if self.redis_client:
+        user_id: str,
+        model: str,
+        reserved_tokens: int,
+        actual_tokens: int
+    ) -> None:
+        """예약 토큰을 실제 사용량으로 정산 (차이만큼 반환, 초과분은 추가 차감)"""
+        delta = reserved_tokens - actual_tokens
+        if delta == 0:
+            return
+        model, limits = self._llm_limits(model)
+        token_key = f"llm:{user_id}:{model}:tokens"
+        capacity = limits["tokens"]
+        rate = capacity / limits["window"]
+        now = time.time()
+        
+        client = await self._client()
+        if client is not None:
             try:
-                pipe = self.redis_client.pipeline()
-                pipe.incrby(f"{key}:total", tokens)
-                pipe.expire(f"{key}:total", window)
-                pipe.execute()
-            except:
-                pass
+                await self._script(client, RECONCILE_SCRIPT)(
+                    keys=[token_key],
+                    args=[now, capacity, rate, delta],
+                )
+            except Exception as e:
+                logger.warning(f"LLM usage reconcile failed: {str(e)}")
+            return
+        
+        bucket = self._bucket(token_key, capacity, rate, now)
+        bucket.level = min(capacity, bucket.level + delta)
+        self._store_bucket(token_key, bucket, capacity, rate, now)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """메모리 저장소 키 수/만료/상한 초과 삭제 통계"""
+        return {
+            "memory_store": self.memory_store.stats.snapshot(),
+            "llm_buckets": self.buckets.stats.snapshot(),
+        }
+
+# 롤업 단위 -> (버킷 크기 초, 보관 버킷 수)
+USAGE_GRANULARITIES = {
+    "minute": (60, 120),
+    "hour": (3600, 24 * 8),
+    "day": (86400, 400),
+}
+
+# 조회 기간 -> (롤업 단위, 기간 초), 그 외 기간은 일 단위 보관분 전체
+USAGE_PERIODS = {
+    "hour": ("minute", 3600),
+    "day": ("hour", 86400),
+    "week": ("hour", 7 * 86400),
+    "month": ("day", 30 * 86400),
+}
+
+
+@dataclass
+class UsageRollup:
+    """버킷 1개의 사용자/모델별 누적"""
+    request_count: int = 0
+    token_count: int = 0
+    generation_time_ms: int = 0
+    cost: float = 0.0
+
+    def add(self, tokens: int, cost: float, generation_time_ms: int, requests: int = 1) -> None:
+        self.request_count += requests
+        self.token_count += tokens
+        self.generation_time_ms += generation_time_ms
+        self.cost += cost
+
+    def merge(self, other: "UsageRollup") -> None:
+        self.add(other.token_count, other.cost, other.generation_time_ms, other.request_count)
+
+
+class UsageRing:
+    """고정 크기 시간 버킷 링 (슬롯마다 사용자 -> 모델 -> 누적, 오래된 버킷은 덮어씀)"""
+
+    def __init__(self, size: int, slots: int):
+        self.size = size
+        self.slots = slots
+        self._starts: List[Optional[int]] = [None] * slots
+        self._buckets: List[Dict[str, Dict[str, UsageRollup]]] = [{} for _ in range(slots)]
+
+    def bucket(self, timestamp: float) -> Tuple[int, Dict[str, Dict[str, UsageRollup]]]:
+        start = int(timestamp // self.size) * self.size
+        index = (start // self.size) % self.slots
+        if self._starts[index] != start:
+            self._starts[index] = start
+            self._buckets[index] = {}
+        return start, self._buckets[index]
+
+    def since(self, timestamp: float) -> Iterator[Dict[str, Dict[str, UsageRollup]]]:
+        """timestamp가 속한 버킷부터 현재까지 (버킷 경계 단위 근사)"""
+        start = int(timestamp // self.size) * self.size
+        for bucket_start, bucket in zip(self._starts, self._buckets):
+            if bucket_start is not None and bucket_start >= start:
+                yield bucket
+
+
+@dataclass
+class UsageFlushStats:
+    """DB 반영 통계 (프로세스 단위)"""
+    flushes: int = 0
+    flushed_rows: int = 0
+    failures: int = 0
+    dropped: int = 0
+
+    def snapshot(self) -> Dict:
+        return asdict(self)
+
 
 class LLMUsageMonitor:
-    """LLM 사용량 모니터링"""
+    """LLM 사용량 모니터링 (분/시간/일 롤업, 미반영 증분은 주기적으로 DB에 일괄 합산)"""
     
-    def __init__(self):
-        self.usage_log = []
+    def __init__(
+        self,
+        flush_interval: float = 60.0,
+        flush_batch_size: int = 500,
+        max_pending: int = 50000
+    ):
+        self.rings = {
+            name: UsageRing(size, slots)
+            for name, (size, slots) in USAGE_GRANULARITIES.items()
+        }
+        # (단위, 버킷 시작, 사용자, 모델) -> 마지막 반영 이후 증분
+        self.pending: Dict[Tuple[str, int, str, str], UsageRollup] = {}
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.max_pending = max_pending
+        self.stats = UsageFlushStats()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
     
     async def log_usage(
         self,
@@ -195,74 +547,146 @@ class LLMUsageMonitor:
         request_type: str,
         response_time: float
     ):
-        """사용량 로깅"""
-        usage_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "user_id": user_id,
-            "model": model,
-            "tokens": tokens,
-            "cost": cost,
-            "request_type": request_type,
-            "response_time": response_time
-        }
+        """사용량 기록 (단위별 버킷 1개씩 갱신, request_type은 롤업 키에 포함하지 않음)"""
+        now = time.time()
+        generation_time_ms = round(response_time * 1000)
         
-        self.usage_log.append(usage_entry)
+        for granularity, ring in self.rings.items():
+            bucket_start, bucket = ring.bucket(now)
+            models = bucket.setdefault(user_id, {})
+            models.setdefault(model, UsageRollup()).add(tokens, cost, generation_time_ms)
+            
+            key = (granularity, bucket_start, user_id, model)
+            delta = self.pending.get(key)
+            if delta is None:
+                # DB 장애가 길어져도 미반영 증분은 상한까지만 보관
+                if len(self.pending) >= self.max_pending:
+                    self.stats.dropped += 1
+                    continue
+                delta = self.pending[key] = UsageRollup()
+            delta.add(tokens, cost, generation_time_ms)
+    
+    def _restore(self, items: List[Tuple[Tuple[str, int, str, str], UsageRollup]]) -> None:
+        for key, delta in items:
+            pending = self.pending.get(key)
+            if pending is None:
+                self.pending[key] = delta
+            else:
+                pending.merge(delta)
+    
+    async def flush(self) -> int:
+        """미반영 증분을 batch 단위로 합산 반영 (실패한 batch는 다음 flush에서 재시도)"""
+        if not self.pending:
+            return 0
+        items = list(self.pending.items())
+        self.pending = {}
+        self.stats.flushes += 1
         
-        # 로그 파일에 저장 (비동기)
-        # 실제 구현에서는 데이터베이스나 로깅 서비스 사용
+        written = 0
+        sent = 0
+        try:
+            db = await get_async_service_supabase()
+            for i in range(0, len(items), self.flush_batch_size):
+                chunk = items[i:i + self.flush_batch_size]
+                rows = [
+                    {
+                        "granularity": granularity,
+                        "bucket_start": datetime.fromtimestamp(bucket_start, tz=timezone.utc).isoformat(),
+                        "user_id": user_id,
+                        "model": model,
+                        "request_count": delta.request_count,
+                        "token_count": delta.token_count,
+                        "generation_time_ms": delta.generation_time_ms,
+                        "cost": round(delta.cost, 6),
+                    }
+                    for (granularity, bucket_start, user_id, model), delta in chunk
+                ]
+                try:
+                    await db.rpc("add_llm_usage_rollups", {"p_rows": rows}).execute()
+                    written += len(rows)
+                except Exception as e:
+                    logger.warning(f"LLM usage flush failed ({len(rows)} rows): {str(e)}")
+                    self.stats.failures += 1
+                    self._restore(chunk)
+                sent = i + len(chunk)
+        except Exception as e:
+            logger.warning(f"LLM usage flush skipped: {str(e)}")
+            self.stats.failures += 1
+        finally:
+            # 연결 실패/취소로 보내지 못한 증분은 되돌림 (취소 시 진행 중이던 batch 포함)
+            self._restore(items[sent:])
+        
+        self.stats.flushed_rows += written
+        return written
+    
+    async def _flush_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"LLM usage flush error: {e}")
+    
+    def start(self) -> None:
+        """주기적 DB 반영 시작"""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """주기 반영 종료 (진행 중인 flush는 끝날 때까지 대기) 후 남은 증분 반영"""
+        if self._task is not None:
+            self._stopping.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
         
     async def get_usage_stats(
         self,
         user_id: Optional[str] = None,
         period: str = "day"
     ) -> Dict[str, Any]:
-        """사용량 통계 조회"""
-        # 기간 설정
-        if period == "day":
-            since = datetime.now() - timedelta(days=1)
-        elif period == "week":
-            since = datetime.now() - timedelta(weeks=1)
-        elif period == "month":
-            since = datetime.now() - timedelta(days=30)
-        else:
-            since = datetime.min
-        
-        # 필터링
-        filtered_logs = [
-            log for log in self.usage_log
-            if datetime.fromisoformat(log["timestamp"]) >= since
-        ]
-        
-        if user_id:
-            filtered_logs = [
-                log for log in filtered_logs
-                if log["user_id"] == user_id
-            ]
-        
-        # 통계 계산
-        total_tokens = sum(log["tokens"] for log in filtered_logs)
-        total_cost = sum(log["cost"] for log in filtered_logs)
-        request_count = len(filtered_logs)
+        """사용량 통계 조회 (기간에 맞는 롤업 버킷만 합산, O(버킷 수))"""
+        granularity, seconds = USAGE_PERIODS.get(period, ("day", None))
+        since = time.time() - seconds if seconds else 0
         
-        # 모델별 통계
+        totals = UsageRollup()
         model_stats = defaultdict(lambda: {"tokens": 0, "cost": 0, "count": 0})
-        for log in filtered_logs:
-            model = log["model"]
-            model_stats[model]["tokens"] += log["tokens"]
-            model_stats[model]["cost"] += log["cost"]
-            model_stats[model]["count"] += 1
+        for bucket in self.rings[granularity].since(since):
+            if user_id:
+                users = [bucket[user_id]] if user_id in bucket else []
+            else:
+                users = bucket.values()
+            for models in users:
+                for model, rollup in models.items():
+                    totals.merge(rollup)
+                    model_stats[model]["tokens"] += rollup.token_count
+                    model_stats[model]["cost"] += rollup.cost
+                    model_stats[model]["count"] += rollup.request_count
         
+        request_count = totals.request_count
         return {
             "period": period,
             "user_id": user_id,
-            "total_tokens": total_tokens,
-            "total_cost": total_cost,
+            "total_tokens": totals.token_count,
+            "total_cost": totals.cost,
             "request_count": request_count,
             "model_stats": dict(model_stats),
-            "average_tokens_per_request": total_tokens / request_count if request_count > 0 else 0,
-            "average_cost_per_request": total_cost / request_count if request_count > 0 else 0
+            "average_tokens_per_request": totals.token_count / request_count if request_count > 0 else 0,
+            "average_cost_per_request": totals.cost / request_count if request_count > 0 else 0,
+            "average_generation_time_ms": totals.generation_time_ms / request_count if request_count > 0 else 0
         }
 
-# 싱글톤 인스턴스
-rate_limiter = RateLimiter()
-usage_monitor = LLMUsageMonitor()
\ No newline at end of file
+# 싱글톤 인스턴스 (Redis는 REDIS_URL 설정 시에만 사용)
+rate_limiter = RateLimiter(
+    use_redis=bool(settings.REDIS_URL),
+    max_memory_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS
+)
+usage_monitor = LLMUsageMonitor(
+    flush_interval=settings.LLM_USAGE_FLUSH_INTERVAL,
+    flush_batch_size=settings.LLM_USAGE_FLUSH_BATCH_SIZE,
+    max_pending=settings.LLM_USAGE_MAX_PENDING
+)
\ No newline at end of file
@@ -69,6 +69,18 @@ class AnalysisRequest(BaseModel):
     force_refresh: bool = False
 
 
+class AnalysisJobStatus(BaseModel):
+    """분석 작업 상태"""
+    job_id: str
+    status: str  # queued, running, retrying, succeeded, failed
+    attempts: int
+    error: Optional[str] = None
+    user_id: Optional[str] = None
+    survey_response_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class QuickAnalysis(BaseModel):
     """빠른 분석 결과 (프론트엔드 표시용)"""
     leadership_style: str
@@ -2,10 +2,13 @@
 AI Leadership 4Dx - Survey Schemas
 """
 
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field, EmailStr, field_validator
+from pydantic.networks import validate_email
+from typing import Annotated, List, Dict, Optional, Any
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from uuid import UUID
 
 
 class QuestionCategory(str, Enum):
@@ -31,6 +34,7 @@ class SurveySubmission(BaseModel):
     department: Optional[str] = Field(None, max_length=100)
     position: Optional[str] = Field(None, max_length=100)
     responses: List[ResponseValue]
+    survey_version: Optional[str] = Field(None, max_length=20)  # 없으면 기본 버전
     completion_time_seconds: Optional[int] = None
     device_info: Optional[Dict[str, Any]] = None
 
@@ -42,11 +46,69 @@ class SurveyResponse(BaseModel):
     responses: Dict[str, int]
     completion_time_seconds: int
     created_at: datetime
+    analysis_job_id: Optional[str] = None
     
     class Config:
         from_attributes = True
 
 
+@lru_cache(maxsize=65536)
+def _normalize_email(email: str) -> str:
+    """EmailStr과 같은 검증/정규화 (대량 입력에서 같은 이메일은 한 번만 검증)"""
+    return validate_email(email)[1]
+
+
+class SurveyBulkRow(BaseModel):
+    """대량 입력 한 행 (SurveySubmission과 같은 규칙, 응답은 {문항 ID: 값})"""
+    user_id: Optional[str] = None
+    name: str = Field(..., min_length=1, max_length=100)
+    email: str
+    organization: Optional[str] = Field(None, max_length=100)
+    department: Optional[str] = Field(None, max_length=100)
+    position: Optional[str] = Field(None, max_length=100)
+    responses: Dict[str, Annotated[int, Field(ge=1, le=7)]]  # 1-7 척도
+    survey_version: Optional[str] = Field(None, max_length=20)
+    completion_time_seconds: Optional[int] = None
+    device_info: Optional[Dict[str, Any]] = None
+
+    @field_validator("user_id")
+    @classmethod
+    def normalize_user_id(cls, value: Optional[str]) -> Optional[str]:
+        """UUID 형식 확인 (DB 다건 insert 전에 행 단위로 거름)"""
+        if value is None:
+            return None
+        try:
+            return str(UUID(value))
+        except ValueError:
+            raise ValueError("must be a UUID")
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, value: str) -> str:
+        return _normalize_email(value)
+
+
+class SurveyBulkError(BaseModel):
+    """대량 입력 행 오류"""
+    row: int  # 데이터 행 번호 (CSV 헤더 제외, 1부터)
+    error: str
+
+
+class SurveyBulkResult(BaseModel):
+    """대량 입력 결과 (error가 있으면 total_rows 행까지만 처리된 부분 결과)"""
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    analyses_enqueued: int = 0
+    analyses_failed: int = 0
+    unanalyzed_response_ids: List[str] = []
+    unanalyzed_truncated: bool = False
+    errors: List[SurveyBulkError] = []
+    errors_truncated: bool = False
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
 class SurveyStats(BaseModel):
     """설문 통계"""
     total_responses: int
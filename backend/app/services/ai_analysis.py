@@ -13,8 +13,10 @@ import os
 
 from app.schemas.survey import SurveyResponseDB, DimensionType
 from app.core.config import settings
-from app.middleware.rate_limit import rate_limiter, usage_monitor
+from app.middleware.rate_limit import estimate_prompt_tokens, rate_limiter, usage_monitor
 from app.utils.anomaly import anomaly_detector
+from app.services.classification import GRID_STYLE_LABELS, classify_grid_styles
+from app.services.insight_cache import insight_cache
 
 class AIAnalysisService:
     """AI 기반 분석 서비스"""
@@ -25,19 +27,11 @@ class AIAnalysisService:
         self.max_tokens = settings.LLM_MAX_TOKENS
         self.timeout = settings.LLM_TIMEOUT
         
-        # 분석 프롬프트 템플릿
-        self.analysis_prompt = """
-You are an expert leadership coach analyzing Grid 3.0 assessment results.
-
-Leadership Assessment Data:
-- People Score: {people_score}/7 (관계 중심)
-- Production Score: {production_score}/7 (성과 중심)
-- Candor Score: {candor_score}/7 (솔직함)
-- LMX Score: {lmx_score}/7 (리더-구성원 관계 품질)
-
-Leadership Style: {leadership_style}
-Organization: {organization}
-Department: {department}
+        # 분석 프롬프트: 정적 시스템 프롬프트(매 호출 동일, provider 프롬프트 캐시 대상) +
+        # 점수/맥락만 담은 짧은 사용자 프롬프트 (변경 시 prompt_version을 올려 인사이트 캐시 무효화)
+        self.prompt_version = "2"
+        self.analysis_system_prompt = """You are an expert leadership coach analyzing Grid 3.0 assessment results.
+Scores are on a 1-7 scale: People (관계 중심), Production (성과 중심), Candor (솔직함), LMX (리더-구성원 관계 품질).
 
 Please provide:
 1. Leadership style analysis (2-3 sentences)
@@ -45,19 +39,15 @@ Please provide:
 3. Growth areas (2-3 points)
 4. Specific action recommendations (3-4 concrete steps)
 
-Focus on practical, actionable insights. Be constructive and encouraging.
-Response in {language}.
-"""
+Focus on practical, actionable insights. Be constructive and encouraging."""
+        self.analysis_prompt = """People {people_score}, Production {production_score}, Candor {candor_score}, LMX {lmx_score}
+Leadership Style: {leadership_style}
+Organization: {organization}
+Department: {department}
+Response in {language}."""
         
-        # 패턴 분석 프롬프트
-        self.pattern_prompt = """
-Analyze the following survey response pattern for potential issues:
-
-Response Pattern:
-{response_pattern}
-
-Identified Anomalies:
-{anomalies}
+        # 패턴 분석 프롬프트 (정적 지시는 시스템 프롬프트, 패턴/이상치만 사용자 프롬프트)
+        self.pattern_system_prompt = """You are a data analyst expert analyzing survey response patterns for potential issues.
 
 Please identify:
 1. Response authenticity (genuine vs. gaming)
@@ -65,8 +55,12 @@ Please identify:
 3. Potential biases
 4. Reliability score (0-100)
 
-Be objective and data-driven in your analysis.
-"""
+Be objective and data-driven in your analysis."""
+        self.pattern_prompt = """Response Pattern:
+{response_pattern}
+
+Identified Anomalies:
+{anomalies}"""
     
     async def analyze_leadership_style(
         self,
@@ -77,12 +71,51 @@ Be objective and data-driven in your analysis.
         if not self.client:
             return self._get_rule_based_analysis(response, language)
         
-        # Rate limit 확인
+        # 양자화 점수 프로필 캐시 확인 (적중 시 LLM 호출/사용량 차감 없음)
+        leadership_style = self._determine_leadership_style(
+            response.people_score,
+            response.production_score
+        )
+        scores = insight_cache.quantize_scores({
+            "people_score": response.people_score,
+            "production_score": response.production_score,
+            "candor_score": response.candor_score,
+            "lmx_score": response.lmx_score
+        })
+        cache_key = insight_cache.key(
+            scores,
+            style=leadership_style,
+            model=self.model,
+            prompt_version=self.prompt_version,
+            organization=response.organization,
+            department=response.department,
+            language=language
+        )
+        cached = await insight_cache.get(cache_key)
+        if cached is not None:
+            return {
+                **cached,
+                "confidence_score": self._calculate_confidence(response),
+                "response_time": 0.0,
+                "cached": True
+            }
+        
+        # LLM 분석 요청 프롬프트 (캐시 키와 같은 양자화 점수 사용)
+        prompt = self.analysis_prompt.format(
+            **scores,
+            leadership_style=leadership_style,
+            organization=response.organization or "N/A",
+            department=response.department or "N/A",
+            language=language
+        )
+        
+        # Rate limit 예약 (프롬프트 추정 토큰 + 최대 출력, 호출 후 실제 사용량으로 정산)
         user_id = str(response.leader_id)
+        reserved_tokens = estimate_prompt_tokens(self.analysis_system_prompt, prompt) + self.max_tokens
         allowed, usage_info = await rate_limiter.check_llm_usage(
             user_id=user_id,
             model=self.model,
-            tokens=self.max_tokens
+            tokens=reserved_tokens
         )
         
         if not allowed:
@@ -92,32 +125,16 @@ Be objective and data-driven in your analysis.
                 "fallback": self._get_rule_based_analysis(response, language)
             }
         
+        # 정산 후 로깅/파싱/캐시 저장이 실패해도 실제 사용한 토큰을 다시 환불하지 않도록 표시
+        settled = False
         try:
-            # 리더십 스타일 판별
-            leadership_style = self._determine_leadership_style(
-                response.people_score,
-                response.production_score
-            )
-            
-            # LLM 분석 요청
-            prompt = self.analysis_prompt.format(
-                people_score=response.people_score,
-                production_score=response.production_score,
-                candor_score=response.candor_score,
-                lmx_score=response.lmx_score,
-                leadership_style=leadership_style,
-                organization=response.organization or "N/A",
-                department=response.department or "N/A",
-                language=language
-            )
-            
             start_time = datetime.now()
             
             completion = await asyncio.wait_for(
                 self.client.chat.completions.create(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": "You are an expert leadership coach."},
+                        {"role": "system", "content": self.analysis_system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     max_tokens=self.max_tokens,
@@ -127,6 +144,10 @@ Be objective and data-driven in your analysis.
             )
             
             response_time = (datetime.now() - start_time).total_seconds()
+            await rate_limiter.reconcile_llm_usage(
+                user_id, self.model, reserved_tokens, completion.usage.total_tokens
+            )
+            settled = True
             
             # 사용량 로깅
             await usage_monitor.log_usage(
@@ -142,21 +163,29 @@ Be objective and data-driven in your analysis.
             content = completion.choices[0].message.content
             analysis = self._parse_llm_response(content)
             
-            return {
+            result = {
                 "leadership_style": leadership_style,
                 "analysis": analysis,
-                "confidence_score": self._calculate_confidence(response),
                 "generated_at": datetime.now().isoformat(),
-                "model": self.model,
+                "model": self.model
+            }
+            await insight_cache.set(cache_key, result, response_time)
+            
+            return {
+                **result,
+                "confidence_score": self._calculate_confidence(response),
                 "response_time": response_time
             }
             
         except asyncio.TimeoutError:
+            # provider가 처리했을 수 있으므로 예약은 유지
             return {
                 "error": "분석 시간 초과",
                 "fallback": self._get_rule_based_analysis(response, language)
             }
         except Exception as e:
+            if not settled:
+                await rate_limiter.reconcile_llm_usage(user_id, self.model, reserved_tokens, 0)
             return {
                 "error": f"분석 중 오류: {str(e)}",
                 "fallback": self._get_rule_based_analysis(response, language)
@@ -175,16 +204,17 @@ Be objective and data-driven in your analysis.
             # 응답 패턴 요약
             pattern_summary = self._summarize_response_pattern(responses)
             
+            # 들여쓰기 없는 JSON (토큰 절감)
             prompt = self.pattern_prompt.format(
-                response_pattern=json.dumps(pattern_summary, indent=2),
-                anomalies=json.dumps(anomalies, indent=2)
+                response_pattern=json.dumps(pattern_summary, ensure_ascii=False, separators=(",", ":")),
+                anomalies=json.dumps(anomalies, ensure_ascii=False, separators=(",", ":"))
             )
             
             completion = await asyncio.wait_for(
                 self.client.chat.completions.create(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": "You are a data analyst expert."},
+                        {"role": "system", "content": self.pattern_system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     max_tokens=300,
@@ -209,19 +239,9 @@ Be objective and data-driven in your analysis.
             return self._get_pattern_analysis_fallback(responses, anomalies)
     
     def _determine_leadership_style(self, people: float, production: float) -> str:
-        """리더십 스타일 판별"""
-        if people <= 3 and production <= 3:
-            return "Impoverished Management"
-        elif people <= 3 and production > 5:
-            return "Authority-Compliance"
-        elif people > 5 and production <= 3:
-            return "Country Club Management"
-        elif 4 <= people <= 5 and 4 <= production <= 5:
-            return "Middle of the Road"
-        elif people > 5 and production > 5:
-            return "Team Leadership"
-        else:
-            return "Transitional"
+        """리더십 스타일 판별 (SQL get_leadership_style과 동일한 커널 사용)"""
+        code = classify_grid_styles([people], [production])[0]
+        return GRID_STYLE_LABELS[code]
     
     def _get_rule_based_analysis(
         self,
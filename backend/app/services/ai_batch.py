@@ -0,0 +1,329 @@
+"""
+AI Leadership 4Dx - Batch Insight Generation
+조직 전체 인사이트 재생성을 provider 배치 API로 제출하고 완료 후 일괄 반영
+
+- 실시간 호출과 요청 한도를 나눠 쓰지 않음 (provider 배치 큐는 별도 한도, 약 50% 할인)
+- 같은 점수 구간(인사이트 캐시 키)은 한 번만 제출, 캐시 적중은 제출하지 않음
+- 항목별 실패는 규칙 기반으로 대체, 배치 전체 실패/만료는 예외 (백필 체크포인트에서 재개)
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..schemas.analysis import LeadershipDimensions, LeadershipStyle
+from .ai_client import AIClient, AIProvider, anthropic_usage, get_ai_client, token_cost, token_usage
+from .analysis import LeadershipAnalyzer, build_ai_insights, build_insight_request
+from .insight_cache import insight_cache
+
+logger = logging.getLogger(__name__)
+
+# 배치 상태
+IN_PROGRESS = "in_progress"
+ENDED = "ended"
+FAILED = "failed"
+
+
+@dataclass
+class BatchItem:
+    """배치 요청 1건"""
+    custom_id: str
+    system_prompt: str
+    prompt: str
+
+
+@dataclass
+class BatchItemResult:
+    """배치 응답 1건 (실패 시 error)"""
+    text: Optional[str] = None
+    usage: Dict[str, int] = field(default_factory=lambda: token_usage(0, 0))
+    error: Optional[str] = None
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API (JSONL 파일 업로드 -> /v1/chat/completions 배치)"""
+
+    discount = 0.5
+
+    def __init__(self, ai_client: AIClient):
+        self.ai_client = ai_client
+        self.client = ai_client.client
+
+    async def submit(self, items: List[BatchItem]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": item.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.ai_client.request_params(item.prompt, item.system_prompt),
+            }, ensure_ascii=False)
+            for item in items
+        ]
+        batch_file = await self.client.files.create(
+            file=("insights.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl"),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            return ENDED
+        if batch.status in ("failed", "expired", "cancelled", "cancelling"):
+            return FAILED
+        return IN_PROGRESS
+
+    async def results(self, batch_id: str) -> Dict[str, BatchItemResult]:
+        batch = await self.client.batches.retrieve(batch_id)
+        results: Dict[str, BatchItemResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+                if entry.get("error") or response.get("status_code") != 200:
+                    error = entry.get("error") or body.get("error") or "request failed"
+                    results[entry["custom_id"]] = BatchItemResult(error=str(error))
+                    continue
+                usage = body.get("usage") or {}
+                results[entry["custom_id"]] = BatchItemResult(
+                    text=body["choices"][0]["message"]["content"],
+                    usage=token_usage(
+                        usage.get("prompt_tokens"),
+                        usage.get("completion_tokens"),
+                        (usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+                    ),
+                )
+        return results
+
+
+class AnthropicBatchBackend:
+    """Anthropic Message Batches API"""
+
+    discount = 0.5
+
+    def __init__(self, ai_client: AIClient):
+        self.ai_client = ai_client
+        self.batches = ai_client.client.beta.messages.batches
+
+    async def submit(self, items: List[BatchItem]) -> str:
+        batch = await self.batches.create(requests=[
+            {
+                "custom_id": item.custom_id,
+                "params": self.ai_client.request_params(item.prompt, item.system_prompt),
+            }
+            for item in items
+        ])
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self.batches.retrieve(batch_id)
+        # ended 이후 항목별 성공/실패는 results에서 구분
+        return ENDED if batch.processing_status == "ended" else IN_PROGRESS
+
+    async def results(self, batch_id: str) -> Dict[str, BatchItemResult]:
+        results: Dict[str, BatchItemResult] = {}
+        async for entry in await self.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                results[entry.custom_id] = BatchItemResult(error=entry.result.type)
+                continue
+            message = entry.result.message
+            results[entry.custom_id] = BatchItemResult(
+                text=message.content[0].text,
+                usage=anthropic_usage(message.usage),
+            )
+        return results
+
+
+class LocalBatchBackend:
+    """배치 API 대체 실행 (같은 계약, 실시간 API를 낮은 동시성으로 호출)"""
+
+    discount = 1.0
+
+    def __init__(self, ai_client: AIClient, concurrency: int = 2):
+        self.ai_client = ai_client
+        self.concurrency = concurrency
+        self._tasks: Dict[str, "asyncio.Task[Dict[str, BatchItemResult]]"] = {}
+        # 결과를 가져간 배치는 _tasks에서 빠지므로 ID는 별도 카운터로 발급 (재사용 방지)
+        self._ids = itertools.count(1)
+
+    async def _run(self, items: List[BatchItem]) -> Dict[str, BatchItemResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def complete(item: BatchItem) -> Tuple[str, BatchItemResult]:
+            async with semaphore:
+                try:
+                    text, usage = await self.ai_client.complete(item.prompt, item.system_prompt)
+                except Exception as e:
+                    return item.custom_id, BatchItemResult(error=str(e))
+                return item.custom_id, BatchItemResult(text=text, usage=usage)
+
+        return dict(await asyncio.gather(*(complete(item) for item in items)))
+
+    async def submit(self, items: List[BatchItem]) -> str:
+        batch_id = f"local-{next(self._ids)}"
+        self._tasks[batch_id] = asyncio.create_task(self._run(items))
+        return batch_id
+
+    async def status(self, batch_id: str) -> str:
+        task = self._tasks[batch_id]
+        if not task.done():
+            return IN_PROGRESS
+        return FAILED if task.exception() else ENDED
+
+    async def results(self, batch_id: str) -> Dict[str, BatchItemResult]:
+        return self._tasks.pop(batch_id).result()
+
+
+def get_batch_backend(ai_client: AIClient, local: bool = False):
+    """provider별 배치 백엔드 (local이면 대체 실행)"""
+    if local:
+        return LocalBatchBackend(ai_client, settings.AI_BATCH_LOCAL_CONCURRENCY)
+    if ai_client.provider == "anthropic":
+        return AnthropicBatchBackend(ai_client)
+    return OpenAIBatchBackend(ai_client)
+
+
+@dataclass
+class BatchReport:
+    """배치 처리량/비용 보고"""
+    provider: str = ""
+    discount: float = 1.0
+    leaders: int = 0
+    cached: int = 0
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    batches: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    elapsed_seconds: float = 0.0
+
+    def snapshot(self) -> Dict:
+        usage = token_usage(self.input_tokens, self.output_tokens, self.cached_input_tokens)
+        cost = token_cost(self.provider, usage, self.discount)
+        per_thousand = 1000 / self.leaders if self.leaders else 0.0
+        return {
+            "provider": self.provider,
+            "leaders": self.leaders,
+            "cached": self.cached,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "batches": self.batches,
+            **usage,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "leaders_per_second": round(self.leaders / self.elapsed_seconds, 2) if self.elapsed_seconds else None,
+            "cost_usd": round(cost, 6),
+            # 같은 토큰을 실시간 API로 처리했을 때의 비용
+            "realtime_cost_usd": round(token_cost(self.provider, usage), 6),
+            "cost_per_1000_leaders_usd": round(cost * per_thousand, 4),
+            "tokens_per_1000_leaders": round(usage["total_tokens"] * per_thousand),
+        }
+
+
+class BatchInsightGenerator:
+    """(차원 점수, 스타일) 목록 -> 배치 제출/대기 -> 인사이트 목록"""
+
+    def __init__(
+        self,
+        ai_provider: Optional[AIProvider] = None,
+        local: bool = False,
+        backend=None,
+        poll_interval: float = settings.AI_BATCH_POLL_INTERVAL,
+        max_wait: float = settings.AI_BATCH_MAX_WAIT,
+    ):
+        self.ai_provider = ai_provider
+        self.local = local
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.report = BatchReport()
+
+    async def _wait(self, backend, batch_id: str) -> None:
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            state = await backend.status(batch_id)
+            if state == ENDED:
+                return
+            if state == FAILED:
+                raise RuntimeError(f"Batch {batch_id} failed")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch_id} not finished after {self.max_wait}s")
+            await asyncio.sleep(self.poll_interval)
+
+    async def generate(
+        self,
+        profiles: List[Tuple[LeadershipDimensions, LeadershipStyle]]
+    ) -> List[Dict]:
+        """프로필별 인사이트 (입력 순서 유지, 항목 실패는 규칙 기반)"""
+        started = time.perf_counter()
+        ai_client = await get_ai_client(self.ai_provider)
+        backend = self.backend or get_batch_backend(ai_client, self.local)
+        self.report.provider = ai_client.provider
+        self.report.discount = backend.discount
+        self.report.leaders += len(profiles)
+
+        # 캐시 키 기준 중복 제거, 캐시 적중은 제출하지 않음
+        keys: List[str] = []
+        ai_results: Dict[str, Dict] = {}
+        requests: Dict[str, BatchItem] = {}
+        for dimensions, style in profiles:
+            data, cache_key = build_insight_request(dimensions, style, self.ai_provider)
+            keys.append(cache_key)
+            if cache_key in ai_results or cache_key in requests:
+                continue
+            cached = await insight_cache.get(cache_key)
+            if cached is not None:
+                ai_results[cache_key] = cached
+                continue
+            system_prompt, prompt = ai_client.build_prompts(data)
+            custom_id = hashlib.sha256(cache_key.encode()).hexdigest()[:32]
+            requests[cache_key] = BatchItem(custom_id, system_prompt, prompt)
+        self.report.cached += sum(1 for key in keys if key in ai_results)
+
+        if requests:
+            batch_id = await backend.submit(list(requests.values()))
+            self.report.batches += 1
+            self.report.submitted += len(requests)
+            logger.info(f"Submitted insight batch {batch_id} ({len(requests)} requests)")
+            await self._wait(backend, batch_id)
+
+            results = await backend.results(batch_id)
+            for cache_key, item in requests.items():
+                result = results.get(item.custom_id)
+                if result is None or result.error:
+                    self.report.failed += 1
+                    logger.warning(f"Batch item {item.custom_id} failed: {result.error if result else 'missing'}")
+                    continue
+                self.report.succeeded += 1
+                self.report.input_tokens += result.usage["input_tokens"]
+                self.report.cached_input_tokens += result.usage.get("cached_input_tokens", 0)
+                self.report.output_tokens += result.usage["output_tokens"]
+                ai_result = ai_client.parse_insight(result.text, result.usage)
+                ai_results[cache_key] = ai_result
+                await insight_cache.set(cache_key, ai_result)
+
+        self.report.elapsed_seconds += time.perf_counter() - started
+        return [
+            build_ai_insights(ai_results[key], style) if key in ai_results
+            else LeadershipAnalyzer.generate_rule_based_insights(dimensions, style)
+            for key, (dimensions, style) in zip(keys, profiles)
+        ]
@@ -3,7 +3,7 @@ AI Leadership 4Dx - AI Client Service
 GPT-4.1과 Claude 4 Sonnet 중 선택 가능한 AI 클라이언트
 """
 
-from typing import Dict, List, Optional, Literal
+from typing import Any, AsyncIterator, Dict, List, Optional, Literal, Tuple
 from abc import ABC, abstractmethod
 import logging
 from openai import AsyncOpenAI
@@ -14,13 +14,148 @@ logger = logging.getLogger(__name__)
 
 AIProvider = Literal["openai", "anthropic"]
 
+# analyze_leadership 프롬프트 버전 (프롬프트/파싱 변경 시 올려서 분석 메모이제이션 무효화)
+PROMPT_VERSION = "2"
+
+# 시스템 프롬프트는 모든 호출에서 동일한 정적 접두부 (provider 프롬프트 캐시 대상)
+# 호출마다 바뀌는 점수/스타일은 사용자 프롬프트(동적 접미부)에만 둔다
+OPENAI_SYSTEM_PROMPT = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
+Analyze the leadership data based on:
+1. Blake & Mouton Grid (People vs Production)
+2. Radical Candor (Care vs Challenge)
+3. Leader-Member Exchange (LMX)
+4. Influence patterns
+
+Provide actionable insights in Korean, in this format:
+1. 주요 강점 (3개)
+2. 개선 영역 (3개)
+3. 구체적인 실행 계획 (5개)
+4. 6개월 후 예상 성과"""
+
+ANTHROPIC_SYSTEM_PROMPT = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
+Analyze the leadership data with deep psychological insights based on:
+1. Blake & Mouton Grid (People vs Production balance)
+2. Radical Candor (Care vs Challenge dynamics)
+3. Leader-Member Exchange (Relationship quality)
+4. Hidden influence patterns (strategic thinking, confidence, risk management)
+
+Provide nuanced, culturally-aware insights in Korean that go beyond surface-level observations, in this format:
+
+1. **핵심 강점** (3개)
+   - 현재 발휘되고 있는 독특한 리더십 자산
+   - 조직에 미치는 긍정적 영향
+
+2. **잠재적 사각지대** (3개)
+   - 인식하지 못하고 있을 수 있는 개선 영역
+   - 장기적 성장을 위한 도전 과제
+
+3. **맞춤형 개발 전략** (5개)
+   - 구체적이고 실행 가능한 행동 계획
+   - 한국 조직 문화 맥락을 고려한 접근
+
+4. **변혁적 성장 시나리오**
+   - 6개월 후 달성 가능한 구체적 변화
+   - 조직과 개인에게 미칠 영향"""
+
+
+def token_usage(
+    input_tokens: Optional[int],
+    output_tokens: Optional[int],
+    cached_input_tokens: Optional[int] = None
+) -> Dict[str, int]:
+    """provider별 사용량을 공통 형식으로 변환 (input_tokens는 캐시 적중분 포함)"""
+    input_tokens = input_tokens or 0
+    output_tokens = output_tokens or 0
+    return {
+        "input_tokens": input_tokens,
+        "cached_input_tokens": cached_input_tokens or 0,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+def openai_usage(usage) -> Dict[str, int]:
+    """OpenAI usage (자동 프롬프트 캐시 적중은 prompt_tokens_details.cached_tokens)"""
+    if usage is None:
+        return token_usage(None, None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return token_usage(
+        usage.prompt_tokens,
+        usage.completion_tokens,
+        getattr(details, "cached_tokens", None),
+    )
+
+
+def anthropic_usage(usage) -> Dict[str, int]:
+    """Anthropic usage (input_tokens는 캐시 미적중분만이므로 캐시 생성/적중분 합산)"""
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    return token_usage(
+        (usage.input_tokens or 0) + cache_write + cache_read,
+        usage.output_tokens,
+        cache_read,
+    )
+
+
+def token_cost(provider: str, usage: Dict[str, int], discount: float = 1.0) -> float:
+    """토큰 사용량 예상 비용 (USD, 캐시 적중 입력은 캐시 읽기 단가, 배치 API는 discount 적용)"""
+    if provider == "anthropic":
+        input_price, cached_price, output_price = (
+            settings.ANTHROPIC_INPUT_PRICE_PER_MTOK,
+            settings.ANTHROPIC_CACHED_INPUT_PRICE_PER_MTOK,
+            settings.ANTHROPIC_OUTPUT_PRICE_PER_MTOK,
+        )
+    else:
+        input_price, cached_price, output_price = (
+            settings.OPENAI_INPUT_PRICE_PER_MTOK,
+            settings.OPENAI_CACHED_INPUT_PRICE_PER_MTOK,
+            settings.OPENAI_OUTPUT_PRICE_PER_MTOK,
+        )
+    cached = usage.get("cached_input_tokens", 0)
+    cost = (
+        (usage.get("input_tokens", 0) - cached) * input_price
+        + cached * cached_price
+        + usage.get("output_tokens", 0) * output_price
+    )
+    return cost / 1_000_000 * discount
+
 
 class AIClient(ABC):
     """AI 클라이언트 추상 클래스"""
     
+    provider: AIProvider
+    model_label: str
+    model: str
+    client: Any  # provider SDK 비동기 클라이언트 (배치 백엔드가 직접 사용)
+    
+    @abstractmethod
+    def request_params(self, prompt: str, system_prompt: Optional[str] = None) -> Dict:
+        """provider API 요청 본문 (실시간/배치 공통)"""
+        pass
+    
     @abstractmethod
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """AI 응답 생성 (텍스트, 토큰 사용량)"""
+        pass
+    
     async def generate_insight(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """AI 인사이트 생성"""
+        text, _ = await self.complete(prompt, system_prompt)
+        return text
+    
+    @abstractmethod
+    def stream_insight(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """AI 인사이트 스트리밍 생성 (텍스트 조각 단위)"""
+        pass
+    
+    @abstractmethod
+    def build_prompts(self, data: Dict) -> Tuple[str, str]:
+        """리더십 분석 (시스템 프롬프트, 사용자 프롬프트)"""
+        pass
+    
+    @abstractmethod
+    def parse_insight(self, text: str, usage: Optional[Dict[str, int]] = None) -> Dict:
+        """리더십 분석 응답 파싱 (실시간/배치 응답 공통)"""
         pass
     
     @abstractmethod
@@ -32,62 +167,71 @@ class AIClient(ABC):
 class OpenAIClient(AIClient):
     """OpenAI GPT-4.1 클라이언트"""
     
+    provider = "openai"
+    model_label = "GPT-4.1"
+    
     def __init__(self):
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
         logger.info(f"OpenAI client initialized with model: {self.model}")
     
-    async def generate_insight(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """GPT-4.1을 사용한 인사이트 생성"""
+    def request_params(self, prompt: str, system_prompt: Optional[str] = None) -> Dict:
+        """chat.completions 요청 본문 (실시간/배치 공통)"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 1000
+        }
+    
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """GPT-4.1을 사용한 응답 생성"""
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
             response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000
+                **self.request_params(prompt, system_prompt)
             )
             
-            return response.choices[0].message.content
+            return response.choices[0].message.content, openai_usage(response.usage)
             
         except Exception as e:
             logger.error(f"OpenAI API error: {str(e)}")
             raise
     
+    async def stream_insight(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """GPT-4.1 스트리밍 응답"""
+        try:
+            stream = await self.client.chat.completions.create(
+                **self.request_params(prompt, system_prompt),
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            
+        except Exception as e:
+            logger.error(f"OpenAI API error: {str(e)}")
+            raise
+    
+    def build_prompts(self, data: Dict) -> Tuple[str, str]:
+        # 정적 시스템 프롬프트 + 점수/스타일만 담은 짧은 사용자 프롬프트
+        prompt = f"""다음 리더십 데이터를 분석해주세요 (7점 척도):
+People {data.get('people', 0)}, Production {data.get('production', 0)}, Care {data.get('care', 0)}, Challenge {data.get('challenge', 0)}, LMX {data.get('lmx', 0)}
+리더십 스타일: {data.get('style', '')}"""
+        return OPENAI_SYSTEM_PROMPT, prompt
+    
     async def analyze_leadership(self, data: Dict) -> Dict:
         """GPT-4.1을 사용한 리더십 분석"""
-        system_prompt = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
-        Analyze the provided leadership data and generate insights based on:
-        1. Blake & Mouton Grid (People vs Production)
-        2. Radical Candor (Care vs Challenge)
-        3. Leader-Member Exchange (LMX)
-        4. Influence patterns
-        
-        Provide actionable insights in Korean."""
-        
-        prompt = f"""다음 리더십 데이터를 분석해주세요:
-
-People 점수: {data.get('people', 0)}/7
-Production 점수: {data.get('production', 0)}/7
-Care 점수: {data.get('care', 0)}/7
-Challenge 점수: {data.get('challenge', 0)}/7
-LMX 점수: {data.get('lmx', 0)}/7
-리더십 스타일: {data.get('style', '')}
-
-다음 형식으로 분석을 제공해주세요:
-1. 주요 강점 (3개)
-2. 개선 영역 (3개)
-3. 구체적인 실행 계획 (5개)
-4. 6개월 후 예상 성과"""
-
-        response = await self.generate_insight(prompt, system_prompt)
-        
-        # 응답 파싱
-        lines = response.strip().split('\n')
+        system_prompt, prompt = self.build_prompts(data)
+        response, usage = await self.complete(prompt, system_prompt)
+        return self.parse_insight(response, usage)
+    
+    def parse_insight(self, text: str, usage: Optional[Dict[str, int]] = None) -> Dict:
+        """GPT-4.1 응답 파싱"""
+        lines = text.strip().split('\n')
         strengths = []
         improvements = []
         action_plans = []
@@ -120,85 +264,84 @@ LMX 점수: {data.get('lmx', 0)}/7
             "improvements": improvements[:3],
             "action_plans": action_plans[:5],
             "expected_outcomes": expected_outcomes.strip(),
-            "ai_model": "GPT-4.1",
-            "provider": "openai"
+            "ai_model": self.model_label,
+            "provider": self.provider,
+            "usage": usage
         }
 
 
 class AnthropicClient(AIClient):
     """Anthropic Claude 4 Sonnet 클라이언트"""
     
+    provider = "anthropic"
+    model_label = "Claude 4 Sonnet"
+    
     def __init__(self):
         self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.model = settings.ANTHROPIC_MODEL
         logger.info(f"Anthropic client initialized with model: {self.model}")
     
-    async def generate_insight(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Claude 4 Sonnet을 사용한 인사이트 생성"""
+    def request_params(self, prompt: str, system_prompt: Optional[str] = None) -> Dict:
+        """messages 요청 본문 (시스템 프롬프트는 system 파라미터, 실시간/배치 공통)"""
+        params = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 1000,
+            "temperature": 0.7
+        }
+        if system_prompt:
+            # 정적 시스템 프롬프트 끝에 캐시 지점 (모델별 최소 길이 미만이면 provider가 무시)
+            params["system"] = [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        return params
+    
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
+        """Claude 4 Sonnet을 사용한 응답 생성 (시스템 프롬프트는 system 파라미터로 전달)"""
         try:
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-            
             response = await self.client.messages.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=1000,
-                temperature=0.7
+                **self.request_params(prompt, system_prompt)
             )
             
-            return response.content[0].text
+            return response.content[0].text, anthropic_usage(response.usage)
+            
+        except Exception as e:
+            logger.error(f"Anthropic API error: {str(e)}")
+            raise
+    
+    async def stream_insight(self, prompt: str, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Claude 4 Sonnet 스트리밍 응답 (시스템 프롬프트는 system 파라미터로 전달)"""
+        try:
+            async with self.client.messages.stream(
+                **self.request_params(prompt, system_prompt)
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
             
         except Exception as e:
             logger.error(f"Anthropic API error: {str(e)}")
             raise
     
+    def build_prompts(self, data: Dict) -> Tuple[str, str]:
+        # 정적 시스템 프롬프트 + 점수/스타일/맥락만 담은 짧은 사용자 프롬프트
+        prompt = f"""다음 리더십 데이터를 심층 분석해주세요 (7점 척도):
+People(사람 중심) {data.get('people', 0)}, Production(성과 중심) {data.get('production', 0)}, Care(배려) {data.get('care', 0)}, Challenge(도전) {data.get('challenge', 0)}, LMX(관계 품질) {data.get('lmx', 0)}
+리더십 스타일: {data.get('style', '')}
+조직 맥락: {data.get('context', '일반 기업 환경')}"""
+        return ANTHROPIC_SYSTEM_PROMPT, prompt
+    
     async def analyze_leadership(self, data: Dict) -> Dict:
         """Claude 4 Sonnet을 사용한 리더십 분석"""
-        system_prompt = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
-        Analyze the provided leadership data with deep psychological insights based on:
-        1. Blake & Mouton Grid (People vs Production balance)
-        2. Radical Candor (Care vs Challenge dynamics)
-        3. Leader-Member Exchange (Relationship quality)
-        4. Hidden influence patterns (strategic thinking, confidence, risk management)
-        
-        Provide nuanced, culturally-aware insights in Korean that go beyond surface-level observations."""
-        
-        prompt = f"""다음 리더십 데이터를 심층 분석해주세요:
-
-기본 차원:
-- People (사람 중심): {data.get('people', 0)}/7
-- Production (성과 중심): {data.get('production', 0)}/7
-- Care (배려): {data.get('care', 0)}/7
-- Challenge (도전): {data.get('challenge', 0)}/7
-- LMX (관계 품질): {data.get('lmx', 0)}/7
-
-리더십 스타일: {data.get('style', '')}
-조직 맥락: {data.get('context', '일반 기업 환경')}
-
-다음 관점에서 깊이 있는 분석을 제공해주세요:
-
-1. **핵심 강점** (3개)
-   - 현재 발휘되고 있는 독특한 리더십 자산
-   - 조직에 미치는 긍정적 영향
-
-2. **잠재적 사각지대** (3개)
-   - 인식하지 못하고 있을 수 있는 개선 영역
-   - 장기적 성장을 위한 도전 과제
-
-3. **맞춤형 개발 전략** (5개)
-   - 구체적이고 실행 가능한 행동 계획
-   - 한국 조직 문화 맥락을 고려한 접근
-
-4. **변혁적 성장 시나리오**
-   - 6개월 후 달성 가능한 구체적 변화
-   - 조직과 개인에게 미칠 영향"""
-
-        response = await self.generate_insight(prompt, system_prompt)
-        
+        system_prompt, prompt = self.build_prompts(data)
+        response, usage = await self.complete(prompt, system_prompt)
+        return self.parse_insight(response, usage)
+    
+    def parse_insight(self, text: str, usage: Optional[Dict[str, int]] = None) -> Dict:
+        """Claude 4 Sonnet 응답 파싱"""
         # Claude의 응답은 더 구조화되어 있을 가능성이 높음
-        sections = response.split('\n\n')
+        sections = text.split('\n\n')
         strengths = []
         improvements = []
         action_plans = []
@@ -223,8 +366,9 @@ class AnthropicClient(AIClient):
             "improvements": improvements,
             "action_plans": action_plans,
             "expected_outcomes": expected_outcomes,
-            "ai_model": "Claude 4 Sonnet",
-            "provider": "anthropic"
+            "ai_model": self.model_label,
+            "provider": self.provider,
+            "usage": usage
         }
 
 
@@ -0,0 +1,57 @@
+"""
+AI Leadership 4Dx - Provider Comparison
+같은 분석 데이터로 모든 provider를 동시에 호출하고 완료 순서대로 결과 반환
+
+provider별 제한 시간이 지나면 그 provider만 오류로 기록하고 나머지 결과는 그대로 반환한다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Tuple
+
+from .ai_client import get_ai_client
+
+logger = logging.getLogger(__name__)
+
+
+async def _analyze(provider: str, data: Dict, timeout: float) -> Tuple[str, Dict]:
+    """provider 1개 분석 (지연 시간/토큰 사용량 포함, 실패/시간 초과는 오류 결과)"""
+    started = time.perf_counter()
+    try:
+        ai_client = await get_ai_client(provider)
+        result = await asyncio.wait_for(ai_client.analyze_leadership(data), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Provider {provider} timed out after {timeout}s")
+        return provider, {
+            "error": f"timed out after {timeout}s",
+            "timed_out": True,
+            "latency_ms": round((time.perf_counter() - started) * 1000),
+        }
+    except Exception as e:
+        logger.error(f"Error with {provider}: {str(e)}")
+        return provider, {
+            "error": str(e),
+            "latency_ms": round((time.perf_counter() - started) * 1000),
+        }
+    return provider, {
+        **result,
+        "usage": result.get("usage"),
+        "latency_ms": round((time.perf_counter() - started) * 1000),
+    }
+
+
+async def compare_providers(
+    providers: List[str],
+    data: Dict,
+    timeout: float = 30.0
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """모든 provider 동시 호출, 완료되는 순서대로 (provider, 결과) 반환"""
+    tasks = [asyncio.create_task(_analyze(provider, data, timeout)) for provider in providers]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 소비자가 중단하면 남은 호출 취소
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,307 @@
+"""
+AI Leadership 4Dx - AI Provider Router
+provider별 EWMA 지연/오류율 기준 라우팅, 연속 실패 시 서킷 브레이커, 선택적 헤징 요청
+
+- provider 미지정 요청: 서킷이 닫힌 provider 중 예상 비용(EWMA 지연 + 오류율 패널티)이
+  가장 낮은 곳으로 보내고, 실패하면 다음 provider로 넘김
+- provider 지정 요청: 지정 provider만 사용 (측정/서킷 판단은 동일)
+- 헤징: 1순위 응답이 p95 지연 안에 오지 않으면 2순위에도 보내고 먼저 성공한 응답 사용
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, cast
+
+from ..core.config import settings
+from .ai_client import AIClient, AIClientFactory, AIProvider, get_ai_client
+
+logger = logging.getLogger(__name__)
+
+# 서킷 상태
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class NoProviderAvailable(RuntimeError):
+    """모든 provider 서킷이 열려 있음"""
+
+
+@dataclass
+class ProviderHealth:
+    """provider 1개의 지연/오류 추적과 서킷 브레이커"""
+    alpha: float = 0.2
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    window: int = 100
+
+    ewma_latency: Optional[float] = None
+    ewma_error_rate: float = 0.0
+    consecutive_failures: int = 0
+    state: str = CLOSED
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+    latencies: Deque[float] = field(default_factory=deque)
+
+    # 라우팅 통계
+    calls: int = 0
+    failures: int = 0
+    routed: int = 0
+    failovers: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    circuit_opens: int = 0
+    rejected: int = 0
+
+    def available(self, now: float) -> bool:
+        """요청 가능 여부 (열린 서킷은 reset_timeout 후 시험 요청 1건 허용)"""
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            return not self.trial_in_flight
+        return self.state == CLOSED
+
+    def acquire(self) -> None:
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record_success(self, latency: float) -> None:
+        self.calls += 1
+        self.ewma_latency = latency if self.ewma_latency is None else (
+            self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+        )
+        self.ewma_error_rate *= 1 - self.alpha
+        self.latencies.append(latency)
+        if len(self.latencies) > self.window:
+            self.latencies.popleft()
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        self.state = CLOSED
+
+    def record_failure(self, now: float) -> None:
+        self.calls += 1
+        self.failures += 1
+        self.ewma_error_rate = self.alpha + (1 - self.alpha) * self.ewma_error_rate
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.circuit_opens += 1
+            self.state = OPEN
+            self.opened_at = now
+
+    def release(self) -> None:
+        """결과 없이 취소된 호출 (헤징 패배 등)"""
+        self.trial_in_flight = False
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def cost(self, failure_penalty: float) -> float:
+        """예상 비용 (측정 전에는 0으로 먼저 시도)"""
+        return (self.ewma_latency or 0.0) + self.ewma_error_rate * failure_penalty
+
+    def snapshot(self) -> Dict:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "state": self.state,
+            "ewma_latency_ms": ms(self.ewma_latency),
+            "p95_latency_ms": ms(self.percentile(0.95)),
+            "ewma_error_rate": round(self.ewma_error_rate, 4),
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "failures": self.failures,
+            "routed": self.routed,
+            "failovers": self.failovers,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "circuit_opens": self.circuit_opens,
+            "rejected": self.rejected,
+        }
+
+
+class AIRouter:
+    """provider 라우팅 계층 (get_ai_client 위)"""
+
+    def __init__(
+        self,
+        providers: Optional[Callable[[], List[str]]] = None,
+        client_getter: Callable[[AIProvider], Awaitable[AIClient]] = get_ai_client,
+        default_provider: Optional[str] = None,
+        alpha: float = 0.2,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        failure_penalty: float = 10.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 1.0,
+        hedge_min_samples: int = 20,
+    ):
+        self.providers = providers or (
+            lambda: [p["provider"] for p in AIClientFactory.get_available_providers()]
+        )
+        self.client_getter = client_getter
+        self.default_provider = default_provider or settings.DEFAULT_AI_PROVIDER
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_penalty = failure_penalty
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.health: Dict[str, ProviderHealth] = {}
+
+    def _health(self, provider: str) -> ProviderHealth:
+        if provider not in self.health:
+            self.health[provider] = ProviderHealth(
+                alpha=self.alpha,
+                failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout,
+            )
+        return self.health[provider]
+
+    def candidates(self, provider: Optional[AIProvider] = None) -> List[str]:
+        """요청 가능한 provider (비용 순, 동률이면 기본 provider 먼저)"""
+        now = time.monotonic()
+        names = [provider] if provider else self.providers()
+        available = []
+        for name in names:
+            health = self._health(name)
+            if health.available(now):
+                available.append(name)
+            else:
+                health.rejected += 1
+        return sorted(
+            available,
+            key=lambda name: (self._health(name).cost(self.failure_penalty), name != self.default_provider),
+        )
+
+    def select(self, provider: Optional[AIProvider] = None) -> str:
+        """1순위 provider (스트리밍처럼 헤징/재시도 없이 직접 호출하는 경우)"""
+        candidates = self.candidates(provider)
+        if not candidates:
+            raise NoProviderAvailable("All AI providers are unavailable (circuit open)")
+        self._health(candidates[0]).routed += 1
+        self._health(candidates[0]).acquire()
+        return candidates[0]
+
+    def record(self, provider: str, latency: Optional[float]) -> None:
+        """직접 호출 결과 기록 (latency None이면 실패)"""
+        if latency is None:
+            self._health(provider).record_failure(time.monotonic())
+        else:
+            self._health(provider).record_success(latency)
+
+    def release(self, provider: str) -> None:
+        """결과 없이 중단된 직접 호출"""
+        self._health(provider).release()
+
+    async def _call(self, provider: str, fn: Callable[[AIClient], Awaitable[Any]]) -> Any:
+        health = self._health(provider)
+        health.acquire()
+        started = time.monotonic()
+        try:
+            result = await fn(await self.client_getter(cast(AIProvider, provider)))
+        except asyncio.CancelledError:
+            health.release()
+            raise
+        except Exception:
+            health.record_failure(time.monotonic())
+            raise
+        health.record_success(time.monotonic() - started)
+        return result
+
+    def hedge_delay(self, provider: str) -> float:
+        """헤징 대기 시간 (표본이 충분하면 p95, 아니면 최소값)"""
+        health = self._health(provider)
+        if len(health.latencies) < self.hedge_min_samples:
+            return max(self.hedge_min_delay, health.ewma_latency or 0.0)
+        return max(self.hedge_min_delay, health.percentile(self.hedge_percentile) or 0.0)
+
+    async def _hedged(self, primary: str, backup: str, fn: Callable[[AIClient], Awaitable[Any]]) -> Any:
+        """1순위가 지연되면 2순위도 호출, 먼저 성공한 결과 반환 (나머지는 취소)"""
+        tasks = {asyncio.create_task(self._call(primary, fn)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+        if not done:
+            self._health(backup).hedges += 1
+            tasks[asyncio.create_task(self._call(backup, fn))] = backup
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] == backup:
+                            self._health(backup).hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                # 헤징 전에 1순위가 실패하면 2순위로 넘김
+                if not pending and backup not in tasks.values():
+                    self._health(backup).failovers += 1
+                    task = asyncio.create_task(self._call(backup, fn))
+                    tasks[task] = backup
+                    pending = {task}
+            # 두 provider 모두 실패해야 여기 도달하므로 error는 항상 설정됨
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run(
+        self,
+        fn: Callable[[AIClient], Awaitable[Any]],
+        provider: Optional[AIProvider] = None
+    ) -> Any:
+        """라우팅된 provider로 fn(client) 실행 (실패 시 다음 provider, 설정 시 헤징)"""
+        candidates = self.candidates(provider)
+        if not candidates:
+            raise NoProviderAvailable("All AI providers are unavailable (circuit open)")
+        self._health(candidates[0]).routed += 1
+
+        if self.hedge and len(candidates) > 1:
+            return await self._hedged(candidates[0], candidates[1], fn)
+
+        error: Optional[Exception] = None
+        for index, name in enumerate(candidates):
+            if index > 0:
+                self._health(name).failovers += 1
+                logger.warning(f"AI provider failover to {name}: {str(error)}")
+            try:
+                return await self._call(name, fn)
+            except Exception as e:
+                error = e
+        assert error is not None
+        raise error
+
+    def snapshot(self) -> Dict:
+        return {
+            "hedge": self.hedge,
+            "providers": {name: health.snapshot() for name, health in self.health.items()},
+        }
+
+    def reset(self) -> None:
+        """측정/서킷 상태 초기화"""
+        self.health.clear()
+
+
+# 싱글톤 인스턴스
+ai_router = AIRouter(
+    alpha=settings.AI_ROUTER_EWMA_ALPHA,
+    failure_threshold=settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.AI_CIRCUIT_RESET_SECONDS,
+    hedge=settings.AI_HEDGE_ENABLED,
+    hedge_percentile=settings.AI_HEDGE_PERCENTILE,
+    hedge_min_delay=settings.AI_HEDGE_MIN_DELAY,
+)
@@ -3,7 +3,7 @@ AI Leadership 4Dx - Analysis Service
 """
 
 import asyncio
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence, Union
 from uuid import uuid4
 import json
 from datetime import datetime
@@ -14,9 +14,15 @@ from ..schemas.analysis import (
     RiskLevel,
     LeadershipAnalysis
 )
-from ..core.database import get_service_supabase
-from ..core.config import settings
-from .ai_client import get_ai_client, AIProvider
+from ..core.database import get_async_service_supabase
+from .ai_client import AIProvider, PROMPT_VERSION
+from .ai_router import ai_router
+from .insight_cache import insight_cache
+from .singleflight import analysis_flight
+from .scoring import DIMENSION_NAMES, calculate_dimensions_batch, get_scoring_spec
+from .classification import assess_risk_levels, classify_styles
+from .repository import RestAnalysisRepository, get_analysis_repository
+from .memo import MEMO_COLUMNS, analysis_content_hash, find_memoized_analysis, key_provider, memo_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,48 +32,28 @@ class LeadershipAnalyzer:
     """리더십 분석 엔진"""
     
     @staticmethod
-    def calculate_dimensions(responses: Dict[str, int]) -> LeadershipDimensions:
+    def calculate_dimensions(
+        responses: Dict[str, int],
+        survey_version: Optional[str] = None
+    ) -> LeadershipDimensions:
         """설문 응답으로부터 리더십 차원 점수 계산"""
         
-        # Blake & Mouton 점수 계산
-        people_questions = ["bm_1", "bm_3", "bm_5", "bm_7", "bm_9", "bm_11", "bm_13"]
-        production_questions = ["bm_2", "bm_4", "bm_6", "bm_8", "bm_10", "bm_12", "bm_14"]
-        
-        people_score = np.mean([responses.get(q, 4) for q in people_questions])
-        production_score = np.mean([responses.get(q, 4) for q in production_questions])
-        
-        # Radical Candor 점수 계산
-        care_questions = ["rc_1", "rc_3", "rc_5", "rc_7", "rc_9"]
-        challenge_questions = ["rc_2", "rc_4", "rc_6", "rc_8", "rc_10"]
-        
-        care_score = np.mean([responses.get(q, 4) for q in care_questions])
-        challenge_score = np.mean([responses.get(q, 4) for q in challenge_questions])
-        
-        # LMX 점수 계산
-        lmx_questions = [f"lmx_{i}" for i in range(1, 11)]
-        lmx_score = np.mean([responses.get(q, 4) for q in lmx_questions])
-        
-        # Influence Gauge (숨겨진 차원) 계산
-        mach_questions = ["ig_1", "ig_4", "ig_7"]  # hidden_m
-        narc_questions = ["ig_2", "ig_5", "ig_8"]  # hidden_n
-        psyc_questions = ["ig_3", "ig_6", "ig_9"]  # hidden_p
-        
-        # 5점 척도로 변환 (1-7 -> 1-5)
-        mach_score = np.mean([responses.get(q, 3) for q in mach_questions]) * 5 / 7
-        narc_score = np.mean([responses.get(q, 3) for q in narc_questions]) * 5 / 7
-        psyc_score = np.mean([responses.get(q, 3) for q in psyc_questions]) * 5 / 7
+        # 설문 버전별 컴파일된 채점 스펙 사용 (일괄 계산과 동일한 커널)
+        spec = get_scoring_spec(survey_version)
+        scores = spec.score(spec.to_matrix([responses]))[0]
         
         return LeadershipDimensions(
-            people=round(people_score, 2),
-            production=round(production_score, 2),
-            care=round(care_score, 2),
-            challenge=round(challenge_score, 2),
-            lmx_score=round(lmx_score, 2),
-            machiavellianism=round(mach_score, 2),
-            narcissism=round(narc_score, 2),
-            psychopathy=round(psyc_score, 2)
+            **{name: float(scores[col]) for col, name in enumerate(DIMENSION_NAMES)}
         )
     
+    @staticmethod
+    def calculate_dimensions_batch(
+        responses: Union[np.ndarray, Sequence[Dict[str, int]]],
+        survey_version: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """여러 응답의 리더십 차원 점수 일괄 계산 (N x 43 행렬 또는 dict 목록)"""
+        return calculate_dimensions_batch(responses, survey_version)
+    
     @staticmethod
     def classify_leadership_style(people: float, production: float) -> LeadershipStyle:
         """Blake & Mouton Grid 기반 리더십 스타일 분류"""
@@ -115,6 +101,16 @@ class LeadershipAnalyzer:
         else:
             return RiskLevel.HIGH
     
+    @staticmethod
+    def classify_leadership_styles(people: np.ndarray, production: np.ndarray) -> np.ndarray:
+        """리더십 스타일 일괄 분류 (classification.STYLE_ORDER 코드 배열)"""
+        return classify_styles(people, production)
+    
+    @staticmethod
+    def assess_risk_levels(dimensions: Dict[str, np.ndarray]) -> np.ndarray:
+        """위험도 일괄 평가 (classification.RISK_ORDER 코드 배열)"""
+        return assess_risk_levels(dimensions)
+    
     @staticmethod
     async def generate_insights(
         dimensions: LeadershipDimensions, 
@@ -125,34 +121,26 @@ class LeadershipAnalyzer:
         
         # AI 클라이언트로 분석 시도
         try:
-            ai_client = await get_ai_client(ai_provider)
-            
-            data = {
-                'people': dimensions.people,
-                'production': dimensions.production,
-                'care': dimensions.care,
-                'challenge': dimensions.challenge,
-                'lmx': dimensions.lmx_score,
-                'style': style.value
-            }
-            
-            ai_result = await ai_client.analyze_leadership(data)
-            
-            return {
-                "strengths": ai_result.get("strengths", []),
-                "weaknesses": ai_result.get("improvements", []),
-                "improvements": ai_result.get("improvements", []),
-                "style_description": _get_style_description(style),
-                "development_plan": ai_result.get("action_plans", []),
-                "ai_insights": ai_result,
-                "ai_provider": ai_result.get("provider", "unknown"),
-                "ai_model": ai_result.get("ai_model", "unknown")
-            }
+            # provider 미지정 요청은 라우터가 고른 provider가 응답하므로 auto 키에 저장
+            data, cache_key = build_insight_request(dimensions, style, ai_provider)
+            ai_result = await insight_cache.get_or_generate(
+                cache_key,
+                lambda: ai_router.run(lambda client: client.analyze_leadership(data), ai_provider)
+            )
+            return build_ai_insights(ai_result, style)
             
         except Exception as e:
             logger.warning(f"AI analysis failed, falling back to rule-based: {str(e)}")
             
         # Fallback: 규칙 기반 분석
+        return LeadershipAnalyzer.generate_rule_based_insights(dimensions, style)
+    
+    @staticmethod
+    def generate_rule_based_insights(
+        dimensions: LeadershipDimensions,
+        style: LeadershipStyle
+    ) -> Dict:
+        """규칙 기반 인사이트 생성 (LLM 호출 없음)"""
         strengths = []
         weaknesses = []
         improvements = []
@@ -196,6 +184,47 @@ class LeadershipAnalyzer:
         }
 
 
+def build_insight_request(
+    dimensions: LeadershipDimensions,
+    style: LeadershipStyle,
+    ai_provider: Optional[AIProvider] = None
+) -> Tuple[Dict, str]:
+    """AI 요청 데이터와 인사이트 캐시 키"""
+    # 양자화 점수로 프롬프트 생성 (같은 구간의 리더는 캐시된 인사이트 공유)
+    scores = insight_cache.quantize_scores({
+        'people': dimensions.people,
+        'production': dimensions.production,
+        'care': dimensions.care,
+        'challenge': dimensions.challenge,
+        'lmx': dimensions.lmx_score
+    })
+    data = {**scores, 'style': style.value}
+    
+    provider, model = key_provider(ai_provider)
+    cache_key = insight_cache.key(
+        scores,
+        style=style,
+        provider=provider,
+        model=model,
+        prompt_version=PROMPT_VERSION
+    )
+    return data, cache_key
+
+
+def build_ai_insights(ai_result: Dict, style: LeadershipStyle) -> Dict:
+    """AI 분석 결과를 저장용 인사이트로 변환"""
+    return {
+        "strengths": ai_result.get("strengths", []),
+        "weaknesses": ai_result.get("improvements", []),
+        "improvements": ai_result.get("improvements", []),
+        "style_description": _get_style_description(style),
+        "development_plan": ai_result.get("action_plans", []),
+        "ai_insights": ai_result,
+        "ai_provider": ai_result.get("provider", "unknown"),
+        "ai_model": ai_result.get("ai_model", "unknown")
+    }
+
+
 def _get_style_description(style: LeadershipStyle) -> str:
     """리더십 스타일 설명"""
     descriptions = {
@@ -239,46 +268,137 @@ def _generate_development_plan(dimensions: LeadershipDimensions, style: Leadersh
     return plan[:5]  # 최대 5개 항목
 
 
-async def trigger_analysis(user_id: str, responses: Dict[str, int], ai_provider: Optional[AIProvider] = None) -> None:
+def build_analysis_record(
+    user_id: str,
+    dimensions: LeadershipDimensions,
+    style: LeadershipStyle,
+    risk_level: RiskLevel,
+    insights: Dict,
+    survey_response_id: Optional[str] = None,
+    content_hash: Optional[str] = None
+) -> Dict:
+    """leadership_analysis 테이블 저장용 레코드 생성"""
+    record = {
+        "user_id": user_id,
+        "blake_mouton_people": dimensions.people,
+        "blake_mouton_production": dimensions.production,
+        "feedback_care": dimensions.care,
+        "feedback_challenge": dimensions.challenge,
+        "lmx_score": dimensions.lmx_score,
+        "influence_machiavellianism": dimensions.machiavellianism,
+        "influence_narcissism": dimensions.narcissism,
+        "influence_psychopathy": dimensions.psychopathy,
+        "leadership_style": style.value,
+        "overall_risk_level": risk_level.value,
+        "ai_insights": insights,
+        # 메모이제이션 키 (규칙 기반 fallback 결과는 None으로 재사용 대상에서 제외)
+        "content_hash": content_hash,
+    }
+    
+    return _link_survey_response(record, survey_response_id)
+
+
+def build_memoized_record(
+    memo: Dict,
+    user_id: str,
+    survey_response_id: Optional[str] = None
+) -> Dict:
+    """저장된 분석의 점수/인사이트를 재사용하는 레코드 생성"""
+    record = {"user_id": user_id, **{column: memo[column] for column in MEMO_COLUMNS}}
+    return _link_survey_response(record, survey_response_id)
+
+
+def _link_survey_response(record: Dict, survey_response_id: Optional[str]) -> Dict:
+    """설문 응답 연결 (없으면 새 id 부여)"""
+    if survey_response_id:
+        # 응답당 하나의 분석 (survey_response_id 기준 upsert, id는 DB 기본값)
+        record["survey_response_id"] = survey_response_id
+    else:
+        record["id"] = str(uuid4())
+    
+    return record
+
+
+async def reuse_memoized_analysis(
+    repository: RestAnalysisRepository,
+    memo: Dict,
+    user_id: str,
+    survey_response_id: Optional[str] = None
+) -> None:
+    """저장된 분석 재사용 (다른 응답/사용자면 이 응답 행으로 복사)"""
+    memo_stats.hits += 1
+    if memo["survey_response_id"] != survey_response_id or memo["user_id"] != user_id:
+        await repository.save_analyses(
+            [build_memoized_record(memo, user_id, survey_response_id)]
+        )
+    logger.info(f"Analysis reused for user {user_id}")
+
+
+async def save_analysis_records(db, records: List[Dict]) -> None:
+    """분석 레코드 저장 (응답 ID가 있으면 upsert, 없으면 insert)"""
+    await RestAnalysisRepository(db).save_analyses(records)
+
+
+async def _compute_analysis(
+    responses: Dict[str, int],
+    ai_provider: Optional[AIProvider] = None,
+    survey_version: Optional[str] = None
+) -> Tuple[LeadershipDimensions, LeadershipStyle, RiskLevel, Dict]:
+    """채점, 스타일 분류, 위험도 평가, 인사이트 생성"""
+    analyzer = LeadershipAnalyzer()
+    
+    # 차원 점수 계산
+    dimensions = analyzer.calculate_dimensions(responses, survey_version)
+    
+    # 리더십 스타일 분류
+    style = analyzer.classify_leadership_style(
+        dimensions.people, 
+        dimensions.production
+    )
+    
+    # 위험도 평가
+    risk_level = analyzer.assess_risk_level(dimensions)
+    
+    # 인사이트 생성
+    insights = await analyzer.generate_insights(dimensions, style, ai_provider)
+    
+    return dimensions, style, risk_level, insights
+
+
+async def trigger_analysis(
+    user_id: str,
+    responses: Dict[str, int],
+    ai_provider: Optional[AIProvider] = None,
+    survey_version: Optional[str] = None,
+    survey_response_id: Optional[str] = None,
+    force_refresh: bool = False
+) -> None:
     """비동기 분석 실행"""
     try:
-        analyzer = LeadershipAnalyzer()
+        db = await get_async_service_supabase()
+        repository = await get_analysis_repository(db)
         
-        # 차원 점수 계산
-        dimensions = analyzer.calculate_dimensions(responses)
+        # 동일 응답/설문 버전/provider/프롬프트 버전의 분석이 있으면 재사용
+        content_hash = analysis_content_hash(responses, survey_version, ai_provider)
+        memo = None if force_refresh else await find_memoized_analysis(db, content_hash)
+        if memo:
+            await reuse_memoized_analysis(repository, memo, user_id, survey_response_id)
+            return
+        memo_stats.misses += 1
         
-        # 리더십 스타일 분류
-        style = analyzer.classify_leadership_style(
-            dimensions.people, 
-            dimensions.production
+        # 같은 내용의 동시 분석(중복 제출, 동시 트리거)은 한 번만 계산
+        dimensions, style, risk_level, insights = await analysis_flight.do(
+            content_hash,
+            lambda: _compute_analysis(responses, ai_provider, survey_version)
         )
         
-        # 위험도 평가
-        risk_level = analyzer.assess_risk_level(dimensions)
-        
-        # 인사이트 생성
-        insights = await analyzer.generate_insights(dimensions, style, ai_provider)
-        
-        # 분석 결과 저장
-        db = get_service_supabase()
-        
-        analysis_data = {
-            "id": str(uuid4()),
-            "user_id": user_id,
-            "blake_mouton_people": dimensions.people,
-            "blake_mouton_production": dimensions.production,
-            "feedback_care": dimensions.care,
-            "feedback_challenge": dimensions.challenge,
-            "lmx_score": dimensions.lmx_score,
-            "influence_machiavellianism": dimensions.machiavellianism,
-            "influence_narcissism": dimensions.narcissism,
-            "influence_psychopathy": dimensions.psychopathy,
-            "leadership_style": style.value,
-            "overall_risk_level": risk_level.value,
-            "ai_insights": insights,
-        }
+        # 호출자마다 자기 응답 행에 결과를 저장하고, 재사용 키는 AI 인사이트가 생성된 경우에만 기록
+        analysis_data = build_analysis_record(
+            user_id, dimensions, style, risk_level, insights, survey_response_id,
+            content_hash=content_hash if "ai_provider" in insights else None
+        )
         
-        result = db.table("leadership_analysis").insert(analysis_data).execute()
+        await repository.save_analyses([analysis_data])
         
         logger.info(f"Analysis completed for user {user_id}")
         
@@ -0,0 +1,241 @@
+"""
+AI Leadership 4Dx - Analysis Backfill
+채점 규칙/스타일 임계값 변경 시 기존 설문 응답 전체를 재분석하는 배치 작업
+
+사용법:
+    python -m app.services.backfill --rule-based
+    python -m app.services.backfill --chunk-size 2000 --no-resume
+    python -m app.services.backfill --batch-llm --chunk-size 10000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ..core.database import get_async_service_supabase
+from ..schemas.analysis import LeadershipDimensions
+from .ai_batch import BatchInsightGenerator
+from .ai_client import AIProvider
+from .analysis import LeadershipAnalyzer, build_analysis_record, save_analysis_records
+from .classification import RISK_ORDER, STYLE_ORDER, assess_risk_levels, classify_styles
+from .scoring import DIMENSION_NAMES, calculate_dimensions_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHECKPOINT_PATH = ".backfill_checkpoint.json"
+
+
+@dataclass
+class BackfillCheckpoint:
+    """재개 가능한 진행 상태 (마지막으로 저장 완료된 응답 ID 기준)"""
+    last_response_id: Optional[str] = None
+    processed: int = 0
+    written: int = 0
+    failed: int = 0
+    completed: bool = False
+
+    @classmethod
+    def load(cls, path: str) -> "BackfillCheckpoint":
+        """체크포인트 파일 로드 (없으면 처음부터)"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str) -> None:
+        """체크포인트 원자적 저장 (임시 파일 -> rename)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, path)
+
+
+class AnalysisBackfill:
+    """survey_responses -> leadership_analysis 일괄 재분석"""
+
+    def __init__(
+        self,
+        db=None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        rule_based: bool = True,
+        ai_provider: Optional[AIProvider] = None,
+        llm_concurrency: int = 4,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+        batch_generator: Optional[BatchInsightGenerator] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.rule_based = rule_based
+        self.ai_provider = ai_provider
+        self.llm_concurrency = llm_concurrency
+        self.checkpoint_path = checkpoint_path
+        # 설정 시 청크별 인사이트를 provider 배치 API로 생성 (실시간 호출 없음)
+        self.batch_generator = batch_generator
+
+    async def fetch_chunk(self, after_id: Optional[str]) -> List[Dict[str, Any]]:
+        """응답 ID 기준 keyset 페이지네이션 (OFFSET 미사용)"""
+        query = self.db.table("survey_responses") \
+            .select("id,user_id,responses,survey_version,created_at")
+        if after_id:
+            query = query.gt("id", after_id)
+        result = await query.order("id").limit(self.chunk_size).execute()
+        return result.data or []
+
+    async def analyze_chunk(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """청크 단위 채점 (설문 버전별 일괄 커널) 후 저장용 레코드 생성"""
+        by_version: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            by_version[row.get("survey_version")].append(row)
+
+        scored = []
+        for version, version_rows in by_version.items():
+            dimensions = calculate_dimensions_batch(
+                [row["responses"] or {} for row in version_rows], version
+            )
+            style_codes = classify_styles(dimensions["people"], dimensions["production"])
+            risk_codes = assess_risk_levels(dimensions)
+
+            for i, row in enumerate(version_rows):
+                try:
+                    row_dimensions = LeadershipDimensions(
+                        **{name: float(dimensions[name][i]) for name in DIMENSION_NAMES}
+                    )
+                except ValidationError as e:
+                    logger.warning(f"Skipping response {row['id']}: {e}")
+                    continue
+                scored.append((
+                    row,
+                    row_dimensions,
+                    STYLE_ORDER[style_codes[i]],
+                    RISK_ORDER[risk_codes[i]],
+                ))
+
+        if self.rule_based:
+            insights = [
+                LeadershipAnalyzer.generate_rule_based_insights(dims, style)
+                for _, dims, style, _ in scored
+            ]
+        elif self.batch_generator is not None:
+            insights = await self.batch_generator.generate(
+                [(dims, style) for _, dims, style, _ in scored]
+            )
+        else:
+            semaphore = asyncio.Semaphore(self.llm_concurrency)
+
+            async def generate(dims, style):
+                async with semaphore:
+                    return await LeadershipAnalyzer.generate_insights(
+                        dims, style, self.ai_provider
+                    )
+
+            insights = await asyncio.gather(
+                *(generate(dims, style) for _, dims, style, _ in scored)
+            )
+
+        records = []
+        for (row, dims, style, risk), row_insights in zip(scored, insights):
+            record = build_analysis_record(
+                row["user_id"], dims, style, risk, row_insights, row["id"]
+            )
+            # 최신 분석 조회 순서가 바뀌지 않도록 응답 시점을 유지
+            if row.get("created_at"):
+                record["created_at"] = row["created_at"]
+            records.append(record)
+        return records
+
+    async def run(
+        self,
+        resume: bool = True,
+        max_rows: Optional[int] = None
+    ) -> BackfillCheckpoint:
+        """전체 재분석 실행 (청크마다 저장 후 체크포인트 기록)"""
+        checkpoint = (
+            BackfillCheckpoint.load(self.checkpoint_path)
+            if resume else BackfillCheckpoint()
+        )
+        if checkpoint.completed:
+            logger.info("Backfill already completed; use --no-resume to rerun")
+            return checkpoint
+
+        if self.db is None:
+            self.db = await get_async_service_supabase()
+
+        started = time.perf_counter()
+        while max_rows is None or checkpoint.processed < max_rows:
+            rows = await self.fetch_chunk(checkpoint.last_response_id)
+            if not rows:
+                checkpoint.completed = True
+                checkpoint.save(self.checkpoint_path)
+                break
+
+            records = await self.analyze_chunk(rows)
+            if records:
+                await save_analysis_records(self.db, records)
+
+            checkpoint.last_response_id = rows[-1]["id"]
+            checkpoint.processed += len(rows)
+            checkpoint.written += len(records)
+            checkpoint.failed += len(rows) - len(records)
+            checkpoint.save(self.checkpoint_path)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Backfill progress: {checkpoint.processed} processed, "
+                f"{checkpoint.written} written, {checkpoint.failed} failed "
+                f"({checkpoint.processed / elapsed:.0f} rows/s)"
+            )
+
+        if self.batch_generator is not None:
+            logger.info(f"Batch insights: {self.batch_generator.report.snapshot()}")
+
+        return checkpoint
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description="Recompute leadership_analysis")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--rule-based", action="store_true",
+                        help="LLM 호출 없이 규칙 기반 인사이트만 생성")
+    parser.add_argument("--ai-provider", choices=["openai", "anthropic"])
+    parser.add_argument("--llm-concurrency", type=int, default=4)
+    parser.add_argument("--batch-llm", action="store_true",
+                        help="인사이트를 provider 배치 API로 생성 (실시간 요청 한도 미사용)")
+    parser.add_argument("--local-batch", action="store_true",
+                        help="배치 API 대신 낮은 동시성의 실시간 호출로 같은 배치 실행")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--no-resume", action="store_true",
+                        help="체크포인트를 무시하고 처음부터 실행")
+    parser.add_argument("--max-rows", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    backfill = AnalysisBackfill(
+        chunk_size=args.chunk_size,
+        rule_based=args.rule_based,
+        ai_provider=args.ai_provider,
+        llm_concurrency=args.llm_concurrency,
+        checkpoint_path=args.checkpoint,
+        batch_generator=(
+            BatchInsightGenerator(args.ai_provider, local=args.local_batch)
+            if args.batch_llm and not args.rule_based else None
+        ),
+    )
+    checkpoint = asyncio.run(
+        backfill.run(resume=not args.no_resume, max_rows=args.max_rows)
+    )
+    logger.info(f"Backfill finished: {asdict(checkpoint)}")
+
+
+if __name__ == "__main__":
+    main()
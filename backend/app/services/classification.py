@@ -0,0 +1,125 @@
+"""
+AI Leadership 4Dx - Classification Kernels
+리더십 스타일 분류 및 위험도 평가 배열 커널
+"""
+
+from typing import List, Mapping, Sequence, Tuple, Union
+import numpy as np
+from ..schemas.analysis import LeadershipStyle, RiskLevel
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+# 코드 -> 스타일 (LeadershipAnalyzer.classify_leadership_style 분기 순서)
+STYLE_ORDER: Tuple[LeadershipStyle, ...] = (
+    LeadershipStyle.IMPOVERISHED,
+    LeadershipStyle.COUNTRY_CLUB,
+    LeadershipStyle.AUTHORITY_COMPLIANCE,
+    LeadershipStyle.MIDDLE_OF_THE_ROAD,
+    LeadershipStyle.TEAM_LEADER,
+    LeadershipStyle.TASK_MANAGER,
+    LeadershipStyle.CUSTOM,
+)
+
+# 코드 -> 위험도
+RISK_ORDER: Tuple[RiskLevel, ...] = (
+    RiskLevel.LOW,
+    RiskLevel.MEDIUM,
+    RiskLevel.HIGH,
+)
+
+# Blake & Mouton 임계값
+LOW = 3.0
+MID_LOW = 4.0
+MID_HIGH = 5.0
+HIGH = 6.0
+
+# Grid 3.0 분류 (AIAnalysisService / SQL get_leadership_style 기준)
+# 코드 순서: Impoverished, Authority-Compliance, Country Club,
+#           Middle of the Road, Team Leadership, Transitional
+GRID_STYLE_LABELS: Tuple[str, ...] = (
+    "Impoverished Management",
+    "Authority-Compliance",
+    "Country Club Management",
+    "Middle of the Road",
+    "Team Leadership",
+    "Transitional",
+)
+
+GRID_STYLE_SQL_LABELS: Tuple[str, ...] = (
+    "Impoverished",
+    "Authority-Compliance",
+    "Country Club",
+    "Middle of the Road",
+    "Team Leadership",
+    "Transitional",
+)
+
+
+def classify_styles(people: ArrayLike, production: ArrayLike) -> np.ndarray:
+    """Blake & Mouton Grid 기반 리더십 스타일 일괄 분류 (STYLE_ORDER 코드 배열)"""
+    people = np.asarray(people, dtype=float)
+    production = np.asarray(production, dtype=float)
+
+    # np.select는 처음 참인 조건을 선택하므로 if/elif 순서와 동일
+    conditions = [
+        (people <= LOW) & (production <= LOW),
+        (people >= HIGH) & (production <= LOW),
+        (people <= LOW) & (production >= HIGH),
+        (MID_LOW <= people) & (people <= MID_HIGH)
+        & (MID_LOW <= production) & (production <= MID_HIGH),
+        (people >= HIGH) & (production >= HIGH),
+        (production > people) & (production >= MID_HIGH),
+    ]
+    return np.select(conditions, np.arange(6), default=6).astype(np.int8)
+
+
+def risk_scores(dimensions: Mapping[str, ArrayLike]) -> np.ndarray:
+    """Dark Triad 가중 점수에 LMX/배려 완화 요인을 적용한 조정 점수"""
+    mach = np.asarray(dimensions["machiavellianism"], dtype=float)
+    narc = np.asarray(dimensions["narcissism"], dtype=float)
+    psyc = np.asarray(dimensions["psychopathy"], dtype=float)
+    lmx = np.asarray(dimensions["lmx_score"], dtype=float)
+    care = np.asarray(dimensions["care"], dtype=float)
+
+    # LeadershipAnalyzer.assess_risk_level과 동일한 연산 순서
+    dark_score = mach * 0.4 + narc * 0.3 + psyc * 0.3
+    mitigating_factor = (lmx + care) / 14
+    return dark_score * (1 - mitigating_factor * 0.3)
+
+
+def assess_risk_levels(dimensions: Mapping[str, ArrayLike]) -> np.ndarray:
+    """
+    Dark Triad 기반 위험도 일괄 평가 (RISK_ORDER 코드 배열)
+
+    Args:
+        dimensions: 차원명 -> 배열 (calculate_dimensions_batch 결과 형식)
+    """
+    adjusted = risk_scores(dimensions)
+    return np.select(
+        [adjusted <= 2.0, adjusted <= 3.5], [0, 1], default=2
+    ).astype(np.int8)
+
+
+def classify_grid_styles(people: ArrayLike, production: ArrayLike) -> np.ndarray:
+    """Grid 3.0 규칙 기반 스타일 일괄 분류 (GRID_STYLE_LABELS 코드 배열)"""
+    people = np.asarray(people, dtype=float)
+    production = np.asarray(production, dtype=float)
+
+    conditions = [
+        (people <= 3) & (production <= 3),
+        (people <= 3) & (production > 5),
+        (people > 5) & (production <= 3),
+        (people >= 4) & (people <= 5) & (production >= 4) & (production <= 5),
+        (people > 5) & (production > 5),
+    ]
+    return np.select(conditions, np.arange(5), default=5).astype(np.int8)
+
+
+def decode_styles(codes: np.ndarray) -> List[LeadershipStyle]:
+    """스타일 코드 배열 -> LeadershipStyle 목록"""
+    return [STYLE_ORDER[code] for code in codes.tolist()]
+
+
+def decode_risks(codes: np.ndarray) -> List[RiskLevel]:
+    """위험도 코드 배열 -> RiskLevel 목록"""
+    return [RISK_ORDER[code] for code in codes.tolist()]
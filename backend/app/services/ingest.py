@@ -0,0 +1,237 @@
+"""
+AI Leadership 4Dx - Bulk Survey Ingestion
+NDJSON/CSV 스트림을 배치 단위로 검증/저장하고 분석 작업을 일괄 등록
+
+요청 본문 전체를 메모리에 올리지 않고 한 배치(batch_size 행)씩 처리한다.
+CSV는 한 줄이 한 행이며 프로필 컬럼 외 컬럼은 문항 ID로 본다.
+저장된 배치는 되돌리지 않으므로 분석 등록 실패나 스트림 중단도 예외 대신 결과에 기록한다.
+"""
+
+import codecs
+import csv
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from ..schemas.survey import SurveyBulkError, SurveyBulkResult, SurveyBulkRow
+from .repository import RestAnalysisRepository
+from .scoring import DEFAULT_SURVEY_VERSION, get_scoring_spec
+
+logger = logging.getLogger(__name__)
+
+# 문항 외 CSV 컬럼
+CSV_FIELDS = (
+    "user_id", "email", "name", "organization", "department", "position",
+    "survey_version", "completion_time_seconds",
+)
+
+# 한 행 최대 길이 (줄바꿈 없는 본문으로 메모리가 커지는 것 방지)
+MAX_LINE_LENGTH = 1_000_000
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 청크 스트림을 줄 단위로 분리 (UTF-8 증분 디코딩)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(pending) > MAX_LINE_LENGTH:
+            raise ValueError(f"line exceeds {MAX_LINE_LENGTH} characters")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def parse_ndjson_row(line: str) -> Dict[str, Any]:
+    """NDJSON 한 줄 (responses는 {문항: 값} 또는 [{question_id, value}] 형식)"""
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise ValueError("row must be a JSON object")
+    responses = row.get("responses")
+    if isinstance(responses, list):
+        try:
+            row["responses"] = {r["question_id"]: r["value"] for r in responses}
+        except (KeyError, TypeError):
+            raise ValueError("responses items must have question_id and value")
+    return row
+
+
+def parse_csv_row(header: List[str], line: str) -> Dict[str, Any]:
+    """CSV 한 줄 (빈 칸은 미응답/미입력)"""
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+
+    row: Dict[str, Any] = {}
+    responses = {}
+    for column, value in zip(header, values):
+        value = value.strip()
+        if not value:
+            continue
+        if column in CSV_FIELDS:
+            row[column] = value
+        else:
+            responses[column] = value
+    row["responses"] = responses
+    return row
+
+
+class SurveyBulkIngestor:
+    """대량 설문 입력 (배치 검증 -> 사용자 일괄 확인/생성 -> 응답 다건 insert -> 분석 일괄 등록)"""
+
+    def __init__(
+        self,
+        repository: RestAnalysisRepository,
+        job_queue=None,
+        batch_size: int = 1000,
+        max_errors: int = 1000,
+        ai_provider: Optional[str] = None,
+    ):
+        self.repository = repository
+        self.job_queue = job_queue
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.ai_provider = ai_provider
+        self.result = SurveyBulkResult()
+
+    def _error(self, row: int, message: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append(SurveyBulkError(row=row, error=message))
+        else:
+            self.result.errors_truncated = True
+
+    def _validate(self, row_number: int, row: Dict[str, Any]) -> Optional[SurveyBulkRow]:
+        try:
+            submission = SurveyBulkRow(**row)
+            get_scoring_spec(submission.survey_version or DEFAULT_SURVEY_VERSION)
+        except ValidationError as e:
+            self._error(row_number, _format_validation_error(e))
+            return None
+        except ValueError as e:
+            self._error(row_number, str(e))
+            return None
+        return submission
+
+    async def _flush(self, batch: List[Tuple[int, SurveyBulkRow]]) -> None:
+        """검증된 배치 저장 (DB 오류 시 배치 전체 행을 실패로 기록)"""
+        if not batch:
+            return
+        new_users = [
+            {
+                "email": s.email, "name": s.name, "organization": s.organization,
+                "department": s.department, "position": s.position,
+            }
+            for _, s in batch if not s.user_id
+        ]
+        # 없는 user_id 한 건이 다건 insert 전체를 실패시키지 않도록 배치당 한 번 조회해 미리 거름
+        supplied = list({s.user_id for _, s in batch if s.user_id})
+        rows = []
+        unresolved = []
+        try:
+            user_ids = await self.repository.ensure_users(new_users) if new_users else {}
+            existing = await self.repository.existing_user_ids(supplied) if supplied else set()
+
+            for row_number, submission in batch:
+                if submission.user_id and submission.user_id not in existing:
+                    unresolved.append((row_number, f"unknown user_id {submission.user_id}"))
+                    continue
+                user_id = submission.user_id or user_ids.get(submission.email)
+                if not user_id:
+                    unresolved.append((row_number, f"user not resolved for {submission.email}"))
+                    continue
+                rows.append({
+                    "id": str(uuid4()),
+                    "user_id": user_id,
+                    "responses": submission.responses,
+                    "survey_version": submission.survey_version or DEFAULT_SURVEY_VERSION,
+                    "completion_time_seconds": submission.completion_time_seconds or 0,
+                    "device_info": submission.device_info,
+                })
+            if rows:
+                await self.repository.insert_survey_responses(rows)
+        except Exception as e:
+            logger.error(f"Bulk survey batch failed: {str(e)}")
+            for row_number, _ in batch:
+                self._error(row_number, f"batch write failed: {str(e)}")
+            return
+
+        for row_number, message in unresolved:
+            self._error(row_number, message)
+        self.result.inserted += len(rows)
+        if self.job_queue is not None and rows:
+            await self._enqueue(rows)
+
+    async def _enqueue(self, rows: List[Dict[str, Any]]) -> None:
+        """저장된 응답의 분석 작업 등록 (실패 시 응답은 유지하고 미등록 ID를 기록)"""
+        try:
+            jobs = await self.job_queue.enqueue_many([
+                {
+                    "user_id": r["user_id"],
+                    "responses": r["responses"],
+                    "ai_provider": self.ai_provider,
+                    "survey_version": r["survey_version"],
+                    "survey_response_id": r["id"],
+                }
+                for r in rows
+            ])
+        except Exception as e:
+            logger.error(f"Bulk survey analysis enqueue failed: {str(e)}")
+            self.result.analyses_failed += len(rows)
+            room = self.max_errors - len(self.result.unanalyzed_response_ids)
+            self.result.unanalyzed_response_ids.extend(r["id"] for r in rows[:max(room, 0)])
+            if len(rows) > room:
+                self.result.unanalyzed_truncated = True
+            return
+        self.result.analyses_enqueued += len(jobs)
+
+    async def ingest(self, chunks: AsyncIterator[bytes], fmt: str) -> SurveyBulkResult:
+        """스트림 전체 처리 (행 번호는 데이터 행 기준 1부터, 스트림 중단 시 부분 결과 반환)"""
+        started = time.perf_counter()
+        header: Optional[List[str]] = None
+        batch: List[Tuple[int, SurveyBulkRow]] = []
+        row_number = 0
+
+        try:
+            async for line in iter_lines(chunks):
+                if not line.strip():
+                    continue
+                if fmt == "csv" and header is None:
+                    header = [column.strip() for column in next(csv.reader([line]))]
+                    continue
+
+                row_number += 1
+                self.result.total_rows += 1
+                try:
+                    row = parse_csv_row(header, line) if fmt == "csv" else parse_ndjson_row(line)
+                except (ValueError, csv.Error) as e:
+                    self._error(row_number, f"parse error: {str(e)}")
+                    continue
+
+                submission = self._validate(row_number, row)
+                if submission is not None:
+                    batch.append((row_number, submission))
+                if len(batch) >= self.batch_size:
+                    await self._flush(batch)
+                    batch = []
+        except Exception as e:
+            # 이전 배치는 이미 저장되었으므로 예외로 결과를 버리면 재전송 시 중복 저장됨
+            logger.warning(f"Bulk survey stream aborted after row {row_number}: {str(e)}")
+            self.result.error = f"stream aborted after row {row_number}: {str(e)}"
+
+        await self._flush(batch)
+        self.result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        return self.result
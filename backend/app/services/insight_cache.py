@@ -0,0 +1,181 @@
+"""
+AI Leadership 4Dx - Insight Cache
+양자화된 점수 프로필 기준 LLM 인사이트 캐시 (프로세스 내 LRU -> Redis 2단계)
+
+비슷한 점수의 리더는 같은 구간 대표값으로 프롬프트를 만들고 생성 결과를 공유한다.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis_client import cache_get, cache_set
+from .singleflight import SingleFlight, insight_flight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InsightCacheStats:
+    """캐시 통계 (프로세스 단위)"""
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> Dict:
+        data = asdict(self)
+        data["saved_seconds"] = round(self.saved_seconds, 3)
+        data["hit_ratio"] = round(self.hit_ratio, 4)
+        return data
+
+
+def quantize(value: float, quantum: float) -> float:
+    """구간 대표값으로 반올림 (예: 0.25 단위)"""
+    if quantum <= 0:
+        return round(value, 2)
+    return round(round(value / quantum) * quantum, 2)
+
+
+class InsightCache:
+    """LLM 인사이트 2단계 캐시"""
+
+    def __init__(
+        self,
+        quantum: float = 0.25,
+        max_entries: int = 1024,
+        local_ttl: int = 600,
+        redis_ttl: int = 604800,
+        use_redis: bool = True,
+        flight: Optional[SingleFlight] = None,
+    ):
+        self.quantum = quantum
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self.flight = flight
+        self.stats = InsightCacheStats()
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def quantize_scores(self, scores: Dict[str, float]) -> Dict[str, float]:
+        """프롬프트/키에 사용할 양자화 점수"""
+        return {name: quantize(value, self.quantum) for name, value in scores.items()}
+
+    def key(self, scores: Dict[str, float], **context: Any) -> str:
+        """양자화 점수 + 스타일/provider/모델/프롬프트 버전 등 문맥의 캐시 키"""
+        canonical = json.dumps(
+            {
+                "quantum": self.quantum,
+                "scores": self.quantize_scores(scores),
+                **{name: getattr(value, "value", value) for name, value in context.items()},
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return "insight:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Dict[str, Any]) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """LRU -> Redis 순서로 조회 (Redis 적중 시 LRU 채움), (항목, 단계) 반환"""
+        entry = self._get_local(key)
+        if entry is not None:
+            return entry, "local"
+        if self.use_redis:
+            raw = await cache_get(key)
+            if raw:
+                entry = json.loads(raw)
+                self._set_local(key, entry)
+                return entry, "redis"
+        return None, ""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회"""
+        entry, tier = await self._lookup(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if tier == "local":
+            self.stats.local_hits += 1
+        else:
+            self.stats.redis_hits += 1
+        self.stats.saved_seconds += entry.get("generation_seconds", 0.0)
+        return entry["value"]
+
+    async def set(self, key: str, value: Dict[str, Any], generation_seconds: float = 0.0) -> None:
+        """캐시 저장 (생성 소요 시간을 함께 기록해 절감 시간 집계)"""
+        entry = {"value": value, "generation_seconds": generation_seconds}
+        self._set_local(key, entry)
+        if self.use_redis:
+            await cache_set(key, json.dumps(entry, ensure_ascii=False), self.redis_ttl)
+
+    async def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """캐시 적중 시 재사용, 미적중 시 생성 후 저장 (생성 실패는 저장하지 않음)
+
+        같은 키의 동시 미적중은 singleflight로 한 번만 생성한다.
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        async def generate_and_store() -> Dict[str, Any]:
+            # 다른 워커가 락을 잡고 생성했을 수 있으므로 다시 확인
+            entry, _ = await self._lookup(key)
+            if entry is not None:
+                return entry["value"]
+            started = time.perf_counter()
+            value = await generate()
+            await self.set(key, value, time.perf_counter() - started)
+            return value
+
+        if self.flight is None:
+            return await generate_and_store()
+        return await self.flight.do(key, generate_and_store)
+
+    def clear(self) -> None:
+        """프로세스 내 캐시/통계 초기화"""
+        self._local.clear()
+        self.stats = InsightCacheStats()
+
+
+# 싱글톤 인스턴스 (Redis 단계는 REDIS_URL 설정 시에만 사용)
+insight_cache = InsightCache(
+    quantum=settings.INSIGHT_CACHE_QUANTUM,
+    max_entries=settings.INSIGHT_CACHE_LOCAL_SIZE,
+    local_ttl=settings.INSIGHT_CACHE_LOCAL_TTL,
+    redis_ttl=settings.INSIGHT_CACHE_TTL,
+    use_redis=bool(settings.REDIS_URL),
+    flight=insight_flight,
+)
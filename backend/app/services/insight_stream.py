@@ -0,0 +1,254 @@
+"""
+AI Leadership 4Dx - Insight Streaming
+LLM 스트리밍 응답을 섹션 항목 단위로 파싱해 이벤트로 전달하고 완료 시 분석 저장
+
+항목은 줄이 끝나는 즉시 내보내므로 첫 강점은 전체 응답 완료 전에 도착한다.
+생성/저장은 백그라운드 작업에서 진행해 클라이언트 연결이 끊겨도 끝까지 저장한다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from ..core.database import get_async_service_supabase
+from .ai_client import AIProvider, get_ai_client
+from .ai_router import ai_router
+from .analysis import (
+    LeadershipAnalyzer,
+    build_ai_insights,
+    build_analysis_record,
+    build_insight_request,
+    reuse_memoized_analysis,
+)
+from .insight_cache import insight_cache
+from .memo import analysis_content_hash, find_memoized_analysis, memo_stats
+from .repository import get_analysis_repository
+
+logger = logging.getLogger(__name__)
+
+# 섹션 제목 키워드 (OpenAI/Anthropic 프롬프트 형식 모두)
+SECTION_KEYWORDS = (
+    ("strengths", ("주요 강점", "핵심 강점")),
+    ("improvements", ("개선 영역", "사각지대")),
+    ("action_plans", ("실행 계획", "개발 전략")),
+    ("expected_outcomes", ("예상 성과", "성장 시나리오")),
+)
+
+# 섹션별 최대 항목 수 (analyze_leadership 파싱과 동일)
+SECTION_LIMITS = {"strengths": 3, "improvements": 3, "action_plans": 5}
+
+# 제목으로 볼 최대 길이 (항목 본문에 키워드가 들어간 경우 제외)
+MAX_HEADER_LENGTH = 40
+
+LIST_MARKER = re.compile(r"^(?:[-•*]+|\d+[.)])\s*")
+
+# 진행 중인 생성 작업 (GC로 취소되지 않도록 참조 유지)
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _clean(line: str) -> str:
+    return line.replace("**", "").strip(" #:").strip()
+
+
+class InsightStreamParser:
+    """텍스트 조각을 받아 완성된 줄마다 (섹션, 항목) 반환"""
+
+    def __init__(self):
+        self.section: Optional[str] = None
+        self.sections: Dict[str, List[str]] = {name: [] for name, _ in SECTION_KEYWORDS}
+        self._pending = ""
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        return [item for item in map(self._parse_line, lines) if item]
+
+    def close(self) -> List[Tuple[str, str]]:
+        """남은 마지막 줄 처리"""
+        line, self._pending = self._pending, ""
+        item = self._parse_line(line)
+        return [item] if item else []
+
+    def _parse_line(self, line: str) -> Optional[Tuple[str, str]]:
+        text = _clean(line)
+        if not text:
+            return None
+
+        if len(text) <= MAX_HEADER_LENGTH:
+            for name, keywords in SECTION_KEYWORDS:
+                if any(keyword in text for keyword in keywords):
+                    self.section = name
+                    return None
+
+        if self.section is None:
+            return None
+        if self.section == "expected_outcomes":
+            item = _clean(LIST_MARKER.sub("", line.strip()))
+        else:
+            # 목록 항목만 (섹션 설명 문장 제외)
+            marker = LIST_MARKER.match(line.strip())
+            if not marker:
+                return None
+            item = _clean(line.strip()[marker.end():])
+            if len(self.sections[self.section]) >= SECTION_LIMITS[self.section]:
+                return None
+        if not item:
+            return None
+        self.sections[self.section].append(item)
+        return self.section, item
+
+    def result(self) -> Dict[str, Any]:
+        """analyze_leadership과 같은 형식의 결과"""
+        return {
+            "strengths": self.sections["strengths"],
+            "improvements": self.sections["improvements"],
+            "action_plans": self.sections["action_plans"],
+            "expected_outcomes": " ".join(self.sections["expected_outcomes"]),
+        }
+
+
+def _insight_events(ai_result: Dict) -> List[Tuple[str, Dict]]:
+    """완성된 결과(캐시/메모)를 항목 이벤트로 변환"""
+    events = []
+    for section in ("strengths", "improvements", "action_plans"):
+        for item in ai_result.get(section, []):
+            events.append(("insight", {"section": section, "item": item}))
+    if ai_result.get("expected_outcomes"):
+        events.append(("insight", {"section": "expected_outcomes", "item": ai_result["expected_outcomes"]}))
+    return events
+
+
+def _done_event(insights: Dict, source: str, elapsed: float) -> Tuple[str, Dict]:
+    ai_insights = insights.get("ai_insights", {})
+    return "done", {
+        "strengths": insights.get("strengths", []),
+        "improvements": insights.get("improvements", []),
+        "action_plans": insights.get("development_plan", []),
+        "expected_outcomes": ai_insights.get("expected_outcomes", ""),
+        "ai_provider": insights.get("ai_provider", "unknown"),
+        "ai_model": insights.get("ai_model", "unknown"),
+        "source": source,
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+async def _analysis_events(
+    user_id: str,
+    survey_response: Dict,
+    ai_provider: Optional[AIProvider] = None,
+    force_refresh: bool = False,
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """채점 -> (메모/캐시 적중 또는 LLM 스트리밍) -> 저장 이벤트"""
+    started = time.perf_counter()
+    responses = survey_response["responses"]
+    survey_version = survey_response.get("survey_version")
+    survey_response_id = survey_response["id"]
+
+    db = await get_async_service_supabase()
+    repository = await get_analysis_repository(db)
+
+    # 채점/분류는 즉시 전달 (LLM 대기 없음)
+    analyzer = LeadershipAnalyzer()
+    dimensions = analyzer.calculate_dimensions(responses, survey_version)
+    style = analyzer.classify_leadership_style(dimensions.people, dimensions.production)
+    risk_level = analyzer.assess_risk_level(dimensions)
+    yield "scores", {
+        "dimensions": dimensions.model_dump(),
+        "leadership_style": style.value,
+        "risk_level": risk_level.value,
+    }
+
+    content_hash = analysis_content_hash(responses, survey_version, ai_provider)
+    memo = None if force_refresh else await find_memoized_analysis(db, content_hash)
+    if memo:
+        await reuse_memoized_analysis(repository, memo, user_id, survey_response_id)
+        insights = memo["ai_insights"]
+        for event in _insight_events(insights.get("ai_insights", {})):
+            yield event
+        yield _done_event(insights, "memo", time.perf_counter() - started)
+        return
+    memo_stats.misses += 1
+
+    try:
+        data, cache_key = build_insight_request(dimensions, style, ai_provider)
+        ai_result = await insight_cache.get(cache_key)
+        source = "cache"
+        if ai_result is not None:
+            for event in _insight_events(ai_result):
+                yield event
+        else:
+            source = "llm"
+            generation_started = time.perf_counter()
+            # 스트림은 중간에 다른 provider로 바꿀 수 없으므로 1순위만 선택하고 결과 기록
+            # 클라이언트 생성/프롬프트 구성 실패도 시험 호출 결과로 기록 (half-open 시험 슬롯 반납)
+            routed = ai_router.select(ai_provider)
+            parser = InsightStreamParser()
+            try:
+                ai_client = await get_ai_client(routed)
+                system_prompt, prompt = ai_client.build_prompts(data)
+                async for text in ai_client.stream_insight(prompt, system_prompt):
+                    for section, item in parser.feed(text):
+                        yield "insight", {"section": section, "item": item}
+            except asyncio.CancelledError:
+                ai_router.release(routed)
+                raise
+            except Exception:
+                ai_router.record(routed, None)
+                raise
+            ai_router.record(routed, time.perf_counter() - generation_started)
+            for section, item in parser.close():
+                yield "insight", {"section": section, "item": item}
+
+            ai_result = {
+                **parser.result(),
+                "ai_model": ai_client.model_label,
+                "provider": ai_client.provider,
+            }
+            await insight_cache.set(cache_key, ai_result, time.perf_counter() - generation_started)
+        insights = build_ai_insights(ai_result, style)
+    except Exception as e:
+        # 비스트리밍 분석과 같이 규칙 기반으로 대체 (재사용 키 기록 안 함)
+        logger.warning(f"AI streaming failed, falling back to rule-based: {str(e)}")
+        yield "error", {"detail": str(e), "fallback": "rule_based"}
+        source = "rule_based"
+        insights = LeadershipAnalyzer.generate_rule_based_insights(dimensions, style)
+        content_hash = None
+
+    await repository.save_analyses([build_analysis_record(
+        user_id, dimensions, style, risk_level, insights, survey_response_id,
+        content_hash=content_hash,
+    )])
+    logger.info(f"Streaming analysis completed for user {user_id}")
+    yield _done_event(insights, source, time.perf_counter() - started)
+
+
+async def stream_leadership_analysis(
+    user_id: str,
+    survey_response: Dict,
+    ai_provider: Optional[AIProvider] = None,
+    force_refresh: bool = False,
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """분석 이벤트 스트림 (소비자가 중단해도 생성/저장은 계속)"""
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for event in _analysis_events(user_id, survey_response, ai_provider, force_refresh):
+                queue.put_nowait(event)
+        except Exception as e:
+            logger.error(f"Streaming analysis failed for user {user_id}: {str(e)}")
+            queue.put_nowait(("error", {"detail": str(e)}))
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(produce())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    while True:
+        event = await queue.get()
+        if event is None:
+            return
+        yield event
@@ -0,0 +1,434 @@
+"""
+AI Leadership 4Dx - Analysis Job Queue
+분석 작업을 요청 경로에서 분리하여 워커 풀에서 처리 (재시도/백오프/dead-letter)
+
+- MemoryJobBackend: 단일 프로세스/테스트용
+- RedisJobBackend: 다중 워커(프로세스) 배포용
+  (꺼낸 작업은 워커별 처리 중 list에 두었다가 완료 시 제거, 응답 없는 워커의 작업은 대기열로 복구)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from ..core.config import settings
+from ..core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# 재시도 예약: 작업 저장 + 지연 sorted set 등록 + 처리 중 list 제거를 원자적으로 (중간 종료 시 중복 실행 방지)
+# KEYS: 작업, 지연 sorted set, 처리 중 list / ARGV: 작업 JSON, TTL, 재시도 시각, 작업 ID
+SCHEDULE_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+redis.call('LREM', KEYS[3], 1, ARGV[4])
+"""
+
+# dead-letter: 작업 저장 + dead-letter list 등록/상한 + 처리 중 list 제거를 원자적으로
+# KEYS: 작업, dead-letter list, 처리 중 list / ARGV: 작업 JSON, TTL, dead-letter 상한, 작업 ID
+DEAD_LETTER_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('LPUSH', KEYS[2], ARGV[4])
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[3]) - 1)
+redis.call('LREM', KEYS[3], 1, ARGV[4])
+"""
+
+# 재시도 시각이 지난 작업을 지연 sorted set에서 대기열로 원자적으로 이동 (중간 종료 시 유실 방지)
+# KEYS: 지연 sorted set, 대기열 / ARGV: 현재 시각, 한 번에 옮길 최대 개수
+PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+  redis.call('ZREM', KEYS[1], unpack(due))
+  redis.call('LPUSH', KEYS[2], unpack(due))
+end
+return #due
+"""
+
+
+class JobStatus(str, Enum):
+    """작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class AnalysisJob:
+    """분석 작업 (payload는 trigger_analysis 인자)"""
+    id: str
+    payload: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "AnalysisJob":
+        data = json.loads(raw)
+        data["status"] = JobStatus(data["status"])
+        return cls(**data)
+
+
+class MemoryJobBackend:
+    """프로세스 내 작업 저장소 (asyncio.Queue)"""
+
+    def __init__(self, max_jobs: int = 10000, max_dead_letters: int = 1000):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self.dead: deque = deque(maxlen=max_dead_letters)
+        self.max_jobs = max_jobs
+
+    async def save(self, job: AnalysisJob) -> None:
+        job.updated_at = time.time()
+        self.jobs[job.id] = job
+        self.jobs.move_to_end(job.id)
+        # 완료된 오래된 작업부터 정리
+        while len(self.jobs) > self.max_jobs:
+            oldest_id, oldest = next(iter(self.jobs.items()))
+            if not oldest.finished:
+                break
+            del self.jobs[oldest_id]
+
+    async def push(self, job: AnalysisJob) -> None:
+        await self.save(job)
+        self.queue.put_nowait(job.id)
+
+    async def push_many(self, jobs: List[AnalysisJob]) -> None:
+        for job in jobs:
+            await self.push(job)
+
+    async def pop(self, timeout: float) -> Optional[AnalysisJob]:
+        try:
+            job_id = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.jobs.get(job_id)
+
+    async def schedule(self, job: AnalysisJob, delay: float) -> None:
+        await self.save(job)
+        asyncio.get_running_loop().call_later(delay, self.queue.put_nowait, job.id)
+
+    async def dead_letter(self, job: AnalysisJob) -> None:
+        await self.save(job)
+        self.dead.appendleft(job.id)
+
+    async def ack(self, job: AnalysisJob) -> None:
+        """프로세스 내 큐는 꺼내는 즉시 소유하므로 처리할 것 없음"""
+
+    async def heartbeat(self) -> None:
+        pass
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self.jobs.get(job_id)
+
+    async def dead_letters(self, limit: int) -> List[AnalysisJob]:
+        return [self.jobs[i] for i in list(self.dead)[:limit] if i in self.jobs]
+
+
+class RedisJobBackend:
+    """Redis 작업 저장소 (대기열 list + 워커별 처리 중 list + 지연 재시도 sorted set + dead-letter list)"""
+
+    QUEUE_KEY = "analysis:jobs:queue"
+    DELAYED_KEY = "analysis:jobs:delayed"
+    DEAD_KEY = "analysis:jobs:dead"
+    WORKERS_KEY = "analysis:jobs:workers"
+    PROCESSING_KEY = "analysis:jobs:processing:{}"
+    JOB_KEY = "analysis:job:{}"
+    PROMOTE_BATCH = 1000
+
+    def __init__(
+        self,
+        client,
+        job_ttl: int = 86400,
+        max_dead_letters: int = 1000,
+        stale_after: float = 300.0,
+        worker_id: Optional[str] = None,
+    ):
+        self.client = client
+        self.job_ttl = job_ttl
+        self.max_dead_letters = max_dead_letters
+        self.stale_after = stale_after
+        self.worker_id = worker_id or str(uuid4())
+        self.processing_key = self.PROCESSING_KEY.format(self.worker_id)
+        self._schedule_script = client.register_script(SCHEDULE_SCRIPT)
+        self._dead_letter_script = client.register_script(DEAD_LETTER_SCRIPT)
+        self._promote_script = client.register_script(PROMOTE_SCRIPT)
+
+    async def save(self, job: AnalysisJob) -> None:
+        job.updated_at = time.time()
+        await self.client.set(self.JOB_KEY.format(job.id), job.to_json(), ex=self.job_ttl)
+
+    async def push(self, job: AnalysisJob) -> None:
+        await self.save(job)
+        await self.client.lpush(self.QUEUE_KEY, job.id)
+
+    async def push_many(self, jobs: List[AnalysisJob]) -> None:
+        """작업 저장/등록을 한 번의 파이프라인으로 처리"""
+        if not jobs:
+            return
+        now = time.time()
+        async with self.client.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                job.updated_at = now
+                pipe.set(self.JOB_KEY.format(job.id), job.to_json(), ex=self.job_ttl)
+            pipe.lpush(self.QUEUE_KEY, *(job.id for job in jobs))
+            await pipe.execute()
+
+    async def _promote_due(self) -> None:
+        """재시도 시각이 지난 작업을 대기열로 이동 (스크립트 1회, 작업마다 한 워커만 이동)"""
+        await self._promote_script(
+            keys=[self.DELAYED_KEY, self.QUEUE_KEY], args=[time.time(), self.PROMOTE_BATCH]
+        )
+
+    async def pop(self, timeout: float) -> Optional[AnalysisJob]:
+        """대기열에서 처리 중 list로 원자적으로 이동 (ack 전에 워커가 죽어도 작업이 남음)"""
+        await self._promote_due()
+        job_id = await self.client.blmove(
+            self.QUEUE_KEY, self.processing_key, max(1, int(timeout)), "RIGHT", "LEFT"
+        )
+        if not job_id:
+            return None
+        job = await self.get(job_id)
+        if job is None:
+            # 작업 본문이 만료된 경우 처리 중 list에 남기지 않음
+            await self.client.lrem(self.processing_key, 1, job_id)
+        return job
+
+    async def ack(self, job: AnalysisJob) -> None:
+        """처리 결과를 저장한 뒤 처리 중 list에서 제거 (재시도 예약/dead-letter는 저장과 함께 제거됨)"""
+        await self.client.lrem(self.processing_key, 1, job.id)
+
+    async def heartbeat(self) -> None:
+        """워커 생존 시각 갱신 + stale_after 동안 갱신 없는 워커의 처리 중 작업 복구"""
+        now = time.time()
+        await self.client.zadd(self.WORKERS_KEY, {self.worker_id: now})
+        stale = await self.client.zrangebyscore(self.WORKERS_KEY, "-inf", now - self.stale_after)
+        for worker_id in stale:
+            requeued = await self.requeue_worker(worker_id)
+            if requeued:
+                logger.warning(f"Requeued {requeued} analysis jobs from stale worker {worker_id}")
+
+    async def requeue_worker(self, worker_id: str) -> int:
+        """워커의 처리 중 작업을 대기열 앞(다음에 꺼낼 쪽)으로 되돌림 (LMOVE라 작업마다 한 워커만 이동)"""
+        processing = self.PROCESSING_KEY.format(worker_id)
+        requeued = 0
+        while await self.client.lmove(processing, self.QUEUE_KEY, "LEFT", "RIGHT"):
+            requeued += 1
+        await self.client.zrem(self.WORKERS_KEY, worker_id)
+        return requeued
+
+    async def schedule(self, job: AnalysisJob, delay: float) -> None:
+        job.updated_at = time.time()
+        await self._schedule_script(
+            keys=[self.JOB_KEY.format(job.id), self.DELAYED_KEY, self.processing_key],
+            args=[job.to_json(), self.job_ttl, job.updated_at + delay, job.id],
+        )
+
+    async def dead_letter(self, job: AnalysisJob) -> None:
+        job.updated_at = time.time()
+        await self._dead_letter_script(
+            keys=[self.JOB_KEY.format(job.id), self.DEAD_KEY, self.processing_key],
+            args=[job.to_json(), self.job_ttl, self.max_dead_letters, job.id],
+        )
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        raw = await self.client.get(self.JOB_KEY.format(job_id))
+        return AnalysisJob.from_json(raw) if raw else None
+
+    async def dead_letters(self, limit: int) -> List[AnalysisJob]:
+        job_ids = await self.client.lrange(self.DEAD_KEY, 0, limit - 1)
+        jobs = [await self.get(job_id) for job_id in job_ids]
+        return [job for job in jobs if job]
+
+
+class AnalysisJobQueue:
+    """분석 작업 큐 + 비동기 워커 풀"""
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        backend=None,
+        workers: int = 4,
+        max_attempts: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        poll_interval: float = 1.0,
+    ):
+        self.handler = handler
+        self.backend = backend or MemoryJobBackend()
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def enqueue(self, payload: Dict[str, Any]) -> AnalysisJob:
+        """작업 등록 후 즉시 반환"""
+        job = AnalysisJob(id=str(uuid4()), payload=payload)
+        await self.backend.push(job)
+        return job
+
+    async def enqueue_many(self, payloads: List[Dict[str, Any]]) -> List[AnalysisJob]:
+        """작업 일괄 등록 (대량 입력용)"""
+        jobs = [AnalysisJob(id=str(uuid4()), payload=payload) for payload in payloads]
+        await self.backend.push_many(jobs)
+        return jobs
+
+    async def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """작업 상태 조회"""
+        return await self.backend.get(job_id)
+
+    async def dead_letters(self, limit: int = 100) -> List[AnalysisJob]:
+        """최종 실패 작업 목록 (최신순)"""
+        return await self.backend.dead_letters(limit)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[AnalysisJob]:
+        """작업 완료(성공/최종 실패)까지 대기, 시간 초과 시 현재 상태 반환"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.backend.get(job_id)
+            if job is None or job.finished or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(0.1)
+
+    def backoff_delay(self, attempts: int) -> float:
+        """지수 백오프 (1, 2, 4, ... 배, 상한 적용)"""
+        return min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+
+    async def process(self, job: AnalysisJob) -> None:
+        """작업 1건 실행 (실패 시 재시도 예약 또는 dead-letter, 결과 저장 후 ack)"""
+        if job.finished:
+            # 결과 저장 후 ack 전에 워커가 종료되어 복구된 작업은 다시 실행하지 않음
+            await self.backend.ack(job)
+            return
+        if job.status == JobStatus.RUNNING and job.attempts >= self.max_attempts:
+            # 실행 중 워커가 종료되어 복구된 작업이 시도 횟수를 모두 쓴 경우
+            job.status = JobStatus.FAILED
+            job.error = job.error or "worker lost during processing"
+            logger.error(f"Analysis job {job.id} moved to dead-letter: {job.error}")
+            await self.backend.dead_letter(job)
+            return
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        await self.backend.save(job)
+
+        try:
+            await self.handler(job.payload)
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts < self.max_attempts:
+                job.status = JobStatus.RETRYING
+                delay = self.backoff_delay(job.attempts)
+                logger.warning(
+                    f"Analysis job {job.id} failed (attempt {job.attempts}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await self.backend.schedule(job, delay)
+            else:
+                job.status = JobStatus.FAILED
+                logger.error(f"Analysis job {job.id} moved to dead-letter: {e}")
+                await self.backend.dead_letter(job)
+        else:
+            job.status = JobStatus.SUCCEEDED
+            job.error = None
+            await self.backend.save(job)
+            await self.backend.ack(job)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await self.backend.pop(self.poll_interval)
+                if job is not None:
+                    await self.process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analysis worker {index} error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self) -> None:
+        """모든 워커가 긴 작업 중이어도 생존 표시가 끊기지 않도록 별도 태스크로 실행"""
+        while True:
+            try:
+                await self.backend.heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analysis worker heartbeat error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        """워커 풀 시작"""
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        logger.info(f"Analysis job queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """워커 풀 종료 (실행 중 작업은 취소, Redis 백엔드면 ack되지 않아 이후 복구됨)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+async def run_analysis_job(payload: Dict[str, Any]) -> None:
+    """분석 작업 핸들러 (survey_response_id 기준 upsert라 재시도해도 중복 없음)"""
+    from .analysis import trigger_analysis
+
+    await trigger_analysis(**payload)
+
+
+# 싱글톤 인스턴스 (get_analysis_job_queue로 초기화)
+analysis_job_queue: Optional[AnalysisJobQueue] = None
+
+
+async def get_analysis_job_queue() -> AnalysisJobQueue:
+    """설정된 백엔드로 작업 큐 생성 (Redis 연결 실패 시 메모리 백엔드)"""
+    global analysis_job_queue
+
+    if analysis_job_queue is None:
+        backend = None
+        if settings.ANALYSIS_JOB_BACKEND == "redis":
+            client = await get_redis_client()
+            if client:
+                backend = RedisJobBackend(client, stale_after=settings.ANALYSIS_JOB_STALE_SECONDS)
+            else:
+                logger.warning("Redis unavailable; using in-process analysis job queue")
+
+        analysis_job_queue = AnalysisJobQueue(
+            run_analysis_job,
+            backend=backend,
+            workers=settings.ANALYSIS_WORKERS,
+            max_attempts=settings.ANALYSIS_JOB_MAX_ATTEMPTS,
+            backoff_base=settings.ANALYSIS_JOB_BACKOFF_SECONDS,
+        )
+
+    return analysis_job_queue
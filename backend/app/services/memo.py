@@ -0,0 +1,109 @@
+"""
+AI Leadership 4Dx - Analysis Memoization
+동일한 응답/채점 스펙/AI provider/프롬프트 버전의 분석 결과 재사용
+
+provider 미지정 요청은 라우터가 고른 provider가 응답하므로 "auto" 키를 따로 써서
+지정 요청의 키에 다른 provider 결과가 섞이지 않게 한다.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+from ..core.config import settings
+from .ai_client import PROMPT_VERSION, AIProvider
+from .scoring import get_scoring_spec
+
+logger = logging.getLogger(__name__)
+
+# 재사용 시 원본 분석에서 복사하는 컬럼
+MEMO_COLUMNS = (
+    "blake_mouton_people",
+    "blake_mouton_production",
+    "feedback_care",
+    "feedback_challenge",
+    "lmx_score",
+    "influence_machiavellianism",
+    "influence_narcissism",
+    "influence_psychopathy",
+    "leadership_style",
+    "overall_risk_level",
+    "ai_insights",
+    "content_hash",
+)
+
+
+@dataclass
+class AnalysisMemoStats:
+    """메모이제이션 적중/미적중 카운터 (프로세스 단위)"""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self) -> Dict:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+# 싱글톤 인스턴스
+memo_stats = AnalysisMemoStats()
+
+# provider 미지정 요청의 캐시/메모 키 provider
+AUTO_PROVIDER = "auto"
+
+
+def _provider_model(provider: str) -> str:
+    """provider별 설정 모델명 (모델 변경 시에도 키가 바뀌도록)"""
+    if provider == "anthropic":
+        return settings.ANTHROPIC_MODEL
+    return settings.OPENAI_MODEL
+
+
+def key_provider(ai_provider: Optional[AIProvider] = None) -> Tuple[str, str]:
+    """캐시/메모 키의 (provider, 모델) - 미지정이면 auto와 응답 가능한 모든 모델"""
+    if not ai_provider:
+        return AUTO_PROVIDER, f"{settings.OPENAI_MODEL}|{settings.ANTHROPIC_MODEL}"
+    provider = getattr(ai_provider, "value", ai_provider)  # AIProviderEnum 허용
+    return provider, _provider_model(provider)
+
+
+def analysis_content_hash(
+    responses: Dict[str, int],
+    survey_version: Optional[str] = None,
+    ai_provider: Optional[AIProvider] = None
+) -> str:
+    """응답 벡터(문항 순서 고정) + 채점 스펙 + provider/모델 + 프롬프트 버전의 정규화 해시"""
+    spec = get_scoring_spec(survey_version)
+    provider, model = key_provider(ai_provider)
+
+    canonical = json.dumps(
+        {
+            "survey_version": spec.version,
+            "responses": [responses.get(q) for q in spec.question_ids],
+            "ai_provider": provider,
+            "ai_model": model,
+            "prompt_version": PROMPT_VERSION,
+        },
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def find_memoized_analysis(db, content_hash: str) -> Optional[Dict]:
+    """동일 해시로 저장된 분석 1건 조회 (조회 실패 시 미적중으로 처리)"""
+    try:
+        result = await db.table("leadership_analysis") \
+            .select("user_id,survey_response_id," + ",".join(MEMO_COLUMNS)) \
+            .eq("content_hash", content_hash) \
+            .limit(1) \
+            .execute()
+    except Exception as e:
+        logger.warning(f"Analysis memo lookup failed: {str(e)}")
+        return None
+    return result.data[0] if result.data else None
+
@@ -0,0 +1,392 @@
+"""
+AI Leadership 4Dx - Analysis Repository
+핫 쿼리(최신 분석, 분석 이력, 사용자별 설문 응답, 분석 저장)와 대량 입력 데이터 접근 계층
+
+기본은 Supabase REST, DB_BACKEND="postgres"이면 asyncpg 풀의 prepared statement로 직접 조회한다.
+Postgres 연결 오류 시 같은 요청을 REST로 다시 처리한다.
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID, uuid4
+
+import asyncpg
+from postgrest.types import ReturnMethod
+
+from ..core.config import settings
+from ..core.database import get_async_service_supabase
+from ..core.postgres import get_pg_pool
+
+logger = logging.getLogger(__name__)
+
+# 라우터 응답에 필요한 컬럼만 조회 (select("*") 대신)
+ANALYSIS_COLUMNS = (
+    "id", "user_id", "survey_response_id",
+    "blake_mouton_people", "blake_mouton_production",
+    "feedback_care", "feedback_challenge", "lmx_score",
+    "influence_machiavellianism", "influence_narcissism", "influence_psychopathy",
+    "leadership_style", "overall_risk_level", "ai_insights",
+    "created_at", "updated_at",
+)
+SURVEY_RESPONSE_COLUMNS = (
+    "id", "user_id", "responses", "survey_version", "completion_time_seconds", "created_at",
+)
+
+# 분석 저장 컬럼 (build_analysis_record/build_memoized_record 공통)
+ANALYSIS_WRITE_COLUMNS = (
+    "user_id",
+    "blake_mouton_people", "blake_mouton_production",
+    "feedback_care", "feedback_challenge", "lmx_score",
+    "influence_machiavellianism", "influence_narcissism", "influence_psychopathy",
+    "leadership_style", "overall_risk_level", "ai_insights", "content_hash",
+)
+
+# 대량 입력 사용자 프로필 컬럼 (이메일 기준 확인/생성)
+USER_PROFILE_COLUMNS = ("email", "name", "organization", "department", "position")
+# REST in_ 필터 URL 길이 제한을 고려한 이메일 조회 단위
+USER_LOOKUP_CHUNK = 200
+
+# 연결 계층 오류만 REST로 대체 (제약 위반 등 SQL 오류는 그대로 전파)
+FALLBACK_ERRORS = (
+    OSError,
+    TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+    asyncpg.CannotConnectNowError,
+)
+
+LATEST_ANALYSIS_SQL = f"""
+SELECT {", ".join(ANALYSIS_COLUMNS)}
+FROM leadership_analysis
+WHERE user_id = $1::uuid
+ORDER BY created_at DESC
+LIMIT 1
+"""
+
+ANALYSIS_HISTORY_SQL = f"""
+SELECT {", ".join(ANALYSIS_COLUMNS)}
+FROM leadership_analysis
+WHERE user_id = $1::uuid
+ORDER BY created_at DESC
+LIMIT $2
+"""
+
+SURVEY_RESPONSES_SQL = f"""
+SELECT {", ".join(SURVEY_RESPONSE_COLUMNS)}
+FROM survey_responses
+WHERE user_id = $1::uuid
+ORDER BY created_at
+"""
+
+LATEST_SURVEY_RESPONSE_SQL = f"""
+SELECT {", ".join(SURVEY_RESPONSE_COLUMNS)}
+FROM survey_responses
+WHERE user_id = $1::uuid
+ORDER BY created_at DESC
+LIMIT 1
+"""
+
+UPSERT_ANALYSIS_SQL = f"""
+INSERT INTO leadership_analysis (survey_response_id, {", ".join(ANALYSIS_WRITE_COLUMNS)})
+VALUES ({", ".join(f"${i}" for i in range(1, len(ANALYSIS_WRITE_COLUMNS) + 2))})
+ON CONFLICT (survey_response_id) DO UPDATE SET
+{", ".join(f"{column} = EXCLUDED.{column}" for column in ANALYSIS_WRITE_COLUMNS)}
+"""
+
+INSERT_ANALYSIS_SQL = f"""
+INSERT INTO leadership_analysis (id, {", ".join(ANALYSIS_WRITE_COLUMNS)})
+VALUES ({", ".join(f"${i}" for i in range(1, len(ANALYSIS_WRITE_COLUMNS) + 2))})
+"""
+
+# 이메일 기준 사용자 일괄 확인/생성 (같은 문장 안의 조회는 삽입 전 스냅샷이라 기존 사용자만 반환)
+ENSURE_USERS_SQL = f"""
+WITH input AS (
+    SELECT DISTINCT ON (email) *
+    FROM unnest({", ".join(f"${i}::text[]" for i in range(1, len(USER_PROFILE_COLUMNS) + 1))})
+        AS t({", ".join(USER_PROFILE_COLUMNS)})
+),
+inserted AS (
+    INSERT INTO users (id, {", ".join(USER_PROFILE_COLUMNS)}, role)
+    SELECT gen_random_uuid(), {", ".join(USER_PROFILE_COLUMNS)}, 'user'
+    FROM input
+    ON CONFLICT (email) DO NOTHING
+    RETURNING id, email
+)
+SELECT id, email FROM inserted
+UNION ALL
+SELECT u.id, u.email FROM users u JOIN input i ON u.email = i.email
+"""
+
+FIND_USER_IDS_SQL = """
+SELECT id, email FROM users WHERE email = ANY($1::text[])
+"""
+
+EXISTING_USER_IDS_SQL = """
+SELECT id FROM users WHERE id = ANY($1::uuid[])
+"""
+
+INSERT_SURVEY_RESPONSES_SQL = """
+INSERT INTO survey_responses (id, user_id, responses, survey_version, completion_time_seconds, device_info)
+SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::jsonb[], $4::text[], $5::int[], $6::jsonb[])
+"""
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def record_to_dict(record: asyncpg.Record) -> Dict[str, Any]:
+    """asyncpg 행을 PostgREST 응답과 같은 형태로 변환 (UUID/시각 문자열, DECIMAL float)"""
+    return {key: _to_json_value(value) for key, value in record.items()}
+
+
+class RestAnalysisRepository:
+    """Supabase REST(PostgREST) 구현"""
+
+    def __init__(self, db=None):
+        self._db = db
+
+    async def _get_db(self):
+        if self._db is None:
+            self._db = await get_async_service_supabase()
+        return self._db
+
+    async def latest_analysis(self, user_id: str) -> Optional[Dict]:
+        """사용자 최신 분석 1건"""
+        rows = await RestAnalysisRepository.analysis_history(self, user_id, 1)
+        return rows[0] if rows else None
+
+    async def analysis_history(self, user_id: str, limit: int) -> List[Dict]:
+        """사용자 분석 이력 (최신순)"""
+        db = await self._get_db()
+        result = await db.table("leadership_analysis") \
+            .select(",".join(ANALYSIS_COLUMNS)) \
+            .eq("user_id", user_id) \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute()
+        return result.data or []
+
+    async def survey_responses(self, user_id: str) -> List[Dict]:
+        """사용자 설문 응답 목록 (제출순)"""
+        db = await self._get_db()
+        result = await db.table("survey_responses") \
+            .select(",".join(SURVEY_RESPONSE_COLUMNS)) \
+            .eq("user_id", user_id) \
+            .order("created_at") \
+            .execute()
+        return result.data or []
+
+    async def latest_survey_response(self, user_id: str) -> Optional[Dict]:
+        """사용자 최신 설문 응답 1건"""
+        db = await self._get_db()
+        result = await db.table("survey_responses") \
+            .select(",".join(SURVEY_RESPONSE_COLUMNS)) \
+            .eq("user_id", user_id) \
+            .order("created_at", desc=True) \
+            .limit(1) \
+            .execute()
+        return result.data[0] if result.data else None
+
+    async def save_analyses(self, records: List[Dict]) -> None:
+        """분석 레코드 저장 (응답 ID가 있으면 upsert, 없으면 insert)"""
+        linked = [r for r in records if r.get("survey_response_id")]
+        unlinked = [r for r in records if not r.get("survey_response_id")]
+
+        db = await self._get_db()
+        table = db.table("leadership_analysis")
+        if linked:
+            await table.upsert(linked, on_conflict="survey_response_id").execute()
+        if unlinked:
+            await table.insert(unlinked).execute()
+
+    async def find_user_ids(self, emails: List[str]) -> Dict[str, str]:
+        """이메일로 사용자 ID 조회 (없는 이메일은 결과에 없음)"""
+        db = await self._get_db()
+        user_ids: Dict[str, str] = {}
+        for start in range(0, len(emails), USER_LOOKUP_CHUNK):
+            result = await db.table("users") \
+                .select("id,email") \
+                .in_("email", emails[start:start + USER_LOOKUP_CHUNK]) \
+                .execute()
+            user_ids.update({row["email"]: row["id"] for row in result.data or []})
+        return user_ids
+
+    async def existing_user_ids(self, user_ids: List[str]) -> Set[str]:
+        """존재하는 사용자 ID만 반환"""
+        db = await self._get_db()
+        existing: Set[str] = set()
+        for start in range(0, len(user_ids), USER_LOOKUP_CHUNK):
+            result = await db.table("users") \
+                .select("id") \
+                .in_("id", user_ids[start:start + USER_LOOKUP_CHUNK]) \
+                .execute()
+            existing.update(row["id"] for row in result.data or [])
+        return existing
+
+    async def create_users(self, users: List[Dict]) -> Dict[str, str]:
+        """사용자 일괄 생성 (이미 있는 이메일은 기존 ID, 동시 생성과 겹쳐도 중복 없음)"""
+        db = await self._get_db()
+        profiles = {user["email"]: user for user in reversed(users)}
+        rows = [
+            {"id": str(uuid4()), **{c: profile.get(c) for c in USER_PROFILE_COLUMNS}, "role": "user"}
+            for profile in profiles.values()
+        ]
+        # 이미 있는 이메일은 ON CONFLICT DO NOTHING으로 건너뛰고 다시 조회
+        result = await db.table("users") \
+            .upsert(rows, on_conflict="email", ignore_duplicates=True) \
+            .execute()
+        user_ids = {row["email"]: row["id"] for row in result.data or []}
+        existing = [email for email in profiles if email not in user_ids]
+        if existing:
+            user_ids.update(await RestAnalysisRepository.find_user_ids(self, existing))
+        return user_ids
+
+    async def ensure_users(self, users: List[Dict]) -> Dict[str, str]:
+        """이메일 기준 사용자 일괄 확인/생성 (이메일 -> 사용자 ID)"""
+        user_ids = await RestAnalysisRepository.find_user_ids(self, [u["email"] for u in users])
+        missing = [user for user in users if user["email"] not in user_ids]
+        if missing:
+            user_ids.update(await RestAnalysisRepository.create_users(self, missing))
+        return user_ids
+
+    async def insert_survey_responses(self, rows: List[Dict]) -> None:
+        """설문 응답 다건 insert (한 요청)"""
+        db = await self._get_db()
+        await db.table("survey_responses") \
+            .insert(rows, returning=ReturnMethod.minimal) \
+            .execute()
+
+
+class PostgresAnalysisRepository(RestAnalysisRepository):
+    """asyncpg 직접 연결 구현 (연결별 prepared statement 캐시 재사용)"""
+
+    def __init__(self, pool: asyncpg.Pool, db=None):
+        super().__init__(db)
+        self.pool = pool
+
+    async def _fetch(self, sql: str, *args: Any) -> List[Dict]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(sql, *args)
+        return [record_to_dict(row) for row in rows]
+
+    async def latest_analysis(self, user_id: str) -> Optional[Dict]:
+        try:
+            rows = await self._fetch(LATEST_ANALYSIS_SQL, user_id)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().latest_analysis(user_id)
+        return rows[0] if rows else None
+
+    async def analysis_history(self, user_id: str, limit: int) -> List[Dict]:
+        try:
+            return await self._fetch(ANALYSIS_HISTORY_SQL, user_id, limit)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().analysis_history(user_id, limit)
+
+    async def survey_responses(self, user_id: str) -> List[Dict]:
+        try:
+            return await self._fetch(SURVEY_RESPONSES_SQL, user_id)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().survey_responses(user_id)
+
+    async def latest_survey_response(self, user_id: str) -> Optional[Dict]:
+        try:
+            rows = await self._fetch(LATEST_SURVEY_RESPONSE_SQL, user_id)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().latest_survey_response(user_id)
+        return rows[0] if rows else None
+
+    async def save_analyses(self, records: List[Dict]) -> None:
+        linked = [
+            (r["survey_response_id"], *(r.get(c) for c in ANALYSIS_WRITE_COLUMNS))
+            for r in records if r.get("survey_response_id")
+        ]
+        unlinked = [
+            (r["id"], *(r.get(c) for c in ANALYSIS_WRITE_COLUMNS))
+            for r in records if not r.get("survey_response_id")
+        ]
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    if linked:
+                        await conn.executemany(UPSERT_ANALYSIS_SQL, linked)
+                    if unlinked:
+                        await conn.executemany(INSERT_ANALYSIS_SQL, unlinked)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres write failed, using REST: {str(e)}")
+            await super().save_analyses(records)
+
+    async def find_user_ids(self, emails: List[str]) -> Dict[str, str]:
+        try:
+            rows = await self._fetch(FIND_USER_IDS_SQL, emails)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().find_user_ids(emails)
+        return {row["email"]: row["id"] for row in rows}
+
+    async def existing_user_ids(self, user_ids: List[str]) -> Set[str]:
+        try:
+            rows = await self._fetch(EXISTING_USER_IDS_SQL, user_ids)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres read failed, using REST: {str(e)}")
+            return await super().existing_user_ids(user_ids)
+        return {row["id"] for row in rows}
+
+    async def ensure_users(self, users: List[Dict]) -> Dict[str, str]:
+        # 배치 안 중복 이메일은 먼저 나온 프로필 사용
+        profiles = {user["email"]: user for user in reversed(users)}
+        columns = [[p.get(c) for p in profiles.values()] for c in USER_PROFILE_COLUMNS]
+        try:
+            rows = await self._fetch(ENSURE_USERS_SQL, *columns)
+            user_ids = {row["email"]: row["id"] for row in rows}
+            # 동시 트랜잭션이 먼저 넣은 이메일은 이 문장의 스냅샷에 보이지 않으므로 다시 조회
+            raced = [email for email in profiles if email not in user_ids]
+            if raced:
+                user_ids.update({
+                    row["email"]: row["id"] for row in await self._fetch(FIND_USER_IDS_SQL, raced)
+                })
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres write failed, using REST: {str(e)}")
+            return await super().ensure_users(users)
+        return user_ids
+
+    async def create_users(self, users: List[Dict]) -> Dict[str, str]:
+        # 조회/생성을 한 문장으로 처리
+        return await self.ensure_users(users)
+
+    async def insert_survey_responses(self, rows: List[Dict]) -> None:
+        columns = (
+            [r["id"] for r in rows],
+            [r["user_id"] for r in rows],
+            [r["responses"] for r in rows],
+            [r["survey_version"] for r in rows],
+            [r["completion_time_seconds"] for r in rows],
+            [r.get("device_info") for r in rows],
+        )
+        try:
+            async with self.pool.acquire() as conn:
+                await conn.execute(INSERT_SURVEY_RESPONSES_SQL, *columns)
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Postgres write failed, using REST: {str(e)}")
+            await super().insert_survey_responses(rows)
+
+
+async def get_analysis_repository(db=None) -> RestAnalysisRepository:
+    """설정된 백엔드의 저장소 반환 (Postgres 풀을 쓸 수 없으면 REST)"""
+    if settings.DB_BACKEND == "postgres":
+        pool = await get_pg_pool()
+        if pool is not None:
+            return PostgresAnalysisRepository(pool, db)
+    return RestAnalysisRepository(db)
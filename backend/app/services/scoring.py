@@ -0,0 +1,238 @@
+"""
+AI Leadership 4Dx - Scoring Kernel
+설문 버전별 채점 스펙 레지스트리와 응답 행렬 기반 리더십 차원 점수 일괄 계산
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# 차원 순서 (LeadershipDimensions 필드명과 동일)
+DIMENSION_NAMES: Tuple[str, ...] = (
+    "people",
+    "production",
+    "care",
+    "challenge",
+    "lmx_score",
+    "machiavellianism",
+    "narcissism",
+    "psychopathy",
+)
+
+# 기본 설문 버전 (survey_responses.survey_version 기본값)
+DEFAULT_SURVEY_VERSION = "1.0"
+
+
+@dataclass(frozen=True)
+class ScoringSpec:
+    """설문 버전별 채점 스펙 (생성 시 인덱스 배열로 컴파일)"""
+
+    version: str
+    question_ids: Tuple[str, ...]
+    dimension_questions: Mapping[str, Sequence[str]]
+    default_values: Mapping[str, float]  # 문항 ID 접두사 -> 미응답 기본값
+    reverse_keyed: FrozenSet[str] = frozenset()
+    rescaled_dimensions: FrozenSet[str] = frozenset()
+    scale_min: int = 1
+    scale_max: int = 7
+    rescale_max: int = 5
+
+    # 컴파일 결과
+    question_index: Dict[str, int] = field(init=False, repr=False)
+    defaults: np.ndarray = field(init=False, repr=False)
+    membership: np.ndarray = field(init=False, repr=False)
+    counts: np.ndarray = field(init=False, repr=False)
+    reverse_mask: np.ndarray = field(init=False, repr=False)
+    rescale_mask: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        question_index = {q: i for i, q in enumerate(self.question_ids)}
+
+        missing = set(DIMENSION_NAMES) - set(self.dimension_questions)
+        if missing:
+            raise ValueError(
+                f"Scoring spec {self.version} missing dimensions: {sorted(missing)}"
+            )
+
+        # 문항 x 차원 소속 행렬
+        membership = np.zeros((len(self.question_ids), len(DIMENSION_NAMES)))
+        for col, dimension in enumerate(DIMENSION_NAMES):
+            for question in self.dimension_questions[dimension]:
+                if question not in question_index:
+                    raise ValueError(
+                        f"Scoring spec {self.version} references unknown "
+                        f"question: {question}"
+                    )
+                membership[question_index[question], col] = 1.0
+
+        defaults = np.array(
+            [self._default_for(q) for q in self.question_ids], dtype=float
+        )
+
+        object.__setattr__(self, "question_index", question_index)
+        object.__setattr__(self, "defaults", defaults)
+        object.__setattr__(self, "membership", membership)
+        object.__setattr__(self, "counts", membership.sum(axis=0))
+        object.__setattr__(
+            self,
+            "reverse_mask",
+            np.array([q in self.reverse_keyed for q in self.question_ids]),
+        )
+        object.__setattr__(
+            self,
+            "rescale_mask",
+            np.array([d in self.rescaled_dimensions for d in DIMENSION_NAMES]),
+        )
+
+    def _default_for(self, question: str) -> float:
+        """가장 긴 접두사가 일치하는 기본값 반환"""
+        for prefix in sorted(self.default_values, key=len, reverse=True):
+            if question.startswith(prefix):
+                return float(self.default_values[prefix])
+        raise ValueError(
+            f"Scoring spec {self.version} has no default for question: {question}"
+        )
+
+    @property
+    def question_count(self) -> int:
+        return len(self.question_ids)
+
+    def to_matrix(self, responses: Sequence[Mapping[str, int]]) -> np.ndarray:
+        """응답 dict 목록을 N x 문항수 행렬로 변환 (미응답은 NaN)"""
+        if not responses:
+            return np.empty((0, self.question_count))
+        # None 값도 dtype=float 변환 시 NaN으로 처리됨
+        return np.array(
+            [
+                [response.get(q, np.nan) for q in self.question_ids]
+                for response in responses
+            ],
+            dtype=float,
+        )
+
+    def score(self, matrix: np.ndarray, decimals: int = 2) -> np.ndarray:
+        """응답 행렬 (N x 문항수) -> 차원 점수 행렬 (N x 8)"""
+        if matrix.ndim != 2 or matrix.shape[1] != self.question_count:
+            raise ValueError(
+                f"Response matrix must have shape (N, {self.question_count}), "
+                f"got {matrix.shape}"
+            )
+
+        # 역채점 문항 변환 (응답한 값에만 적용)
+        if self.reverse_mask.any():
+            matrix = np.where(
+                self.reverse_mask, self.scale_min + self.scale_max - matrix, matrix
+            )
+
+        # 미응답 기본값 채우기
+        filled = np.where(np.isnan(matrix), self.defaults, matrix)
+
+        # 합계 / 문항 수 = 평균 (np.mean과 동일한 연산 순서 유지)
+        scores = (filled @ self.membership) / self.counts
+
+        # 척도 변환 (예: 1-7 -> 1-5)
+        if self.rescale_mask.any():
+            scores[:, self.rescale_mask] = (
+                scores[:, self.rescale_mask] * self.rescale_max / self.scale_max
+            )
+
+        return np.round(scores, decimals)
+
+
+# 버전 1.0 문항 구성
+_V1_DIMENSION_QUESTIONS: Dict[str, List[str]] = {
+    # Blake & Mouton
+    "people": ["bm_1", "bm_3", "bm_5", "bm_7", "bm_9", "bm_11", "bm_13"],
+    "production": ["bm_2", "bm_4", "bm_6", "bm_8", "bm_10", "bm_12", "bm_14"],
+    # Radical Candor
+    "care": ["rc_1", "rc_3", "rc_5", "rc_7", "rc_9"],
+    "challenge": ["rc_2", "rc_4", "rc_6", "rc_8", "rc_10"],
+    # LMX
+    "lmx_score": [f"lmx_{i}" for i in range(1, 11)],
+    # Influence Gauge (숨겨진 차원)
+    "machiavellianism": ["ig_1", "ig_4", "ig_7"],
+    "narcissism": ["ig_2", "ig_5", "ig_8"],
+    "psychopathy": ["ig_3", "ig_6", "ig_9"],
+}
+
+SCORING_SPEC_V1 = ScoringSpec(
+    version=DEFAULT_SURVEY_VERSION,
+    question_ids=(
+        tuple(f"bm_{i}" for i in range(1, 15))
+        + tuple(f"rc_{i}" for i in range(1, 11))
+        + tuple(f"lmx_{i}" for i in range(1, 11))
+        + tuple(f"ig_{i}" for i in range(1, 10))
+    ),
+    dimension_questions=_V1_DIMENSION_QUESTIONS,
+    # 미응답 기본값 (Influence Gauge는 3, 나머지는 4)
+    default_values={"bm_": 4, "rc_": 4, "lmx_": 4, "ig_": 3},
+    rescaled_dimensions=frozenset({"machiavellianism", "narcissism", "psychopathy"}),
+)
+
+
+# 버전 -> 컴파일된 스펙 (프로세스 내 캐시)
+_registry: Dict[str, ScoringSpec] = {}
+
+
+def register_scoring_spec(spec: ScoringSpec, *aliases: str) -> None:
+    """채점 스펙 등록"""
+    for version in (spec.version, *aliases):
+        _registry[version] = spec
+
+
+def get_scoring_spec(version: Optional[str] = None) -> ScoringSpec:
+    """설문 버전에 해당하는 컴파일된 채점 스펙 조회"""
+    spec = _registry.get(version or DEFAULT_SURVEY_VERSION)
+    if spec is None:
+        raise ValueError(f"Unknown survey version: {version}")
+    return spec
+
+
+def get_registered_versions() -> List[str]:
+    """등록된 설문 버전 목록"""
+    return sorted(_registry)
+
+
+# SQLAlchemy 모델 기본값 "1.0.0"도 동일 스펙으로 처리
+register_scoring_spec(SCORING_SPEC_V1, "1.0.0")
+
+# 하위 호환용 (버전 1.0 기준)
+QUESTION_IDS = SCORING_SPEC_V1.question_ids
+QUESTION_INDEX = SCORING_SPEC_V1.question_index
+
+
+def responses_to_matrix(
+    responses: Sequence[Mapping[str, int]],
+    survey_version: Optional[str] = None,
+) -> np.ndarray:
+    """응답 dict 목록을 N x 문항수 행렬로 변환 (미응답은 NaN)"""
+    return get_scoring_spec(survey_version).to_matrix(responses)
+
+
+def calculate_dimensions_batch(
+    responses: Union[np.ndarray, Sequence[Mapping[str, int]]],
+    survey_version: Optional[str] = None,
+    decimals: int = 2,
+) -> Dict[str, np.ndarray]:
+    """
+    N명의 설문 응답으로부터 8개 차원 점수를 한 번에 계산
+
+    Args:
+        responses: N x 문항수 응답 행렬 (열 순서는 스펙의 question_ids,
+            미응답은 NaN) 또는 문항 ID -> 응답값 dict 목록
+        survey_version: 설문 버전 (없으면 기본 버전)
+        decimals: 반올림 자릿수
+
+    Returns:
+        차원명 -> 길이 N 배열
+    """
+    spec = get_scoring_spec(survey_version)
+
+    if isinstance(responses, np.ndarray):
+        matrix = responses.astype(float)
+    else:
+        matrix = spec.to_matrix(responses)
+
+    scores = spec.score(matrix, decimals)
+
+    return {name: scores[:, col] for col, name in enumerate(DIMENSION_NAMES)}
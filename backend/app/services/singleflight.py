@@ -0,0 +1,132 @@
+"""
+AI Leadership 4Dx - Singleflight
+같은 키의 동시 요청을 하나의 실행으로 합침 (프로세스 내 공유 future + 선택적 Redis 락)
+
+Redis 락은 워커 간 중복 실행만 막는다. 락을 기다린 워커는 락 해제 후 직접 실행하므로
+실행 함수는 캐시/메모이제이션을 먼저 확인하도록 구성해야 한다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict
+from uuid import uuid4
+
+from ..core.config import settings
+from ..core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# 락 소유자만 해제 (compare-and-delete)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlightStats:
+    """실행/공유 횟수 (프로세스 단위)"""
+    executions: int = 0
+    shared: int = 0
+    lock_waits: int = 0
+
+    def snapshot(self) -> Dict:
+        return asdict(self)
+
+
+class SingleFlight:
+    """키별 진행 중 실행 중복 제거"""
+
+    def __init__(
+        self,
+        namespace: str,
+        use_redis: bool = False,
+        lock_ttl: float = 120.0,
+        poll_interval: float = 0.1,
+    ):
+        self.namespace = namespace
+        self.use_redis = use_redis
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.stats = SingleFlightStats()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """진행 중인 같은 키 실행이 있으면 그 결과를 함께 기다림"""
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._run(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats.shared += 1
+
+        # 한 호출자가 취소되어도 공유 실행은 계속
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        client = await get_redis_client() if self.use_redis else None
+        if client is None:
+            self.stats.executions += 1
+            return await fn()
+
+        lock_key = f"singleflight:{self.namespace}:{key}"
+        token = uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+        waited = False
+
+        while True:
+            try:
+                acquired = await client.set(
+                    lock_key, token, nx=True, px=int(self.lock_ttl * 1000)
+                )
+            except Exception as e:
+                logger.warning(f"Singleflight lock unavailable, running locally: {str(e)}")
+                acquired = None
+                deadline = 0
+
+            if acquired or time.monotonic() >= deadline:
+                break
+            if not waited:
+                self.stats.lock_waits += 1
+                waited = True
+            await asyncio.sleep(self.poll_interval)
+
+        self.stats.executions += 1
+        try:
+            return await fn()
+        finally:
+            if acquired:
+                try:
+                    await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Singleflight lock release failed: {str(e)}")
+
+
+# 싱글톤 인스턴스
+analysis_flight = SingleFlight(
+    "analysis",
+    use_redis=settings.SINGLEFLIGHT_REDIS_LOCK,
+    lock_ttl=settings.SINGLEFLIGHT_LOCK_TTL,
+)
+insight_flight = SingleFlight(
+    "insight",
+    use_redis=settings.SINGLEFLIGHT_REDIS_LOCK,
+    lock_ttl=settings.SINGLEFLIGHT_LOCK_TTL,
+)
+user_flight = SingleFlight(
+    "user",
+    use_redis=settings.SINGLEFLIGHT_REDIS_LOCK,
+    lock_ttl=settings.SINGLEFLIGHT_LOCK_TTL,
+)
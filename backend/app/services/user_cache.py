@@ -0,0 +1,184 @@
+"""
+AI Leadership 4Dx - User Resolution Cache
+설문 제출 이메일 -> 사용자 ID 캐시 (프로세스 내 LRU -> Redis 2단계)
+
+DB에 없는 이메일은 짧게 부정 캐시해 생성 전 조회를 건너뛴다. 생성은 이메일 기준
+upsert (ON CONFLICT DO NOTHING 후 재조회)라 동시 첫 제출에도 사용자가 중복되지 않는다.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.redis_client import cache_delete, cache_get, cache_set
+from .singleflight import SingleFlight, user_flight
+
+logger = logging.getLogger(__name__)
+
+# 부정 캐시 값 (DB에 없는 이메일)
+MISSING = ""
+
+
+@dataclass
+class UserCacheStats:
+    """캐시 통계 (프로세스 단위)"""
+    local_hits: int = 0
+    redis_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    lookups: int = 0
+    creates: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.negative_hits + self.misses
+        return hits / total if total else 0.0
+
+    def snapshot(self) -> Dict:
+        data = asdict(self)
+        data["hit_ratio"] = round(self.hit_ratio, 4)
+        return data
+
+
+class UserResolutionCache:
+    """이메일 -> 사용자 ID 2단계 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        local_ttl: int = 300,
+        redis_ttl: int = 86400,
+        negative_ttl: int = 60,
+        use_redis: bool = True,
+        flight: Optional[SingleFlight] = None,
+    ):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.negative_ttl = negative_ttl
+        self.use_redis = use_redis
+        self.flight = flight
+        self.stats = UserCacheStats()
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def key(self, email: str) -> str:
+        """이메일 해시 키 (Redis에 이메일 원문을 남기지 않음)"""
+        return "user_email:" + hashlib.sha256(email.encode("utf-8")).hexdigest()
+
+    def _get_local(self, key: str) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str, ttl: float) -> None:
+        self._local[key] = (time.monotonic() + ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _lookup(self, key: str) -> Tuple[Optional[str], str]:
+        """LRU -> Redis 순서로 조회 (Redis 적중 시 LRU 채움), (값, 단계) 반환"""
+        value = self._get_local(key)
+        if value is not None:
+            return value, "local"
+        if self.use_redis:
+            value = await cache_get(key)
+            if value is not None:
+                self._set_local(key, value, self.local_ttl if value else self.negative_ttl)
+                return value, "redis"
+        return None, ""
+
+    async def get(self, email: str) -> Optional[str]:
+        """사용자 ID 조회 (미적중 None, 부정 캐시 적중 MISSING)"""
+        value, tier = await self._lookup(self.key(email))
+        if value is None:
+            self.stats.misses += 1
+        elif value == MISSING:
+            self.stats.negative_hits += 1
+        elif tier == "local":
+            self.stats.local_hits += 1
+        else:
+            self.stats.redis_hits += 1
+        return value
+
+    async def set(self, email: str, user_id: str) -> None:
+        key = self.key(email)
+        self._set_local(key, user_id, self.local_ttl)
+        if self.use_redis:
+            await cache_set(key, user_id, self.redis_ttl)
+
+    async def set_missing(self, email: str) -> None:
+        """DB에 없는 이메일 부정 캐시"""
+        key = self.key(email)
+        self._set_local(key, MISSING, self.negative_ttl)
+        if self.use_redis:
+            await cache_set(key, MISSING, self.negative_ttl)
+
+    async def invalidate(self, email: str) -> None:
+        """가입/사용자 변경 시 항목 제거"""
+        key = self.key(email)
+        self._local.pop(key, None)
+        self.stats.invalidations += 1
+        if self.use_redis:
+            await cache_delete(key)
+
+    async def resolve(self, email: str, profile: Dict, repository) -> str:
+        """이메일의 사용자 ID 반환 (없으면 profile로 생성)
+
+        캐시 적중 시 DB 조회 없음. 같은 이메일의 동시 미적중은 singleflight로 한 번만 처리한다.
+        """
+        cached = await self.get(email)
+        if cached:
+            return cached
+
+        async def load() -> str:
+            # 함께 기다린 요청이 이미 채웠을 수 있으므로 다시 확인
+            value, _ = await self._lookup(self.key(email))
+            if value:
+                return value
+            if value is None:
+                self.stats.lookups += 1
+                user_id = (await repository.find_user_ids([email])).get(email)
+                if user_id:
+                    await self.set(email, user_id)
+                    return user_id
+                await self.set_missing(email)
+
+            self.stats.creates += 1
+            user_id = (await repository.create_users([{**profile, "email": email}])).get(email)
+            if not user_id:
+                raise ValueError(f"User not resolved for {email}")
+            await self.set(email, user_id)
+            return user_id
+
+        if self.flight is None:
+            return await load()
+        return await self.flight.do(self.key(email), load)
+
+    def clear(self) -> None:
+        """프로세스 내 캐시/통계 초기화"""
+        self._local.clear()
+        self.stats = UserCacheStats()
+
+
+# 싱글톤 인스턴스 (Redis 단계는 REDIS_URL 설정 시에만 사용)
+user_cache = UserResolutionCache(
+    max_entries=settings.USER_CACHE_LOCAL_SIZE,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+    redis_ttl=settings.USER_CACHE_TTL,
+    negative_ttl=settings.USER_CACHE_NEGATIVE_TTL,
+    use_redis=bool(settings.REDIS_URL),
+    flight=user_flight,
+)
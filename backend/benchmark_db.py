@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+AI Leadership 4Dx - DB 동시 처리량 벤치마크
+고정 지연 PostgREST 대역 서버를 띄우고 동기 클라이언트(기존 라우터 방식)와
+비동기 클라이언트(현재 라우터) 동시 처리량 비교
+
+사용법: python benchmark_db.py [--requests 400] [--concurrency 50] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+PORT = free_port()
+os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{PORT}"
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.api import analysis  # noqa: E402
+from app.core.database import async_supabase_client, get_service_supabase  # noqa: E402
+
+ANALYSIS_ROW = {
+    "id": "00000000-0000-0000-0000-000000000001",
+    "user_id": "bench-user",
+    "blake_mouton_people": 5.2,
+    "blake_mouton_production": 4.8,
+    "feedback_care": 5.5,
+    "feedback_challenge": 4.1,
+    "lmx_score": 5.0,
+    "influence_machiavellianism": 2.5,
+    "influence_narcissism": 2.2,
+    "influence_psychopathy": 1.9,
+    "leadership_style": "Middle-of-the-Road",
+    "overall_risk_level": "low",
+    "ai_insights": {"strengths": ["s"], "weaknesses": [], "improvements": ["i"]},
+    "created_at": "2025-10-18T00:00:00+00:00",
+    "updated_at": "2025-10-18T00:00:00+00:00",
+}
+
+
+def create_fake_postgrest(latency: float) -> FastAPI:
+    """모든 조회에 고정 지연 후 분석 행 1건을 돌려주는 PostgREST 대역"""
+    fake = FastAPI()
+
+    @fake.get("/rest/v1/{table}")
+    async def select(table: str):
+        await asyncio.sleep(latency)
+        return [ANALYSIS_ROW]
+
+    return fake
+
+
+def create_bench_app() -> FastAPI:
+    bench = FastAPI()
+
+    @bench.get("/before/user/{user_id}")
+    async def get_user_analysis_blocking(user_id: str):
+        """기존 방식: async 핸들러 안에서 동기 클라이언트 호출"""
+        db = get_service_supabase()
+        result = db.table("leadership_analysis") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .order("created_at", desc=True) \
+            .limit(1) \
+            .execute()
+        return result.data[0]
+
+    # 현재 방식: 비동기 클라이언트로 이전된 실제 라우터
+    bench.include_router(analysis.router, prefix="/after")
+    return bench
+
+
+def serve_fake_postgrest(latency: float) -> None:
+    uvicorn.run(
+        create_fake_postgrest(latency),
+        host="127.0.0.1", port=PORT, log_level="warning", lifespan="off"
+    )
+
+
+def start_server(latency: float) -> multiprocessing.Process:
+    """측정 대상과 CPU를 나눠 쓰지 않도록 별도 프로세스에서 실행"""
+    process = multiprocessing.Process(target=serve_fake_postgrest, args=(latency,), daemon=True)
+    process.start()
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+
+
+async def run_load(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    await client.get(path)  # 클라이언트/커넥션 준비
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main(requests: int, concurrency: int, latency: float) -> None:
+    server = start_server(latency)
+    transport = httpx.ASGITransport(app=create_bench_app())
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(
+                f"📊 {requests} requests, concurrency {concurrency}, "
+                f"DB latency {latency * 1000:.0f}ms"
+            )
+            for label, path in (
+                ("sync client (before)", "/before/user/bench-user"),
+                ("async client (after)", "/after/user/bench-user"),
+            ):
+                result = await run_load(client, path, requests, concurrency)
+                print(
+                    f"  {label:<22} {result['rps']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:7.1f}ms  p95 {result['p95_ms']:7.1f}ms"
+                )
+    finally:
+        await async_supabase_client.close()
+        server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Router DB concurrency benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="PostgREST 응답 지연 (초)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
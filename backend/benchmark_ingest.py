@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+AI Leadership 4Dx - 대량 설문 입력 벤치마크
+SurveyBulkIngestor로 NDJSON/CSV 합성 데이터를 입력해 처리량(rows/s) 측정
+(저장소: PostgresAnalysisRepository, 분석 작업은 메모리 큐에 일괄 등록만 함)
+
+사용법: DATABASE_URL=postgresql://... python benchmark_ingest.py [--rows 20000] [--batch-size 1000]
+(신규 이메일로 사용자를 생성하므로 users 테이블에 insert 가능한 DB 필요)
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import asyncpg  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.postgres import _init_connection  # noqa: E402
+from app.services.ingest import SurveyBulkIngestor  # noqa: E402
+from app.services.jobs import AnalysisJobQueue, MemoryJobBackend  # noqa: E402
+from app.services.repository import PostgresAnalysisRepository  # noqa: E402
+from app.services.scoring import get_scoring_spec  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_rows(rows: int, users: int, run_id: str):
+    """합성 응답 (users명이 여러 번 응답)"""
+    questions = get_scoring_spec().question_ids
+    for i in range(rows):
+        yield {
+            "email": f"bulk-{run_id}-{i % users}@example.com",
+            "name": f"Bulk User {i % users}",
+            "organization": "Bench Corp",
+            "responses": {q: random.randint(1, 7) for q in questions},
+            "completion_time_seconds": 600,
+        }
+
+
+def encode(rows, fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+    questions = get_scoring_spec().question_ids
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["email", "name", "organization", "completion_time_seconds", *questions])
+    for row in rows:
+        writer.writerow([
+            row["email"], row["name"], row["organization"], row["completion_time_seconds"],
+            *(row["responses"][q] for q in questions),
+        ])
+    return out.getvalue().encode("utf-8")
+
+
+async def stream(body: bytes):
+    """요청 본문처럼 고정 크기 청크로 전달"""
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+async def noop_handler(payload):
+    return None
+
+
+async def run(fmt: str, rows: int, users: int, batch_size: int, pool) -> None:
+    run_id = f"{fmt}-{int(time.time())}"
+    body = encode(make_rows(rows, users, run_id), fmt)
+    queue = AnalysisJobQueue(noop_handler, backend=MemoryJobBackend(max_jobs=rows))
+    ingestor = SurveyBulkIngestor(
+        PostgresAnalysisRepository(pool), queue, batch_size=batch_size,
+    )
+
+    started = time.perf_counter()
+    result = await ingestor.ingest(stream(body), fmt)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"  {fmt:<7} {len(body) / 1e6:6.1f} MB  inserted {result.inserted:>6}  "
+        f"failed {result.failed:>3}  enqueued {result.analyses_enqueued:>6}  "
+        f"{elapsed:6.2f}s  {result.inserted / elapsed:8.0f} rows/s"
+    )
+
+
+async def main(args) -> None:
+    if not settings.DATABASE_URL:
+        sys.exit("DATABASE_URL is required")
+
+    pool = await asyncpg.create_pool(
+        settings.DATABASE_URL, min_size=1, max_size=2, init=_init_connection,
+    )
+    try:
+        print(f"📊 {args.rows} rows / {args.users} users, batch {args.batch_size}")
+        for fmt in ("ndjson", "csv"):
+            await run(fmt, args.rows, args.users, args.batch_size, pool)
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk survey ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+AI Leadership 4Dx - Postgres 핫 쿼리 지연 벤치마크
+분석 저장소(PostgresAnalysisRepository)의 핫 쿼리 지연을 prepared statement 캐시 사용/미사용으로 비교
+
+사용법: DATABASE_URL=postgresql://... python benchmark_postgres.py [--iterations 2000]
+(설문 응답/분석 데이터가 있는 DB 필요, 분석 저장은 기존 응답 행에 upsert)
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import asyncpg  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.postgres import _init_connection  # noqa: E402
+from app.services.repository import PostgresAnalysisRepository  # noqa: E402
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return (
+        statistics.median(samples) * 1000,
+        samples[int(len(samples) * 0.95) - 1] * 1000,
+    )
+
+
+async def measure(repository, name, call, iterations):
+    await call()  # 연결별 준비 (prepared statement 캐시 채움)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return name, summarize(samples)
+
+
+async def run_suite(statement_cache_size: int, iterations: int):
+    pool = await asyncpg.create_pool(
+        settings.DATABASE_URL,
+        min_size=1,
+        max_size=1,
+        statement_cache_size=statement_cache_size,
+        init=_init_connection,
+    )
+    repository = PostgresAnalysisRepository(pool)
+    try:
+        async with pool.acquire() as conn:
+            user_ids = [str(r["user_id"]) for r in await conn.fetch(
+                "SELECT DISTINCT user_id FROM leadership_analysis LIMIT 1000"
+            )]
+        analysis = await repository.latest_analysis(user_ids[0])
+        record = {
+            key: analysis[key]
+            for key in (
+                "user_id", "survey_response_id",
+                "blake_mouton_people", "blake_mouton_production",
+                "feedback_care", "feedback_challenge", "lmx_score",
+                "influence_machiavellianism", "influence_narcissism", "influence_psychopathy",
+                "leadership_style", "overall_risk_level", "ai_insights",
+            )
+        }
+
+        def user():
+            return random.choice(user_ids)
+
+        return [
+            await measure(repository, "latest analysis",
+                          lambda: repository.latest_analysis(user()), iterations),
+            await measure(repository, "analysis history (10)",
+                          lambda: repository.analysis_history(user(), 10), iterations),
+            await measure(repository, "survey responses",
+                          lambda: repository.survey_responses(user()), iterations),
+            await measure(repository, "latest survey response",
+                          lambda: repository.latest_survey_response(user()), iterations),
+            await measure(repository, "analysis upsert",
+                          lambda: repository.save_analyses([record]), iterations),
+        ]
+    finally:
+        await pool.close()
+
+
+async def main(iterations: int) -> None:
+    if not settings.DATABASE_URL:
+        sys.exit("DATABASE_URL is required")
+
+    print(f"📊 {iterations} sequential calls per query (p50 / p95 ms)")
+    unprepared = await run_suite(0, iterations)
+    prepared = await run_suite(100, iterations)
+    print(f"  {'query':<24} {'no stmt cache':>18} {'prepared (cached)':>20}")
+    for (name, (u50, u95)), (_, (p50, p95)) in zip(unprepared, prepared):
+        print(f"  {name:<24} {u50:8.3f} / {u95:7.3f} {p50:10.3f} / {p95:7.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Postgres hot query latency benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+AI Leadership 4Dx - 프롬프트 토큰/첫 토큰 지연 벤치마크
+이전 프롬프트(점수와 지시문이 섞인 사용자 프롬프트)와 현재 프롬프트(정적 시스템 접두부 +
+짧은 동적 접미부)를 가짜 provider에 스트리밍 호출해 입력 토큰, 캐시 적중 토큰, TTFT 비교
+
+가짜 provider (httpx MockTransport, 실제 SDK 경로 그대로 사용):
+- 토큰 수: 영단어 1개/숫자 1자/한글 1자/기호 1자/줄바꿈·들여쓰기 묶음 = 1토큰 근사 (실제 토크나이저 아님)
+- 프롬프트 캐시: OpenAI는 자동 접두부 캐시 (--cache-min-tokens 이상, 128토큰 단위),
+  Anthropic은 cache_control 지점까지의 접두부 (--cache-min-tokens 이상)
+- TTFT: 기본 지연 + 미캐시 입력 토큰당 prefill 시간 + 캐시 토큰당 1/10 시간
+
+사용법: python benchmark_prompts.py [--calls 50] [--cache-min-tokens 1024]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx  # noqa: E402
+from anthropic import AsyncAnthropic  # noqa: E402
+from openai import AsyncOpenAI  # noqa: E402
+
+from app.services.ai_client import AnthropicClient, OpenAIClient  # noqa: E402
+
+# 가짜 provider 응답 (TTFT 측정용, 내용은 파싱 형식만 맞춤)
+OPENAI_TEXT = "1. 주요 강점 (3개)\n1. 신뢰 관계\n2. 개선 영역 (3개)\n1. 위임\n3. 실행 계획\n- 1:1 미팅\n4. 6개월 후 예상 성과\n몰입도 향상"
+ANTHROPIC_TEXT = "1. **핵심 강점** (3개)\n- 공감 능력\n\n2. **잠재적 사각지대** (3개)\n- 과도한 개입\n\n4. **변혁적 성장 시나리오**\n자율적 팀 문화"
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\s+|.", re.S)
+CACHE_BLOCK = 128
+
+
+def count_tokens(text: str) -> List[str]:
+    # 단일 공백은 다음 단어에 붙고, 줄바꿈/들여쓰기 묶음은 1토큰
+    return [token for token in TOKEN_PATTERN.findall(text) if token != " "]
+
+
+def legacy_prompts(provider: str, data: Dict) -> tuple:
+    """PROMPT_VERSION 1 프롬프트 (지시문/형식이 점수 뒤에 오는 사용자 프롬프트)"""
+    if provider == "openai":
+        system_prompt = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
+        Analyze the provided leadership data and generate insights based on:
+        1. Blake & Mouton Grid (People vs Production)
+        2. Radical Candor (Care vs Challenge)
+        3. Leader-Member Exchange (LMX)
+        4. Influence patterns
+
+        Provide actionable insights in Korean."""
+        prompt = f"""다음 리더십 데이터를 분석해주세요:
+
+People 점수: {data['people']}/7
+Production 점수: {data['production']}/7
+Care 점수: {data['care']}/7
+Challenge 점수: {data['challenge']}/7
+LMX 점수: {data['lmx']}/7
+리더십 스타일: {data['style']}
+
+다음 형식으로 분석을 제공해주세요:
+1. 주요 강점 (3개)
+2. 개선 영역 (3개)
+3. 구체적인 실행 계획 (5개)
+4. 6개월 후 예상 성과"""
+        return system_prompt, prompt
+
+    system_prompt = """You are an expert leadership analyst specializing in the 4D Leadership Assessment model.
+        Analyze the provided leadership data with deep psychological insights based on:
+        1. Blake & Mouton Grid (People vs Production balance)
+        2. Radical Candor (Care vs Challenge dynamics)
+        3. Leader-Member Exchange (Relationship quality)
+        4. Hidden influence patterns (strategic thinking, confidence, risk management)
+
+        Provide nuanced, culturally-aware insights in Korean that go beyond surface-level observations."""
+    prompt = f"""다음 리더십 데이터를 심층 분석해주세요:
+
+기본 차원:
+- People (사람 중심): {data['people']}/7
+- Production (성과 중심): {data['production']}/7
+- Care (배려): {data['care']}/7
+- Challenge (도전): {data['challenge']}/7
+- LMX (관계 품질): {data['lmx']}/7
+
+리더십 스타일: {data['style']}
+조직 맥락: 일반 기업 환경
+
+다음 관점에서 깊이 있는 분석을 제공해주세요:
+
+1. **핵심 강점** (3개)
+   - 현재 발휘되고 있는 독특한 리더십 자산
+   - 조직에 미치는 긍정적 영향
+
+2. **잠재적 사각지대** (3개)
+   - 인식하지 못하고 있을 수 있는 개선 영역
+   - 장기적 성장을 위한 도전 과제
+
+3. **맞춤형 개발 전략** (5개)
+   - 구체적이고 실행 가능한 행동 계획
+   - 한국 조직 문화 맥락을 고려한 접근
+
+4. **변혁적 성장 시나리오**
+   - 6개월 후 달성 가능한 구체적 변화
+   - 조직과 개인에게 미칠 영향"""
+    return system_prompt, prompt
+
+
+class LegacyAnthropicClient(AnthropicClient):
+    """이전 요청 형식 (system 문자열, 캐시 지점 없음)"""
+
+    def request_params(self, prompt: str, system_prompt: Optional[str] = None) -> Dict:
+        params = super().request_params(prompt, system_prompt)
+        if system_prompt:
+            params["system"] = system_prompt
+        return params
+
+
+class FakeProvider:
+    """토큰 계산/프롬프트 캐시/TTFT를 흉내내는 스트리밍 provider"""
+
+    def __init__(self, cache_min_tokens: int, base_latency: float, prefill_per_token: float):
+        self.cache_min_tokens = cache_min_tokens
+        self.base_latency = base_latency
+        self.prefill_per_token = prefill_per_token
+        self.prefixes = set()
+        self.calls: List[Dict[str, int]] = []
+
+    def _prefix_hash(self, tokens: List[str], length: int) -> str:
+        return hashlib.sha256("\x00".join(tokens[:length]).encode()).hexdigest()
+
+    def _openai_cached(self, tokens: List[str]) -> int:
+        """자동 접두부 캐시: 이전 요청과 일치하는 가장 긴 128토큰 단위 접두부"""
+        cached = 0
+        for length in range(self.cache_min_tokens, len(tokens) + 1, CACHE_BLOCK):
+            key = self._prefix_hash(tokens, length)
+            if key in self.prefixes:
+                cached = length
+            self.prefixes.add(key)
+        return cached
+
+    def _anthropic_cached(self, system_tokens: List[str], cache_control: bool) -> tuple:
+        """cache_control 지점까지의 접두부 (쓰기, 읽기)"""
+        if not cache_control or len(system_tokens) < self.cache_min_tokens:
+            return 0, 0
+        key = self._prefix_hash(system_tokens, len(system_tokens))
+        if key in self.prefixes:
+            return 0, len(system_tokens)
+        self.prefixes.add(key)
+        return len(system_tokens), 0
+
+    async def _delay(self, input_tokens: int, cached: int) -> None:
+        uncached = input_tokens - cached
+        await asyncio.sleep(
+            self.base_latency + uncached * self.prefill_per_token + cached * self.prefill_per_token / 10
+        )
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path.endswith("/chat/completions"):
+            tokens = count_tokens("".join(m["content"] for m in body["messages"]))
+            cached = self._openai_cached(tokens)
+            self.calls.append({"input_tokens": len(tokens), "cached_input_tokens": cached})
+            await self._delay(len(tokens), cached)
+            chunks = [
+                "data: " + json.dumps({
+                    "id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                }) + "\n\n"
+                for piece in OPENAI_TEXT.split("\n")
+            ]
+            chunks.append("data: [DONE]\n\n")
+        else:
+            system = body.get("system") or ""
+            blocks = system if isinstance(system, list) else [{"type": "text", "text": system}]
+            system_tokens = count_tokens("".join(block["text"] for block in blocks))
+            user_tokens = count_tokens("".join(m["content"] for m in body["messages"]))
+            cache_write, cache_read = self._anthropic_cached(
+                system_tokens, any("cache_control" in block for block in blocks)
+            )
+            total = len(system_tokens) + len(user_tokens)
+            self.calls.append({"input_tokens": total, "cached_input_tokens": cache_read})
+            await self._delay(total, cache_read)
+            usage = {
+                "input_tokens": total - cache_write - cache_read,
+                "cache_creation_input_tokens": cache_write,
+                "cache_read_input_tokens": cache_read,
+                "output_tokens": 1,
+            }
+            events = [
+                ("message_start", {"type": "message_start", "message": {
+                    "id": "msg_bench", "type": "message", "role": "assistant", "content": [],
+                    "model": body["model"], "stop_reason": None, "stop_sequence": None, "usage": usage,
+                }}),
+                ("content_block_start", {"type": "content_block_start", "index": 0,
+                                         "content_block": {"type": "text", "text": ""}}),
+                *[
+                    ("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                             "delta": {"type": "text_delta", "text": piece}})
+                    for piece in ANTHROPIC_TEXT.split("\n")
+                ],
+                ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                ("message_delta", {"type": "message_delta",
+                                   "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                   "usage": {"output_tokens": 100}}),
+                ("message_stop", {"type": "message_stop"}),
+            ]
+            chunks = [f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events]
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content="".join(chunks).encode("utf-8"),
+        )
+
+
+def make_client(provider: str, fake: FakeProvider, legacy: bool):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+    if provider == "openai":
+        client = OpenAIClient.__new__(OpenAIClient)
+        client.client = AsyncOpenAI(api_key="bench", base_url="http://fake/v1", http_client=http_client)
+        client.model = "gpt-bench"
+    else:
+        client = (LegacyAnthropicClient if legacy else AnthropicClient).__new__(
+            LegacyAnthropicClient if legacy else AnthropicClient
+        )
+        client.client = AsyncAnthropic(api_key="bench", base_url="http://fake", http_client=http_client)
+        client.model = "claude-bench"
+    return client
+
+
+def make_profiles(count: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    styles = ["Team Leader", "Country Club", "Task Manager", "Middle of the Road", "Impoverished"]
+    return [
+        {
+            **{name: round(rng.randint(4, 28) / 4, 2) for name in ("people", "production", "care", "challenge", "lmx")},
+            "style": rng.choice(styles),
+        }
+        for _ in range(count)
+    ]
+
+
+async def run(provider: str, legacy: bool, profiles: List[Dict], args) -> Dict:
+    fake = FakeProvider(args.cache_min_tokens, args.base_latency, args.prefill_per_token)
+    client = make_client(provider, fake, legacy)
+    # 연결/SDK 초기화 비용 제외용 준비 호출 (측정/캐시 상태에서 제외)
+    async for _ in client.stream_insight("warm-up"):
+        break
+    fake.calls.clear()
+    fake.prefixes.clear()
+
+    ttfts = []
+    for data in profiles:
+        system_prompt, prompt = legacy_prompts(provider, data) if legacy else client.build_prompts(data)
+        started = time.perf_counter()
+        async for _ in client.stream_insight(prompt, system_prompt):
+            ttfts.append(time.perf_counter() - started)
+            break
+    return {
+        "input_tokens": statistics.mean(call["input_tokens"] for call in fake.calls),
+        "cached_input_tokens": statistics.mean(call["cached_input_tokens"] for call in fake.calls),
+        "ttft_ms": statistics.mean(ttfts) * 1000,
+        "ttft_p95_ms": sorted(ttfts)[int(0.95 * (len(ttfts) - 1))] * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt prefix/token benchmark against a fake provider")
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--cache-min-tokens", type=int, default=1024,
+                        help="provider 최소 캐시 길이 (OpenAI/Anthropic Sonnet 1024)")
+    parser.add_argument("--base-latency", type=float, default=0.02)
+    parser.add_argument("--prefill-per-token", type=float, default=0.0001)
+    args = parser.parse_args()
+
+    profiles = make_profiles(args.calls)
+    print(f"{args.calls} calls per run, cache min {args.cache_min_tokens} tokens (approximate tokenizer)")
+    print(f"{'provider':<10} {'prompts':<8} {'input tok':>10} {'cached tok':>11} {'TTFT ms':>8} {'p95 ms':>7}")
+    for provider in ("openai", "anthropic"):
+        before = await run(provider, True, profiles, args)
+        after = await run(provider, False, profiles, args)
+        for label, result in (("before", before), ("after", after)):
+            print(
+                f"{provider:<10} {label:<8} {result['input_tokens']:>10.0f} "
+                f"{result['cached_input_tokens']:>11.0f} {result['ttft_ms']:>8.1f} {result['ttft_p95_ms']:>7.1f}"
+            )
+        print(
+            f"{'':<10} {'change':<8} {after['input_tokens'] / before['input_tokens'] - 1:>+10.0%} "
+            f"{'':>11} {after['ttft_ms'] / before['ttft_ms'] - 1:>+8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
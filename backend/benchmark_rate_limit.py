@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+AI Leadership 4Dx - Rate limit Redis 백엔드 벤치마크
+기존 방식(동기 redis 파이프라인, 요청마다 zset 멤버 추가)과 현재 방식(redis.asyncio + GCRA 스크립트 1회 왕복)의
+초당 확인 수, 이벤트 루프 블로킹 시간, 키당 메모리 비교
+
+- 이벤트 루프 블로킹: 1ms 간격 하트비트 태스크의 지연 합계/최대값 (확인 중 다른 요청이 멈춘 시간)
+- 키당 메모리: 한 키에 --per-key회 확인 후 MEMORY USAGE (지원하지 않는 서버면 멤버 수만 표시)
+
+사용법: python benchmark_rate_limit.py [--redis-url redis://localhost:6379/15] [--checks 5000] [--concurrency 50]
+주의: 벤치마크 키(bench:*, rl:bench:*)만 사용하지만 운영 DB가 아닌 Redis를 지정할 것
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench-anon-key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "bench-service-key")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import redis  # noqa: E402
+import redis.asyncio as aioredis  # noqa: E402
+
+from app.middleware.rate_limit import RateLimiter  # noqa: E402
+
+HEARTBEAT = 0.001
+
+
+class LegacyRateLimiter:
+    """이전 _check_redis (async 함수 안에서 동기 파이프라인 실행, 요청마다 zset 멤버 추가)"""
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis_client = redis_client
+
+    async def check_rate_limit(self, key: str, limit: int, window: int):
+        pipe = self.redis_client.pipeline()
+        now = time.time()
+        pipe.zremrangebyscore(key, 0, now - window)
+        pipe.zadd(key, {str(now): now})
+        pipe.zcount(key, now - window, now)
+        pipe.expire(key, window)
+        count = pipe.execute()[2]
+        return count <= limit, {"limit": limit, "remaining": max(0, limit - count)}
+
+
+async def heartbeat(lags: list, stop: asyncio.Event) -> None:
+    """루프가 막힌 시간 = 예정보다 늦게 깨어난 시간"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT)
+        lags.append(max(0.0, time.perf_counter() - started - HEARTBEAT))
+
+
+async def run_load(limiter, prefix: str, checks: int, concurrency: int, keys: int) -> Dict:
+    lags: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(i: int) -> None:
+        async with semaphore:
+            await limiter.check_rate_limit(f"{prefix}:{i % keys}", 1_000_000, 3600)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(check(i) for i in range(checks)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await monitor
+
+    return {
+        "checks_per_second": checks / elapsed,
+        "blocked_ms": sum(lags) * 1000,
+        "max_lag_ms": max(lags, default=0.0) * 1000,
+        "p50_lag_ms": statistics.median(lags) * 1000 if lags else 0.0,
+    }
+
+
+def key_memory(client: redis.Redis, key: str) -> str:
+    try:
+        return f"{client.memory_usage(key)} bytes"
+    except redis.ResponseError:
+        kind = client.type(key)
+        size = client.zcard(key) if kind == "zset" else 1
+        return f"{kind} x{size}"
+
+
+async def main(args) -> None:
+    sync_client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+    async_client = aioredis.from_url(args.redis_url, decode_responses=True, max_connections=args.concurrency)
+    sync_client.ping()
+
+    limiters = (
+        ("sync pipeline (before)", "bench:before", LegacyRateLimiter(sync_client)),
+        ("async GCRA (after)", "bench:after", RateLimiter(redis_client=async_client)),
+    )
+    # 스크립트 등록/연결 생성 워밍업
+    for _, prefix, limiter in limiters:
+        await limiter.check_rate_limit(f"{prefix}:warmup", 10, 60)
+
+    print(f"📊 {args.checks} checks over {args.keys} keys, concurrency {args.concurrency}, {args.redis_url}")
+    for label, prefix, limiter in limiters:
+        result = await run_load(limiter, prefix, args.checks, args.concurrency, args.keys)
+        print(
+            f"  {label:<24} {result['checks_per_second']:9.1f} checks/s  "
+            f"loop blocked {result['blocked_ms']:8.1f}ms  "
+            f"max lag {result['max_lag_ms']:6.1f}ms  p50 lag {result['p50_lag_ms']:5.2f}ms"
+        )
+
+    print(f"🧠 memory per key after {args.per_key} checks")
+    for label, prefix, limiter in limiters:
+        key = f"{prefix}:memory"
+        for _ in range(args.per_key):
+            await limiter.check_rate_limit(key, 1_000_000, 3600)
+        stored = f"rl:{key}" if isinstance(limiter, RateLimiter) else key
+        print(f"  {label:<24} {key_memory(sync_client, stored)}")
+
+    for pattern in ("bench:*", "rl:bench:*"):
+        for key in sync_client.scan_iter(pattern):
+            sync_client.delete(key)
+    sync_client.close()
+    await async_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate limiter Redis backend benchmark")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/15"))
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=100, help="동시 확인에 쓰는 서로 다른 키 수")
+    parser.add_argument("--per-key", type=int, default=1000, help="메모리 측정 키 하나에 보낼 확인 수")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,217 @@
+"""
+테스트 공용 픽스처/헬퍼
+무작위 설문 응답, Supabase 대체 구현, LLM 응답 예시
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.schemas.analysis import LeadershipDimensions
+from app.services import analysis
+from app.services.analysis import LeadershipAnalyzer
+from app.services.memo import memo_stats
+from app.services.scoring import QUESTION_IDS
+
+
+def make_random_responses(count: int, seed: int = 42, missing_rate: float = 0.1):
+    """무작위 설문 응답 생성 (일부 문항 누락 포함)"""
+    rng = np.random.default_rng(seed)
+    responses = []
+    for _ in range(count):
+        response = {}
+        for question in QUESTION_IDS:
+            if rng.random() >= missing_rate:
+                # Influence Gauge는 5점 환산 후에도 1 이상이 되도록 2-7 범위 사용
+                low = 2 if question.startswith("ig_") else 1
+                response[question] = int(rng.integers(low, 8))
+        responses.append(response)
+    return responses
+
+
+class FakeAnalysisQuery:
+    """leadership_analysis 조회/저장 최소 구현"""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, size):
+        return self
+
+    def upsert(self, records, on_conflict):
+        for record in records:
+            self.table.rows = [
+                r for r in self.table.rows
+                if r.get(on_conflict) != record[on_conflict]
+            ] + [dict(record)]
+        return self
+
+    def insert(self, records):
+        self.table.rows.extend(dict(r) for r in records)
+        return self
+
+    async def execute(self):
+        rows = [
+            r for r in self.table.rows
+            if all(r.get(column) == value for column, value in self.filters.items())
+        ]
+        return SimpleNamespace(data=rows)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        return FakeAnalysisQuery(self)
+
+
+@pytest.fixture
+def fake_env(monkeypatch):
+    """DB/LLM 호출 대체 (LLM 호출 횟수 기록)"""
+    db = FakeSupabase()
+    llm_calls = []
+
+    async def fake_generate_insights(dimensions, style, ai_provider=None):
+        llm_calls.append(style)
+        return {"strengths": ["s"], "ai_provider": "openai"}
+
+    async def fake_get_db():
+        return db
+
+    monkeypatch.setattr(analysis, "get_async_service_supabase", fake_get_db)
+    monkeypatch.setattr(
+        LeadershipAnalyzer, "generate_insights", staticmethod(fake_generate_insights)
+    )
+    monkeypatch.setattr(memo_stats, "hits", 0)
+    monkeypatch.setattr(memo_stats, "misses", 0)
+    return db, llm_calls
+
+
+class FakeQuery:
+    """Supabase 쿼리 빌더 최소 구현 (select/gt/order/limit/upsert)"""
+
+    def __init__(self, table):
+        self.table = table
+        self.after = None
+        self.size = None
+        self.payload = None
+
+    def select(self, columns):
+        return self
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def upsert(self, records, on_conflict):
+        self.payload = records
+        return self
+
+    async def execute(self):
+        if self.payload is not None:
+            self.table.upsert(self.payload)
+            return SimpleNamespace(data=self.payload)
+        rows = sorted(self.table.rows, key=lambda r: r["id"])
+        if self.after:
+            rows = [r for r in rows if r["id"] > self.after]
+        return SimpleNamespace(data=rows[:self.size])
+
+
+class FakeTable:
+    def __init__(self, rows=None, fail_on_upsert=None):
+        self.rows = rows or []
+        self.upsert_calls = 0
+        self.fail_on_upsert = fail_on_upsert
+
+    def upsert(self, records):
+        self.upsert_calls += 1
+        if self.upsert_calls == self.fail_on_upsert:
+            raise RuntimeError("simulated crash")
+        for record in records:
+            self.rows = [
+                r for r in self.rows
+                if r["survey_response_id"] != record["survey_response_id"]
+            ] + [record]
+
+
+class FakeBackfillSupabase:
+    def __init__(self, responses, fail_on_upsert=None):
+        self.tables = {
+            "survey_responses": FakeTable(responses),
+            "leadership_analysis": FakeTable(fail_on_upsert=fail_on_upsert),
+        }
+
+    def table(self, name):
+        return FakeQuery(self.tables[name])
+
+
+def make_survey_rows(count):
+    return [
+        {
+            "id": f"resp-{i:05d}",
+            "user_id": f"user-{i % 7}",
+            "responses": response,
+            "survey_version": "1.0",
+            "created_at": "2025-08-02T10:00:00",
+        }
+        for i, response in enumerate(make_random_responses(count, seed=3))
+    ]
+
+
+def make_dimensions(**overrides):
+    values = {
+        "people": 5.1, "production": 4.9, "care": 6.0, "challenge": 3.2,
+        "lmx_score": 5.5, "machiavellianism": 2.0, "narcissism": 2.0, "psychopathy": 2.0,
+    }
+    values.update(overrides)
+    return LeadershipDimensions(**values)
+
+
+OPENAI_TEXT = """### 1. 주요 강점 (3개)
+1. 팀원과의 신뢰 관계
+2. **명확한 목표 설정**: 방향 제시
+3. 일관된 피드백
+4. 넘치는 항목
+
+2. 개선 영역
+1. 위임 부족
+2. 갈등 회피
+
+3. 구체적인 실행 계획
+- 주간 1:1 미팅
+- 분기별 목표 점검
+
+4. 6개월 후 예상 성과
+팀 몰입도가 높아지고
+이직률이 감소합니다."""
+
+ANTHROPIC_TEXT = """1. **핵심 강점** (3개)
+현재 발휘되고 있는 자산입니다.
+- 공감 능력
+- 실행력
+
+2. **잠재적 사각지대** (3개)
+- 과도한 개입
+
+3. **맞춤형 개발 전략** (5개)
+- 코칭 대화 연습
+
+4. **변혁적 성장 시나리오**
+자율적인 팀 문화가 자리잡습니다."""
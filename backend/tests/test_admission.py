@@ -0,0 +1,150 @@
+"""
+요청 한도/동시 실행 제어 미들웨어 테스트
+경로별/사용자별 한도(429), 동시 실행 상한 + 대기열(503), 응답 헤더, 정책 매칭 검증
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from jose import jwt
+
+from app.middleware import admission
+from app.middleware.admission import (
+    DEFAULT_POLICIES,
+    AdmissionController,
+    AdmissionMiddleware,
+    RoutePolicy,
+)
+from app.middleware.rate_limit import RateLimiter
+
+
+def make_client(*policies, delay=0.0):
+    app = FastAPI()
+
+    @app.get("/api/reports/pdf/{user_id}")
+    async def pdf(user_id: str):
+        await asyncio.sleep(delay)
+        return {"user_id": user_id}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    controller = AdmissionController(list(policies), limiter=RateLimiter())
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test"), controller
+
+
+def bearer(sub, secret="test-secret"):
+    return {"Authorization": f"Bearer {jwt.encode({'sub': sub}, secret, algorithm='HS256')}"}
+
+
+class TestRateLimit:
+    """경로별/사용자별 한도 테스트"""
+
+    async def test_quota_exceeded_returns_429(self):
+        """한도 초과는 핸들러 실행 전 429, 허용 응답에도 한도 헤더"""
+        client, controller = make_client(RoutePolicy("pdf", "/api/reports/pdf/{user_id}", limit=2))
+        async with client:
+            first = await client.get("/api/reports/pdf/u1")
+            await client.get("/api/reports/pdf/u1")
+            denied = await client.get("/api/reports/pdf/u1")
+
+        assert first.status_code == 200
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert denied.status_code == 429
+        assert int(denied.headers["Retry-After"]) == 30
+        assert denied.headers["X-RateLimit-Remaining"] == "0"
+        assert controller.stats["pdf"].snapshot()["rate_limited"] == 1
+
+    async def test_per_principal_quota(self, monkeypatch):
+        """서명 확인된 사용자별 한도, 위조 토큰은 IP 기준"""
+        monkeypatch.setattr(admission, "JWT_SECRET", "test-secret")
+        client, _ = make_client(RoutePolicy("pdf", "/api/reports/pdf/{user_id}", limit=1, anonymous_limit=1))
+        async with client:
+            alice = await client.get("/api/reports/pdf/x", headers=bearer("alice"))
+            bob = await client.get("/api/reports/pdf/x", headers=bearer("bob"))
+            alice_again = await client.get("/api/reports/pdf/x", headers=bearer("alice"))
+            forged = await client.get("/api/reports/pdf/x", headers=bearer("mallory", secret="wrong"))
+            anonymous = await client.get("/api/reports/pdf/x")
+
+        assert [r.status_code for r in (alice, bob, alice_again)] == [200, 200, 429]
+        assert forged.status_code == 200
+        assert anonymous.status_code == 429
+
+    async def test_unmatched_paths_pass_through(self):
+        """정책 없는 경로는 제한/헤더 없음"""
+        client, _ = make_client(RoutePolicy("pdf", "/api/reports/pdf/{user_id}", limit=1))
+        async with client:
+            responses = [await client.get("/health") for _ in range(3)]
+
+        assert all(r.status_code == 200 for r in responses)
+        assert "X-RateLimit-Limit" not in responses[0].headers
+
+
+class TestConcurrency:
+    """동시 실행 상한/대기열 테스트"""
+
+    async def test_overload_rejected_fast(self):
+        """슬롯 + 대기열을 넘는 요청은 기다리지 않고 503"""
+        policy = RoutePolicy(
+            "pdf", "/api/reports/pdf/{user_id}", limit=100,
+            max_concurrency=2, max_queue=1, queue_timeout=1.0,
+        )
+        client, controller = make_client(policy, delay=0.1)
+
+        async def timed_get():
+            started = time.perf_counter()
+            response = await client.get("/api/reports/pdf/u1")
+            return response, time.perf_counter() - started
+
+        async with client:
+            results = await asyncio.gather(*(timed_get() for _ in range(10)))
+
+        codes = [response.status_code for response, _ in results]
+        assert codes.count(200) == 3
+        assert codes.count(503) == 7
+        rejected = [elapsed for response, elapsed in results if response.status_code == 503]
+        assert max(rejected) < 0.1
+        assert all(response.headers["Retry-After"] == "1" for response, _ in results if response.status_code == 503)
+
+        stats = controller.snapshot()["pdf"]
+        assert (stats["admitted"], stats["queued"], stats["queue_full"]) == (3, 1, 7)
+        assert stats["concurrency"]["active"] == 0
+
+    async def test_queue_timeout(self):
+        """대기열에서 queue_timeout을 넘기면 503"""
+        policy = RoutePolicy(
+            "pdf", "/api/reports/pdf/{user_id}", limit=100,
+            max_concurrency=1, max_queue=5, queue_timeout=0.02,
+        )
+        client, controller = make_client(policy, delay=0.2)
+        async with client:
+            slow, queued = await asyncio.gather(
+                client.get("/api/reports/pdf/u1"), client.get("/api/reports/pdf/u2")
+            )
+
+        assert (slow.status_code, queued.status_code) == (200, 503)
+        assert controller.stats["pdf"].queue_timeouts == 1
+
+
+class TestPolicies:
+    """기본 정책 매칭 테스트"""
+
+    @pytest.mark.parametrize("method, path, expected", [
+        ("GET", "/api/reports/pdf/u1", "reports_pdf"),
+        ("GET", "/api/reports/team/Acme", "reports_team"),
+        ("GET", "/api/survey/stats", "survey_stats"),
+        ("POST", "/api/survey/submit", "api"),
+        ("GET", "/api/reports/pdf/u1/extra", "api"),
+        ("GET", "/health", None),
+    ])
+    def test_default_policy_match(self, method, path, expected):
+        controller = AdmissionController(DEFAULT_POLICIES, limiter=RateLimiter())
+        policy = controller.match(method, path)
+        assert (policy.name if policy else None) == expected
@@ -0,0 +1,269 @@
+"""
+배치 인사이트 생성 테스트
+점수 구간 중복 제거/캐시 생략, 항목 실패 대체, provider 배치 형식, 백필 연동, 비용 보고 검증
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from conftest import (
+    ANTHROPIC_TEXT,
+    OPENAI_TEXT,
+    FakeBackfillSupabase,
+    make_dimensions,
+    make_survey_rows,
+)
+
+from app.schemas.analysis import LeadershipStyle
+from app.services import ai_batch
+from app.services.ai_batch import (
+    AnthropicBatchBackend,
+    BatchInsightGenerator,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
+from app.services.ai_client import AnthropicClient, OpenAIClient
+from app.services.analysis import LeadershipAnalyzer
+from app.services.backfill import AnalysisBackfill
+from app.services.insight_cache import InsightCache
+
+STYLE = LeadershipStyle.MIDDLE_OF_THE_ROAD
+
+
+def make_openai_client(fail_on=None):
+    """실시간 호출을 기록하는 OpenAIClient (fail_on 포함 프롬프트는 실패)"""
+    client = OpenAIClient.__new__(OpenAIClient)
+    client.model = "gpt-test"
+    client.calls = []
+
+    async def create(**params):
+        prompt = params["messages"][-1]["content"]
+        client.calls.append(prompt)
+        if fail_on and fail_on in prompt:
+            raise RuntimeError("rate limited")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=OPENAI_TEXT))],
+            usage=SimpleNamespace(prompt_tokens=200, completion_tokens=300),
+        )
+
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    client = make_openai_client()
+
+    async def fake_get_ai_client(provider=None):
+        return client
+
+    monkeypatch.setattr(ai_batch, "get_ai_client", fake_get_ai_client)
+    monkeypatch.setattr(ai_batch, "insight_cache", InsightCache(use_redis=False))
+    return client
+
+
+class TestBatchInsightGenerator:
+    """배치 제출/대기/반영 테스트"""
+
+    async def test_dedupes_and_preserves_order(self, batch_env):
+        """같은 점수 구간은 한 번만 제출, 결과는 입력 순서대로"""
+        generator = BatchInsightGenerator(backend=LocalBatchBackend(batch_env), poll_interval=0.001)
+        profiles = [
+            (make_dimensions(), STYLE),
+            (make_dimensions(people=5.05), STYLE),
+            (make_dimensions(people=2.0), LeadershipStyle.TASK_MANAGER),
+        ]
+
+        insights = await generator.generate(profiles)
+
+        assert len(batch_env.calls) == 2
+        assert [i["ai_provider"] for i in insights] == ["openai"] * 3
+        assert insights[0] == insights[1]
+        assert insights[0]["strengths"][0] == "팀원과의 신뢰 관계"
+        assert insights[2]["style_description"] != insights[0]["style_description"]
+
+        report = generator.report.snapshot()
+        assert (report["leaders"], report["submitted"], report["succeeded"]) == (3, 2, 2)
+        assert report["input_tokens"] == 400
+        assert report["tokens_per_1000_leaders"] == round(1000 * 1000 / 3)
+
+    async def test_cached_profiles_are_not_submitted(self, batch_env):
+        """다음 실행에서 캐시 적중 프로필은 제출하지 않음"""
+        generator = BatchInsightGenerator(backend=LocalBatchBackend(batch_env), poll_interval=0.001)
+        await generator.generate([(make_dimensions(), STYLE)])
+
+        await generator.generate([(make_dimensions(), STYLE), (make_dimensions(care=2.0), STYLE)])
+
+        assert len(batch_env.calls) == 2
+        assert generator.report.cached == 1
+        assert generator.report.batches == 2
+
+    async def test_item_failure_falls_back_to_rule_based(self, monkeypatch):
+        """실패한 항목만 규칙 기반, 나머지는 LLM 결과"""
+        client = make_openai_client(fail_on="People 2.0,")
+
+        async def fake_get_ai_client(provider=None):
+            return client
+
+        monkeypatch.setattr(ai_batch, "get_ai_client", fake_get_ai_client)
+        monkeypatch.setattr(ai_batch, "insight_cache", InsightCache(use_redis=False))
+        generator = BatchInsightGenerator(backend=LocalBatchBackend(client), poll_interval=0.001)
+        failing = make_dimensions(people=2.0)
+
+        insights = await generator.generate([(make_dimensions(), STYLE), (failing, STYLE)])
+
+        assert insights[0]["ai_provider"] == "openai"
+        assert insights[1] == LeadershipAnalyzer.generate_rule_based_insights(failing, STYLE)
+        assert generator.report.failed == 1
+
+    async def test_failed_batch_raises(self, batch_env):
+        """배치 전체 실패는 예외 (백필은 체크포인트에서 재개)"""
+        class FailedBackend:
+            discount = 0.5
+
+            async def submit(self, items):
+                return "batch-1"
+
+            async def status(self, batch_id):
+                return ai_batch.FAILED
+
+        generator = BatchInsightGenerator(backend=FailedBackend(), poll_interval=0.001)
+        with pytest.raises(RuntimeError):
+            await generator.generate([(make_dimensions(), STYLE)])
+
+    async def test_cost_report_applies_batch_discount(self, batch_env):
+        """배치 비용은 실시간 비용의 할인율 적용"""
+        backend = LocalBatchBackend(batch_env)
+        backend.discount = 0.5
+        generator = BatchInsightGenerator(backend=backend, poll_interval=0.001)
+        await generator.generate([(make_dimensions(), STYLE)])
+
+        report = generator.report.snapshot()
+        assert report["cost_usd"] == pytest.approx(report["realtime_cost_usd"] / 2)
+        assert report["cost_per_1000_leaders_usd"] == pytest.approx(report["cost_usd"] * 1000, rel=1e-3)
+
+    async def test_local_batch_ids_not_reused(self, batch_env):
+        """결과를 가져간 뒤 제출한 배치도 진행 중인 배치와 ID가 겹치지 않음"""
+        backend = LocalBatchBackend(batch_env)
+        first = await backend.submit([ai_batch.BatchItem("a", "sys", "prompt")])
+        second = await backend.submit([ai_batch.BatchItem("b", "sys", "prompt")])
+        await backend._tasks[first]
+        await backend.results(first)
+
+        third = await backend.submit([ai_batch.BatchItem("c", "sys", "prompt")])
+        await backend._tasks[third]
+
+        assert len({first, second, third}) == 3
+        assert list(await backend.results(second)) == ["b"]
+        assert list(await backend.results(third)) == ["c"]
+
+
+class TestProviderBackends:
+    """provider 배치 API 요청/응답 형식 테스트"""
+
+    async def test_openai_batch(self):
+        """JSONL 업로드 -> 배치 생성, 출력/오류 파일 파싱"""
+        client = make_openai_client()
+        uploads = {}
+
+        async def create_file(file, purpose):
+            uploads["purpose"] = purpose
+            uploads["lines"] = [json.loads(line) for line in file[1].decode().splitlines()]
+            return SimpleNamespace(id="file-in")
+
+        async def create_batch(**kwargs):
+            uploads["batch"] = kwargs
+            return SimpleNamespace(id="batch-1")
+
+        async def retrieve(batch_id):
+            return SimpleNamespace(status="completed", output_file_id="file-out", error_file_id="file-err")
+
+        outputs = {
+            "file-out": json.dumps({"custom_id": "a", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": OPENAI_TEXT}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 20},
+            }}}),
+            "file-err": json.dumps({"custom_id": "b", "response": None, "error": {"code": "expired"}}),
+        }
+
+        async def content(file_id):
+            return SimpleNamespace(text=outputs[file_id])
+
+        client.client.files = SimpleNamespace(create=create_file, content=content)
+        client.client.batches = SimpleNamespace(create=create_batch, retrieve=retrieve)
+        backend = OpenAIBatchBackend(client)
+
+        batch_id = await backend.submit([ai_batch.BatchItem("a", "sys", "prompt")])
+        assert batch_id == "batch-1"
+        assert uploads["purpose"] == "batch"
+        assert uploads["batch"]["completion_window"] == "24h"
+        line = uploads["lines"][0]
+        assert line["url"] == "/v1/chat/completions"
+        assert line["body"] == client.request_params("prompt", "sys")
+
+        assert await backend.status(batch_id) == ai_batch.ENDED
+        results = await backend.results(batch_id)
+        assert results["a"].text == OPENAI_TEXT
+        assert results["a"].usage["total_tokens"] == 30
+        assert "expired" in results["b"].error
+
+    async def test_anthropic_batch(self):
+        """요청별 params는 실시간 호출과 동일, succeeded 외 결과는 실패"""
+        client = AnthropicClient.__new__(AnthropicClient)
+        client.model = "claude-test"
+        created = {}
+
+        async def create(requests):
+            created["requests"] = requests
+            return SimpleNamespace(id="msgbatch-1")
+
+        async def retrieve(batch_id):
+            return SimpleNamespace(processing_status="ended")
+
+        async def entries():
+            yield SimpleNamespace(custom_id="a", result=SimpleNamespace(
+                type="succeeded",
+                message=SimpleNamespace(
+                    content=[SimpleNamespace(text=ANTHROPIC_TEXT)],
+                    usage=SimpleNamespace(input_tokens=5, output_tokens=7),
+                ),
+            ))
+            yield SimpleNamespace(custom_id="b", result=SimpleNamespace(type="errored"))
+
+        async def results(batch_id):
+            return entries()
+
+        batches = SimpleNamespace(create=create, retrieve=retrieve, results=results)
+        client.client = SimpleNamespace(beta=SimpleNamespace(messages=SimpleNamespace(batches=batches)))
+        backend = AnthropicBatchBackend(client)
+
+        await backend.submit([ai_batch.BatchItem("a", "sys", "prompt")])
+        assert created["requests"][0]["params"]["system"][0]["text"] == "sys"
+
+        assert await backend.status("msgbatch-1") == ai_batch.ENDED
+        parsed = await backend.results("msgbatch-1")
+        assert "공감 능력" in client.parse_insight(parsed["a"].text)["strengths"]
+        assert parsed["b"].error == "errored"
+
+
+class TestBackfillBatchMode:
+    """백필 배치 모드 테스트"""
+
+    async def test_backfill_uses_batch(self, batch_env, tmp_path):
+        """청크별 배치 1회, 저장 레코드에 AI 인사이트"""
+        rows = make_survey_rows(12)
+        db = FakeBackfillSupabase(rows)
+        generator = BatchInsightGenerator(backend=LocalBatchBackend(batch_env), poll_interval=0.001)
+        backfill = AnalysisBackfill(
+            db=db, chunk_size=5, rule_based=False, batch_generator=generator,
+            checkpoint_path=str(tmp_path / "cp.json"),
+        )
+
+        checkpoint = await backfill.run()
+
+        assert checkpoint.written == 12
+        assert generator.report.batches == 3
+        assert generator.report.submitted == len(batch_env.calls)
+        saved = db.tables["leadership_analysis"].rows
+        assert all(row["ai_insights"]["ai_provider"] == "openai" for row in saved)
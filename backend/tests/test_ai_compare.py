@@ -0,0 +1,116 @@
+"""
+AI Provider 비교 테스트
+동시 호출, 완료 순서 반환, provider별 시간 초과/오류, 지연 시간/토큰 사용량 검증
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.services import ai_compare
+from app.services.ai_client import AnthropicClient, OpenAIClient, token_usage
+from app.services.ai_compare import compare_providers
+
+DATA = {"people": 5.0, "production": 4.0, "style": "Team Leader"}
+
+
+class FakeClient:
+    def __init__(self, provider, delay, fail=False):
+        self.provider = provider
+        self.delay = delay
+        self.fail = fail
+
+    async def analyze_leadership(self, data):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return {"strengths": [self.provider], "provider": self.provider, "usage": token_usage(100, 50)}
+
+
+def use_clients(monkeypatch, *clients):
+    by_provider = {client.provider: client for client in clients}
+
+    async def fake_get_ai_client(provider=None):
+        return by_provider[provider]
+
+    monkeypatch.setattr(ai_compare, "get_ai_client", fake_get_ai_client)
+    return list(by_provider)
+
+
+async def collect(providers, timeout=1.0):
+    return [item async for item in compare_providers(providers, DATA, timeout)]
+
+
+class TestCompareProviders:
+    """동시 호출 테스트"""
+
+    async def test_parallel_in_completion_order(self, monkeypatch):
+        """전체 시간은 가장 느린 provider 기준, 빠른 결과가 먼저"""
+        providers = use_clients(
+            monkeypatch, FakeClient("openai", 0.2), FakeClient("anthropic", 0.05)
+        )
+
+        started = time.perf_counter()
+        results = await collect(providers)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.2 + 0.05 * 0.9
+        assert [provider for provider, _ in results] == ["anthropic", "openai"]
+        anthropic = results[0][1]
+        assert anthropic["usage"] == token_usage(100, 50)
+        assert 40 <= anthropic["latency_ms"] < 200
+
+    async def test_timeout_and_error_are_partial(self, monkeypatch):
+        """시간 초과/오류 provider만 오류로 기록하고 나머지는 정상 반환"""
+        providers = use_clients(
+            monkeypatch,
+            FakeClient("openai", 5.0),
+            FakeClient("anthropic", 0.01),
+            FakeClient("broken", 0.0, fail=True),
+        )
+
+        results = dict(await collect(providers, timeout=0.1))
+
+        assert results["anthropic"]["strengths"] == ["anthropic"]
+        assert results["openai"]["timed_out"] is True
+        assert results["broken"]["error"] == "quota exceeded"
+
+
+class TestTokenUsage:
+    """provider 응답 사용량 변환 테스트"""
+
+    async def test_openai_usage(self):
+        client = OpenAIClient.__new__(OpenAIClient)
+        client.model = "m"
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="text"))],
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=30),
+        )
+
+        async def create(**kwargs):
+            return response
+
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        assert await client.complete("p", "s") == ("text", token_usage(12, 30))
+
+    async def test_anthropic_usage_and_system_param(self):
+        """시스템 프롬프트는 messages가 아닌 system 파라미터"""
+        client = AnthropicClient.__new__(AnthropicClient)
+        client.model = "m"
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="text")],
+                usage=SimpleNamespace(input_tokens=7, output_tokens=3),
+            )
+
+        client.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+
+        assert await client.complete("p", "s") == ("text", token_usage(7, 3))
+        assert calls[0]["system"] == [
+            {"type": "text", "text": "s", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert [m["role"] for m in calls[0]["messages"]] == ["user"]
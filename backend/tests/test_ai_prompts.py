@@ -0,0 +1,116 @@
+"""
+AI 프롬프트 구조/토큰 계산 테스트
+정적 시스템 접두부와 동적 사용자 접미부 분리, 캐시 지점, provider 캐시 사용량 변환 검증
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_client import (
+    ANTHROPIC_SYSTEM_PROMPT,
+    OPENAI_SYSTEM_PROMPT,
+    AnthropicClient,
+    OpenAIClient,
+    anthropic_usage,
+    openai_usage,
+    token_cost,
+    token_usage,
+)
+from app.services.insight_stream import SECTION_KEYWORDS
+
+LOW = {"people": 2.0, "production": 3.25, "care": 4.5, "challenge": 5.0, "lmx": 1.75, "style": "Impoverished"}
+HIGH = {"people": 6.5, "production": 6.75, "care": 6.0, "challenge": 5.5, "lmx": 6.25, "style": "Team Leader"}
+
+
+def make_client(cls):
+    client = cls.__new__(cls)
+    client.model = "m"
+    return client
+
+
+class TestPromptPrefix:
+    """정적 접두부/동적 접미부 분리 테스트"""
+
+    @pytest.mark.parametrize("cls", [OpenAIClient, AnthropicClient])
+    def test_system_prompt_is_static(self, cls):
+        """시스템 프롬프트는 점수와 무관하게 동일, 점수/스타일은 사용자 프롬프트에만"""
+        client = make_client(cls)
+        low_system, low_prompt = client.build_prompts(LOW)
+        high_system, high_prompt = client.build_prompts(HIGH)
+
+        assert low_system == high_system
+        assert "1.75" in low_prompt and "Impoverished" in low_prompt
+        assert "1.75" not in low_system
+        # 동적 접미부는 정적 접두부보다 훨씬 짧음
+        assert len(low_prompt) * 3 < len(low_system)
+
+    @pytest.mark.parametrize("system_prompt", [OPENAI_SYSTEM_PROMPT, ANTHROPIC_SYSTEM_PROMPT])
+    def test_format_headings_stay_in_prefix(self, system_prompt):
+        """응답 파싱 기준 섹션 제목은 정적 접두부에 유지"""
+        for _, keywords in SECTION_KEYWORDS:
+            assert any(keyword in system_prompt for keyword in keywords)
+
+    def test_anthropic_cache_breakpoint(self):
+        """Anthropic 요청은 정적 시스템 프롬프트 끝에 캐시 지점"""
+        client = make_client(AnthropicClient)
+        system_prompt, prompt = client.build_prompts(LOW)
+
+        params = client.request_params(prompt, system_prompt)
+
+        assert params["system"] == [
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+        assert params["messages"] == [{"role": "user", "content": prompt}]
+
+    def test_openai_prefix_first(self):
+        """OpenAI 자동 캐시는 접두부 일치 기준이므로 정적 시스템 메시지가 먼저"""
+        client = make_client(OpenAIClient)
+        system_prompt, prompt = client.build_prompts(LOW)
+
+        messages = client.request_params(prompt, system_prompt)["messages"]
+
+        assert messages[0] == {"role": "system", "content": OPENAI_SYSTEM_PROMPT}
+        assert messages[1]["content"] == prompt
+
+
+class TestCachedUsage:
+    """provider 캐시 사용량 변환 테스트"""
+
+    def test_openai_cached_tokens(self):
+        usage = SimpleNamespace(
+            prompt_tokens=1500, completion_tokens=200,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+        )
+        assert openai_usage(usage) == token_usage(1500, 200, 1280)
+        assert openai_usage(SimpleNamespace(prompt_tokens=10, completion_tokens=5)) == token_usage(10, 5)
+
+    def test_anthropic_cache_read_and_write(self):
+        """input_tokens는 캐시 생성/적중분 포함 전체 입력"""
+        usage = SimpleNamespace(
+            input_tokens=40, output_tokens=300,
+            cache_creation_input_tokens=0, cache_read_input_tokens=1100,
+        )
+        assert anthropic_usage(usage) == token_usage(1140, 300, 1100)
+
+        first = SimpleNamespace(
+            input_tokens=40, output_tokens=300,
+            cache_creation_input_tokens=1100, cache_read_input_tokens=0,
+        )
+        assert anthropic_usage(first) == token_usage(1140, 300, 0)
+
+    def test_cached_input_priced_at_cache_read_rate(self, monkeypatch):
+        """캐시 적중 입력은 캐시 읽기 단가, 나머지 입력은 전체 단가"""
+        from app.services import ai_client
+
+        monkeypatch.setattr(ai_client.settings, "ANTHROPIC_INPUT_PRICE_PER_MTOK", 3.0)
+        monkeypatch.setattr(ai_client.settings, "ANTHROPIC_CACHED_INPUT_PRICE_PER_MTOK", 0.3)
+        monkeypatch.setattr(ai_client.settings, "ANTHROPIC_OUTPUT_PRICE_PER_MTOK", 15.0)
+        usage = anthropic_usage(SimpleNamespace(
+            input_tokens=40, output_tokens=300,
+            cache_creation_input_tokens=0, cache_read_input_tokens=1_000_000,
+        ))
+
+        assert token_cost("anthropic", usage) == pytest.approx((40 * 3.0 + 300 * 15.0) / 1_000_000 + 0.3)
+        assert token_cost("anthropic", usage, discount=0.5) == pytest.approx(token_cost("anthropic", usage) / 2)
+        assert token_cost("anthropic", usage) < token_cost("anthropic", token_usage(1_000_040, 300))
@@ -0,0 +1,182 @@
+"""
+AI provider 라우팅 테스트
+EWMA 지연 기준 선택, 실패 시 전환, 서킷 브레이커 열림/시험 요청, 헤징 검증
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.ai_router import CLOSED, OPEN, AIRouter, NoProviderAvailable
+
+
+class FakeProvider:
+    def __init__(self, name, delay=0.0, fail=False):
+        self.provider = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def analyze_leadership(self, data):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.provider} down")
+        return {"provider": self.provider}
+
+
+def make_router(*fakes, **kwargs):
+    clients = {fake.provider: fake for fake in fakes}
+
+    async def client_getter(provider):
+        return clients[provider]
+
+    return AIRouter(
+        providers=lambda: list(clients),
+        client_getter=client_getter,
+        default_provider=fakes[0].provider,
+        **kwargs,
+    )
+
+
+async def analyze(router, provider=None):
+    result = await router.run(lambda client: client.analyze_leadership({}), provider)
+    return result["provider"]
+
+
+class TestRouting:
+    """지연/오류율 기준 provider 선택 테스트"""
+
+    async def test_prefers_lower_latency(self):
+        """측정 전에는 기본 provider, 이후에는 EWMA 지연이 낮은 provider"""
+        slow, fast = FakeProvider("openai", delay=0.03), FakeProvider("anthropic", delay=0.0)
+        router = make_router(slow, fast)
+
+        assert await analyze(router) == "openai"
+        assert await analyze(router) == "anthropic"
+        assert [await analyze(router) for _ in range(5)] == ["anthropic"] * 5
+
+        stats = router.snapshot()["providers"]
+        assert stats["openai"]["ewma_latency_ms"] > stats["anthropic"]["ewma_latency_ms"]
+        assert stats["anthropic"]["routed"] == 6
+
+    async def test_failover_on_error(self):
+        """1순위 실패 시 같은 요청을 다음 provider로 전환"""
+        broken, healthy = FakeProvider("openai", fail=True), FakeProvider("anthropic")
+        router = make_router(broken, healthy)
+
+        assert await analyze(router) == "anthropic"
+
+        stats = router.snapshot()["providers"]
+        assert stats["openai"]["failures"] == 1
+        assert stats["openai"]["ewma_error_rate"] > 0
+        assert stats["anthropic"]["failovers"] == 1
+
+    async def test_explicit_provider_is_honored(self):
+        """provider 지정 요청은 다른 provider로 넘기지 않음"""
+        broken, healthy = FakeProvider("openai", fail=True), FakeProvider("anthropic")
+        router = make_router(broken, healthy)
+
+        with pytest.raises(RuntimeError):
+            await analyze(router, "openai")
+        assert healthy.calls == 0
+
+
+class TestCircuitBreaker:
+    """서킷 브레이커 테스트"""
+
+    async def test_opens_after_consecutive_failures(self):
+        """연속 실패가 기준에 도달하면 열리고 해당 provider 호출 중단"""
+        broken, healthy = FakeProvider("openai", fail=True), FakeProvider("anthropic", delay=0.01)
+        router = make_router(broken, healthy, failure_threshold=3, failure_penalty=0.0)
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await analyze(router, "openai")
+        assert router.health["openai"].state == OPEN
+
+        with pytest.raises(NoProviderAvailable):
+            await analyze(router, "openai")
+        assert await analyze(router) == "anthropic"
+        assert broken.calls == 3
+        assert router.snapshot()["providers"]["openai"]["circuit_opens"] == 1
+
+    async def test_half_open_trial(self):
+        """reset_timeout 후 시험 요청 1건, 성공하면 닫히고 실패하면 다시 열림"""
+        flaky = FakeProvider("openai", fail=True)
+        router = make_router(flaky, failure_threshold=1, reset_timeout=0.0)
+
+        with pytest.raises(RuntimeError):
+            await analyze(router)
+        assert router.health["openai"].state == OPEN
+
+        with pytest.raises(RuntimeError):
+            await analyze(router)
+        assert router.health["openai"].state == OPEN
+        assert router.health["openai"].circuit_opens == 2
+
+        flaky.fail = False
+        assert await analyze(router) == "openai"
+        assert router.health["openai"].state == CLOSED
+
+    async def test_half_open_allows_single_trial(self):
+        """시험 요청 진행 중에는 추가 요청 거부"""
+        slow = FakeProvider("openai", delay=0.02)
+        router = make_router(slow, failure_threshold=1, reset_timeout=0.0)
+        router.record("openai", None)
+
+        results = await asyncio.gather(analyze(router), analyze(router), return_exceptions=True)
+
+        assert results[0] == "openai"
+        assert isinstance(results[1], NoProviderAvailable)
+        assert slow.calls == 1
+        assert router.health["openai"].state == CLOSED
+
+
+class TestHedging:
+    """헤징 요청 테스트"""
+
+    async def test_hedge_wins_when_primary_stalls(self):
+        """1순위가 지연 기준을 넘기면 2순위 결과 사용, 1순위는 취소"""
+        stalled, backup = FakeProvider("openai", delay=1.0), FakeProvider("anthropic", delay=0.0)
+        router = make_router(stalled, backup, hedge=True, hedge_min_delay=0.02)
+
+        started = asyncio.get_running_loop().time()
+        assert await analyze(router) == "anthropic"
+        assert asyncio.get_running_loop().time() - started < 0.5
+
+        await asyncio.sleep(0)
+        assert stalled.cancelled == 1
+        stats = router.snapshot()["providers"]
+        assert (stats["anthropic"]["hedges"], stats["anthropic"]["hedge_wins"]) == (1, 1)
+        # 취소된 헤징 패배는 실패로 기록하지 않음
+        assert stats["openai"]["failures"] == 0
+
+    async def test_no_hedge_when_primary_is_fast(self):
+        """1순위가 지연 기준 안에 응답하면 2순위 호출 없음"""
+        fast, backup = FakeProvider("openai"), FakeProvider("anthropic")
+        router = make_router(fast, backup, hedge=True, hedge_min_delay=0.05)
+
+        assert await analyze(router) == "openai"
+        assert backup.calls == 0
+
+    async def test_hedge_delay_uses_p95(self):
+        """표본이 충분하면 p95 지연을 헤징 기준으로 사용"""
+        router = make_router(FakeProvider("openai"), hedge=True, hedge_min_delay=0.0, hedge_min_samples=20)
+        for index in range(100):
+            router.record("openai", index / 100)
+
+        assert router.hedge_delay("openai") == pytest.approx(0.95)
+
+    async def test_primary_failure_before_hedge_fails_over(self):
+        """헤징 전에 1순위가 실패하면 즉시 2순위로 전환"""
+        broken, backup = FakeProvider("openai", fail=True), FakeProvider("anthropic")
+        router = make_router(broken, backup, hedge=True, hedge_min_delay=1.0)
+
+        assert await analyze(router) == "anthropic"
+        assert router.snapshot()["providers"]["anthropic"]["failovers"] == 1
@@ -0,0 +1,71 @@
+"""
+분석 재계산(backfill) 작업 테스트
+청크 단위 처리, upsert 멱등성, 체크포인트 재개 검증
+"""
+
+import pytest
+from conftest import FakeBackfillSupabase, make_survey_rows
+
+from app.services.analysis import LeadershipAnalyzer
+from app.services.backfill import AnalysisBackfill, BackfillCheckpoint
+
+
+class TestAnalysisBackfill:
+    """재분석 배치 작업 테스트"""
+
+    async def test_backfill_matches_single_analysis(self, tmp_path):
+        """일괄 재분석 결과가 단건 분석과 동일"""
+        rows = make_survey_rows(25)
+        db = FakeBackfillSupabase(rows)
+        backfill = AnalysisBackfill(
+            db=db, chunk_size=10, checkpoint_path=str(tmp_path / "cp.json")
+        )
+
+        checkpoint = await backfill.run()
+
+        assert checkpoint.completed
+        assert checkpoint.processed == 25
+        assert db.tables["leadership_analysis"].upsert_calls == 3
+
+        analyses = {
+            a["survey_response_id"]: a for a in db.tables["leadership_analysis"].rows
+        }
+        for row in rows:
+            dims = LeadershipAnalyzer.calculate_dimensions(row["responses"])
+            style = LeadershipAnalyzer.classify_leadership_style(
+                dims.people, dims.production
+            )
+            analysis = analyses[row["id"]]
+            assert analysis["blake_mouton_people"] == dims.people
+            assert analysis["leadership_style"] == style.value
+            assert analysis["overall_risk_level"] == (
+                LeadershipAnalyzer.assess_risk_level(dims).value
+            )
+            assert analysis["ai_insights"] == (
+                LeadershipAnalyzer.generate_rule_based_insights(dims, style)
+            )
+
+    async def test_resume_after_crash(self, tmp_path):
+        """중단 후 재실행 시 체크포인트부터 이어서 처리"""
+        rows = make_survey_rows(30)
+        db = FakeBackfillSupabase(rows, fail_on_upsert=2)
+        checkpoint_path = str(tmp_path / "cp.json")
+        backfill = AnalysisBackfill(
+            db=db, chunk_size=10, checkpoint_path=checkpoint_path
+        )
+
+        with pytest.raises(RuntimeError):
+            await backfill.run()
+
+        saved = BackfillCheckpoint.load(checkpoint_path)
+        assert saved.processed == 10
+        assert saved.last_response_id == "resp-00009"
+
+        checkpoint = await backfill.run()
+
+        assert checkpoint.completed
+        assert checkpoint.processed == 30
+        analyses = db.tables["leadership_analysis"].rows
+        assert sorted(a["survey_response_id"] for a in analyses) == [
+            row["id"] for row in rows
+        ]
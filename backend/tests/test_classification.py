@@ -0,0 +1,131 @@
+"""
+분류 커널 테스트
+배열 커널이 스칼라 분류기/SQL 함수와 동일한 결과를 내는지 검증
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+
+from app.schemas.analysis import LeadershipDimensions
+from app.services.analysis import LeadershipAnalyzer
+from app.services.classification import (
+    GRID_STYLE_LABELS,
+    GRID_STYLE_SQL_LABELS,
+    assess_risk_levels,
+    classify_grid_styles,
+    classify_styles,
+    decode_risks,
+    decode_styles,
+)
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "supabase" / "migrations" / "20250802000000_initial_schema.sql"
+)
+
+
+def score_grid():
+    """경계값을 포함한 점수 격자 (0.05 단위, 1-7)"""
+    values = np.round(np.arange(1.0, 7.001, 0.05), 2)
+    people, production = np.meshgrid(values, values)
+    return people.ravel(), production.ravel()
+
+
+def legacy_determine_leadership_style(people, production):
+    """AIAnalysisService._determine_leadership_style 기존 분기 (기준값)"""
+    if people <= 3 and production <= 3:
+        return "Impoverished Management"
+    elif people <= 3 and production > 5:
+        return "Authority-Compliance"
+    elif people > 5 and production <= 3:
+        return "Country Club Management"
+    elif 4 <= people <= 5 and 4 <= production <= 5:
+        return "Middle of the Road"
+    elif people > 5 and production > 5:
+        return "Team Leadership"
+    else:
+        return "Transitional"
+
+
+def load_sql_style_rules():
+    """마이그레이션의 get_leadership_style 분기를 (조건식, 결과) 목록으로 변환"""
+    sql = MIGRATION_PATH.read_text(encoding="utf-8")
+    body = re.search(
+        r"FUNCTION get_leadership_style\(.*?BEGIN(.*?)END IF;", sql, re.S
+    ).group(1)
+
+    rules = []
+    condition = None
+    for line in body.splitlines():
+        line = line.strip()
+        match = re.match(r"(?:ELS)?IF (.+) THEN", line)
+        if match:
+            condition = match.group(1).replace(" AND ", " and ")
+        elif line == "ELSE":
+            condition = "True"
+        elif line.startswith("RETURN"):
+            rules.append((condition, re.search(r"'(.+)'", line).group(1)))
+    return rules
+
+
+class TestStyleKernel:
+    """스타일 분류 커널 테스트"""
+
+    def test_matches_scalar_classifier(self):
+        """LeadershipAnalyzer.classify_leadership_style과 결과 일치"""
+        people, production = score_grid()
+        styles = decode_styles(classify_styles(people, production))
+
+        for p, q, style in zip(people.tolist(), production.tolist(), styles):
+            assert style == LeadershipAnalyzer.classify_leadership_style(p, q), (p, q)
+
+    def test_matches_ai_service_classifier(self):
+        """AIAnalysisService 분기와 결과 일치"""
+        people, production = score_grid()
+        codes = classify_grid_styles(people, production)
+
+        for p, q, code in zip(people.tolist(), production.tolist(), codes.tolist()):
+            assert GRID_STYLE_LABELS[code] == legacy_determine_leadership_style(p, q)
+
+    def test_matches_sql_function(self):
+        """SQL get_leadership_style 함수와 결과 일치"""
+        rules = load_sql_style_rules()
+        assert len(rules) == len(GRID_STYLE_SQL_LABELS)
+
+        people, production = score_grid()
+        codes = classify_grid_styles(people, production)
+
+        for p, q, code in zip(people.tolist(), production.tolist(), codes.tolist()):
+            scope = {"people_score": p, "production_score": q}
+            expected = next(
+                label for condition, label in rules if eval(condition, {}, scope)
+            )
+            assert GRID_STYLE_SQL_LABELS[code] == expected, (p, q)
+
+
+class TestRiskKernel:
+    """위험도 평가 커널 테스트"""
+
+    def test_matches_scalar_assessment(self):
+        """LeadershipAnalyzer.assess_risk_level과 결과 일치"""
+        rng = np.random.default_rng(0)
+        size = 5000
+        dimensions = {
+            "people": np.full(size, 4.0),
+            "production": np.full(size, 4.0),
+            "care": np.round(rng.uniform(1, 7, size), 2),
+            "challenge": np.full(size, 4.0),
+            "lmx_score": np.round(rng.uniform(1, 7, size), 2),
+            "machiavellianism": np.round(rng.uniform(1, 5, size), 2),
+            "narcissism": np.round(rng.uniform(1, 5, size), 2),
+            "psychopathy": np.round(rng.uniform(1, 5, size), 2),
+        }
+        risks = decode_risks(assess_risk_levels(dimensions))
+
+        for i, risk in enumerate(risks):
+            row = LeadershipDimensions(
+                **{name: float(values[i]) for name, values in dimensions.items()}
+            )
+            assert risk == LeadershipAnalyzer.assess_risk_level(row), i
@@ -0,0 +1,83 @@
+"""
+사용자별 클라이언트 풀 테스트
+토큰 기준 재사용, JWT 만료 제거, LRU 크기 제한, 통계 검증
+"""
+
+import time
+
+from jose import jwt
+
+from app.core import client_pool
+from app.core.client_pool import UserClientPool, token_ttl
+
+
+def make_token(sub: str, expires_in: float = 3600) -> str:
+    return jwt.encode({"sub": sub, "exp": int(time.time() + expires_in)}, "secret")
+
+
+class FakeFactory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self, access_token):
+        client = object()
+        self.created.append((access_token, client))
+        return client
+
+
+class TestUserClientPool:
+    """풀 동작 테스트"""
+
+    def test_reuses_client_per_token(self):
+        """같은 토큰은 같은 클라이언트, 다른 토큰은 새 클라이언트"""
+        factory = FakeFactory()
+        pool = UserClientPool("test-reuse", factory)
+        alice, bob = make_token("alice"), make_token("bob")
+
+        first = pool.get(alice)
+        assert pool.get(alice) is first
+        assert pool.get(bob) is not first
+
+        assert len(factory.created) == 2
+        assert pool.snapshot() == {
+            "size": 2, "max_size": 256, "created": 2, "reused": 1, "expired": 0, "evicted": 0,
+        }
+
+    def test_expired_token_is_recreated(self, monkeypatch):
+        """JWT 만료 후에는 제거하고 새로 생성, 이미 만료된 토큰은 풀에 넣지 않음"""
+        factory = FakeFactory()
+        pool = UserClientPool("test-expiry", factory)
+        token = make_token("alice", expires_in=60)
+
+        first = pool.get(token)
+        now = time.monotonic()
+        monkeypatch.setattr(client_pool.time, "monotonic", lambda: now + 61)
+        assert pool.get(token) is not first
+        assert pool.stats.expired == 1
+
+        pool.get(make_token("bob", expires_in=-5))
+        assert len(pool) == 1
+        assert pool.stats.created == 3
+
+    def test_lru_bound(self):
+        """최대 크기 초과 시 가장 오래 사용하지 않은 토큰 제거"""
+        factory = FakeFactory()
+        pool = UserClientPool("test-lru", factory, max_size=2)
+        a, b, c = (make_token(name) for name in "abc")
+
+        client_a = pool.get(a)
+        pool.get(b)
+        pool.get(a)
+        pool.get(c)
+
+        assert pool.get(a) is client_a
+        assert pool.stats.evicted == 1
+        assert len(factory.created) == 3
+        pool.get(b)
+        assert len(factory.created) == 4
+
+    def test_token_ttl_without_exp(self):
+        """exp 클레임이 없거나 JWT가 아니면 기본 TTL"""
+        assert token_ttl(jwt.encode({"sub": "x"}, "secret"), 120.0) == 120.0
+        assert token_ttl("not-a-jwt", 120.0) == 120.0
+        assert 3500 < token_ttl(make_token("x"), 120.0) <= 3600
@@ -0,0 +1,226 @@
+"""
+대량 설문 입력 테스트
+NDJSON/CSV 파싱, 행별 오류, 배치 저장/분석 일괄 등록, 배치 실패 처리 검증
+"""
+
+import json
+
+from app.services.ingest import SurveyBulkIngestor, iter_lines
+from app.services.jobs import AnalysisJobQueue
+
+QUESTIONS = {"bm_1": 5, "bm_2": 3}
+EXISTING_USER = "3f2b8c1e-6a4d-4e0b-9c7a-1d2e3f4a5b6c"
+
+
+class FakeRepository:
+    def __init__(self, fail_insert=False):
+        self.fail_insert = fail_insert
+        self.user_batches = []
+        self.response_batches = []
+        self.id_lookups = []
+
+    async def ensure_users(self, users):
+        self.user_batches.append(users)
+        return {user["email"]: f"user-{user['email']}" for user in users}
+
+    async def existing_user_ids(self, user_ids):
+        self.id_lookups.append(user_ids)
+        return {user_id for user_id in user_ids if user_id == EXISTING_USER}
+
+    async def insert_survey_responses(self, rows):
+        if self.fail_insert:
+            raise RuntimeError("db down")
+        self.response_batches.append(rows)
+
+
+async def noop_handler(payload):
+    return None
+
+
+async def stream(body: bytes, chunk_size: int = 7):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+def ndjson(*rows) -> bytes:
+    return "".join(
+        (row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def row(email: str, **extra):
+    return {"name": "Kim", "email": email, "responses": QUESTIONS, **extra}
+
+
+class TestIterLines:
+    """스트림 줄 분리 테스트"""
+
+    async def test_split_across_chunks(self):
+        """청크 경계에 걸친 줄/멀티바이트 문자/CRLF 처리"""
+        body = "이름,email\r\n김철수,a@example.com\r\nlast".encode("utf-8")
+
+        lines = [line async for line in iter_lines(stream(body, chunk_size=3))]
+
+        assert lines == ["이름,email", "김철수,a@example.com", "last"]
+
+
+class TestSurveyBulkIngestor:
+    """대량 입력 처리 테스트"""
+
+    async def test_ndjson_batches_and_enqueue(self):
+        """배치 크기마다 저장하고 저장된 응답마다 분석 작업 등록"""
+        repo = FakeRepository()
+        queue = AnalysisJobQueue(noop_handler)
+        body = ndjson(
+            row("a@example.com"),
+            row("b@example.com", responses=[{"question_id": "bm_1", "value": 2}]),
+            row("c@example.com", user_id=EXISTING_USER.upper()),
+        )
+
+        result = await SurveyBulkIngestor(
+            repo, queue, batch_size=2, ai_provider="anthropic",
+        ).ingest(stream(body), "ndjson")
+
+        assert (result.total_rows, result.inserted, result.failed) == (3, 3, 0)
+        assert result.analyses_enqueued == 3
+        assert [len(batch) for batch in repo.response_batches] == [2, 1]
+        # user_id가 있는 행은 사용자 확인 생략
+        assert [[u["email"] for u in batch] for batch in repo.user_batches] == [
+            ["a@example.com", "b@example.com"],
+        ]
+
+        rows = [r for batch in repo.response_batches for r in batch]
+        assert rows[1]["responses"] == {"bm_1": 2}
+        assert rows[2]["user_id"] == EXISTING_USER
+        job = await queue.get(next(iter(queue.backend.jobs)))
+        assert job.payload["ai_provider"] == "anthropic"
+        assert job.payload["survey_response_id"] == rows[0]["id"]
+
+    async def test_per_row_errors(self):
+        """파싱/검증 실패 행은 건너뛰고 행 번호와 사유 반환"""
+        repo = FakeRepository()
+        body = ndjson(
+            row("a@example.com"),
+            "{not json",
+            row("not-an-email"),
+            row("b@example.com", responses={"bm_1": 9}),
+            row("c@example.com", survey_version="9.9"),
+            "[1, 2]",
+        )
+
+        result = await SurveyBulkIngestor(repo).ingest(stream(body), "ndjson")
+
+        assert (result.total_rows, result.inserted, result.failed) == (6, 1, 5)
+        assert [e.row for e in result.errors] == [2, 3, 4, 5, 6]
+        assert result.errors[0].error.startswith("parse error")
+        assert result.errors[1].error.startswith("email")
+        assert result.errors[2].error.startswith("responses.bm_1")
+        assert result.analyses_enqueued == 0
+
+    async def test_csv(self):
+        """헤더 행 기준 프로필 컬럼/문항 컬럼 분리, 빈 칸은 미응답"""
+        repo = FakeRepository()
+        body = (
+            "email,name,department,bm_1,bm_2\n"
+            "a@example.com,Kim,Sales,5,\n"
+            "b@example.com,Lee,,8,1\n"
+            "c@example.com,Park\n"
+        ).encode("utf-8")
+
+        result = await SurveyBulkIngestor(repo).ingest(stream(body), "csv")
+
+        assert (result.total_rows, result.inserted, result.failed) == (3, 1, 2)
+        assert repo.response_batches[0][0]["responses"] == {"bm_1": 5}
+        assert repo.user_batches[0][0]["department"] == "Sales"
+        assert [e.row for e in result.errors] == [2, 3]
+        assert "columns" in result.errors[1].error
+
+    async def test_user_id_checked_per_row(self):
+        """형식이 잘못되거나 없는 user_id 행만 실패, 같은 배치의 나머지 행은 저장"""
+        repo = FakeRepository()
+        body = ndjson(
+            row("a@example.com", user_id=EXISTING_USER),
+            row("b@example.com", user_id="not-a-uuid"),
+            row("c@example.com", user_id="00000000-0000-4000-8000-000000000000"),
+            row("d@example.com"),
+        )
+
+        result = await SurveyBulkIngestor(repo).ingest(stream(body), "ndjson")
+
+        assert (result.inserted, result.failed) == (2, 2)
+        assert [e.row for e in result.errors] == [2, 3]
+        assert result.errors[0].error.startswith("user_id")
+        assert result.errors[1].error.startswith("unknown user_id")
+        # 배치당 한 번만 조회
+        assert len(repo.id_lookups) == 1
+        assert [r["user_id"] for r in repo.response_batches[0]] == [EXISTING_USER, "user-d@example.com"]
+
+    async def test_batch_failure_marks_rows(self):
+        """DB 저장 실패 시 배치 행 전체를 실패로 기록하고 작업은 등록하지 않음"""
+        repo = FakeRepository(fail_insert=True)
+        queue = AnalysisJobQueue(noop_handler)
+        body = ndjson(row("a@example.com"), row("b@example.com"))
+
+        result = await SurveyBulkIngestor(repo, queue).ingest(stream(body), "ndjson")
+
+        assert (result.inserted, result.failed, result.analyses_enqueued) == (0, 2, 0)
+        assert all("db down" in e.error for e in result.errors)
+
+    async def test_error_list_is_bounded(self):
+        """오류 목록은 max_errors까지만 반환 (실패 건수는 전체)"""
+        body = ndjson(*["{bad"] * 5)
+
+        result = await SurveyBulkIngestor(
+            FakeRepository(), max_errors=2,
+        ).ingest(stream(body), "ndjson")
+
+        assert result.failed == 5
+        assert len(result.errors) == 2
+        assert result.errors_truncated is True
+
+    async def test_line_length_limit(self, monkeypatch):
+        """줄바꿈 없이 계속되는 본문은 중단하고 그때까지 저장한 부분 결과 반환"""
+        from app.services import ingest
+
+        monkeypatch.setattr(ingest, "MAX_LINE_LENGTH", 200)
+        repo = FakeRepository()
+        body = ndjson(row("a@example.com"), row("b@example.com"), row("c@example.com")) + b"x" * 500
+
+        result = await SurveyBulkIngestor(repo, batch_size=2).ingest(stream(body, chunk_size=64), "ndjson")
+
+        assert (result.total_rows, result.inserted, result.failed) == (3, 3, 0)
+        assert "stream aborted after row 3" in result.error
+        assert "exceeds 200 characters" in result.error
+        assert sum(len(batch) for batch in repo.response_batches) == 3
+
+    async def test_enqueue_failure_keeps_result(self):
+        """분석 등록 실패는 저장 결과를 유지하고 미등록 응답 ID로 기록"""
+        class FailingQueue:
+            async def enqueue_many(self, payloads):
+                raise RuntimeError("redis down")
+
+        repo = FakeRepository()
+        body = ndjson(row("a@example.com"), row("b@example.com"), row("c@example.com"))
+
+        result = await SurveyBulkIngestor(repo, FailingQueue(), batch_size=2).ingest(stream(body), "ndjson")
+
+        inserted_ids = [r["id"] for batch in repo.response_batches for r in batch]
+        assert (result.inserted, result.failed, result.error) == (3, 0, None)
+        assert (result.analyses_enqueued, result.analyses_failed) == (0, 3)
+        assert result.unanalyzed_response_ids == inserted_ids
+
+    async def test_unanalyzed_ids_are_bounded(self):
+        """미등록 응답 ID도 max_errors까지만 반환"""
+        class FailingQueue:
+            async def enqueue_many(self, payloads):
+                raise RuntimeError("redis down")
+
+        body = ndjson(*[row(f"{i}@example.com") for i in range(5)])
+
+        result = await SurveyBulkIngestor(
+            FakeRepository(), FailingQueue(), batch_size=2, max_errors=3,
+        ).ingest(stream(body), "ndjson")
+
+        assert result.analyses_failed == 5
+        assert len(result.unanalyzed_response_ids) == 3
+        assert result.unanalyzed_truncated is True
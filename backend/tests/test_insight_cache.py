@@ -0,0 +1,148 @@
+"""
+LLM 인사이트 캐시 테스트
+양자화 키, LRU/TTL, 적중률/절감 시간, 인사이트 생성 연동 검증
+"""
+
+import time
+
+import pytest
+from conftest import make_dimensions
+
+from app.schemas.analysis import LeadershipStyle
+from app.services import analysis
+from app.services.ai_router import AIRouter
+from app.services.analysis import LeadershipAnalyzer
+from app.services.insight_cache import InsightCache, quantize
+
+
+class FakeAIClient:
+    model = "fake-model"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def analyze_leadership(self, data):
+        self.prompts.append(data)
+        return {"strengths": ["s"], "improvements": ["i"], "provider": "openai"}
+
+
+class TestInsightCache:
+    """2단계 캐시 동작 테스트"""
+
+    def test_quantized_key(self):
+        """같은 구간 점수는 같은 키, 문맥이 다르면 다른 키"""
+        cache = InsightCache(quantum=0.25, use_redis=False)
+        base = cache.key({"people": 5.1, "production": 4.9}, style="Team Leader")
+
+        assert quantize(5.1, 0.25) == 5.0
+        assert quantize(5.13, 0.25) == 5.25
+        assert cache.key({"people": 5.05, "production": 4.95}, style="Team Leader") == base
+        assert cache.key({"people": 5.2, "production": 4.9}, style="Team Leader") != base
+        assert cache.key({"people": 5.1, "production": 4.9}, style="Custom") != base
+
+    async def test_lru_eviction_and_ttl(self, monkeypatch):
+        """최대 항목 수 초과 시 가장 오래된 항목 제거, TTL 만료 시 미적중"""
+        cache = InsightCache(max_entries=2, local_ttl=10, use_redis=False)
+        await cache.set("a", {"v": 1})
+        await cache.set("b", {"v": 2})
+        assert await cache.get("a") == {"v": 1}
+        await cache.set("c", {"v": 3})
+
+        assert await cache.get("b") is None
+        assert await cache.get("c") == {"v": 3}
+
+        now = time.monotonic()
+        monkeypatch.setattr("app.services.insight_cache.time.monotonic", lambda: now + 11)
+        assert await cache.get("a") is None
+
+    async def test_stats_and_failures(self):
+        """적중률/절감 시간 집계, 생성 실패는 저장하지 않음"""
+        cache = InsightCache(use_redis=False)
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            return {"v": 1}
+
+        async def failing():
+            raise RuntimeError("llm down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_generate("k", failing)
+        await cache.get_or_generate("k", generate)
+        await cache.get_or_generate("k", generate)
+
+        stats = cache.stats.snapshot()
+        assert len(calls) == 1
+        assert stats["local_hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_ratio"] == pytest.approx(1 / 3, abs=1e-4)
+        assert stats["saved_seconds"] >= 0
+
+
+class TestGenerateInsightsCache:
+    """LeadershipAnalyzer.generate_insights 캐시 연동 테스트"""
+
+    async def test_near_identical_profiles_share_insights(self, monkeypatch):
+        """근접 점수 리더는 LLM 1회 호출 결과를 공유"""
+        client = FakeAIClient()
+        cache = InsightCache(quantum=0.25, use_redis=False)
+
+        async def fake_get_ai_client(provider=None):
+            return client
+
+        monkeypatch.setattr(analysis, "insight_cache", cache)
+        monkeypatch.setattr(analysis, "ai_router", AIRouter(client_getter=fake_get_ai_client))
+
+        style = LeadershipStyle.MIDDLE_OF_THE_ROAD
+        first = await LeadershipAnalyzer.generate_insights(make_dimensions(), style, "openai")
+        second = await LeadershipAnalyzer.generate_insights(
+            make_dimensions(people=5.05, lmx_score=5.45), style, "openai"
+        )
+        await LeadershipAnalyzer.generate_insights(make_dimensions(people=6.0), style, "openai")
+
+        assert first == second
+        assert len(client.prompts) == 2
+        assert client.prompts[0]["people"] == 5.0
+        assert client.prompts[0]["lmx"] == 5.5
+        assert cache.stats.local_hits == 1
+
+    async def test_failover_result_not_cached_for_explicit_provider(self, monkeypatch):
+        """기본 provider 실패로 대체 provider가 응답한 결과는 기본 provider 지정 요청에 재사용되지 않음"""
+        class ProviderClient(FakeAIClient):
+            def __init__(self, provider, fail=False):
+                super().__init__()
+                self.provider = provider
+                self.fail = fail
+
+            async def analyze_leadership(self, data):
+                self.prompts.append(data)
+                if self.fail:
+                    raise RuntimeError(f"{self.provider} down")
+                return {"strengths": [self.provider], "provider": self.provider}
+
+        clients = {"openai": ProviderClient("openai", fail=True), "anthropic": ProviderClient("anthropic")}
+
+        async def fake_get_ai_client(provider=None):
+            return clients[provider]
+
+        router = AIRouter(
+            providers=lambda: ["openai", "anthropic"],
+            client_getter=fake_get_ai_client,
+            default_provider="openai",
+        )
+        monkeypatch.setattr(analysis, "insight_cache", InsightCache(use_redis=False))
+        monkeypatch.setattr(analysis, "ai_router", router)
+
+        style = LeadershipStyle.MIDDLE_OF_THE_ROAD
+        routed = await LeadershipAnalyzer.generate_insights(make_dimensions(), style)
+        assert routed["ai_provider"] == "anthropic"
+
+        clients["openai"].fail = False
+        explicit = await LeadershipAnalyzer.generate_insights(make_dimensions(), style, "openai")
+        again = await LeadershipAnalyzer.generate_insights(make_dimensions(), style)
+
+        assert explicit["ai_provider"] == "openai"
+        assert len(clients["openai"].prompts) == 2
+        assert again["ai_provider"] == "anthropic"
+        assert len(clients["anthropic"].prompts) == 1
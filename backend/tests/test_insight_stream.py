@@ -0,0 +1,198 @@
+"""
+AI 인사이트 스트리밍 테스트
+섹션 증분 파싱, 이벤트 순서/첫 항목 도착 시점, 완료 시 저장, 캐시/대체/연결 끊김 검증
+"""
+
+import asyncio
+import time
+
+import pytest
+from conftest import ANTHROPIC_TEXT, OPENAI_TEXT, FakeSupabase, make_random_responses
+
+from app.services import insight_stream
+from app.services.ai_router import CLOSED, AIRouter
+from app.services.insight_cache import InsightCache
+from app.services.insight_stream import InsightStreamParser, stream_leadership_analysis
+
+
+def chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class FakeStreamingClient:
+    model = "fake-model"
+    model_label = "Fake"
+    provider = "openai"
+
+    def __init__(self, text=OPENAI_TEXT, delay=0.01, fail_after=None):
+        self.text = text
+        self.delay = delay
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def build_prompts(self, data):
+        return "system", f"prompt {data['style']}"
+
+    async def stream_insight(self, prompt, system_prompt=None):
+        self.calls += 1
+        for index, piece in enumerate(chunks(self.text, 16)):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("stream dropped")
+            await asyncio.sleep(self.delay)
+            yield piece
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    db = FakeSupabase()
+    client = FakeStreamingClient()
+
+    async def fake_get_db():
+        return db
+
+    async def fake_get_ai_client(provider=None):
+        return client
+
+    monkeypatch.setattr(insight_stream, "get_async_service_supabase", fake_get_db)
+    monkeypatch.setattr(insight_stream, "get_ai_client", fake_get_ai_client)
+    monkeypatch.setattr(insight_stream, "insight_cache", InsightCache(use_redis=False))
+    monkeypatch.setattr(insight_stream, "ai_router", AIRouter(providers=lambda: ["openai"]))
+    return db, client
+
+
+def survey_response(seed: int = 0):
+    return {
+        "id": f"resp-{seed}",
+        "responses": make_random_responses(1, seed=seed)[0],
+        "survey_version": None,
+    }
+
+
+async def collect(events):
+    received = []
+    async for event, data in events:
+        received.append((time.perf_counter(), event, data))
+    return received
+
+
+class TestInsightStreamParser:
+    """섹션 증분 파싱 테스트"""
+
+    @pytest.mark.parametrize("size", [1, 7, 1000])
+    def test_openai_format(self, size):
+        """청크 크기와 무관하게 같은 결과, 섹션별 최대 항목 수 적용"""
+        parser = InsightStreamParser()
+        items = [item for piece in chunks(OPENAI_TEXT, size) for item in parser.feed(piece)]
+        items += parser.close()
+
+        assert parser.result() == {
+            "strengths": ["팀원과의 신뢰 관계", "명확한 목표 설정: 방향 제시", "일관된 피드백"],
+            "improvements": ["위임 부족", "갈등 회피"],
+            "action_plans": ["주간 1:1 미팅", "분기별 목표 점검"],
+            "expected_outcomes": "팀 몰입도가 높아지고 이직률이 감소합니다.",
+        }
+        assert items[0] == ("strengths", "팀원과의 신뢰 관계")
+
+    def test_anthropic_format(self):
+        """굵은 제목 형식, 목록이 아닌 설명 문장은 제외"""
+        parser = InsightStreamParser()
+        parser.feed(ANTHROPIC_TEXT)
+        parser.close()
+
+        result = parser.result()
+        assert result["strengths"] == ["공감 능력", "실행력"]
+        assert result["improvements"] == ["과도한 개입"]
+        assert result["action_plans"] == ["코칭 대화 연습"]
+        assert result["expected_outcomes"] == "자율적인 팀 문화가 자리잡습니다."
+
+
+class TestStreamLeadershipAnalysis:
+    """분석 이벤트 스트림 테스트"""
+
+    async def test_streams_before_completion_and_persists(self, stream_env):
+        """점수 -> 항목(생성 중 도착) -> done 순서, 완료 시 분석 저장 및 캐시"""
+        db, client = stream_env
+        started = time.perf_counter()
+
+        received = await collect(stream_leadership_analysis("u1", survey_response()))
+
+        events = [event for _, event, _ in received]
+        assert events[0] == "scores"
+        assert events[-1] == "done"
+        first_insight = next(at for at, event, _ in received if event == "insight")
+        # 첫 항목은 전체 스트림(약 30청크 x 10ms) 완료보다 훨씬 먼저 도착
+        assert first_insight - started < (received[-1][0] - started) / 2
+
+        done = received[-1][2]
+        assert done["source"] == "llm"
+        assert done["strengths"][0] == "팀원과의 신뢰 관계"
+        assert done["expected_outcomes"].startswith("팀 몰입도")
+
+        assert len(db.rows) == 1
+        record = db.rows[0]
+        assert record["survey_response_id"] == "resp-0"
+        assert record["content_hash"]
+        assert record["ai_insights"]["ai_insights"]["action_plans"] == ["주간 1:1 미팅", "분기별 목표 점검"]
+
+    async def test_cache_and_memo_skip_llm(self, stream_env):
+        """같은 점수 구간은 캐시, 같은 응답은 메모 재사용 (LLM 재호출 없음)"""
+        db, client = stream_env
+        await collect(stream_leadership_analysis("u1", survey_response()))
+
+        memo_hit = await collect(
+            stream_leadership_analysis("u2", {**survey_response(), "id": "resp-u2"})
+        )
+        assert memo_hit[-1][2]["source"] == "memo"
+        assert [row["user_id"] for row in db.rows] == ["u1", "u2"]
+
+        refreshed = await collect(
+            stream_leadership_analysis("u1", survey_response(), force_refresh=True)
+        )
+        assert refreshed[-1][2]["source"] == "cache"
+        assert client.calls == 1
+
+    async def test_failure_falls_back_to_rule_based(self, stream_env):
+        """스트림 실패 시 error 이벤트 후 규칙 기반 결과 저장 (재사용 키 없음)"""
+        db, client = stream_env
+        client.fail_after = 3
+
+        received = await collect(stream_leadership_analysis("u1", survey_response()))
+
+        events = [event for _, event, _ in received]
+        assert "error" in events
+        assert received[-1][2]["source"] == "rule_based"
+        assert db.rows[0]["content_hash"] is None
+
+    async def test_disconnect_still_persists(self, stream_env):
+        """소비자가 첫 이벤트 후 끊어도 생성/저장은 완료"""
+        db, client = stream_env
+        events = stream_leadership_analysis("u1", survey_response())
+
+        assert (await events.__anext__())[0] == "scores"
+        await events.aclose()
+
+        await asyncio.wait_for(asyncio.gather(*insight_stream._background_tasks), 5)
+        assert len(db.rows) == 1
+
+    async def test_client_setup_failure_releases_half_open_trial(self, stream_env, monkeypatch):
+        """클라이언트 생성 실패도 시험 호출 실패로 기록 (서킷이 다시 닫힐 수 있음)"""
+        db, client = stream_env
+        router = AIRouter(providers=lambda: ["openai"], failure_threshold=1, reset_timeout=0.0)
+        router.record("openai", None)
+        monkeypatch.setattr(insight_stream, "ai_router", router)
+
+        async def missing_key(provider=None):
+            raise ValueError("OpenAI API key is not configured")
+
+        monkeypatch.setattr(insight_stream, "get_ai_client", missing_key)
+        failed = await collect(stream_leadership_analysis("u1", survey_response()))
+        assert failed[-1][2]["source"] == "rule_based"
+        assert not router.health["openai"].trial_in_flight
+
+        async def fake_get_ai_client(provider=None):
+            return client
+
+        monkeypatch.setattr(insight_stream, "get_ai_client", fake_get_ai_client)
+        recovered = await collect(stream_leadership_analysis("u1", survey_response(1)))
+        assert recovered[-1][2]["source"] == "llm"
+        assert router.health["openai"].state == CLOSED
@@ -0,0 +1,231 @@
+"""
+분석 작업 큐 테스트
+워커 풀 처리, 재시도/백오프, dead-letter 검증
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.jobs import AnalysisJob, AnalysisJobQueue, JobStatus, RedisJobBackend
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis Lua 스크립트 실행)
+except ImportError:  # 개발 의존성 미설치 시 Redis 백엔드 테스트만 건너뜀
+    fakeredis = None
+
+
+def make_queue(handler, **kwargs):
+    options = {"workers": 4, "max_attempts": 3, "backoff_base": 0.01, "poll_interval": 0.05}
+    options.update(kwargs)
+    return AnalysisJobQueue(handler, **options)
+
+
+class TestAnalysisJobQueue:
+    """분석 작업 큐 테스트"""
+
+    async def test_burst_processed_by_worker_pool(self):
+        """동시 실행 수를 워커 수로 제한하며 전체 작업 처리"""
+        running = 0
+        peak = 0
+        done = []
+
+        async def handler(payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            done.append(payload["user_id"])
+
+        queue = make_queue(handler, workers=8)
+        await queue.start()
+        try:
+            jobs = [await queue.enqueue({"user_id": f"u{i}"}) for i in range(200)]
+            assert all(job.status == JobStatus.QUEUED for job in jobs)
+
+            results = await asyncio.gather(*(queue.wait(job.id, 10) for job in jobs))
+        finally:
+            await queue.stop()
+
+        assert all(job.status == JobStatus.SUCCEEDED for job in results)
+        assert sorted(done) == sorted(f"u{i}" for i in range(200))
+        assert peak <= 8
+
+    async def test_retry_with_backoff(self):
+        """일시적 실패는 백오프 후 재시도하여 성공"""
+        calls = []
+
+        async def handler(payload):
+            calls.append(asyncio.get_running_loop().time())
+            if len(calls) < 3:
+                raise RuntimeError("temporary")
+
+        queue = make_queue(handler, backoff_base=0.05)
+        await queue.start()
+        try:
+            job = await queue.enqueue({"user_id": "u1"})
+            job = await queue.wait(job.id, 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.attempts == 3
+        assert job.error is None
+        assert calls[1] - calls[0] >= 0.05
+        assert calls[2] - calls[1] >= 0.1
+        assert await queue.dead_letters() == []
+
+    async def test_dead_letter_after_max_attempts(self):
+        """최대 시도 횟수 초과 시 dead-letter로 이동"""
+        async def handler(payload):
+            raise ValueError("bad payload")
+
+        queue = make_queue(handler)
+        await queue.start()
+        try:
+            job = await queue.enqueue({"user_id": "u1"})
+            job = await queue.wait(job.id, 5)
+        finally:
+            await queue.stop()
+
+        assert job.status == JobStatus.FAILED
+        assert job.attempts == 3
+        assert job.error == "bad payload"
+        assert [j.id for j in await queue.dead_letters()] == [job.id]
+
+    def test_job_serialization(self):
+        """Redis 저장 형식 왕복 변환"""
+        job = AnalysisJob(id="j1", payload={"user_id": "u1"}, status=JobStatus.RETRYING)
+        restored = AnalysisJob.from_json(job.to_json())
+
+        assert restored == job
+        assert restored.status is JobStatus.RETRYING
+
+
+@pytest.mark.skipif(fakeredis is None, reason="fakeredis[lua] not installed")
+class TestRedisJobBackend:
+    """Redis 백엔드 처리 중 list/워커 복구 테스트"""
+
+    async def test_ack_clears_processing_list(self):
+        """꺼낸 작업은 처리 중 list에 있다가 결과 저장 후 제거"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        backend = RedisJobBackend(client, worker_id="w1")
+        done = []
+
+        async def handler(payload):
+            assert await client.lrange(backend.processing_key, 0, -1) == ["j1"]
+            done.append(payload["user_id"])
+
+        await backend.push(AnalysisJob(id="j1", payload={"user_id": "u1"}))
+        job = await backend.pop(1)
+        assert await client.llen(RedisJobBackend.QUEUE_KEY) == 0
+
+        await make_queue(handler, backend=backend).process(job)
+
+        assert (await backend.get("j1")).status == JobStatus.SUCCEEDED
+        assert done == ["u1"]
+        assert await client.llen(backend.processing_key) == 0
+
+    async def test_crashed_worker_jobs_requeued(self):
+        """ack 전에 워커가 죽으면 다른 워커의 heartbeat가 작업을 대기열로 되돌려 재실행"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        crashed = RedisJobBackend(client, stale_after=0.05, worker_id="crashed")
+        survivor = RedisJobBackend(client, stale_after=0.05, worker_id="survivor")
+        await crashed.heartbeat()
+        await crashed.push(AnalysisJob(id="j1", payload={"user_id": "u1"}))
+
+        # 실행 중 종료: 꺼내고 RUNNING으로 저장했지만 ack하지 않음
+        job = await crashed.pop(1)
+        job.status = JobStatus.RUNNING
+        job.attempts = 1
+        await crashed.save(job)
+        assert await survivor.pop(1) is None
+
+        # 생존 표시가 stale_after 안이면 복구하지 않음
+        await survivor.heartbeat()
+        assert await client.lrange(crashed.processing_key, 0, -1) == ["j1"]
+
+        await asyncio.sleep(0.1)
+        await survivor.heartbeat()
+        assert await client.llen(crashed.processing_key) == 0
+        assert await client.zscore(RedisJobBackend.WORKERS_KEY, "crashed") is None
+
+        done = []
+
+        async def handler(payload):
+            done.append(payload["user_id"])
+
+        job = await survivor.pop(1)
+        await make_queue(handler, backend=survivor).process(job)
+
+        job = await survivor.get("j1")
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.attempts == 2
+        assert done == ["u1"]
+        assert await client.llen(survivor.processing_key) == 0
+
+    async def test_lost_job_dead_lettered_after_max_attempts(self):
+        """실행 중 워커 종료가 반복되어 시도 횟수를 모두 쓴 작업은 dead-letter"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        backend = RedisJobBackend(client, worker_id="w1")
+        await backend.push(AnalysisJob(id="j1", payload={"user_id": "u1"}))
+        job = await backend.pop(1)
+        job.status = JobStatus.RUNNING
+        job.attempts = 3
+
+        async def handler(payload):
+            raise AssertionError("must not run")
+
+        await make_queue(handler, backend=backend).process(job)
+
+        job = await backend.get("j1")
+        assert job.status == JobStatus.FAILED
+        assert job.error == "worker lost during processing"
+        assert [j.id for j in await backend.dead_letters(10)] == ["j1"]
+        assert await client.llen(backend.processing_key) == 0
+
+    async def test_retry_leaves_processing_list_atomically(self):
+        """재시도 예약은 처리 중 list 제거와 함께 처리되고, 재시도 시각이 지나면 대기열로 이동"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        backend = RedisJobBackend(client, worker_id="w1")
+        await backend.push(AnalysisJob(id="j1", payload={"user_id": "u1"}))
+        job = await backend.pop(1)
+
+        async def handler(payload):
+            raise RuntimeError("llm down")
+
+        await make_queue(handler, backend=backend, backoff_base=60).process(job)
+
+        assert await client.llen(backend.processing_key) == 0
+        assert await client.zscore(RedisJobBackend.DELAYED_KEY, "j1") is not None
+        assert (await backend.get("j1")).status == JobStatus.RETRYING
+
+        await client.zadd(RedisJobBackend.DELAYED_KEY, {"j1": 0})
+        job = await backend.pop(1)
+        assert job.id == "j1"
+        assert await client.zcard(RedisJobBackend.DELAYED_KEY) == 0
+        assert await client.lrange(backend.processing_key, 0, -1) == ["j1"]
+
+    async def test_requeued_finished_job_not_rerun(self):
+        """결과 저장 후 ack 전에 종료되어 복구된 작업은 다시 실행하지 않고 ack만 함"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        crashed = RedisJobBackend(client, worker_id="crashed")
+        survivor = RedisJobBackend(client, worker_id="survivor")
+        await crashed.push(AnalysisJob(id="j1", payload={"user_id": "u1"}))
+        job = await crashed.pop(1)
+        job.status = JobStatus.SUCCEEDED
+        job.attempts = 1
+        await crashed.save(job)
+        assert await survivor.requeue_worker("crashed") == 1
+
+        async def handler(payload):
+            raise AssertionError("must not run")
+
+        job = await survivor.pop(1)
+        await make_queue(handler, backend=survivor).process(job)
+
+        job = await survivor.get("j1")
+        assert (job.status, job.attempts) == (JobStatus.SUCCEEDED, 1)
+        assert await client.llen(survivor.processing_key) == 0
@@ -0,0 +1,90 @@
+"""
+분석 메모이제이션 테스트
+정규화 해시 키와 동일 응답 재분석 시 결과 재사용 검증
+"""
+
+import pytest
+from conftest import make_random_responses
+
+from app.services import memo
+from app.services.analysis import LeadershipAnalyzer, trigger_analysis
+from app.services.memo import analysis_content_hash, memo_stats
+
+
+class TestContentHash:
+    """재사용 키 테스트"""
+
+    def test_canonical_key(self):
+        """문항 순서/설문 버전 별칭과 무관하게 동일 키"""
+        responses = make_random_responses(1, seed=5, missing_rate=0)[0]
+        reordered = dict(reversed(list(responses.items())))
+
+        assert analysis_content_hash(responses, "1.0", "openai") == \
+            analysis_content_hash(reordered, "1.0.0", "openai")
+
+    def test_key_components(self):
+        """응답/provider/프롬프트 버전이 바뀌면 다른 키"""
+        responses = make_random_responses(1, seed=5, missing_rate=0)[0]
+        base = analysis_content_hash(responses, None, "openai")
+
+        changed = dict(responses, bm_1=(responses["bm_1"] % 7) + 1)
+        assert analysis_content_hash(changed, None, "openai") != base
+        assert analysis_content_hash(responses, None, "anthropic") != base
+        # provider 미지정은 실제 응답 provider가 달라질 수 있어 지정 요청과 다른 키
+        assert analysis_content_hash(responses, None, None) != base
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(memo, "PROMPT_VERSION", "test")
+            assert analysis_content_hash(responses, None, "openai") != base
+
+
+class TestAnalysisMemoization:
+    """동일 응답 재분석 테스트"""
+
+    async def test_repeat_trigger_reuses_analysis(self, fake_env):
+        """동일 응답 재트리거는 LLM 호출/쓰기 없이 재사용"""
+        db, llm_calls = fake_env
+        responses = make_random_responses(1, seed=8, missing_rate=0)[0]
+
+        await trigger_analysis("u1", responses, "openai", survey_response_id="r1")
+        await trigger_analysis("u1", responses, "openai", survey_response_id="r1")
+
+        assert len(llm_calls) == 1
+        assert len(db.rows) == 1
+        assert memo_stats.snapshot() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    async def test_resubmission_writes_reference_row(self, fake_env):
+        """동일 답변 재제출은 저장된 점수/인사이트로 새 응답 행만 기록"""
+        db, llm_calls = fake_env
+        responses = make_random_responses(1, seed=8, missing_rate=0)[0]
+
+        await trigger_analysis("u1", responses, "openai", survey_response_id="r1")
+        await trigger_analysis("u2", responses, "openai", survey_response_id="r2")
+
+        assert len(llm_calls) == 1
+        first, second = db.rows
+        assert second["survey_response_id"] == "r2"
+        assert second["user_id"] == "u2"
+        for column in memo.MEMO_COLUMNS:
+            assert second[column] == first[column]
+
+    async def test_force_refresh_and_fallback(self, fake_env, monkeypatch):
+        """force_refresh는 재계산, 규칙 기반 fallback 결과는 재사용하지 않음"""
+        db, llm_calls = fake_env
+        responses = make_random_responses(1, seed=8, missing_rate=0)[0]
+
+        await trigger_analysis("u1", responses, "openai", survey_response_id="r1")
+        await trigger_analysis(
+            "u1", responses, "openai", survey_response_id="r1", force_refresh=True
+        )
+        assert len(llm_calls) == 2
+
+        async def fallback_insights(dimensions, style, ai_provider=None):
+            return LeadershipAnalyzer.generate_rule_based_insights(dimensions, style)
+
+        monkeypatch.setattr(
+            LeadershipAnalyzer, "generate_insights", staticmethod(fallback_insights)
+        )
+        await trigger_analysis("u1", responses, "anthropic", survey_response_id="r3")
+
+        assert [r["content_hash"] is None for r in db.rows] == [False, True]
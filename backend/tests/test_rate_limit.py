@@ -0,0 +1,462 @@
+"""
+LLM 사용량 제한 테스트
+예약-정산 토큰 버킷(메모리/Redis Lua 스크립트 동일 동작), 동시 예약 한도, 리필, Redis 스크립트 1회 왕복,
+메모리 저장소 키 상한/만료 정리, LLM 사용량 롤업/일괄 반영 검증
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.middleware import rate_limit
+from app.middleware.rate_limit import (
+    LLMUsageMonitor,
+    RateLimiter,
+    RateLimitStore,
+    estimate_prompt_tokens,
+)
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis Lua 스크립트 실행)
+except ImportError:  # 개발 의존성 미설치 시 실제 스크립트 테스트만 건너뜀
+    fakeredis = None
+
+LIMITS = {"requests": 10, "tokens": 1000, "window": 100}
+
+requires_lua = pytest.mark.skipif(fakeredis is None, reason="fakeredis[lua] not installed")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def make_limiter(redis_client=None):
+    limiter = RateLimiter(redis_client=redis_client)
+    limiter.llm_limits = {"gpt-4o-mini": dict(LIMITS)}
+    return limiter
+
+
+@pytest.fixture(params=["memory", pytest.param("redis", marks=requires_lua)])
+def limiter(request):
+    """메모리 저장소와 실제 Lua 스크립트(fakeredis)를 같은 시나리오로 검증"""
+    if request.param == "redis":
+        return make_limiter(fakeredis.FakeAsyncRedis(decode_responses=True))
+    return make_limiter()
+
+
+class FakeScript:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class FakeRedis:
+    """스크립트별 고정 결과를 돌려주는 비동기 클라이언트 대역"""
+
+    def __init__(self, reserve_result=None, reconcile_result="0", gcra_result=None):
+        self.scripts = {
+            rate_limit.RESERVE_SCRIPT: FakeScript(reserve_result),
+            rate_limit.RECONCILE_SCRIPT: FakeScript(reconcile_result),
+            rate_limit.GCRA_SCRIPT: FakeScript(gcra_result),
+        }
+        self.registered = 0
+
+    def register_script(self, script):
+        self.registered += 1
+        return self.scripts[script]
+
+
+class TestTokenBucket:
+    """예약/정산 테스트 (메모리, Redis 스크립트)"""
+
+    async def test_reconcile_refunds_unused_reservation(self, limiter, clock):
+        """최대 출력 기준 예약 후 실제 사용량만 차감"""
+        allowed, info = await limiter.check_llm_usage("u1", "gpt-4o-mini", 400)
+        assert allowed
+        assert info["tokens"]["remaining"] == 600
+
+        await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 400, 150)
+
+        _, info = await limiter.check_llm_usage("u1", "gpt-4o-mini", 0)
+        assert info["tokens"]["remaining"] == 850
+
+    async def test_full_quota_usable_with_reconcile(self, limiter, clock):
+        """정산하면 예약 크기가 아닌 실제 사용량 기준으로 한도 소진 (정산 없으면 2회에서 차단)"""
+        calls = 0
+        while calls < 10:
+            allowed, _ = await limiter.check_llm_usage("u1", "gpt-4o-mini", 400)
+            if not allowed:
+                break
+            await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 400, 100)
+            calls += 1
+        assert calls == 7
+
+    async def test_concurrent_reservations_never_overshoot(self, limiter, clock):
+        """동시 예약 합계는 용량을 넘지 않음"""
+        results = await asyncio.gather(*[
+            limiter.check_llm_usage("u1", "gpt-4o-mini", 300) for _ in range(10)
+        ])
+
+        assert sum(allowed for allowed, _ in results) == 3
+        denied = next(info for allowed, info in results if not allowed)
+        assert denied["retry_after"] == 20
+
+    async def test_overuse_is_charged_and_refills(self, limiter, clock):
+        """실제 사용이 예약보다 크면 추가 차감, 시간이 지나면 리필"""
+        await limiter.check_llm_usage("u1", "gpt-4o-mini", 500)
+        await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 500, 1200)
+
+        allowed, info = await limiter.check_llm_usage("u1", "gpt-4o-mini", 100)
+        assert not allowed
+        assert info["retry_after"] == 30
+
+        clock.value += 30
+        allowed, _ = await limiter.check_llm_usage("u1", "gpt-4o-mini", 100)
+        assert allowed
+
+    async def test_request_bucket(self, limiter, clock):
+        """요청 수 한도는 토큰과 함께 확인 (거부 시 둘 다 차감 안 함)"""
+        for _ in range(10):
+            assert (await limiter.check_llm_usage("u1", "gpt-4o-mini", 10))[0]
+
+        allowed, info = await limiter.check_llm_usage("u1", "gpt-4o-mini", 10)
+        assert not allowed
+        assert info["tokens"]["remaining"] == 900
+        assert info["requests"]["retry_after"] == 10
+
+
+class TestMemoryRateLimit:
+    """메모리 GCRA/저장소 상한 테스트"""
+
+    async def test_gcra_matches_redis_semantics(self, clock):
+        """window 동안 limit회, 거부는 차감하지 않고 간격마다 1회 회복"""
+        limiter = RateLimiter()
+        results = [await limiter.check_rate_limit("k", limit=10, window=100) for _ in range(12)]
+
+        assert [allowed for allowed, _ in results] == [True] * 10 + [False] * 2
+        assert results[0][1] == {"limit": 10, "remaining": 9, "reset": 1010, "retry_after": 0}
+        assert results[10][1]["retry_after"] == 10
+
+        clock.value += 10
+        assert (await limiter.check_rate_limit("k", limit=10, window=100))[0]
+        assert not (await limiter.check_rate_limit("k", limit=10, window=100))[0]
+        assert len(limiter.memory_store) == 1
+
+    async def test_key_cap_evicts_least_recently_used(self, clock):
+        """키 수는 상한을 넘지 않고 가장 오래 쓰지 않은 키부터 삭제"""
+        limiter = RateLimiter(max_memory_keys=3)
+        for user in ["a", "b", "c"]:
+            await limiter.check_rate_limit(user, limit=10, window=100)
+        await limiter.check_rate_limit("a", limit=10, window=100)
+        await limiter.check_rate_limit("d", limit=10, window=100)
+
+        assert list(limiter.memory_store._data) == ["c", "a", "d"]
+        assert limiter.snapshot()["memory_store"] == {"keys": 3, "expired": 0, "evicted": 1}
+
+    async def test_idle_keys_expire(self, clock):
+        """TAT가 지난 키는 새 키와 같으므로 이후 확인에서 정리"""
+        limiter = RateLimiter()
+        for user in ["a", "b", "c"]:
+            await limiter.check_rate_limit(user, limit=10, window=100)
+
+        clock.value += 11
+        await limiter.check_rate_limit("d", limit=10, window=100)
+
+        assert list(limiter.memory_store._data) == ["c", "d"]
+        assert limiter.memory_store.stats.expired == 2
+
+    async def test_llm_buckets_bounded(self, clock):
+        """LLM 버킷도 같은 상한, 가득 찬 버킷은 만료되어 다시 가득 찬 상태로 시작"""
+        limiter = make_limiter()
+        limiter.buckets = RateLimitStore(max_keys=4)
+        for user in ["u1", "u2", "u3"]:
+            await limiter.check_llm_usage(user, "gpt-4o-mini", 100)
+
+        assert len(limiter.buckets) == 4
+        assert limiter.buckets.stats.evicted == 2
+
+        await limiter.reconcile_llm_usage("u3", "gpt-4o-mini", 100, 0)
+        clock.value += 10
+        _, info = await limiter.check_llm_usage("u3", "gpt-4o-mini", 0)
+        assert info["tokens"]["remaining"] == 1000
+
+
+class TestRedisPath:
+    """Redis 스크립트 경로 테스트"""
+
+    async def test_single_round_trip(self, clock):
+        """예약은 토큰/요청 버킷을 스크립트 1회로 처리"""
+        redis = FakeRedis([1, "600", "9"])
+        limiter = RateLimiter(redis_client=redis)
+        limiter.llm_limits = {"gpt-4o-mini": dict(LIMITS)}
+        reserve = redis.scripts[rate_limit.RESERVE_SCRIPT]
+        reconcile = redis.scripts[rate_limit.RECONCILE_SCRIPT]
+
+        allowed, info = await limiter.check_llm_usage("u1", "gpt-4o-mini", 400)
+        await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 400, 150)
+
+        assert allowed
+        assert info["tokens"]["remaining"] == 600
+        assert reserve.calls == [(
+            ["llm:u1:gpt-4o-mini:tokens", "llm:u1:gpt-4o-mini:requests"],
+            [1000.0, 1000, 10.0, 400, 10, 0.1],
+        )]
+        assert reconcile.calls == [(["llm:u1:gpt-4o-mini:tokens"], [1000.0, 1000, 10.0, 250])]
+        # 스크립트는 클라이언트당 한 번만 등록
+        await limiter.check_llm_usage("u1", "gpt-4o-mini", 400)
+        assert redis.registered == 2
+
+    async def test_redis_failure_allows(self, clock):
+        """Redis 장애 시 통과 (기존 동작 유지)"""
+        down = ConnectionError("down")
+        limiter = RateLimiter(redis_client=FakeRedis(down, down, down))
+
+        allowed, _ = await limiter.check_llm_usage("u1", "gpt-4o-mini", 400)
+        await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 400, 100)
+
+        assert allowed
+        assert (await limiter.check_rate_limit("k", limit=10, window=100))[0]
+
+    async def test_gcra_allowed(self, clock):
+        """허용 시 남은 횟수/초기화 시각은 스크립트가 돌려준 TAT 기준"""
+        redis = FakeRedis(gcra_result=[1, "1030"])
+        limiter = RateLimiter(redis_client=redis)
+
+        allowed, info = await limiter.check_rate_limit("k", limit=10, window=100)
+
+        assert allowed
+        assert info == {"limit": 10, "remaining": 7, "reset": 1030, "retry_after": 0}
+        assert redis.scripts[rate_limit.GCRA_SCRIPT].calls == [(["rl:k"], [1000.0, 10.0, 100])]
+
+    async def test_gcra_denied(self, clock):
+        """거부 시 다음 요청 간격이 열릴 때까지 대기 시간"""
+        limiter = RateLimiter(redis_client=FakeRedis(gcra_result=[0, "1095.5"]))
+
+        allowed, info = await limiter.check_rate_limit("k", limit=10, window=100)
+
+        assert not allowed
+        assert info["remaining"] == 0
+        assert info["retry_after"] == 6
+
+    async def test_shared_client_when_use_redis(self, clock, monkeypatch):
+        """redis_client 미주입 + use_redis면 공유 비동기 클라이언트 사용"""
+        redis = FakeRedis(gcra_result=[1, "1010"])
+
+        async def fake_get_redis_client():
+            return redis
+
+        monkeypatch.setattr(rate_limit, "get_redis_client", fake_get_redis_client)
+        limiter = RateLimiter(use_redis=True)
+
+        await limiter.check_rate_limit("k", limit=10, window=100)
+
+        assert redis.scripts[rate_limit.GCRA_SCRIPT].calls
+
+
+@requires_lua
+class TestRedisScripts:
+    """실제 Lua 스크립트(fakeredis) 테스트"""
+
+    async def test_overuse_outlives_window(self, clock):
+        """초과 사용으로 음수가 된 버킷은 가득 찰 때까지 유지 (window TTL로 만료되어 초기화되지 않음)"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        limiter = make_limiter(client)
+        key = "llm:u1:gpt-4o-mini:tokens"
+
+        await limiter.check_llm_usage("u1", "gpt-4o-mini", 500)
+        assert 45 <= await client.ttl(key) <= 50
+
+        await limiter.reconcile_llm_usage("u1", "gpt-4o-mini", 500, 1700)
+        assert float(await client.hget(key, "level")) == -700
+        # (1000 - (-700)) / 10 토큰/초
+        assert 165 <= await client.ttl(key) <= 170
+        assert 1 <= await client.ttl("llm:u1:gpt-4o-mini:requests") <= 10
+
+    async def test_gcra(self, clock):
+        """window 동안 limit회 허용, 거부는 차감 없음, TTL은 TAT까지"""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        limiter = RateLimiter(redis_client=client)
+
+        results = [await limiter.check_rate_limit("k", limit=10, window=100) for _ in range(11)]
+
+        assert [allowed for allowed, _ in results] == [True] * 10 + [False]
+        assert results[0][1] == {"limit": 10, "remaining": 9, "reset": 1010, "retry_after": 0}
+        assert results[-1][1]["retry_after"] == 10
+        assert float(await client.get("rl:k")) == 1100
+        assert 99_000 <= await client.pttl("rl:k") <= 100_000
+
+        clock.value += 10
+        assert (await limiter.check_rate_limit("k", limit=10, window=100))[0]
+
+
+class TestEstimatePromptTokens:
+    def test_estimate(self):
+        assert estimate_prompt_tokens("abcd" * 10) == 10
+        assert estimate_prompt_tokens("리더십", "ab") == 4
+
+
+class FakeRpc:
+    def __init__(self, db, name, params):
+        self.db, self.name, self.params = db, name, params
+
+    async def execute(self):
+        if self.db.fail:
+            raise ConnectionError("db down")
+        if self.db.gate is not None:
+            self.db.entered.set()
+            await self.db.gate.wait()
+        self.db.calls.append((self.name, self.params["p_rows"]))
+
+
+class FakeDB:
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+        # gate가 있으면 RPC가 열릴 때까지 대기 (진행 중 flush 재현용)
+        self.gate = None
+        self.entered = asyncio.Event()
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+
+@pytest.fixture
+def usage_db(monkeypatch):
+    db = FakeDB()
+
+    async def fake_get_async_service_supabase():
+        return db
+
+    monkeypatch.setattr(rate_limit, "get_async_service_supabase", fake_get_async_service_supabase)
+    return db
+
+
+async def log(monitor, user="u1", model="gpt-4o-mini", tokens=100, cost=0.01, response_time=0.5):
+    await monitor.log_usage(user, model, tokens, cost, "leadership_analysis", response_time)
+
+
+class TestLLMUsageMonitor:
+    """사용량 롤업/DB 반영 테스트"""
+
+    async def test_stats_by_period_and_user(self, clock):
+        """기간별 롤업 합산, 사용자 필터, 모델별 통계"""
+        monitor = LLMUsageMonitor()
+        await log(monitor)
+        await log(monitor, model="claude-3", tokens=300, cost=0.03, response_time=1.5)
+        await log(monitor, user="u2")
+        clock.value += 2 * 86400
+        await log(monitor, tokens=50)
+
+        day = await monitor.get_usage_stats("u1", "day")
+        assert (day["request_count"], day["total_tokens"]) == (1, 50)
+
+        month = await monitor.get_usage_stats("u1", "month")
+        assert month["request_count"] == 3
+        assert month["model_stats"]["claude-3"] == {"tokens": 300, "cost": 0.03, "count": 1}
+        assert month["average_generation_time_ms"] == pytest.approx(2500 / 3)
+
+        everyone = await monitor.get_usage_stats(period="month")
+        assert everyone["total_tokens"] == 550
+
+    async def test_ring_memory_is_bounded(self, clock):
+        """보관 버킷 수를 넘으면 오래된 버킷을 덮어씀"""
+        monitor = LLMUsageMonitor()
+        for _ in range(300):
+            await log(monitor)
+            clock.value += 60
+
+        ring = monitor.rings["minute"]
+        assert sum(1 for start in ring._starts if start is not None) == ring.slots
+        assert (await monitor.get_usage_stats("u1", "hour"))["request_count"] == 60
+
+    async def test_flush_sends_deltas_in_batches(self, clock, usage_db):
+        """단위별 증분을 batch로 합산 함수에 전달, 다음 flush는 새 증분만"""
+        monitor = LLMUsageMonitor(flush_batch_size=4)
+        await log(monitor)
+        await log(monitor)
+        await log(monitor, user="u2")
+
+        assert await monitor.flush() == 6
+        assert [len(rows) for _, rows in usage_db.calls] == [4, 2]
+        rows = [row for _, rows in usage_db.calls for row in rows]
+        minute = next(r for r in rows if r["granularity"] == "minute" and r["user_id"] == "u1")
+        assert minute["bucket_start"] == "1970-01-01T00:16:00+00:00"
+        assert (minute["request_count"], minute["token_count"], minute["generation_time_ms"]) == (2, 200, 1000)
+        assert usage_db.calls[0][0] == "add_llm_usage_rollups"
+
+        await log(monitor)
+        await monitor.flush()
+        assert all(row["request_count"] == 1 for row in usage_db.calls[-1][1])
+        assert monitor.stats.flushed_rows == 9
+
+    async def test_failed_flush_is_retried(self, clock, usage_db):
+        """반영 실패 증분은 보관했다가 다음 flush에 합쳐서 전달"""
+        monitor = LLMUsageMonitor()
+        await log(monitor)
+        usage_db.fail = True
+        assert await monitor.flush() == 0
+        assert monitor.stats.failures == 1
+
+        await log(monitor)
+        usage_db.fail = False
+        await monitor.flush()
+
+        assert not monitor.pending
+        assert {row["request_count"] for row in usage_db.calls[0][1]} == {2}
+
+    async def test_cancelled_flush_restores_deltas(self, clock, usage_db):
+        """RPC 도중 취소돼도 보내지 못한 증분은 되돌려 다음 flush에서 반영"""
+        monitor = LLMUsageMonitor()
+        await log(monitor)
+        usage_db.gate = asyncio.Event()
+        task = asyncio.create_task(monitor.flush())
+        await usage_db.entered.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert len(monitor.pending) == 3
+        assert {delta.request_count for delta in monitor.pending.values()} == {1}
+
+        usage_db.gate = None
+        assert await monitor.flush() == 3
+        assert not monitor.pending
+
+    async def test_stop_waits_for_inflight_flush(self, clock, usage_db):
+        """stop은 진행 중인 주기 flush를 취소하지 않고 기다린 뒤 남은 증분 반영"""
+        monitor = LLMUsageMonitor(flush_interval=0.01)
+        await log(monitor)
+        usage_db.gate = asyncio.Event()
+        monitor.start()
+        await usage_db.entered.wait()
+        await log(monitor, user="u2")
+
+        stopping = asyncio.create_task(monitor.stop())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()
+        usage_db.gate.set()
+        await stopping
+
+        assert not monitor.pending
+        assert [len(rows) for _, rows in usage_db.calls] == [3, 3]
+        assert {row["user_id"] for row in usage_db.calls[1][1]} == {"u2"}
+
+    async def test_pending_is_capped(self, clock):
+        """미반영 증분은 상한까지만 보관 (롤업 통계는 유지)"""
+        monitor = LLMUsageMonitor(max_pending=3)
+        await log(monitor)
+        await log(monitor, user="u2")
+
+        assert len(monitor.pending) == 3
+        assert monitor.stats.dropped == 3
+        assert (await monitor.get_usage_stats("u2", "day"))["request_count"] == 1
@@ -0,0 +1,156 @@
+"""
+분석 저장소 테스트
+REST 컬럼 조회, Postgres 행 변환, 연결 오류 시 REST 대체, 백엔드 선택 검증
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+import asyncpg
+import pytest
+
+from app.services import repository
+from app.services.repository import (
+    ANALYSIS_COLUMNS,
+    PostgresAnalysisRepository,
+    RestAnalysisRepository,
+    get_analysis_repository,
+    record_to_dict,
+)
+
+ROW = {"id": "a1", "user_id": "u1", "ai_insights": {"strengths": ["s"]}}
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.call = {"table": table}
+
+    def select(self, columns):
+        self.call["select"] = columns
+        return self
+
+    def eq(self, column, value):
+        self.call[column] = value
+        return self
+
+    def order(self, column, desc=False):
+        self.call["order"] = (column, desc)
+        return self
+
+    def limit(self, size):
+        self.call["limit"] = size
+        return self
+
+    async def execute(self):
+        self.db.calls.append(self.call)
+        return SimpleNamespace(data=[ROW])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FailingPool:
+    """연결 획득 실패 풀 (DB 다운 상황)"""
+
+    def __init__(self, error):
+        self.error = error
+        self.attempts = 0
+
+    def acquire(self):
+        self.attempts += 1
+        raise self.error
+
+
+class TestRestRepository:
+    """REST 구현 테스트"""
+
+    async def test_latest_analysis_selects_columns(self):
+        """select("*") 대신 필요한 컬럼만 최신순 1건 조회"""
+        db = FakeSupabase()
+
+        row = await RestAnalysisRepository(db).latest_analysis("u1")
+
+        assert row == ROW
+        assert db.calls == [{
+            "table": "leadership_analysis",
+            "select": ",".join(ANALYSIS_COLUMNS),
+            "user_id": "u1",
+            "order": ("created_at", True),
+            "limit": 1,
+        }]
+
+
+class TestPostgresRepository:
+    """asyncpg 구현 테스트"""
+
+    def test_record_to_dict_matches_rest_shape(self):
+        """UUID/시각은 문자열, DECIMAL은 float로 변환"""
+        created_at = datetime(2025, 10, 18, tzinfo=timezone.utc)
+        row = record_to_dict({
+            "id": UUID(int=1),
+            "lmx_score": Decimal("5.25"),
+            "created_at": created_at,
+            "ai_insights": {"strengths": []},
+        })
+
+        assert row == {
+            "id": "00000000-0000-0000-0000-000000000001",
+            "lmx_score": 5.25,
+            "created_at": "2025-10-18T00:00:00+00:00",
+            "ai_insights": {"strengths": []},
+        }
+
+    async def test_connection_error_falls_back_to_rest(self):
+        """연결 오류 시 같은 조회를 REST로 처리"""
+        db = FakeSupabase()
+        pool = FailingPool(ConnectionRefusedError("db down"))
+        repo = PostgresAnalysisRepository(pool, db)
+
+        assert await repo.latest_analysis("u1") == ROW
+        assert await repo.analysis_history("u1", 5) == [ROW]
+        assert pool.attempts == 2
+        assert [call["limit"] for call in db.calls] == [1, 5]
+
+    async def test_sql_error_is_not_retried(self):
+        """제약 위반 등 SQL 오류는 REST로 재시도하지 않음"""
+        db = FakeSupabase()
+        repo = PostgresAnalysisRepository(FailingPool(asyncpg.UniqueViolationError("dup")), db)
+
+        with pytest.raises(asyncpg.UniqueViolationError):
+            await repo.save_analyses([{"survey_response_id": "r1", "user_id": "u1"}])
+        assert db.calls == []
+
+
+class TestRepositorySelection:
+    """백엔드 선택 테스트"""
+
+    async def test_backend_selection(self, monkeypatch):
+        """rest 설정 또는 풀 생성 실패 시 REST, 풀이 있으면 Postgres"""
+        pool = object()
+        available = {"pool": None}
+
+        async def fake_get_pg_pool():
+            return available["pool"]
+
+        monkeypatch.setattr(repository, "get_pg_pool", fake_get_pg_pool)
+
+        monkeypatch.setattr(repository.settings, "DB_BACKEND", "rest")
+        available["pool"] = pool
+        assert type(await get_analysis_repository()) is RestAnalysisRepository
+
+        monkeypatch.setattr(repository.settings, "DB_BACKEND", "postgres")
+        available["pool"] = None
+        assert type(await get_analysis_repository()) is RestAnalysisRepository
+
+        available["pool"] = pool
+        selected = await get_analysis_repository()
+        assert isinstance(selected, PostgresAnalysisRepository)
+        assert selected.pool is pool
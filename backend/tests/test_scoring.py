@@ -0,0 +1,118 @@
+"""
+점수 계산 커널 테스트
+일괄 계산 결과가 단건 계산과 동일한지 검증
+"""
+
+import numpy as np
+import pytest
+from conftest import make_random_responses
+
+from app.services.analysis import LeadershipAnalyzer
+from app.services.scoring import (
+    DIMENSION_NAMES,
+    SCORING_SPEC_V1,
+    ScoringSpec,
+    calculate_dimensions_batch,
+    get_scoring_spec,
+    register_scoring_spec,
+    responses_to_matrix,
+)
+
+
+def legacy_calculate_dimensions(responses):
+    """기존 문항 목록 기반 단건 계산 (기준값)"""
+    def mean(questions, default=4):
+        return np.mean([responses.get(q, default) for q in questions])
+
+    def ig(*numbers):
+        return mean([f"ig_{n}" for n in numbers], default=3) * 5 / 7
+
+    return {
+        "people": round(mean([f"bm_{i}" for i in range(1, 15, 2)]), 2),
+        "production": round(mean([f"bm_{i}" for i in range(2, 15, 2)]), 2),
+        "care": round(mean([f"rc_{i}" for i in range(1, 11, 2)]), 2),
+        "challenge": round(mean([f"rc_{i}" for i in range(2, 11, 2)]), 2),
+        "lmx_score": round(mean([f"lmx_{i}" for i in range(1, 11)]), 2),
+        "machiavellianism": round(ig(1, 4, 7), 2),
+        "narcissism": round(ig(2, 5, 8), 2),
+        "psychopathy": round(ig(3, 6, 9), 2),
+    }
+
+
+class TestBatchScoring:
+    """일괄 점수 계산 테스트"""
+
+    def test_matches_legacy_scoring(self):
+        """기존 단건 계산식과 결과 일치"""
+        responses = make_random_responses(500)
+        batch = calculate_dimensions_batch(responses)
+
+        for i, response in enumerate(responses):
+            expected = legacy_calculate_dimensions(response)
+            single = LeadershipAnalyzer.calculate_dimensions(response)
+            for name in DIMENSION_NAMES:
+                assert batch[name][i] == expected[name], (i, name)
+                assert getattr(single, name) == expected[name], (i, name)
+
+    def test_matrix_and_dict_inputs_agree(self):
+        """행렬 입력과 dict 목록 입력 결과 일치"""
+        responses = make_random_responses(50, seed=7)
+        from_dicts = calculate_dimensions_batch(responses)
+        from_matrix = calculate_dimensions_batch(responses_to_matrix(responses))
+
+        for name in DIMENSION_NAMES:
+            np.testing.assert_array_equal(from_dicts[name], from_matrix[name])
+
+    def test_empty_response_uses_defaults(self):
+        """미응답 시 기본값 (4, Influence Gauge는 3) 적용"""
+        result = calculate_dimensions_batch([{}])
+
+        assert result["people"][0] == 4.0
+        assert result["lmx_score"][0] == 4.0
+        assert result["machiavellianism"][0] == round(3 * 5 / 7, 2)
+
+    def test_invalid_matrix_shape(self):
+        """잘못된 행렬 크기 거부"""
+        with pytest.raises(ValueError):
+            calculate_dimensions_batch(np.ones((3, 10)))
+
+
+class TestScoringSpecRegistry:
+    """설문 버전별 채점 스펙 레지스트리 테스트"""
+
+    def test_default_version_and_alias(self):
+        """기본 버전 및 모델 기본값 "1.0.0" 조회"""
+        assert get_scoring_spec() is SCORING_SPEC_V1
+        assert get_scoring_spec("1.0.0") is SCORING_SPEC_V1
+
+    def test_unknown_version(self):
+        """등록되지 않은 버전 거부"""
+        with pytest.raises(ValueError):
+            get_scoring_spec("9.9")
+
+    def test_reverse_keyed_items(self):
+        """역채점 문항은 (min + max - 응답값)으로 계산"""
+        spec = ScoringSpec(
+            version="test-reverse",
+            question_ids=SCORING_SPEC_V1.question_ids,
+            dimension_questions=SCORING_SPEC_V1.dimension_questions,
+            default_values={"bm_": 4, "rc_": 4, "lmx_": 4, "ig_": 3},
+            reverse_keyed=frozenset({"bm_1"}),
+        )
+        register_scoring_spec(spec)
+
+        result = calculate_dimensions_batch(
+            [{"bm_1": 1, **{f"bm_{i}": 7 for i in range(3, 15, 2)}}],
+            survey_version="test-reverse",
+        )
+        assert result["people"][0] == 7.0
+
+    def test_invalid_spec(self):
+        """존재하지 않는 문항 참조 시 컴파일 실패"""
+        with pytest.raises(ValueError):
+            ScoringSpec(
+                version="broken",
+                question_ids=("bm_1",),
+                dimension_questions={name: ["bm_2"] for name in DIMENSION_NAMES},
+                default_values={"bm_": 4},
+            )
@@ -0,0 +1,100 @@
+"""
+Singleflight 테스트
+같은 키 동시 실행 합침, 예외 전파, 동시 분석 중복 제거 검증
+"""
+
+import asyncio
+
+import pytest
+from conftest import make_random_responses
+
+from app.services import analysis
+from app.services.analysis import LeadershipAnalyzer, trigger_analysis
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """키별 실행 합침 테스트"""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """같은 키 동시 호출은 한 번만 실행"""
+        flight = SingleFlight("test")
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"value": len(calls)}
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(10)))
+        other = await flight.do("other", work)
+
+        assert results == [{"value": 1}] * 10
+        assert other == {"value": 2}
+        assert flight.stats.executions == 2
+        assert flight.stats.shared == 9
+        assert not flight.in_flight("k")
+
+    async def test_error_propagates_and_retries(self):
+        """실패는 모든 대기자에게 전파되고 다음 호출은 다시 실행"""
+        flight = SingleFlight("test")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("k", failing), flight.do("k", failing), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def ok():
+            return "ok"
+
+        assert await flight.do("k", ok) == "ok"
+        assert flight.stats.executions == 2
+
+    async def test_cancelled_caller_does_not_cancel_shared_work(self):
+        """한 호출자 취소 시에도 다른 대기자는 결과 수신"""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+class TestAnalysisCoalescing:
+    """동시 분석 중복 제거 테스트"""
+
+    async def test_double_submit_makes_one_llm_call(self, fake_env, monkeypatch):
+        """동일 답변 동시 제출은 LLM 1회 호출, 응답별 행은 각각 저장"""
+        db, llm_calls = fake_env
+
+        async def slow_insights(dimensions, style, ai_provider=None):
+            llm_calls.append(style)
+            await asyncio.sleep(0.02)
+            return {"strengths": ["s"], "ai_provider": "openai"}
+
+        monkeypatch.setattr(
+            LeadershipAnalyzer, "generate_insights", staticmethod(slow_insights)
+        )
+        monkeypatch.setattr(analysis, "analysis_flight", SingleFlight("analysis"))
+        responses = make_random_responses(1, seed=11, missing_rate=0)[0]
+
+        await asyncio.gather(
+            trigger_analysis("u1", responses, "openai", survey_response_id="r1"),
+            trigger_analysis("u1", responses, "openai", survey_response_id="r2"),
+        )
+
+        assert len(llm_calls) == 1
+        assert sorted(r["survey_response_id"] for r in db.rows) == ["r1", "r2"]
+        assert analysis.analysis_flight.stats.shared == 1
@@ -0,0 +1,155 @@
+"""
+보고서 집계 조회 테스트
+팀 보고서/동료 비교가 집계 행 조회만으로 구성되는지 검증
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import reports
+
+
+class FakeStatsQuery:
+    """집계 테이블 조회 (eq/in_ 조건만 지원)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = [value]
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def limit(self, size):
+        return self
+
+    async def execute(self):
+        rows = [
+            row for row in self.rows
+            if all(row[column] in values for column, values in self.filters.items())
+        ]
+        return SimpleNamespace(data=rows)
+
+
+class FakeSupabase:
+    def __init__(self, rows_by_table):
+        self.rows_by_table = rows_by_table
+        self.tables = []
+
+    def table(self, name):
+        self.tables.append(name)
+        return FakeStatsQuery(self.rows_by_table[name])
+
+
+def make_db_getter(db):
+    async def get_db():
+        return db
+    return get_db
+
+
+STATS_ROWS = [
+    {
+        "organization": "Acme",
+        "department": "",
+        "member_count": 4,
+        "analyzed_members": 3,
+        "style_counts": {"team_leader": 2, "impoverished": 1, "country_club": 0},
+        "risk_counts": {"low": 2, "medium": 0, "high": 1},
+        "sum_people": "15.00",
+        "sum_production": "12.00",
+        "sum_lmx": "13.50",
+    },
+    {
+        "organization": "Acme",
+        "department": "Eng",
+        "member_count": 0,
+        "analyzed_members": 0,
+        "style_counts": {},
+        "risk_counts": {"low": 0, "medium": 0, "high": 0},
+        "sum_people": "0",
+        "sum_production": "0",
+        "sum_lmx": "0",
+    },
+]
+
+
+class TestTeamReport:
+    """팀 보고서 집계 조회 테스트"""
+
+    async def test_report_from_aggregate_row(self, monkeypatch):
+        """집계 행에서 분포와 평균 점수 계산"""
+        db = FakeSupabase({"team_analysis_stats": STATS_ROWS})
+        monkeypatch.setattr(reports, "get_async_service_supabase", make_db_getter(db))
+
+        report = await reports.get_team_report("Acme")
+
+        assert db.tables == ["team_analysis_stats"]
+        assert report["total_members"] == 4
+        assert report["analyzed_members"] == 3
+        assert report["style_distribution"] == {"team_leader": 2, "impoverished": 1}
+        assert report["risk_distribution"] == {"low": 2, "medium": 0, "high": 1}
+        assert report["average_scores"] == pytest.approx(
+            {"people": 5.0, "production": 4.0, "lmx": 4.5}
+        )
+
+    async def test_empty_department_not_found(self, monkeypatch):
+        """구성원이 없는 부서는 404"""
+        db = FakeSupabase({"team_analysis_stats": STATS_ROWS})
+        monkeypatch.setattr(reports, "get_async_service_supabase", make_db_getter(db))
+
+        for department in ("Eng", "Sales"):
+            with pytest.raises(HTTPException) as exc:
+                await reports.get_team_report("Acme", department)
+            assert exc.value.status_code == 404
+
+
+STYLE_ROWS = [
+    {"scope": "", "total": 10, "style_counts": {"team_leader": 6, "impoverished": 4}},
+    {"scope": "Acme", "total": 4, "style_counts": {"team_leader": 3, "impoverished": 1}},
+    {"scope": "Other", "total": 6, "style_counts": {"team_leader": 3, "impoverished": 3}},
+]
+
+
+class TestPeerStyleDistribution:
+    """동료 스타일 분포 테스트"""
+
+    async def test_excludes_own_analysis(self):
+        """전체/조직 분포에서 본인 최신 분석 제외"""
+        db = FakeSupabase({
+            "user_latest_analysis": [
+                {"user_id": "u1", "organization": "Acme", "leadership_style": "impoverished"}
+            ],
+            "style_distribution_stats": STYLE_ROWS,
+        })
+
+        peers = await reports._get_peer_style_distribution(db, "u1")
+
+        assert peers["total_peers"] == 9
+        assert peers["style_distribution"] == pytest.approx(
+            {"team_leader": 600 / 9, "impoverished": 300 / 9}
+        )
+        assert peers["organization"]["name"] == "Acme"
+        assert peers["organization"]["total_peers"] == 3
+        assert peers["organization"]["style_distribution"] == {"team_leader": 100.0}
+
+    async def test_user_without_analysis(self):
+        """분석이 없는 사용자는 전체 분포 그대로"""
+        db = FakeSupabase({
+            "user_latest_analysis": [],
+            "style_distribution_stats": STYLE_ROWS,
+        })
+
+        peers = await reports._get_peer_style_distribution(db, "u2")
+
+        assert peers["total_peers"] == 10
+        assert peers["style_distribution"] == {"team_leader": 60.0, "impoverished": 40.0}
+        assert "organization" not in peers
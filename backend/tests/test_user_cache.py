@@ -0,0 +1,133 @@
+"""
+사용자 확인 캐시 테스트
+반복 제출 무조회, 부정 캐시, 무효화, 동시 첫 제출 합치기, Redis 단계 검증
+"""
+
+import asyncio
+
+from app.services import user_cache as user_cache_module
+from app.services.singleflight import SingleFlight
+from app.services.user_cache import MISSING, UserResolutionCache
+
+PROFILE = {"name": "Kim", "organization": "Acme"}
+
+
+class FakeRepository:
+    def __init__(self, existing=None, delay=0.0):
+        self.users = dict(existing or {})
+        self.delay = delay
+        self.lookups = 0
+        self.creates = 0
+
+    async def find_user_ids(self, emails):
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        return {email: self.users[email] for email in emails if email in self.users}
+
+    async def create_users(self, users):
+        self.creates += 1
+        await asyncio.sleep(self.delay)
+        for user in users:
+            self.users.setdefault(user["email"], f"id-{len(self.users)}")
+        return {user["email"]: self.users[user["email"]] for user in users}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+        return True
+
+
+class TestUserResolutionCache:
+    """이메일 -> 사용자 ID 캐시 테스트"""
+
+    async def test_repeat_submitter_skips_db(self):
+        """첫 제출만 조회하고 반복 제출은 DB 왕복 없음"""
+        cache = UserResolutionCache(use_redis=False)
+        repo = FakeRepository({"a@example.com": "u1"})
+
+        for _ in range(3):
+            assert await cache.resolve("a@example.com", PROFILE, repo) == "u1"
+
+        assert (repo.lookups, repo.creates) == (1, 0)
+        assert cache.stats.local_hits == 2
+        assert cache.stats.misses == 1
+
+    async def test_new_user_is_created_and_cached(self):
+        """없는 이메일은 부정 캐시 후 생성, 생성된 ID로 덮어씀"""
+        cache = UserResolutionCache(use_redis=False)
+        repo = FakeRepository()
+
+        user_id = await cache.resolve("new@example.com", PROFILE, repo)
+
+        assert repo.users == {"new@example.com": user_id}
+        assert await cache.get("new@example.com") == user_id
+        assert (cache.stats.lookups, cache.stats.creates) == (1, 1)
+
+    async def test_negative_entry_skips_lookup(self):
+        """부정 캐시 적중 시 조회 없이 바로 생성 (upsert)"""
+        cache = UserResolutionCache(use_redis=False)
+        repo = FakeRepository()
+        await cache.set_missing("b@example.com")
+
+        await cache.resolve("b@example.com", PROFILE, repo)
+
+        assert (repo.lookups, repo.creates) == (0, 1)
+        assert cache.stats.negative_hits == 1
+
+    async def test_invalidate(self):
+        """가입/변경 후 무효화하면 다음 제출에서 다시 조회"""
+        cache = UserResolutionCache(use_redis=False)
+        repo = FakeRepository({"a@example.com": "u1"})
+        await cache.resolve("a@example.com", PROFILE, repo)
+
+        repo.users["a@example.com"] = "u2"
+        await cache.invalidate("a@example.com")
+
+        assert await cache.resolve("a@example.com", PROFILE, repo) == "u2"
+        assert repo.lookups == 2
+
+    async def test_concurrent_first_submissions(self):
+        """같은 이메일의 동시 첫 제출은 한 번만 조회/생성"""
+        cache = UserResolutionCache(use_redis=False, flight=SingleFlight("test-user"))
+        repo = FakeRepository(delay=0.01)
+
+        ids = await asyncio.gather(*[
+            cache.resolve("c@example.com", PROFILE, repo) for _ in range(10)
+        ])
+
+        assert len(set(ids)) == 1
+        assert (repo.lookups, repo.creates) == (1, 1)
+
+    async def test_redis_tier(self, monkeypatch):
+        """다른 프로세스가 채운 Redis 항목 재사용, 부정 항목은 짧은 TTL"""
+        redis = FakeRedis()
+        monkeypatch.setattr(user_cache_module, "cache_get", redis.get)
+        monkeypatch.setattr(user_cache_module, "cache_set", redis.set)
+        monkeypatch.setattr(user_cache_module, "cache_delete", redis.delete)
+
+        writer = UserResolutionCache(redis_ttl=100, negative_ttl=5)
+        await writer.set("a@example.com", "u1")
+        await writer.set_missing("b@example.com")
+
+        reader = UserResolutionCache()
+        assert await reader.resolve("a@example.com", PROFILE, FakeRepository()) == "u1"
+        assert await reader.get("b@example.com") == MISSING
+        assert reader.stats.redis_hits == 1
+        assert sorted(redis.ttls.values()) == [5, 100]
+        assert "a@example.com" not in "".join(redis.values)
+
+        await writer.invalidate("a@example.com")
+        assert writer.key("a@example.com") not in redis.values
@@ -0,0 +1,26 @@
+-- 분석 재계산(backfill) 지원
+-- 작성일: 2025-10-18
+-- 목적: 설문 응답당 하나의 분석 결과를 upsert 할 수 있도록 제약 추가
+
+-- =====================================================
+-- 1. 리더십 스타일 컬럼 (API에서 저장/조회)
+-- =====================================================
+ALTER TABLE leadership_analysis
+  ADD COLUMN IF NOT EXISTS leadership_style TEXT;
+
+-- =====================================================
+-- 2. 응답당 하나의 분석 결과
+-- =====================================================
+-- 동일 응답에 대한 중복 분석 중 최신 것만 유지
+DELETE FROM leadership_analysis a
+USING leadership_analysis b
+WHERE a.survey_response_id = b.survey_response_id
+  AND (a.created_at, a.id) < (b.created_at, b.id);
+
+-- survey_response_id 기준 upsert (ON CONFLICT) 대상
+CREATE UNIQUE INDEX IF NOT EXISTS uq_leadership_analysis_survey_response_id
+  ON leadership_analysis(survey_response_id);
+
+-- 최신 분석 조회 (user_id + created_at DESC)
+CREATE INDEX IF NOT EXISTS idx_leadership_analysis_user_created
+  ON leadership_analysis(user_id, created_at DESC);
@@ -0,0 +1,356 @@
+-- 조직/부서별 분석 집계 (증분 유지)
+-- 작성일: 2025-10-18
+-- 목적: 팀 보고서를 전체 분석 조회 대신 집계 행 1건 조회로 처리
+
+-- =====================================================
+-- 1. 사용자별 집계 반영 상태 (최신 분석 1건만 집계)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS user_latest_analysis (
+  user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+  -- 삭제 트리거가 이전 분석으로 교체하므로 CASCADE는 트리거를 거치지 않은 경우의 안전장치
+  analysis_id UUID NOT NULL REFERENCES leadership_analysis(id) ON DELETE CASCADE,
+  organization TEXT,
+  department TEXT,
+  leadership_style TEXT,
+  overall_risk_level TEXT NOT NULL,
+  blake_mouton_people DECIMAL(3,2) NOT NULL,
+  blake_mouton_production DECIMAL(3,2) NOT NULL,
+  lmx_score DECIMAL(3,2) NOT NULL,
+  analysis_created_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- =====================================================
+-- 2. 조직/부서별 집계
+-- =====================================================
+-- department = '' 는 조직 전체, 'A/B' 형식의 하위 부서는 'A'에도 합산
+CREATE TABLE IF NOT EXISTS team_analysis_stats (
+  organization TEXT NOT NULL,
+  department TEXT NOT NULL DEFAULT '',
+  member_count INTEGER NOT NULL DEFAULT 0,
+  analyzed_members INTEGER NOT NULL DEFAULT 0,
+  style_counts JSONB NOT NULL DEFAULT '{}',
+  risk_counts JSONB NOT NULL DEFAULT '{"low": 0, "medium": 0, "high": 0}',
+  sum_people NUMERIC NOT NULL DEFAULT 0,
+  sum_production NUMERIC NOT NULL DEFAULT 0,
+  sum_lmx NUMERIC NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (organization, department)
+);
+
+ALTER TABLE team_analysis_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_latest_analysis ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can view team stats" ON team_analysis_stats FOR SELECT
+  USING (
+    EXISTS (
+      SELECT 1 FROM users
+      WHERE id = auth.uid() AND role IN ('admin', 'manager')
+    )
+  );
+
+-- =====================================================
+-- 3. Helper Functions
+-- =====================================================
+-- 부서 경로 -> 집계 대상 범위 ('', 'A', 'A/B', ...)
+CREATE OR REPLACE FUNCTION team_stat_scopes(p_department TEXT)
+RETURNS SETOF TEXT AS $$
+DECLARE
+  parts TEXT[];
+  i INTEGER;
+BEGIN
+  RETURN NEXT '';
+  IF p_department IS NULL OR p_department = '' THEN
+    RETURN;
+  END IF;
+  parts := string_to_array(p_department, '/');
+  FOR i IN 1..array_length(parts, 1) LOOP
+    RETURN NEXT array_to_string(parts[1:i], '/');
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- 집계 증감 (p_sign = 1 추가, -1 제거)
+CREATE OR REPLACE FUNCTION adjust_team_analysis_stats(
+  p_organization TEXT,
+  p_department TEXT,
+  p_style TEXT,
+  p_risk TEXT,
+  p_people DECIMAL,
+  p_production DECIMAL,
+  p_lmx DECIMAL,
+  p_sign INTEGER
+) RETURNS VOID AS $$
+DECLARE
+  scope TEXT;
+  style_key TEXT := COALESCE(p_style, 'Unknown');
+BEGIN
+  IF p_organization IS NULL THEN
+    RETURN;
+  END IF;
+
+  FOR scope IN SELECT team_stat_scopes(p_department) LOOP
+    INSERT INTO team_analysis_stats (organization, department)
+    VALUES (p_organization, scope)
+    ON CONFLICT (organization, department) DO NOTHING;
+
+    UPDATE team_analysis_stats SET
+      analyzed_members = analyzed_members + p_sign,
+      -- 0이 된 스타일 키는 제거 (재구성 결과와 동일하게 유지)
+      style_counts = CASE
+        WHEN COALESCE((style_counts->>style_key)::INTEGER, 0) + p_sign = 0
+          THEN style_counts - style_key
+        ELSE jsonb_set(
+          style_counts, ARRAY[style_key],
+          to_jsonb(COALESCE((style_counts->>style_key)::INTEGER, 0) + p_sign)
+        )
+      END,
+      risk_counts = jsonb_set(
+        risk_counts, ARRAY[p_risk],
+        to_jsonb(COALESCE((risk_counts->>p_risk)::INTEGER, 0) + p_sign)
+      ),
+      sum_people = sum_people + p_sign * p_people,
+      sum_production = sum_production + p_sign * p_production,
+      sum_lmx = sum_lmx + p_sign * p_lmx,
+      updated_at = NOW()
+    WHERE organization = p_organization AND department = scope;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 구성원 수 증감
+CREATE OR REPLACE FUNCTION adjust_team_member_count(
+  p_organization TEXT,
+  p_department TEXT,
+  p_sign INTEGER
+) RETURNS VOID AS $$
+DECLARE
+  scope TEXT;
+BEGIN
+  IF p_organization IS NULL THEN
+    RETURN;
+  END IF;
+
+  FOR scope IN SELECT team_stat_scopes(p_department) LOOP
+    INSERT INTO team_analysis_stats (organization, department, member_count)
+    VALUES (p_organization, scope, p_sign)
+    ON CONFLICT (organization, department) DO UPDATE
+    SET member_count = team_analysis_stats.member_count + p_sign,
+        updated_at = NOW();
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =====================================================
+-- 4. Triggers
+-- =====================================================
+-- 새 분석 저장 시 이전 최신 분석 기여분을 빼고 새 분석을 더함
+CREATE OR REPLACE FUNCTION apply_latest_analysis()
+RETURNS TRIGGER AS $$
+DECLARE
+  prev user_latest_analysis%ROWTYPE;
+  member users%ROWTYPE;
+BEGIN
+  -- 동일 사용자에 대한 동시 갱신 직렬화
+  PERFORM pg_advisory_xact_lock(hashtext(NEW.user_id::TEXT));
+
+  SELECT * INTO prev FROM user_latest_analysis WHERE user_id = NEW.user_id;
+
+  -- 더 오래된 분석(backfill 등)은 집계에 영향 없음
+  IF FOUND AND prev.analysis_id <> NEW.id
+     AND prev.analysis_created_at > NEW.created_at THEN
+    RETURN NEW;
+  END IF;
+
+  SELECT * INTO member FROM users WHERE id = NEW.user_id;
+
+  IF prev.user_id IS NOT NULL THEN
+    PERFORM adjust_team_analysis_stats(
+      prev.organization, prev.department, prev.leadership_style,
+      prev.overall_risk_level, prev.blake_mouton_people,
+      prev.blake_mouton_production, prev.lmx_score, -1
+    );
+  END IF;
+
+  PERFORM adjust_team_analysis_stats(
+    member.organization, member.department, NEW.leadership_style,
+    NEW.overall_risk_level::TEXT, NEW.blake_mouton_people,
+    NEW.blake_mouton_production, NEW.lmx_score, 1
+  );
+
+  INSERT INTO user_latest_analysis VALUES (
+    NEW.user_id, NEW.id, member.organization, member.department,
+    NEW.leadership_style, NEW.overall_risk_level::TEXT,
+    NEW.blake_mouton_people, NEW.blake_mouton_production, NEW.lmx_score,
+    NEW.created_at
+  )
+  ON CONFLICT (user_id) DO UPDATE SET
+    analysis_id = EXCLUDED.analysis_id,
+    organization = EXCLUDED.organization,
+    department = EXCLUDED.department,
+    leadership_style = EXCLUDED.leadership_style,
+    overall_risk_level = EXCLUDED.overall_risk_level,
+    blake_mouton_people = EXCLUDED.blake_mouton_people,
+    blake_mouton_production = EXCLUDED.blake_mouton_production,
+    lmx_score = EXCLUDED.lmx_score,
+    analysis_created_at = EXCLUDED.analysis_created_at;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 최신 분석 삭제 시 기여분을 빼고 남은 분석 중 최신 것으로 교체 (없으면 집계에서 제외)
+CREATE OR REPLACE FUNCTION remove_latest_analysis()
+RETURNS TRIGGER AS $$
+DECLARE
+  prev user_latest_analysis%ROWTYPE;
+  member users%ROWTYPE;
+  fallback leadership_analysis%ROWTYPE;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext(OLD.user_id::TEXT));
+
+  SELECT * INTO prev FROM user_latest_analysis WHERE user_id = OLD.user_id;
+  IF NOT FOUND OR prev.analysis_id <> OLD.id THEN
+    RETURN OLD;
+  END IF;
+
+  -- 사용자 삭제에 따른 CASCADE면 기여분은 remove_team_membership_stats에서 이미 뺐음
+  SELECT * INTO member FROM users WHERE id = OLD.user_id;
+  IF NOT FOUND THEN
+    RETURN OLD;
+  END IF;
+
+  PERFORM adjust_team_analysis_stats(
+    prev.organization, prev.department, prev.leadership_style,
+    prev.overall_risk_level, prev.blake_mouton_people,
+    prev.blake_mouton_production, prev.lmx_score, -1
+  );
+
+  SELECT * INTO fallback FROM leadership_analysis
+  WHERE user_id = OLD.user_id AND id <> OLD.id
+  ORDER BY created_at DESC, id DESC
+  LIMIT 1;
+
+  IF NOT FOUND THEN
+    DELETE FROM user_latest_analysis WHERE user_id = OLD.user_id;
+    RETURN OLD;
+  END IF;
+
+  PERFORM adjust_team_analysis_stats(
+    member.organization, member.department, fallback.leadership_style,
+    fallback.overall_risk_level::TEXT, fallback.blake_mouton_people,
+    fallback.blake_mouton_production, fallback.lmx_score, 1
+  );
+
+  UPDATE user_latest_analysis SET
+    analysis_id = fallback.id,
+    organization = member.organization,
+    department = member.department,
+    leadership_style = fallback.leadership_style,
+    overall_risk_level = fallback.overall_risk_level::TEXT,
+    blake_mouton_people = fallback.blake_mouton_people,
+    blake_mouton_production = fallback.blake_mouton_production,
+    lmx_score = fallback.lmx_score,
+    analysis_created_at = fallback.created_at
+  WHERE user_id = OLD.user_id;
+
+  RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 사용자 소속 변경 시 구성원 수와 분석 기여분을 함께 이동
+CREATE OR REPLACE FUNCTION apply_team_membership()
+RETURNS TRIGGER AS $$
+DECLARE
+  latest user_latest_analysis%ROWTYPE;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM adjust_team_member_count(OLD.organization, OLD.department, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM adjust_team_member_count(NEW.organization, NEW.department, 1);
+  END IF;
+
+  IF TG_OP = 'INSERT' THEN
+    RETURN NEW;
+  END IF;
+
+  SELECT * INTO latest FROM user_latest_analysis WHERE user_id = OLD.id;
+  IF FOUND THEN
+    PERFORM adjust_team_analysis_stats(
+      latest.organization, latest.department, latest.leadership_style,
+      latest.overall_risk_level, latest.blake_mouton_people,
+      latest.blake_mouton_production, latest.lmx_score, -1
+    );
+    IF TG_OP = 'UPDATE' THEN
+      PERFORM adjust_team_analysis_stats(
+        NEW.organization, NEW.department, latest.leadership_style,
+        latest.overall_risk_level, latest.blake_mouton_people,
+        latest.blake_mouton_production, latest.lmx_score, 1
+      );
+      UPDATE user_latest_analysis
+      SET organization = NEW.organization, department = NEW.department
+      WHERE user_id = NEW.id;
+    END IF;
+  END IF;
+
+  RETURN COALESCE(NEW, OLD);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS apply_latest_analysis_stats ON leadership_analysis;
+CREATE TRIGGER apply_latest_analysis_stats
+  AFTER INSERT OR UPDATE ON leadership_analysis
+  FOR EACH ROW EXECUTE FUNCTION apply_latest_analysis();
+
+-- analysis_id FK의 CASCADE 삭제 전에 이전 분석으로 교체해야 하므로 BEFORE
+DROP TRIGGER IF EXISTS remove_latest_analysis_stats ON leadership_analysis;
+CREATE TRIGGER remove_latest_analysis_stats
+  BEFORE DELETE ON leadership_analysis
+  FOR EACH ROW EXECUTE FUNCTION remove_latest_analysis();
+
+DROP TRIGGER IF EXISTS apply_team_membership_stats ON users;
+CREATE TRIGGER apply_team_membership_stats
+  AFTER INSERT OR UPDATE OF organization, department ON users
+  FOR EACH ROW EXECUTE FUNCTION apply_team_membership();
+
+-- 삭제는 user_latest_analysis CASCADE 삭제 전에 기여분을 빼야 하므로 BEFORE
+DROP TRIGGER IF EXISTS remove_team_membership_stats ON users;
+CREATE TRIGGER remove_team_membership_stats
+  BEFORE DELETE ON users
+  FOR EACH ROW EXECUTE FUNCTION apply_team_membership();
+
+-- =====================================================
+-- 5. 초기 집계 (기존 데이터 기준 재구성)
+-- =====================================================
+CREATE OR REPLACE FUNCTION rebuild_team_analysis_stats()
+RETURNS VOID AS $$
+DECLARE
+  rec RECORD;
+BEGIN
+  DELETE FROM team_analysis_stats;
+  DELETE FROM user_latest_analysis;
+
+  FOR rec IN SELECT organization, department FROM users LOOP
+    PERFORM adjust_team_member_count(rec.organization, rec.department, 1);
+  END LOOP;
+
+  INSERT INTO user_latest_analysis
+  SELECT DISTINCT ON (a.user_id)
+    a.user_id, a.id, u.organization, u.department, a.leadership_style,
+    a.overall_risk_level::TEXT, a.blake_mouton_people,
+    a.blake_mouton_production, a.lmx_score, a.created_at
+  FROM leadership_analysis a
+  JOIN users u ON u.id = a.user_id
+  ORDER BY a.user_id, a.created_at DESC, a.id DESC;
+
+  FOR rec IN SELECT * FROM user_latest_analysis LOOP
+    PERFORM adjust_team_analysis_stats(
+      rec.organization, rec.department, rec.leadership_style,
+      rec.overall_risk_level, rec.blake_mouton_people,
+      rec.blake_mouton_production, rec.lmx_score, 1
+    );
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+SELECT rebuild_team_analysis_stats();
@@ -0,0 +1,92 @@
+-- 리더십 스타일 분포 집계 (동료 비교용)
+-- 작성일: 2025-10-18
+-- 목적: 보고서 요약의 동료 비교를 전체 분석 조회 대신 집계 행 조회로 처리
+
+-- =====================================================
+-- 1. 스타일 분포 집계
+-- =====================================================
+-- scope = '' 는 전체, 그 외는 조직명. 사용자별 최신 분석 1건만 집계
+CREATE TABLE IF NOT EXISTS style_distribution_stats (
+  scope TEXT PRIMARY KEY,
+  total INTEGER NOT NULL DEFAULT 0,
+  style_counts JSONB NOT NULL DEFAULT '{}',
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE style_distribution_stats ENABLE ROW LEVEL SECURITY;
+
+-- =====================================================
+-- 2. Helper Functions
+-- =====================================================
+-- 분포 증감 (p_sign = 1 추가, -1 제거)
+CREATE OR REPLACE FUNCTION adjust_style_distribution(
+  p_scope TEXT,
+  p_style TEXT,
+  p_sign INTEGER
+) RETURNS VOID AS $$
+DECLARE
+  style_key TEXT := COALESCE(p_style, 'Unknown');
+BEGIN
+  IF p_scope IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO style_distribution_stats (scope)
+  VALUES (p_scope)
+  ON CONFLICT (scope) DO NOTHING;
+
+  UPDATE style_distribution_stats SET
+    total = total + p_sign,
+    style_counts = CASE
+      WHEN COALESCE((style_counts->>style_key)::INTEGER, 0) + p_sign = 0
+        THEN style_counts - style_key
+      ELSE jsonb_set(
+        style_counts, ARRAY[style_key],
+        to_jsonb(COALESCE((style_counts->>style_key)::INTEGER, 0) + p_sign)
+      )
+    END,
+    updated_at = NOW()
+  WHERE scope = p_scope;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =====================================================
+-- 3. Triggers
+-- =====================================================
+-- user_latest_analysis 변경(최신 분석 교체, 소속 변경, 사용자 삭제)을 그대로 반영
+CREATE OR REPLACE FUNCTION apply_style_distribution()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM adjust_style_distribution('', OLD.leadership_style, -1);
+    PERFORM adjust_style_distribution(OLD.organization, OLD.leadership_style, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM adjust_style_distribution('', NEW.leadership_style, 1);
+    PERFORM adjust_style_distribution(NEW.organization, NEW.leadership_style, 1);
+  END IF;
+
+  RETURN COALESCE(NEW, OLD);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS apply_style_distribution_stats ON user_latest_analysis;
+CREATE TRIGGER apply_style_distribution_stats
+  AFTER INSERT OR UPDATE OR DELETE ON user_latest_analysis
+  FOR EACH ROW EXECUTE FUNCTION apply_style_distribution();
+
+-- =====================================================
+-- 4. 초기 집계
+-- =====================================================
+DELETE FROM style_distribution_stats;
+
+INSERT INTO style_distribution_stats (scope, total, style_counts)
+SELECT scope, SUM(count)::INTEGER, jsonb_object_agg(style, count)
+FROM (
+  SELECT scope, COALESCE(leadership_style, 'Unknown') AS style, COUNT(*) AS count
+  FROM user_latest_analysis,
+       LATERAL (VALUES (''), (organization)) AS scopes(scope)
+  WHERE scope IS NOT NULL
+  GROUP BY scope, COALESCE(leadership_style, 'Unknown')
+) counts
+GROUP BY scope;
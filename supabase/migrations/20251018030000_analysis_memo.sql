@@ -0,0 +1,14 @@
+-- 분석 결과 메모이제이션
+-- 작성일: 2025-10-18
+-- 목적: 동일 응답/채점 스펙/AI provider/프롬프트 버전의 분석 결과 재사용
+
+-- =====================================================
+-- 1. 재사용 키 컬럼
+-- =====================================================
+-- sha256(응답 벡터 + 설문 버전 + provider/모델 + 프롬프트 버전), 규칙 기반 fallback 결과는 NULL
+ALTER TABLE leadership_analysis
+  ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_leadership_analysis_content_hash
+  ON leadership_analysis(content_hash)
+  WHERE content_hash IS NOT NULL;
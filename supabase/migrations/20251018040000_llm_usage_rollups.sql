@@ -0,0 +1,65 @@
+-- LLM 사용량 롤업 (분/시간/일 버킷)
+-- 작성일: 2025-10-18
+-- 목적: 호출별 로그 대신 사용자/모델별 시간 버킷 집계를 워커가 주기적으로 일괄 합산
+
+-- =====================================================
+-- 1. 롤업 테이블
+-- =====================================================
+-- token_count, generation_time_ms는 llm_feedbacks 컬럼과 같은 의미의 버킷 합계
+CREATE TABLE IF NOT EXISTS llm_usage_rollups (
+  granularity TEXT NOT NULL CHECK (granularity IN ('minute', 'hour', 'day')),
+  bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+  user_id TEXT NOT NULL,
+  model TEXT NOT NULL,
+  request_count INTEGER NOT NULL DEFAULT 0,
+  token_count BIGINT NOT NULL DEFAULT 0,
+  generation_time_ms BIGINT NOT NULL DEFAULT 0,
+  cost NUMERIC NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (granularity, bucket_start, user_id, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_usage_rollups_user
+  ON llm_usage_rollups(user_id, granularity, bucket_start DESC);
+
+ALTER TABLE llm_usage_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Admins can view LLM usage" ON llm_usage_rollups FOR SELECT
+  USING (
+    EXISTS (
+      SELECT 1 FROM users
+      WHERE id = auth.uid() AND role IN ('admin', 'manager')
+    )
+  );
+
+-- =====================================================
+-- 2. 증분 합산 (워커마다 자기 증분만 보내므로 덮어쓰지 않고 더함)
+-- =====================================================
+-- p_rows: [{granularity, bucket_start, user_id, model, request_count, token_count, generation_time_ms, cost}, ...]
+-- 한 호출 안에서 (granularity, bucket_start, user_id, model)은 중복되지 않아야 함
+CREATE OR REPLACE FUNCTION add_llm_usage_rollups(p_rows JSONB)
+RETURNS VOID AS $$
+  INSERT INTO llm_usage_rollups AS t (
+    granularity, bucket_start, user_id, model,
+    request_count, token_count, generation_time_ms, cost
+  )
+  SELECT
+    r.granularity, r.bucket_start, r.user_id, r.model,
+    r.request_count, r.token_count, r.generation_time_ms, r.cost
+  FROM jsonb_to_recordset(p_rows) AS r(
+    granularity TEXT,
+    bucket_start TIMESTAMP WITH TIME ZONE,
+    user_id TEXT,
+    model TEXT,
+    request_count INTEGER,
+    token_count BIGINT,
+    generation_time_ms BIGINT,
+    cost NUMERIC
+  )
+  ON CONFLICT (granularity, bucket_start, user_id, model) DO UPDATE
+  SET request_count = t.request_count + EXCLUDED.request_count,
+      token_count = t.token_count + EXCLUDED.token_count,
+      generation_time_ms = t.generation_time_ms + EXCLUDED.generation_time_ms,
+      cost = t.cost + EXCLUDED.cost,
+      updated_at = NOW();
+$$ LANGUAGE sql;